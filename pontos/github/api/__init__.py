@@ -16,13 +16,20 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from pontos.github.api.api import GitHubAsyncRESTApi, GitHubRESTApi
+from pontos.github.api.cache import ResponseCache
+from pontos.github.api.graphql import (
+    GitHubAsyncGraphQL,
+    GitHubAsyncGraphQLClient,
+)
 from pontos.github.api.helper import (
     DEFAULT_GITHUB_API_URL,
+    DEFAULT_LIMITS,
     DEFAULT_TIMEOUT_CONFIG,
     JSON,
     JSON_OBJECT,
     FileStatus,
 )
+from pontos.github.api.scheduler import RequestScheduler
 
 __all__ = [
     "JSON",
@@ -30,6 +37,11 @@ __all__ = [
     "FileStatus",
     "GitHubRESTApi",
     "GitHubAsyncRESTApi",
+    "GitHubAsyncGraphQL",
+    "GitHubAsyncGraphQLClient",
+    "ResponseCache",
+    "RequestScheduler",
     "DEFAULT_TIMEOUT_CONFIG",
     "DEFAULT_GITHUB_API_URL",
+    "DEFAULT_LIMITS",
 ]
@@ -15,7 +15,11 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from contextlib import AbstractAsyncContextManager
+from contextlib import (
+    AbstractAsyncContextManager,
+    AbstractContextManager,
+    AsyncExitStack,
+)
 from types import TracebackType
 from typing import Callable, Dict, Iterable, Iterator, Optional, Type
 
@@ -29,13 +33,19 @@ from pontos.github.api.branch import (
     GitHubAsyncRESTBranches,
     GitHubRESTBranchMixin,
 )
+from pontos.github.api.cache import ResponseCache
 from pontos.github.api.client import GitHubAsyncRESTClient
 from pontos.github.api.contents import (
     GitHubAsyncRESTContent,
     GitHubRESTContentMixin,
 )
+from pontos.github.api.graphql import (
+    GitHubAsyncGraphQL,
+    GitHubAsyncGraphQLClient,
+)
 from pontos.github.api.helper import (
     DEFAULT_GITHUB_API_URL,
+    DEFAULT_LIMITS,
     DEFAULT_TIMEOUT_CONFIG,
     JSON,
     JSON_OBJECT,
@@ -58,6 +68,10 @@ from pontos.github.api.release import (
     GitHubRESTReleaseMixin,
 )
 from pontos.github.api.repositories import GitHubAsyncRESTRepositories
+from pontos.github.api.scheduler import (
+    DEFAULT_MAX_CONCURRENCY,
+    RequestScheduler,
+)
 from pontos.github.api.search import GitHubAsyncRESTSearch
 from pontos.github.api.tags import GitHubAsyncRESTTags
 from pontos.github.api.teams import GitHubAsyncRESTTeams
@@ -66,6 +80,25 @@ from pontos.github.api.workflows import (
     GitHubRESTWorkflowsMixin,
 )
 
+# module level request functions of httpx which are sent via the connection
+# pool of the GitHubRESTApi client instead
+_CLIENT_METHODS = (
+    (httpx.delete, "delete"),
+    (httpx.get, "get"),
+    (httpx.head, "head"),
+    (httpx.options, "options"),
+    (httpx.patch, "patch"),
+    (httpx.post, "post"),
+    (httpx.put, "put"),
+)
+
+
+def _client_method(request: Callable) -> Optional[str]:
+    for func, method in _CLIENT_METHODS:
+        if request is func:
+            return method
+    return None
+
 
 class GitHubAsyncRESTApi(AbstractAsyncContextManager):
     """
@@ -74,7 +107,7 @@ class GitHubAsyncRESTApi(AbstractAsyncContextManager):
     Example:
         .. code-block:: python
 
-            with GitHubAsyncRESTApi(token) as api:
+            async with GitHubAsyncRESTApi(token) as api:
                 repositories = await api.organizations.get_repositories("foo")
     """
 
@@ -84,8 +117,36 @@ class GitHubAsyncRESTApi(AbstractAsyncContextManager):
         url: Optional[str] = DEFAULT_GITHUB_API_URL,
         *,
         timeout: Optional[httpx.Timeout] = DEFAULT_TIMEOUT_CONFIG,
+        cache: Optional[ResponseCache] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        scheduler: Optional[RequestScheduler] = None,
     ) -> None:
-        self._client = GitHubAsyncRESTClient(token, url, timeout=timeout)
+        """
+        Args:
+            token: GitHub token to use for authentication
+            url: GitHub API URL
+            timeout: Timeout settings for the HTTP requests
+            cache: Optional cache for the responses of GET requests
+            max_concurrency: Maximum number of concurrent requests
+            scheduler: Optional scheduler for throttling and retrying the
+                requests. If set max_concurrency is ignored. If not set a
+                scheduler with the default throttling and retries and the
+                passed max_concurrency is used. The scheduler is shared by
+                the REST and the GraphQL requests.
+        """
+        self._client = GitHubAsyncRESTClient(
+            token,
+            url,
+            timeout=timeout,
+            cache=cache,
+            max_concurrency=max_concurrency,
+            scheduler=scheduler,
+        )
+        self._token = token
+        self._url = url
+        self._timeout = timeout
+        self._graphql_client: Optional[GitHubAsyncGraphQLClient] = None
+        self._exit_stack: Optional[AsyncExitStack] = None
 
     @property
     def organizations(self) -> GitHubAsyncRESTOrganizations:
@@ -178,8 +239,37 @@ class GitHubAsyncRESTApi(AbstractAsyncContextManager):
         """
         return GitHubAsyncRESTSearch(self._client)
 
+    def _get_graphql_client(self) -> GitHubAsyncGraphQLClient:
+        """
+        Get the GraphQL client. The client is created on first use.
+        """
+        if self._graphql_client is None:
+            # share the concurrency limit and rate limit state with the REST
+            # requests
+            self._graphql_client = GitHubAsyncGraphQLClient(
+                self._token,
+                self._url,
+                timeout=self._timeout,
+                scheduler=self._client.scheduler,
+            )
+            if self._exit_stack is not None:
+                # close the client together with the REST client
+                self._exit_stack.push_async_exit(self._graphql_client)
+        return self._graphql_client
+
+    @property
+    def graphql(self) -> GitHubAsyncGraphQL:
+        """
+        Bulk reads using the GraphQL API
+        """
+        return GitHubAsyncGraphQL(self._get_graphql_client())
+
     async def __aenter__(self) -> "GitHubAsyncRESTApi":
-        await self._client.__aenter__()
+        exit_stack = AsyncExitStack()
+        await exit_stack.enter_async_context(self._client)
+        if self._graphql_client is not None:
+            exit_stack.push_async_exit(self._graphql_client)
+        self._exit_stack = exit_stack
         return self
 
     async def __aexit__(
@@ -188,7 +278,12 @@ class GitHubAsyncRESTApi(AbstractAsyncContextManager):
         exc_value: Optional[BaseException],
         traceback: Optional[TracebackType],
     ) -> Optional[bool]:
-        return await self._client.__aexit__(exc_type, exc_value, traceback)
+        exit_stack, self._exit_stack = self._exit_stack, None
+        # the closed GraphQL client can't be used anymore
+        self._graphql_client = None
+        if exit_stack is None:
+            return None
+        return await exit_stack.__aexit__(exc_type, exc_value, traceback)
 
 
 class GitHubRESTApi(
@@ -200,8 +295,21 @@ class GitHubRESTApi(
     GitHubRESTPullRequestsMixin,
     GitHubRESTReleaseMixin,
     GitHubRESTWorkflowsMixin,
+    AbstractContextManager,
 ):
-    """GitHubRESTApi Mixin"""
+    """
+    GitHubRESTApi Mixin
+
+    All requests are sent via a single pooled HTTP client to reuse the
+    connections. Should be used as a context manager or closed explicitly to
+    release the connections.
+
+    Example:
+        .. code-block:: python
+
+            with GitHubRESTApi(token) as api:
+                api.release_exists("foo/bar", "v1.2.3")
+    """
 
     def __init__(
         self,
@@ -209,10 +317,56 @@ class GitHubRESTApi(
         url: Optional[str] = DEFAULT_GITHUB_API_URL,
         *,
         timeout: httpx.Timeout = DEFAULT_TIMEOUT_CONFIG,
+        cache: Optional[ResponseCache] = None,
+        http2: bool = True,
+        limits: httpx.Limits = DEFAULT_LIMITS,
     ) -> None:
+        """
+        Create a new GitHubRESTApi instance
+
+        Args:
+            token: GitHub token to use for authentication
+            url: GitHub API URL
+            timeout: Timeout settings for the HTTP requests
+            cache: Optional cache for the responses of GET requests
+            http2: Use HTTP/2 if supported by the server
+            limits: Limits for the connection pool like the maximum number
+                of (keep-alive) connections
+        """
         self.token = token
         self.url = url
         self.timeout = timeout
+        self.cache = cache
+        self._http2 = http2
+        self._limits = limits
+        self._client: Optional[httpx.Client] = None
+
+    def _get_client(self) -> httpx.Client:
+        """
+        Get the pooled HTTP client. The client is created on first use.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.Client(
+                timeout=self.timeout, http2=self._http2, limits=self._limits
+            )
+        return self._client
+
+    def close(self) -> None:
+        """
+        Close the pooled HTTP client and all of its connections
+        """
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> Optional[bool]:
+        self.close()
+        return None
 
     def _request_headers(
         self, *, content_type: Optional[str] = None
@@ -246,16 +400,34 @@ class GitHubRESTApi(
         content_type: Optional[str] = None,
     ) -> httpx.Response:
         request = request or httpx.get
+        is_get = request is httpx.get
+        method = _client_method(request)
+        if method:
+            request = getattr(self._get_client(), method)
+
         headers = self._request_headers(content_type=content_type)
         kwargs = self._request_kwargs(data=data, content=content)
-        return request(
+
+        if self.cache is None or not is_get:
+            return request(
+                url,
+                headers=headers,
+                params=params,
+                follow_redirects=True,
+                timeout=self.timeout,
+                **kwargs,
+            )
+
+        key = self.cache.key(url, params=params, headers=headers)
+        response = request(
             url,
-            headers=headers,
+            headers={**headers, **self.cache.request_headers(key)},
             params=params,
             follow_redirects=True,
             timeout=self.timeout,
             **kwargs,
         )
+        return self.cache.response(key, response)
 
     def _request_api_url(self, api) -> str:
         return f"{self.url}{api}"
@@ -223,7 +223,12 @@ class GitHubRESTArtifactsMixin:
                     print(".", end="")
         """
         api = f"{self.url}/repos/{repo}/actions/artifacts/{artifact}/zip"
-        return download(api, destination, headers=self._request_headers())
+        return download(
+            api,
+            destination,
+            headers=self._request_headers(),
+            client=self._get_client(),
+        )
 
     def get_workflow_run_artifacts(
         self, repo: str, run: str
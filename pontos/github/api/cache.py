@@ -0,0 +1,334 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import base64
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import httpx
+
+__all__ = (
+    "CacheEntry",
+    "ResponseCache",
+)
+
+DEFAULT_CACHE_MAX_ENTRIES = 1000
+DEFAULT_CACHE_TTL = 24 * 60 * 60.0  # one day in seconds
+HTTP_NOT_MODIFIED = 304
+
+
+def _unlink(path: Path) -> None:
+    # Path.unlink(missing_ok=True) requires Python >= 3.8
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+@dataclass
+class CacheEntry:
+    """
+    A cached response of a GET request
+
+    Attributes:
+        url: URL of the request
+        status_code: HTTP status code of the cached response
+        headers: HTTP headers of the cached response
+        content: Body of the cached response
+        etag: ETag header value of the cached response if available
+        last_modified: Last-Modified header value of the cached response if
+            available
+        stored: Timestamp when the entry has been stored
+    """
+
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored: float
+
+    @classmethod
+    def from_response(cls, response: httpx.Response) -> "CacheEntry":
+        """
+        Create a cache entry from a httpx response
+        """
+        return cls(
+            url=str(response.url),
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            content=response.content,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+            stored=time.monotonic(),
+        )
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """
+        Get the HTTP headers for a conditional request to validate the entry
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_response(
+        self, request: Optional[httpx.Request] = None
+    ) -> httpx.Response:
+        """
+        Create a httpx response from the cached data
+        """
+        headers = {
+            name: value
+            for name, value in self.headers.items()
+            # the content is already decoded
+            if name.lower() not in ("content-encoding", "transfer-encoding")
+        }
+        return httpx.Response(
+            self.status_code,
+            headers=headers,
+            content=self.content,
+            request=request or httpx.Request("GET", self.url),
+        )
+
+
+class ResponseCache:
+    """
+    A cache for responses of GET requests using conditional requests
+
+    Responses containing an ETag or Last-Modified header are stored. Before
+    a request is sent, the headers for a conditional request can be looked
+    up. If the server answers with 304 Not Modified the cached response can be
+    used instead. GitHub doesn't count 304 responses against the rate limit.
+
+    Entries are kept in memory and evicted in least recently used order if
+    the cache is full. Entries older then the time to live are dropped. If a
+    directory is passed the entries are additionally stored on disk and are
+    available to subsequent runs.
+
+    Example:
+        .. code-block:: python
+
+            cache = ResponseCache(directory=Path(".cache/github"))
+
+            async with GitHubAsyncRESTApi(token, cache=cache) as api:
+                repo = await api.repositories.get("foo/bar")
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        ttl: Optional[float] = DEFAULT_CACHE_TTL,
+        directory: Optional[Union[str, Path]] = None,
+    ) -> None:
+        """
+        Create a new response cache
+
+        Args:
+            max_entries: Maximum number of entries to keep in memory
+            ttl: Time to live of an entry in seconds. If None entries don't
+                expire.
+            directory: Optional directory to store the entries on disk
+        """
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._directory = Path(directory) if directory else None
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+        if self._directory:
+            self._directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(
+        url: Union[str, httpx.URL],
+        *,
+        params: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """
+        Create a cache key for a request
+
+        The key includes the authorization header to never share entries
+        between different tokens.
+        """
+        url = httpx.URL(url)
+        if params:
+            url = url.copy_merge_params(params)
+        authorization = (headers or {}).get("Authorization", "")
+        return hashlib.sha256(
+            f"{authorization}\n{url}".encode("utf-8")
+        ).hexdigest()
+
+    def _expired(self, entry: CacheEntry) -> bool:
+        return (
+            self._ttl is not None
+            and time.monotonic() - entry.stored > self._ttl
+        )
+
+    def _path(self, key: str) -> Path:
+        return self._directory / f"{key}.json"
+
+    def _load(self, key: str) -> Optional[CacheEntry]:
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            data["content"] = base64.b64decode(data["content"])
+            # monotonic timestamps are not usable across processes
+            age = time.time() - data.pop("timestamp")
+            data["stored"] = time.monotonic() - age
+            return CacheEntry(**data)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save(self, key: str, entry: CacheEntry) -> None:
+        data = asdict(entry)
+        data["content"] = base64.b64encode(entry.content).decode("ascii")
+        data["timestamp"] = time.time() - (time.monotonic() - entry.stored)
+        del data["stored"]
+        try:
+            self._path(key).write_text(json.dumps(data), encoding="utf-8")
+        except OSError:
+            pass
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Get a cached entry
+
+        Args:
+            key: The cache key of the request
+
+        Returns:
+            The entry or None if there is no valid entry for the key
+        """
+        entry = self._entries.get(key)
+        if entry is None and self._directory:
+            entry = self._load(key)
+            if entry is not None:
+                self._add(key, entry)
+
+        if entry is None:
+            return None
+
+        if self._expired(entry):
+            self.remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return entry
+
+    def _add(self, key: str, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def store(self, key: str, response: httpx.Response) -> None:
+        """
+        Store a response in the cache
+
+        Only successful responses providing an ETag or Last-Modified header
+        are stored.
+
+        Args:
+            key: The cache key of the request
+            response: The response to store
+        """
+        if not response.is_success:
+            return
+
+        entry = CacheEntry.from_response(response)
+        if not entry.etag and not entry.last_modified:
+            return
+
+        self._add(key, entry)
+
+        if self._directory:
+            self._save(key, entry)
+
+    def remove(self, key: str) -> None:
+        """
+        Remove an entry from the cache
+
+        Args:
+            key: The cache key of the request
+        """
+        self._entries.pop(key, None)
+        if self._directory:
+            _unlink(self._path(key))
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache
+        """
+        self._entries.clear()
+        if self._directory:
+            for path in self._directory.glob("*.json"):
+                _unlink(path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def request_headers(self, key: str) -> Dict[str, str]:
+        """
+        Get the HTTP headers for a conditional request
+
+        Args:
+            key: The cache key of the request
+
+        Returns:
+            A dict containing If-None-Match and If-Modified-Since headers if
+            a valid entry exists. An empty dict otherwise.
+        """
+        entry = self.get(key)
+        return entry.conditional_headers() if entry else {}
+
+    def response(self, key: str, response: httpx.Response) -> httpx.Response:
+        """
+        Process the response of a (conditional) request
+
+        If the response is a 304 Not Modified response the cached response is
+        returned. Otherwise the response is stored in the cache and returned.
+
+        Args:
+            key: The cache key of the request
+            response: The response of the request
+
+        Returns:
+            The cached or the passed response
+        """
+        if response.status_code == HTTP_NOT_MODIFIED:
+            entry = self.get(key)
+            if entry:
+                # refresh the entry
+                entry.stored = time.monotonic()
+                if self._directory:
+                    self._save(key, entry)
+                return entry.to_response(response.request)
+            return response
+
+        self.store(key, response)
+        return response
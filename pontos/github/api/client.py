@@ -15,21 +15,39 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-
+import asyncio
+from collections import deque
 from contextlib import AbstractAsyncContextManager
+from functools import partial
 from types import TracebackType
-from typing import Any, AsyncContextManager, AsyncIterator, Dict, Optional, Type
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Optional,
+    Type,
+)
 
 import httpx
 
+from pontos.github.api.cache import ResponseCache
 from pontos.github.api.helper import (
     DEFAULT_GITHUB_API_URL,
     DEFAULT_TIMEOUT_CONFIG,
     JSON,
     JSON_OBJECT,
+    _get_last_page,
     _get_next_url,
+    _get_page_url,
+)
+from pontos.github.api.scheduler import (
+    DEFAULT_MAX_CONCURRENCY,
+    RequestScheduler,
 )
 from pontos.github.models.base import GitHubModel
+from pontos.helper import AsyncFileContent
 
 Headers = Dict[str, str]
 Params = Dict[str, str]
@@ -38,6 +56,17 @@ Params = Dict[str, str]
 # https://docs.github.com/en/rest/overview/api-versions
 GITHUB_API_VERSION = "2022-11-28"
 
+# number of pages requested concurrently when the total number of pages of a
+# paginated response is known
+DEFAULT_MAX_PREFETCH_PAGES = 10
+
+
+def _is_replayable(content: Optional[Any]) -> bool:
+    # streamed content can't be sent again unless it's read from a file
+    return content is None or isinstance(
+        content, (str, bytes, AsyncFileContent)
+    )
+
 
 class GitHubAsyncRESTClient(AbstractAsyncContextManager):
     """
@@ -59,11 +88,43 @@ class GitHubAsyncRESTClient(AbstractAsyncContextManager):
         url: Optional[str] = DEFAULT_GITHUB_API_URL,
         *,
         timeout: Optional[httpx.Timeout] = DEFAULT_TIMEOUT_CONFIG,
+        cache: Optional[ResponseCache] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        scheduler: Optional[RequestScheduler] = None,
     ) -> None:
+        """
+        Create a new client
+
+        Args:
+            token: GitHub token to use for authentication
+            url: GitHub API URL
+            timeout: Timeout settings for the HTTP requests
+            cache: Optional cache for the responses of GET requests. If set
+                conditional requests are sent and 304 Not Modified responses
+                are served from the cache.
+            max_concurrency: Maximum number of concurrent requests
+            scheduler: Optional scheduler for throttling and retrying the
+                requests. Allows to share a scheduler between clients using
+                the same token. If set max_concurrency is ignored. If not set
+                a scheduler with the default throttling and retries and the
+                passed max_concurrency is used.
+        """
         self.token = token
         self.url = url
+        self._cache = cache
+        self._scheduler = scheduler or RequestScheduler(
+            max_concurrency=max_concurrency
+        )
         self._client = httpx.AsyncClient(timeout=timeout, http2=True)
 
+    @property
+    def scheduler(self) -> RequestScheduler:
+        """
+        The scheduler of the requests. Can be passed to other clients using
+        the same token.
+        """
+        return self._scheduler
+
     def _request_headers(
         self, *, content_type: Optional[str] = None
     ) -> Headers:
@@ -120,32 +181,70 @@ class GitHubAsyncRESTClient(AbstractAsyncContextManager):
         url = self._request_url(api)
         headers = self._request_headers()
         kwargs = self._request_kwargs()
-        return await self._client.get(
-            url,
-            headers=headers,
-            params=params,
-            follow_redirects=True,
-            **kwargs,
+
+        if self._cache is None:
+            return await self._scheduler.run(
+                partial(
+                    self._client.get,
+                    url,
+                    headers=headers,
+                    params=params,
+                    follow_redirects=True,
+                    **kwargs,
+                )
+            )
+
+        key = self._cache.key(url, params=params, headers=headers)
+        response = await self._scheduler.run(
+            partial(
+                self._client.get,
+                url,
+                headers={**headers, **self._cache.request_headers(key)},
+                params=params,
+                follow_redirects=True,
+                **kwargs,
+            )
         )
+        return self._cache.response(key, response)
 
     async def get_all(
         self,
         api: str,
         *,
         params: Optional[Params] = None,
+        max_prefetch: int = DEFAULT_MAX_PREFETCH_PAGES,
     ) -> AsyncIterator[httpx.Response]:
         """
         Get paginated content of a get GitHub API request
 
+        If the first response announces the last page of the result, the
+        remaining pages are requested concurrently. The responses are always
+        yielded in page order.
+
         Args:
             api: API path to use for the get request
             params: Optional params to use for the get request
+            max_prefetch: Maximum number of pages to request concurrently. Use
+                1 to request the pages one after another.
         """
         response = await self.get(api, params=params)
 
         yield response
 
         next_url = _get_next_url(response)
+        last_page = _get_last_page(response)
+
+        if (
+            next_url
+            and last_page
+            and max_prefetch > 1
+            and "page" in httpx.URL(next_url).params
+        ):
+            async for response in self._get_pages(
+                next_url, last_page, params=params, max_prefetch=max_prefetch
+            ):
+                yield response
+            return
 
         while next_url:
             response = await self.get(next_url, params=params)
@@ -154,6 +253,43 @@ class GitHubAsyncRESTClient(AbstractAsyncContextManager):
 
             next_url = _get_next_url(response)
 
+    async def _get_pages(
+        self,
+        next_url: str,
+        last_page: int,
+        *,
+        params: Optional[Params],
+        max_prefetch: int,
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Request the pages from next_url up to last_page concurrently and yield
+        the responses in order
+        """
+        first_page = int(httpx.URL(next_url).params["page"])
+        pages = iter(range(first_page, last_page + 1))
+        pending: Deque[asyncio.Task] = deque()
+
+        def request_next_page() -> None:
+            page = next(pages, None)
+            if page is not None:
+                pending.append(
+                    asyncio.create_task(
+                        self.get(_get_page_url(next_url, page), params=params)
+                    )
+                )
+
+        try:
+            for _ in range(max_prefetch):
+                request_next_page()
+
+            while pending:
+                response = await pending.popleft()
+                request_next_page()
+                yield response
+        finally:
+            for task in pending:
+                task.cancel()
+
     async def delete(
         self, api: str, *, params: Optional[Params] = None
     ) -> httpx.Response:
@@ -166,7 +302,9 @@ class GitHubAsyncRESTClient(AbstractAsyncContextManager):
         """
         headers = self._request_headers()
         url = self._request_url(api)
-        return await self._client.delete(url, params=params, headers=headers)
+        return await self._scheduler.run(
+            partial(self._client.delete, url, params=params, headers=headers)
+        )
 
     async def post(
         self,
@@ -176,6 +314,7 @@ class GitHubAsyncRESTClient(AbstractAsyncContextManager):
         params: Optional[Params] = None,
         content: Optional[str] = None,
         content_type: Optional[str] = None,
+        headers: Optional[Headers] = None,
     ) -> httpx.Response:
         """
         Post request to a GitHub API
@@ -184,11 +323,27 @@ class GitHubAsyncRESTClient(AbstractAsyncContextManager):
             api: API path to use for the post request
             params: Optional params to use for the post request
             data: Optional data to include in the post request
+            content: Optional content to send in the post request
+            content_type: Content type of the content
+            headers: Optional additional headers for the request, for example
+                a Content-Length header for streamed content
         """
-        headers = self._request_headers(content_type=content_type)
+        headers = {
+            **self._request_headers(content_type=content_type),
+            **(headers or {}),
+        }
         url = self._request_url(api)
-        return await self._client.post(
-            url, params=params, headers=headers, json=data, content=content
+        return await self._scheduler.run(
+            partial(
+                self._client.post,
+                url,
+                params=params,
+                headers=headers,
+                json=data,
+                content=content,
+            ),
+            retry=_is_replayable(content),
+            retry_server_errors=False,
         )
 
     async def put(
@@ -210,8 +365,17 @@ class GitHubAsyncRESTClient(AbstractAsyncContextManager):
         """
         headers = self._request_headers(content_type=content_type)
         url = self._request_url(api)
-        return await self._client.put(
-            url, params=params, headers=headers, json=data, content=content
+        return await self._scheduler.run(
+            partial(
+                self._client.put,
+                url,
+                params=params,
+                headers=headers,
+                json=data,
+                content=content,
+            ),
+            retry=_is_replayable(content),
+            retry_server_errors=True,
         )
 
     async def patch(
@@ -233,18 +397,31 @@ class GitHubAsyncRESTClient(AbstractAsyncContextManager):
         """
         headers = self._request_headers(content_type=content_type)
         url = self._request_url(api)
-        return await self._client.patch(
-            url, params=params, headers=headers, json=data, content=content
+        return await self._scheduler.run(
+            partial(
+                self._client.patch,
+                url,
+                params=params,
+                headers=headers,
+                json=data,
+                content=content,
+            ),
+            retry=_is_replayable(content),
+            retry_server_errors=True,
         )
 
-    def stream(self, api: str) -> AsyncContextManager[httpx.Response]:
+    def stream(
+        self, api: str, *, headers: Optional[Headers] = None
+    ) -> AsyncContextManager[httpx.Response]:
         """
         Stream data from a GitHub API
 
         Args:
             api: API path to use for the post request
+            headers: Optional additional headers for the request, for example
+                a Range header
         """
-        headers = self._request_headers()
+        headers = {**self._request_headers(), **(headers or {})}
         url = self._request_url(api)
         return self._client.stream(
             "GET", url, headers=headers, follow_redirects=True
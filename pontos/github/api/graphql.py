@@ -0,0 +1,868 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from contextlib import AbstractAsyncContextManager
+from functools import partial
+from types import TracebackType
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+import httpx
+
+from pontos.github.api.client import GITHUB_API_VERSION
+from pontos.github.api.errors import GitHubApiError
+from pontos.github.api.helper import (
+    DEFAULT_GITHUB_API_URL,
+    DEFAULT_TIMEOUT_CONFIG,
+    JSON_OBJECT,
+)
+from pontos.github.api.scheduler import (
+    DEFAULT_MAX_CONCURRENCY,
+    RequestScheduler,
+)
+from pontos.github.models.base import User
+from pontos.github.models.branch import BranchProtection
+from pontos.github.models.organization import Repository, RepositoryType
+from pontos.github.models.release import Release
+
+__all__ = (
+    "GitHubAsyncGraphQL",
+    "GitHubAsyncGraphQLClient",
+)
+
+Variables = Dict[str, Any]
+
+# maximum number of nodes per page of a GraphQL connection
+MAX_PAGE_SIZE = 100
+
+# number of repositories queried within a single request by the batched
+# repository queries
+DEFAULT_BATCH_SIZE = 20
+
+DEFAULT_GITHUB_UPLOADS_URL = "https://uploads.github.com"
+
+_PAGE_INFO = "pageInfo { hasNextPage endCursor }"
+
+_USER_FIELDS = """
+    __typename
+    login
+    id
+    avatarUrl
+    url
+    ... on User { databaseId isSiteAdmin }
+    ... on Organization { databaseId }
+    ... on Bot { databaseId }
+"""
+
+_REPOSITORY_FIELDS = f"""
+    databaseId
+    id
+    name
+    nameWithOwner
+    description
+    url
+    sshUrl
+    homepageUrl
+    isArchived
+    isDisabled
+    isFork
+    isPrivate
+    isTemplate
+    visibility
+    hasIssuesEnabled
+    hasProjectsEnabled
+    hasWikiEnabled
+    forkCount
+    stargazerCount
+    createdAt
+    updatedAt
+    pushedAt
+    primaryLanguage {{ name }}
+    owner {{ {_USER_FIELDS} }}
+"""
+
+_BRANCH_PROTECTION_FIELDS = """
+    allowsDeletions
+    allowsForcePushes
+    blocksCreations
+    dismissesStaleReviews
+    isAdminEnforced
+    lockAllowsFetchAndMerge
+    lockBranch
+    requireLastPushApproval
+    requiredApprovingReviewCount
+    requiresApprovingReviews
+    requiresCodeOwnerReviews
+    requiresCommitSignatures
+    requiresConversationResolution
+    requiresLinearHistory
+    requiresStatusChecks
+    requiresStrictStatusChecks
+    requiredStatusChecks { context app { databaseId } }
+"""
+
+_RELEASE_FIELDS = f"""
+    databaseId
+    id
+    name
+    tagName
+    description
+    url
+    isDraft
+    isPrerelease
+    createdAt
+    publishedAt
+    tagCommit {{ oid }}
+    author {{ {_USER_FIELDS} }}
+"""
+
+_REPOSITORIES_QUERY = f"""
+query($organization: String!, $privacy: RepositoryPrivacy, $isFork: Boolean,
+      $cursor: String) {{
+  organization(login: $organization) {{
+    repositories(first: {MAX_PAGE_SIZE}, after: $cursor, privacy: $privacy,
+                 isFork: $isFork) {{
+      {_PAGE_INFO}
+      nodes {{
+        {_REPOSITORY_FIELDS}
+        defaultBranchRef {{
+          name
+          %s
+        }}
+      }}
+    }}
+  }}
+}}
+"""
+
+_TEAMS_QUERY = f"""
+query($organization: String!, $cursor: String) {{
+  organization(login: $organization) {{
+    teams(first: {MAX_PAGE_SIZE}, after: $cursor) {{
+      {_PAGE_INFO}
+      nodes {{
+        slug
+        members(first: {MAX_PAGE_SIZE}) {{
+          {_PAGE_INFO}
+          nodes {{ {_USER_FIELDS} }}
+        }}
+      }}
+    }}
+  }}
+}}
+"""
+
+_TEAM_MEMBERS_QUERY = f"""
+query($organization: String!, $team: String!, $cursor: String) {{
+  organization(login: $organization) {{
+    team(slug: $team) {{
+      members(first: {MAX_PAGE_SIZE}, after: $cursor) {{
+        {_PAGE_INFO}
+        nodes {{ {_USER_FIELDS} }}
+      }}
+    }}
+  }}
+}}
+"""
+
+_REPOSITORY_CONNECTION_QUERY = f"""
+query($owner: String!, $name: String!, $cursor: String) {{
+  repository(owner: $owner, name: $name) {{
+    %s(first: {MAX_PAGE_SIZE}, after: $cursor%s) {{
+      {_PAGE_INFO}
+      nodes {{ %s }}
+    }}
+  }}
+}}
+"""
+
+# newest releases first like the REST API
+_RELEASES_ORDER = "orderBy: {field: CREATED_AT, direction: DESC}"
+
+_REPOSITORY_TYPE_FILTERS: Dict[RepositoryType, Variables] = {
+    RepositoryType.ALL: {},
+    RepositoryType.PUBLIC: {"privacy": "PUBLIC"},
+    RepositoryType.PRIVATE: {"privacy": "PRIVATE"},
+    RepositoryType.FORKS: {"isFork": True},
+    RepositoryType.SOURCES: {"isFork": False},
+}
+
+
+def _graphql_url(url: str) -> str:
+    """
+    Get the GraphQL endpoint for a GitHub (Enterprise) REST API URL
+    """
+    url = url.rstrip("/")
+    if url.endswith("/v3"):
+        # GitHub Enterprise Server uses /api/v3 and /api/graphql
+        return f"{url[:-3]}/graphql"
+    return f"{url}/graphql"
+
+
+def _uploads_url(url: str) -> str:
+    """
+    Get the URL for uploading release assets for a GitHub REST API URL
+    """
+    url = url.rstrip("/")
+    if url == DEFAULT_GITHUB_API_URL:
+        return DEFAULT_GITHUB_UPLOADS_URL
+    if url.endswith("/v3"):
+        return f"{url[:-3]}/uploads"
+    return url
+
+
+def _split_repo(repo: str) -> Tuple[str, str]:
+    owner, _, name = repo.partition("/")
+    if not owner or not name:
+        raise GitHubApiError(f"Invalid repository name '{repo}'.")
+    return owner, name
+
+
+def _batched(items: Sequence[str], size: int) -> Iterable[Sequence[str]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _user_dict(api_url: str, node: JSON_OBJECT) -> JSON_OBJECT:
+    """
+    Convert a GraphQL actor into the REST representation of a user
+    """
+    login = node["login"]
+    url = f"{api_url}/users/{login}"
+    return {
+        "login": login,
+        "id": node.get("databaseId"),
+        "node_id": node["id"],
+        "avatar_url": node["avatarUrl"],
+        "gravatar_id": "",
+        "url": url,
+        "html_url": node["url"],
+        "followers_url": f"{url}/followers",
+        "following_url": f"{url}/following{{/other_user}}",
+        "gists_url": f"{url}/gists{{/gist_id}}",
+        "starred_url": f"{url}/starred{{/owner}}{{/repo}}",
+        "subscriptions_url": f"{url}/subscriptions",
+        "organizations_url": f"{url}/orgs",
+        "repos_url": f"{url}/repos",
+        "events_url": f"{url}/events{{/privacy}}",
+        "received_events_url": f"{url}/received_events",
+        "type": node["__typename"],
+        "site_admin": node.get("isSiteAdmin", False),
+    }
+
+
+def _repository_dict(api_url: str, node: JSON_OBJECT) -> JSON_OBJECT:
+    """
+    Convert a GraphQL repository into the REST representation of a repository
+    """
+    url = f"{api_url}/repos/{node['nameWithOwner']}"
+    default_branch = node.get("defaultBranchRef")
+    language = node.get("primaryLanguage")
+    return {
+        "archive_url": f"{url}/{{archive_format}}{{/ref}}",
+        "assignees_url": f"{url}/assignees{{/user}}",
+        "blobs_url": f"{url}/git/blobs{{/sha}}",
+        "branches_url": f"{url}/branches{{/branch}}",
+        "collaborators_url": f"{url}/collaborators{{/collaborator}}",
+        "comments_url": f"{url}/comments{{/number}}",
+        "commits_url": f"{url}/commits{{/sha}}",
+        "compare_url": f"{url}/compare/{{base}}...{{head}}",
+        "contents_url": f"{url}/contents/{{+path}}",
+        "contributors_url": f"{url}/contributors",
+        "deployments_url": f"{url}/deployments",
+        "downloads_url": f"{url}/downloads",
+        "events_url": f"{url}/events",
+        "fork": node["isFork"],
+        "forks_url": f"{url}/forks",
+        "full_name": node["nameWithOwner"],
+        "git_commits_url": f"{url}/git/commits{{/sha}}",
+        "git_refs_url": f"{url}/git/refs{{/sha}}",
+        "git_tags_url": f"{url}/git/tags{{/sha}}",
+        "hooks_url": f"{url}/hooks",
+        "html_url": node["url"],
+        "id": node["databaseId"],
+        "issue_comment_url": f"{url}/issues/comments{{/number}}",
+        "issue_events_url": f"{url}/issues/events{{/number}}",
+        "issues_url": f"{url}/issues{{/number}}",
+        "keys_url": f"{url}/keys{{/key_id}}",
+        "labels_url": f"{url}/labels{{/name}}",
+        "languages_url": f"{url}/languages",
+        "merges_url": f"{url}/merges",
+        "milestones_url": f"{url}/milestones{{/number}}",
+        "name": node["name"],
+        "node_id": node["id"],
+        "notifications_url": (
+            f"{url}/notifications{{?since,all,participating}}"
+        ),
+        "owner": _user_dict(api_url, node["owner"]),
+        "private": node["isPrivate"],
+        "pulls_url": f"{url}/pulls{{/number}}",
+        "releases_url": f"{url}/releases{{/id}}",
+        "stargazers_url": f"{url}/stargazers",
+        "statuses_url": f"{url}/statuses/{{sha}}",
+        "subscribers_url": f"{url}/subscribers",
+        "subscription_url": f"{url}/subscription",
+        "tags_url": f"{url}/tags",
+        "teams_url": f"{url}/teams",
+        "trees_url": f"{url}/git/trees{{/sha}}",
+        "url": url,
+        "archived": node.get("isArchived"),
+        "clone_url": f"{node['url']}.git",
+        "created_at": node.get("createdAt"),
+        "default_branch": default_branch["name"] if default_branch else None,
+        "description": node.get("description"),
+        "disabled": node.get("isDisabled"),
+        "forks_count": node.get("forkCount"),
+        "has_issues": node.get("hasIssuesEnabled"),
+        "has_projects": node.get("hasProjectsEnabled"),
+        "has_wiki": node.get("hasWikiEnabled"),
+        "homepage": node.get("homepageUrl"),
+        "is_template": node.get("isTemplate"),
+        "language": language["name"] if language else None,
+        "pushed_at": node.get("pushedAt"),
+        "ssh_url": node.get("sshUrl"),
+        "stargazers_count": node.get("stargazerCount"),
+        "updated_at": node.get("updatedAt"),
+        "visibility": (
+            node["visibility"].lower() if node.get("visibility") else None
+        ),
+    }
+
+
+def _branch_protection_dict(
+    repository_url: str, branch: str, node: JSON_OBJECT
+) -> JSON_OBJECT:
+    """
+    Convert a GraphQL branch protection rule into the REST representation of
+    a branch protection
+    """
+    url = f"{repository_url}/branches/{branch}/protection"
+
+    def feature(name: str, enabled: bool) -> JSON_OBJECT:
+        return {"url": f"{url}/{name}", "enabled": enabled}
+
+    data = {
+        "url": url,
+        "enforce_admins": feature("enforce_admins", node["isAdminEnforced"]),
+        "required_linear_history": {"enabled": node["requiresLinearHistory"]},
+        "allow_force_pushes": {"enabled": node["allowsForcePushes"]},
+        "allow_deletions": {"enabled": node["allowsDeletions"]},
+        "block_creations": {"enabled": node["blocksCreations"]},
+        "required_conversation_resolution": {
+            "enabled": node["requiresConversationResolution"]
+        },
+        "lock_branch": {"enabled": node["lockBranch"]},
+        "allow_fork_syncing": {"enabled": node["lockAllowsFetchAndMerge"]},
+        "required_signatures": feature(
+            "required_signatures", node["requiresCommitSignatures"]
+        ),
+    }
+
+    if node["requiresStatusChecks"]:
+        data["required_status_checks"] = {
+            "url": f"{url}/required_status_checks",
+            "strict": node["requiresStrictStatusChecks"],
+            "checks": [
+                {
+                    "context": check["context"],
+                    "app_id": (
+                        check["app"]["databaseId"] if check["app"] else None
+                    ),
+                }
+                for check in node["requiredStatusChecks"] or []
+            ],
+        }
+
+    if node["requiresApprovingReviews"]:
+        data["required_pull_request_reviews"] = {
+            "url": f"{url}/required_pull_request_reviews",
+            "dismiss_stale_reviews": node["dismissesStaleReviews"],
+            "require_code_owner_reviews": node["requiresCodeOwnerReviews"],
+            "required_approving_review_count": node[
+                "requiredApprovingReviewCount"
+            ],
+            "require_last_push_approval": node["requireLastPushApproval"],
+        }
+
+    return data
+
+
+def _release_dict(api_url: str, repo: str, node: JSON_OBJECT) -> JSON_OBJECT:
+    """
+    Convert a GraphQL release into the REST representation of a release
+    """
+    url = f"{api_url}/repos/{repo}/releases/{node['databaseId']}"
+    tag = node["tagName"]
+    tag_commit = node.get("tagCommit")
+    author = node.get("author")
+    return {
+        "assets_url": f"{url}/assets",
+        "created_at": node["createdAt"],
+        "draft": node["isDraft"],
+        "html_url": node["url"],
+        "id": node["databaseId"],
+        "node_id": node["id"],
+        "prerelease": node["isPrerelease"],
+        "tag_name": tag,
+        "target_commitish": tag_commit["oid"] if tag_commit else tag,
+        "upload_url": (
+            f"{_uploads_url(api_url)}/repos/{repo}/releases/"
+            f"{node['databaseId']}/assets{{?name,label}}"
+        ),
+        "url": url,
+        "author": _user_dict(api_url, author) if author else None,
+        "body": node.get("description"),
+        "name": node.get("name"),
+        "published_at": node.get("publishedAt"),
+        "tarball_url": f"{api_url}/repos/{repo}/tarball/{tag}",
+        "zipball_url": f"{api_url}/repos/{repo}/zipball/{tag}",
+    }
+
+
+class GitHubAsyncGraphQLClient(AbstractAsyncContextManager):
+    """
+    A client for calling the GitHub GraphQL API asynchronously
+
+    Should be used as an async context manager
+
+    Example:
+        .. code-block:: python
+
+        async with GitHubAsyncGraphQLClient(token) as client:
+            data = await client.query("query { viewer { login } }")
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        url: Optional[str] = DEFAULT_GITHUB_API_URL,
+        *,
+        timeout: Optional[httpx.Timeout] = DEFAULT_TIMEOUT_CONFIG,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        scheduler: Optional[RequestScheduler] = None,
+    ) -> None:
+        """
+        Create a new client
+
+        Args:
+            token: GitHub token to use for authentication
+            url: GitHub REST API URL. The GraphQL endpoint is derived from it.
+            timeout: Timeout settings for the HTTP requests
+            max_concurrency: Maximum number of concurrent requests
+            scheduler: Optional scheduler for throttling and retrying the
+                requests. Allows to share a scheduler with a REST client
+                using the same token. If set max_concurrency is ignored. If
+                not set a scheduler with the default throttling and retries
+                and the passed max_concurrency is used.
+        """
+        self.token = token
+        self.url = url
+        self.graphql_url = _graphql_url(url)
+        self._scheduler = scheduler or RequestScheduler(
+            max_concurrency=max_concurrency
+        )
+        self._client = httpx.AsyncClient(timeout=timeout, http2=True)
+
+    def _request_headers(self) -> Dict[str, str]:
+        """
+        Get the default request headers
+        """
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": GITHUB_API_VERSION,
+        }
+        if self.token:
+            headers["Authorization"] = f"bearer {self.token}"
+        return headers
+
+    async def query(
+        self, query: str, variables: Optional[Variables] = None
+    ) -> JSON_OBJECT:
+        """
+        Run a GraphQL query
+
+        Args:
+            query: The GraphQL query
+            variables: Optional variables for the query
+
+        Returns:
+            The data of the query result
+
+        Raises:
+            `httpx.HTTPStatusError` if there was an error in the request
+            GitHubApiError if the query returned errors
+        """
+        data = {"query": query}
+        if variables:
+            data["variables"] = variables
+
+        # queries are read only and can always be retried
+        response = await self._scheduler.run(
+            partial(
+                self._client.post,
+                self.graphql_url,
+                headers=self._request_headers(),
+                json=data,
+            )
+        )
+        response.raise_for_status()
+
+        result = response.json()
+        errors = result.get("errors")
+        if errors:
+            messages = "; ".join(error.get("message", "") for error in errors)
+            raise GitHubApiError(f"GraphQL query failed: {messages}")
+
+        return result["data"]
+
+    async def query_all(
+        self,
+        query: str,
+        path: Sequence[str],
+        variables: Optional[Variables] = None,
+        *,
+        cursor: Optional[str] = None,
+    ) -> AsyncIterator[JSON_OBJECT]:
+        """
+        Run a GraphQL query for a paginated connection and yield the nodes of
+        all pages
+
+        The query must accept a $cursor variable for the after argument of
+        the connection and request the nodes and the pageInfo with
+        hasNextPage and endCursor of the connection.
+
+        Args:
+            query: The GraphQL query
+            path: The keys of the connection within the data of the query
+                result, for example ("organization", "repositories")
+            variables: Optional variables for the query
+            cursor: Cursor to start after
+
+        Raises:
+            `httpx.HTTPStatusError` if there was an error in the request
+            GitHubApiError if the query returned errors
+        """
+        variables = variables or {}
+        while True:
+            connection = await self.query(
+                query, {**variables, "cursor": cursor}
+            )
+            for key in path:
+                connection = connection.get(key) if connection else None
+
+            if not connection:
+                return
+
+            for node in connection["nodes"]:
+                yield node
+
+            page_info = connection["pageInfo"]
+            if not page_info["hasNextPage"]:
+                return
+
+            cursor = page_info["endCursor"]
+
+    async def __aenter__(self) -> "GitHubAsyncGraphQLClient":
+        await self._client.__aenter__()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> Optional[bool]:
+        return await self._client.__aexit__(exc_type, exc_value, traceback)
+
+
+class GitHubAsyncGraphQL:
+    """
+    Bulk reads using the GitHub GraphQL API
+
+    Each method replaces many requests to the REST API by a few GraphQL
+    queries. The results are returned as the models of the REST API.
+
+    Example:
+        .. code-block:: python
+
+        async with GitHubAsyncGraphQLClient(token) as client:
+            api = GitHubAsyncGraphQL(client)
+            async for repo, protection in api.default_branch_protections(
+                "foo"
+            ):
+                print(repo.name, protection)
+    """
+
+    def __init__(self, client: GitHubAsyncGraphQLClient) -> None:
+        self._client = client
+
+    async def _repositories(
+        self,
+        organization: str,
+        repository_type: RepositoryType,
+        protection: bool,
+    ) -> AsyncIterator[Tuple[JSON_OBJECT, JSON_OBJECT]]:
+        """
+        Get the repository nodes of an organization and their REST
+        representation
+        """
+        try:
+            variables = dict(_REPOSITORY_TYPE_FILTERS[repository_type])
+        except KeyError:
+            raise GitHubApiError(
+                f"Repository type {repository_type.name} is not supported by "
+                "the GraphQL API."
+            ) from None
+
+        variables["organization"] = organization
+        query = _REPOSITORIES_QUERY % (
+            f"branchProtectionRule {{ {_BRANCH_PROTECTION_FIELDS} }}"
+            if protection
+            else ""
+        )
+        async for node in self._client.query_all(
+            query, ("organization", "repositories"), variables
+        ):
+            yield node, _repository_dict(self._client.url, node)
+
+    async def repositories(
+        self,
+        organization: str,
+        *,
+        repository_type: RepositoryType = RepositoryType.ALL,
+    ) -> AsyncIterator[Repository]:
+        """
+        Get all repositories of an organization with 100 repositories per
+        request
+
+        Args:
+            organization: GitHub organization to use
+            repository_type: Only list repositories of this type. MEMBER and
+                INTERNAL are not supported.
+
+        Raises:
+            `httpx.HTTPStatusError` if there was an error in the request
+            GitHubApiError if the query failed
+        """
+        async for _, data in self._repositories(
+            organization, repository_type, False
+        ):
+            yield Repository.from_dict(data)
+
+    async def default_branch_protections(
+        self,
+        organization: str,
+        *,
+        repository_type: RepositoryType = RepositoryType.ALL,
+    ) -> AsyncIterator[Tuple[Repository, Optional[BranchProtection]]]:
+        """
+        Get all repositories of an organization together with the protection
+        of their default branch
+
+        The user, team and app based restrictions and allowances of the
+        protection are not available via GraphQL in the format of the REST
+        API and are not set. Use `GitHubAsyncRESTBranches.protection_rules`
+        for them.
+
+        Args:
+            organization: GitHub organization to use
+            repository_type: Only list repositories of this type. MEMBER and
+                INTERNAL are not supported.
+
+        Returns:
+            An async iterator yielding tuples of the repository and the
+            protection of the default branch. The protection is None if the
+            default branch isn't protected.
+
+        Raises:
+            `httpx.HTTPStatusError` if there was an error in the request
+            GitHubApiError if the query failed
+        """
+        async for node, data in self._repositories(
+            organization, repository_type, True
+        ):
+            branch = node.get("defaultBranchRef")
+            rule = branch.get("branchProtectionRule") if branch else None
+            protection = (
+                BranchProtection.from_dict(
+                    _branch_protection_dict(data["url"], branch["name"], rule)
+                )
+                if rule
+                else None
+            )
+            yield Repository.from_dict(data), protection
+
+    async def team_members(
+        self, organization: str
+    ) -> AsyncIterator[Tuple[str, List[User]]]:
+        """
+        Get the members of all teams of an organization. Team members will
+        include the members of child teams.
+
+        Args:
+            organization: GitHub organization to use
+
+        Returns:
+            An async iterator yielding tuples of the team slug and the team
+            members
+
+        Raises:
+            `httpx.HTTPStatusError` if there was an error in the request
+            GitHubApiError if the query failed
+        """
+        api_url = self._client.url
+        async for team in self._client.query_all(
+            _TEAMS_QUERY,
+            ("organization", "teams"),
+            {"organization": organization},
+        ):
+            members = team["members"]
+            nodes = list(members["nodes"])
+            if members["pageInfo"]["hasNextPage"]:
+                async for node in self._client.query_all(
+                    _TEAM_MEMBERS_QUERY,
+                    ("organization", "team", "members"),
+                    {"organization": organization, "team": team["slug"]},
+                    cursor=members["pageInfo"]["endCursor"],
+                ):
+                    nodes.append(node)
+
+            yield team["slug"], [
+                User.from_dict(_user_dict(api_url, node)) for node in nodes
+            ]
+
+    async def _batched_repository_connection(
+        self,
+        repos: Iterable[str],
+        connection: str,
+        fields: str,
+        batch_size: int,
+        *,
+        arguments: str = "",
+    ) -> AsyncIterator[Tuple[str, List[JSON_OBJECT]]]:
+        """
+        Get the nodes of a connection of several repositories
+
+        The first page of the connection is requested for batch_size
+        repositories at once. Additional pages are requested per repository.
+        """
+        arguments = f", {arguments}" if arguments else ""
+        repos = list(dict.fromkeys(repos))
+        for batch in _batched(repos, batch_size):
+            variables = {}
+            parameters = []
+            selections = []
+            for index, repo in enumerate(batch):
+                owner, name = _split_repo(repo)
+                variables[f"owner{index}"] = owner
+                variables[f"name{index}"] = name
+                parameters.append(
+                    f"$owner{index}: String!, $name{index}: String!"
+                )
+                selections.append(
+                    f"repo{index}: repository(owner: $owner{index}, "
+                    f"name: $name{index}) {{ {connection}"
+                    f"(first: {MAX_PAGE_SIZE}{arguments}) {{ {_PAGE_INFO} "
+                    f"nodes {{ {fields} }} }} }}"
+                )
+
+            data = await self._client.query(
+                f"query({', '.join(parameters)}) {{ {' '.join(selections)} }}",
+                variables,
+            )
+
+            for index, repo in enumerate(batch):
+                result = data[f"repo{index}"][connection]
+                nodes = list(result["nodes"])
+                if result["pageInfo"]["hasNextPage"]:
+                    owner, name = _split_repo(repo)
+                    async for node in self._client.query_all(
+                        _REPOSITORY_CONNECTION_QUERY
+                        % (connection, arguments, fields),
+                        ("repository", connection),
+                        {"owner": owner, "name": name},
+                        cursor=result["pageInfo"]["endCursor"],
+                    ):
+                        nodes.append(node)
+
+                yield repo, nodes
+
+    async def labels(
+        self, repos: Iterable[str], *, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> AsyncIterator[Tuple[str, List[str]]]:
+        """
+        Get the labels of several repositories
+
+        Args:
+            repos: Full names of the repositories, for example "foo/bar"
+            batch_size: Number of repositories to query within one request
+
+        Returns:
+            An async iterator yielding tuples of the repository and the names
+            of its labels
+
+        Raises:
+            `httpx.HTTPStatusError` if there was an error in the request
+            GitHubApiError if the query failed
+        """
+        async for repo, nodes in self._batched_repository_connection(
+            repos, "labels", "name", batch_size
+        ):
+            yield repo, [node["name"] for node in nodes]
+
+    async def releases(
+        self, repos: Iterable[str], *, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> AsyncIterator[Tuple[str, List[Release]]]:
+        """
+        Get the releases of several repositories
+
+        The assets of the releases are not set because GraphQL doesn't
+        provide the IDs of the assets required by the REST API.
+
+        Args:
+            repos: Full names of the repositories, for example "foo/bar"
+            batch_size: Number of repositories to query within one request
+
+        Returns:
+            An async iterator yielding tuples of the repository and its
+            releases
+
+        Raises:
+            `httpx.HTTPStatusError` if there was an error in the request
+            GitHubApiError if the query failed
+        """
+        api_url = self._client.url
+        async for repo, nodes in self._batched_repository_connection(
+            repos,
+            "releases",
+            _RELEASE_FIELDS,
+            batch_size,
+            arguments=_RELEASES_ORDER,
+        ):
+            yield repo, [
+                Release.from_dict(_release_dict(api_url, repo, node))
+                for node in nodes
+            ]
@@ -23,6 +23,10 @@ import httpx
 DEFAULT_GITHUB_API_URL = "https://api.github.com"
 DEFAULT_TIMEOUT = 180.0  # three minutes
 DEFAULT_TIMEOUT_CONFIG = httpx.Timeout(DEFAULT_TIMEOUT)  # three minutes
+# keep idle connections open between the (sequential) requests of scripts
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=10, max_keepalive_connections=10, keepalive_expiry=30.0
+)
 JSON_OBJECT = Dict[str, Union[str, bool, int]]  # pylint: disable=invalid-name
 JSON = Union[List[JSON_OBJECT], JSON_OBJECT]
 
@@ -42,3 +46,25 @@ def _get_next_url(response: httpx.Response) -> Optional[str]:
             pass
 
     return None
+
+
+def _get_last_page(response: httpx.Response) -> Optional[int]:
+    """
+    Get the number of the last page of a paginated response if the response
+    uses page based pagination
+    """
+    if response and response.links:
+        try:
+            url = httpx.URL(response.links["last"]["url"])
+            return int(url.params["page"])
+        except (KeyError, ValueError):
+            pass
+
+    return None
+
+
+def _get_page_url(url: str, page: int) -> str:
+    """
+    Get the URL of a specific page for a paginated response URL
+    """
+    return str(httpx.URL(url).copy_set_param("page", str(page)))
@@ -16,6 +16,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import asyncio
+import random
 from pathlib import Path
 from typing import (
     AsyncContextManager,
@@ -34,13 +35,21 @@ from pontos.github.api.client import GitHubAsyncREST
 from pontos.github.api.helper import JSON_OBJECT
 from pontos.github.models.release import Release
 from pontos.helper import (
+    DEFAULT_DOWNLOAD_CONCURRENCY,
+    DEFAULT_DOWNLOAD_PART_SIZE,
+    AsyncDownloadManager,
     AsyncDownloadProgressIterable,
+    AsyncFileContent,
+    DownloadProgressCallback,
     DownloadProgressIterable,
     download,
     download_async,
-    upload,
 )
 
+DEFAULT_MAX_CONCURRENT_UPLOADS = 4
+DEFAULT_UPLOAD_RETRIES = 3
+UPLOAD_RETRY_BACKOFF = 1.0  # in seconds
+
 
 class GitHubAsyncRESTReleases(GitHubAsyncREST):
     async def create(
@@ -198,6 +207,20 @@ class GitHubAsyncRESTReleases(GitHubAsyncREST):
 
             await asyncio.gather(*tasks)
 
+        """
+        async for asset_json in self._release_assets(
+            repo, tag, match_pattern=match_pattern
+        ):
+            asset_url: str = asset_json.get("browser_download_url", "")
+            name: str = asset_json.get("name", "")
+
+            yield name, download_async(self._client.stream(asset_url))
+
+    async def _release_assets(
+        self, repo: str, tag: str, *, match_pattern: Optional[str] = None
+    ) -> AsyncIterator[JSON_OBJECT]:
+        """
+        Get the assets of a release matching the pattern
         """
         release = await self.get(repo, tag)
         assets_url = release.assets_url
@@ -209,28 +232,145 @@ class GitHubAsyncRESTReleases(GitHubAsyncREST):
 
         assets_json = response.json()
         for asset_json in assets_json:
-            asset_url: str = asset_json.get("browser_download_url", "")
             name: str = asset_json.get("name", "")
 
             if match_pattern and not Path(name).match(match_pattern):
                 continue
 
-            yield name, download_async(self._client.stream(asset_url))
+            yield asset_json
+
+    def download_manager(
+        self,
+        *,
+        max_concurrency: int = DEFAULT_DOWNLOAD_CONCURRENCY,
+        part_size: int = DEFAULT_DOWNLOAD_PART_SIZE,
+        progress: Optional[DownloadProgressCallback] = None,
+    ) -> AsyncDownloadManager:
+        """
+        Create a download manager for release files like the assets or the
+        source archives of a release. The downloads are requested via the
+        client of the API.
+
+        Args:
+            max_concurrency: Maximum number of concurrent requests for all
+                files
+            part_size: Files larger than this size are downloaded in parts
+                of this size
+            progress: Optional callable getting the path, the number of
+                downloaded bytes and the size of a file
+
+        Example:
+            .. code-block:: python
+
+            release = await api.get("foo/bar", "v1.2.3")
+            manager = api.download_manager()
+            async for path in manager.download_all(
+                (asset.browser_download_url, asset.name, asset.size)
+                for asset in release.assets
+            ):
+                print(f"Downloaded {path}")
+        """
+        return AsyncDownloadManager(
+            lambda url, headers: self._client.stream(url, headers=headers),
+            max_concurrency=max_concurrency,
+            part_size=part_size,
+            progress=progress,
+        )
+
+    async def download_release_assets_to(
+        self,
+        repo: str,
+        tag: str,
+        directory: Union[Path, str],
+        *,
+        match_pattern: Optional[str] = None,
+        max_concurrency: int = DEFAULT_DOWNLOAD_CONCURRENCY,
+        part_size: int = DEFAULT_DOWNLOAD_PART_SIZE,
+        progress: Optional[DownloadProgressCallback] = None,
+    ) -> AsyncIterator[Path]:
+        """
+        Download release assets concurrently into a directory
+
+        Large assets are downloaded in several parts concurrently. Failed
+        downloads are resumed.
+
+        Args:
+            repo: GitHub repository (owner/name) to use
+            tag: The git tag for the release
+            directory: Directory to store the assets in. It is created if it
+                doesn't exist.
+            match_pattern: Optional pattern which the name of the available
+                artifact must match. For example "*.zip". Allows to download
+                only specific artifacts.
+            max_concurrency: Maximum number of concurrent requests for all
+                assets
+            part_size: Assets larger than this size are downloaded in parts
+                of this size
+            progress: Optional callable getting the path, the number of
+                downloaded bytes and the size of an asset
+
+        Returns:
+            An async iterator yielding the paths of the downloaded assets in
+            the order of their completion
+
+        Raises:
+            HTTPError if the request was invalid
+
+        Example:
+            .. code-block:: python
+
+            async for path in api.download_release_assets_to(
+                "foo/bar", "v1.2.3", "dist"
+            ):
+                print(f"Downloaded {path}")
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        manager = self.download_manager(
+            max_concurrency=max_concurrency,
+            part_size=part_size,
+            progress=progress,
+        )
+        downloads = [
+            (
+                asset_json.get("browser_download_url", ""),
+                directory / asset_json.get("name", ""),
+                asset_json.get("size"),
+            )
+            async for asset_json in self._release_assets(
+                repo, tag, match_pattern=match_pattern
+            )
+        ]
+        async for path in manager.download_all(downloads):
+            yield path
 
     async def upload_release_assets(
         self,
         repo: str,
         tag: str,
         files: Iterable[Union[Path, Tuple[Path, str]]],
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENT_UPLOADS,
+        max_retries: int = DEFAULT_UPLOAD_RETRIES,
+        release: Optional[Release] = None,
     ) -> AsyncIterator[Path]:
         """
         Upload release assets asynchronously
 
+        The files are streamed in large chunks. Uploads failing with a server
+        error are retried.
+
         Args:
             repo: GitHub repository (owner/name) to use
             tag: The git tag for the release
             files: An iterable of file paths or an iterable of tuples
                 containing a file path and content types to upload as an asset
+            max_concurrency: Maximum number of concurrent uploads
+            max_retries: Maximum number of retries for an upload failing with
+                a server error
+            release: The release of the tag if it has been requested already.
+                Avoids requesting the release again when uploading assets
+                several times.
 
         Returns:
             yields each file after its upload is finished
@@ -256,19 +396,32 @@ class GitHubAsyncRESTReleases(GitHubAsyncREST):
             ):
                print(f"Uploaded: {uploaded_file}")
         """
-        release = await self.get(repo, tag)
+        if release is None:
+            release = await self.get(repo, tag)
         asset_url = release.upload_url.replace("{?name,label}", "")
+        semaphore = asyncio.Semaphore(max_concurrency)
 
         async def upload_file(
             file_path, content_type
         ) -> Tuple[httpx.Response, Path]:
-            response = await self._client.post(
-                asset_url,
-                params={"name": file_path.name},
-                content_type=content_type,
-                content=upload(file_path),
-            )
-            return response, file_path
+            content = AsyncFileContent(file_path)
+            async with semaphore:
+                attempt = 0
+                while True:
+                    response = await self._client.post(
+                        asset_url,
+                        params={"name": file_path.name},
+                        content_type=content_type,
+                        content=content,
+                        headers={"Content-Length": str(content.length)},
+                    )
+                    if not response.is_server_error or attempt >= max_retries:
+                        return response, file_path
+
+                    await asyncio.sleep(
+                        random.uniform(0, UPLOAD_RETRY_BACKOFF * 2**attempt)
+                    )
+                    attempt += 1
 
         tasks = []
         for file_path in files:
@@ -459,7 +612,7 @@ class GitHubRESTReleaseMixin:
             HTTPError if the request was invalid
         """
         api = f"https://github.com/{repo}/archive/refs/tags/{tag}.tar.gz"
-        return download(api, destination)
+        return download(api, destination, client=self._get_client())
 
     def download_release_zip(
         self, repo: str, tag: str, destination: Path
@@ -476,7 +629,7 @@ class GitHubRESTReleaseMixin:
             HTTPError if the request was invalid
         """
         api = f"https://github.com/{repo}/archive/refs/tags/{tag}.zip"
-        return download(api, destination)
+        return download(api, destination, client=self._get_client())
 
     def download_release_assets(
         self,
@@ -508,6 +661,7 @@ class GitHubRESTReleaseMixin:
                 with download(
                     asset_url,
                     Path(name),
+                    client=self._get_client(),
                 ) as progress:
                     yield progress
 
@@ -0,0 +1,212 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional
+
+import httpx
+
+__all__ = ("RequestScheduler",)
+
+# GitHub allows up to 100 concurrent requests
+# https://docs.github.com/en/rest/guides/best-practices-for-integrators#dealing-with-secondary-rate-limits
+DEFAULT_MAX_CONCURRENCY = 20
+# GitHub's secondary rate limit allows 900 points per minute for REST API
+# requests. A GET request costs one point.
+DEFAULT_REQUESTS_PER_SECOND = 15.0
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF_FACTOR = 1.0  # in seconds
+DEFAULT_MAX_BACKOFF = 60.0  # in seconds
+
+HTTP_FORBIDDEN = 403
+HTTP_TOO_MANY_REQUESTS = 429
+SERVER_ERROR_STATUS_CODES = (500, 502, 503, 504)
+
+
+def _header_value(response: httpx.Response, name: str) -> Optional[float]:
+    value = response.headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class RequestScheduler:
+    """
+    Schedules requests to the GitHub REST API
+
+    The scheduler
+
+    * limits the number of concurrent requests
+    * throttles the requests using a token bucket
+    * tracks the X-RateLimit-Remaining, X-RateLimit-Reset and Retry-After
+      headers and pauses all requests until the rate limit is reset
+    * retries rate limited requests and requests failing with a server error
+      using an exponential backoff with jitter
+
+    A scheduler is used for all requests of a GitHubAsyncRESTClient and
+    therefore for all requests using the same token.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        requests_per_second: Optional[float] = DEFAULT_REQUESTS_PER_SECOND,
+        burst: Optional[int] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+    ) -> None:
+        """
+        Create a new scheduler
+
+        Args:
+            max_concurrency: Maximum number of concurrent requests
+            requests_per_second: Sustained number of requests per second. If
+                None the requests are not throttled.
+            burst: Number of requests that may be sent at once before the
+                requests get throttled. Defaults to requests_per_second.
+            max_retries: Maximum number of retries for a request
+            backoff_factor: Base delay in seconds for the exponential backoff
+                between retries
+            max_backoff: Maximum delay in seconds between retries
+        """
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.burst = burst or max(1, int(requests_per_second or 1))
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+
+        # asyncio primitives must be created within the running event loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.burst),
+            self._tokens + (now - self._last_refill) * self.requests_per_second,
+        )
+        self._last_refill = now
+
+    def _block(self, delay: float) -> None:
+        self._blocked_until = max(
+            self._blocked_until, time.monotonic() + max(delay, 0.0)
+        )
+
+    async def _acquire(self) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            delay = self._blocked_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            if not self.requests_per_second:
+                return
+
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep(
+                    (1 - self._tokens) / self.requests_per_second
+                )
+                self._refill()
+
+            self._tokens -= 1
+
+    def _update(self, response: httpx.Response) -> None:
+        retry_after = _header_value(response, "retry-after")
+        if retry_after is not None:
+            self._block(retry_after)
+            return
+
+        remaining = _header_value(response, "x-ratelimit-remaining")
+        reset = _header_value(response, "x-ratelimit-reset")
+        if remaining == 0 and reset is not None:
+            self._block(reset - time.time())
+
+    @staticmethod
+    def is_rate_limited(response: httpx.Response) -> bool:
+        """
+        Check if a response has been rejected because of a rate limit
+        """
+        if response.status_code == HTTP_TOO_MANY_REQUESTS:
+            return True
+        return response.status_code == HTTP_FORBIDDEN and (
+            _header_value(response, "retry-after") is not None
+            or _header_value(response, "x-ratelimit-remaining") == 0
+        )
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff_factor * 2**attempt)
+        )
+
+    async def run(
+        self,
+        request: Callable[[], Awaitable[httpx.Response]],
+        *,
+        retry: bool = True,
+        retry_server_errors: bool = True,
+    ) -> httpx.Response:
+        """
+        Run a request
+
+        Args:
+            request: A callable returning an awaitable for sending the
+                request. It is called again for every retry.
+            retry: Retry the request if it fails. Must be disabled if the
+                request can't be sent again, for example because its content
+                is streamed.
+            retry_server_errors: Retry the request if the server responds
+                with a 5xx status code. Should be disabled for requests that
+                are not idempotent.
+
+        Returns:
+            The response of the request. If the request still fails after all
+            retries the last response is returned.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                await self._acquire()
+                response = await request()
+                self._update(response)
+
+            failed = self.is_rate_limited(response) or (
+                retry_server_errors
+                and response.status_code in SERVER_ERROR_STATUS_CODES
+            )
+            if not retry or not failed or attempt >= self.max_retries:
+                return response
+
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
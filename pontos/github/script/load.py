@@ -99,8 +99,8 @@ def run_github_script_function(
         return retval
 
     # it's sync
-    api = GitHubRESTApi(token, timeout=timeout)
-    return func(api, args)
+    with GitHubRESTApi(token, timeout=timeout) as api:
+        return func(api, args)
 
 
 def run_add_arguments_function(
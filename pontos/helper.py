@@ -16,8 +16,11 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
 import os
+import random
 import re
+import shutil
 import subprocess
 import sys
 import warnings
@@ -31,12 +34,14 @@ from typing import (
     Any,
     AsyncContextManager,
     AsyncIterator,
+    BinaryIO,
     Callable,
     Dict,
     Generator,
     Generic,
     Iterable,
     Iterator,
+    List,
     Optional,
     Tuple,
     Type,
@@ -51,6 +56,16 @@ from pontos.errors import PontosError
 DEFAULT_TIMEOUT = 1000
 DEFAULT_CHUNK_SIZE = 4096
 
+DEFAULT_UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+DEFAULT_DOWNLOAD_BUFFER_SIZE = 1024 * 1024  # 1 MiB
+DEFAULT_DOWNLOAD_PART_SIZE = 64 * 1024 * 1024  # 64 MiB
+DEFAULT_DOWNLOAD_CONCURRENCY = 8
+DEFAULT_DOWNLOAD_RETRIES = 3
+DOWNLOAD_RETRY_BACKOFF = 1.0  # in seconds
+
+HTTP_PARTIAL_CONTENT = 206
+HTTP_RANGE_NOT_SATISFIABLE = 416
+
 
 async def upload(file_path: Path) -> AsyncIterator[bytes]:
     with file_path.open("rb") as f:
@@ -60,6 +75,53 @@ async def upload(file_path: Path) -> AsyncIterator[bytes]:
             read = f.read(DEFAULT_CHUNK_SIZE)
 
 
+class AsyncFileContent:
+    """
+    The content of a file for streaming it in an upload request
+
+    The file is read in large chunks without an additional buffer to reduce
+    the per chunk overhead. In contrast to the upload async generator the
+    content can be iterated several times and therefore the request can be
+    sent again.
+
+    Example:
+        .. code-block:: python
+
+        content = AsyncFileContent(Path("foo.tar.gz"))
+        await client.post(
+            url,
+            content=content,
+            headers={"Content-Length": str(content.length)},
+        )
+    """
+
+    def __init__(
+        self, path: Path, *, chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE
+    ) -> None:
+        """
+        Args:
+            path: Path of the file to upload
+            chunk_size: Read the file in chunks of this size
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+
+    @property
+    def length(self) -> int:
+        """
+        Size of the file in bytes
+        """
+        return self.path.stat().st_size
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        # an unbuffered file reads the chunks directly into the returned bytes
+        with self.path.open("rb", buffering=0) as f:
+            content = f.read(self.chunk_size)
+            while content:
+                yield content
+                content = f.read(self.chunk_size)
+
+
 T = TypeVar("T", str, bytes)
 
 
@@ -171,6 +233,406 @@ async def download_async(
         )
 
 
+StreamFactory = Callable[
+    [str, Dict[str, str]], AsyncContextManager[httpx.Response]
+]
+DownloadProgressCallback = Callable[[Path, int, Optional[int]], None]
+
+
+class _RestartDownloadError(Exception):
+    """
+    The already downloaded parts of a file can't be used. Either the server
+    ignored the Range header of a request or the file has changed.
+    """
+
+
+def _response_validator(response: httpx.Response) -> Optional[str]:
+    """
+    Get the strong ETag or the Last-Modified date of a response to be used as
+    If-Range header
+    """
+    etag = response.headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return response.headers.get("last-modified")
+
+
+class _DownloadValidator:
+    """
+    The validator (ETag or Last-Modified date) of a file downloaded in parts
+
+    It is stored next to the part files. A resumed download only continues
+    the parts if the file hasn't changed since.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self.value = path.read_text(encoding="utf-8") if path.exists() else None
+
+    def check(self, response: httpx.Response) -> None:
+        """
+        Store the validator of the first response and ensure that all other
+        responses belong to the same version of the file
+        """
+        value = _response_validator(response)
+        if not value:
+            return
+
+        if self.value is None:
+            self.replace(response)
+        elif value != self.value:
+            raise _RestartDownloadError()
+
+    def replace(self, response: httpx.Response) -> None:
+        """
+        Store the validator of a response containing the whole file
+        """
+        self.value = _response_validator(response)
+        if self.value:
+            self._path.write_text(self.value, encoding="utf-8")
+        else:
+            self.remove()
+
+    def remove(self) -> None:
+        try:
+            self._path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _append_file(source: Path, target: BinaryIO) -> None:
+    """
+    Append the content of a file to another file
+
+    Uses os.sendfile to copy the content within the kernel if possible.
+    """
+    target.seek(0, os.SEEK_END)
+    target.flush()
+    with source.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        offset = 0
+        try:
+            while offset < size:
+                sent = os.sendfile(
+                    target.fileno(), f.fileno(), offset, size - offset
+                )
+                if not sent:
+                    break
+                offset += sent
+        except (AttributeError, OSError):
+            # sendfile is not available or doesn't support files as target
+            pass
+
+        target.seek(0, os.SEEK_END)
+        if offset < size:
+            f.seek(offset)
+            shutil.copyfileobj(f, target, DEFAULT_DOWNLOAD_BUFFER_SIZE)
+
+
+class AsyncDownloadManager:
+    """
+    Download files concurrently
+
+    Large files with a known size are split into parts which are downloaded
+    concurrently using HTTP Range requests. The parts are stored next to the
+    destination as <destination>.part<N> files and are concatenated when all
+    parts are downloaded. If a download fails the already downloaded content
+    is kept and the download is resumed on the next retry or the next run.
+    The ETag or Last-Modified date of the file is stored as
+    <destination>.validator and sent as If-Range header when resuming. If the
+    file has changed in between the download starts over.
+
+    Example:
+        .. code-block:: python
+
+        async with httpx.AsyncClient(follow_redirects=True) as client:
+            manager = AsyncDownloadManager(
+                lambda url, headers: client.stream("GET", url, headers=headers)
+            )
+            await manager.download("https://foo.bar/baz.zip", "baz.zip")
+    """
+
+    def __init__(
+        self,
+        stream: StreamFactory,
+        *,
+        max_concurrency: int = DEFAULT_DOWNLOAD_CONCURRENCY,
+        part_size: int = DEFAULT_DOWNLOAD_PART_SIZE,
+        buffer_size: int = DEFAULT_DOWNLOAD_BUFFER_SIZE,
+        max_retries: int = DEFAULT_DOWNLOAD_RETRIES,
+        progress: Optional[DownloadProgressCallback] = None,
+    ) -> None:
+        """
+        Create a new download manager
+
+        Args:
+            stream: A callable getting an URL and additional request headers
+                and returning an async context manager providing a streaming
+                response for a GET request
+            max_concurrency: Maximum number of concurrent requests for all
+                downloads
+            part_size: Files with a known size larger than this size are
+                downloaded in parts of this size
+            buffer_size: Size of the buffer for writing the content
+            max_retries: Maximum number of retries for a part if the
+                connection fails or the server responds with an error
+            progress: Optional callable getting the destination, the number of
+                downloaded bytes and the size of a file (if known) whenever
+                new content of the file has been written
+        """
+        self._stream = stream
+        self.max_concurrency = max_concurrency
+        self.part_size = part_size
+        self.buffer_size = buffer_size
+        self.max_retries = max_retries
+        self._progress = progress
+
+        # asyncio primitives must be created within the running event loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @staticmethod
+    def _part_path(destination: Path, index: int) -> Path:
+        return destination.with_name(f"{destination.name}.part{index}")
+
+    @staticmethod
+    def _validator(destination: Path) -> _DownloadValidator:
+        return _DownloadValidator(
+            destination.with_name(f"{destination.name}.validator")
+        )
+
+    def _ranges(self, length: Optional[int]) -> List[Tuple[int, Optional[int]]]:
+        """
+        Split a file into ranges of first and last (inclusive) byte. The last
+        byte of a single range is None.
+        """
+        if not length or length <= self.part_size:
+            return [(0, None)]
+
+        return [
+            (start, min(start + self.part_size, length) - 1)
+            for start in range(0, length, self.part_size)
+        ]
+
+    async def _download_part(
+        self,
+        url: str,
+        path: Path,
+        start: int,
+        end: Optional[int],
+        validator: _DownloadValidator,
+        on_content: Callable[[int], None],
+    ) -> None:
+        """
+        Download a range of a file into a part file and resume the download
+        if the part file already exists
+        """
+        attempt = 0
+        while True:
+            written = path.stat().st_size if path.exists() else 0
+            offset = start + written
+            if end is not None and offset > end:
+                return
+
+            headers = {}
+            if end is not None:
+                headers["Range"] = f"bytes={offset}-{end}"
+            elif offset:
+                headers["Range"] = f"bytes={offset}-"
+
+            if headers and validator.value:
+                # the server sends the whole file if it has changed
+                headers["If-Range"] = validator.value
+
+            try:
+                async with self._semaphore, self._stream(
+                    url, headers
+                ) as response:
+                    if (
+                        response.status_code == HTTP_RANGE_NOT_SATISFIABLE
+                        and end is None
+                    ):
+                        # the file has been downloaded completely already
+                        return
+
+                    response.raise_for_status()
+
+                    mode = "ab"
+                    if headers and response.status_code != HTTP_PARTIAL_CONTENT:
+                        if end is not None:
+                            raise _RestartDownloadError()
+
+                        # the whole file is sent again
+                        mode = "wb"
+                        on_content(-written)
+                        validator.replace(response)
+                    else:
+                        validator.check(response)
+
+                    # write the content as received and let a large write
+                    # buffer combine it. this doesn't lose already received
+                    # content on connection errors.
+                    with path.open(mode, buffering=self.buffer_size) as f:
+                        async for content in response.aiter_bytes():
+                            f.write(content)
+                            on_content(len(content))
+                return
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                if (
+                    isinstance(e, httpx.HTTPStatusError)
+                    and not e.response.is_server_error
+                ) or attempt >= self.max_retries:
+                    raise
+
+            await asyncio.sleep(
+                random.uniform(0, DOWNLOAD_RETRY_BACKOFF * 2**attempt)
+            )
+            attempt += 1
+
+    async def _download_parts(
+        self,
+        url: str,
+        destination: Path,
+        ranges: List[Tuple[int, Optional[int]]],
+        length: Optional[int],
+    ) -> None:
+        validator = self._validator(destination)
+        if validator.value is None:
+            # existing parts can't be checked for changes of the file
+            self._remove_parts(destination, len(ranges))
+
+        paths = [
+            self._part_path(destination, index) for index in range(len(ranges))
+        ]
+        downloaded = sum(path.stat().st_size for path in paths if path.exists())
+
+        def on_content(size: int) -> None:
+            nonlocal downloaded
+            downloaded += size
+            if self._progress:
+                self._progress(destination, downloaded, length)
+
+        tasks = [
+            asyncio.ensure_future(
+                self._download_part(
+                    url, path, start, end, validator, on_content
+                )
+            )
+            for path, (start, end) in zip(paths, ranges)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _remove_parts(self, destination: Path, count: int) -> None:
+        for index in range(count):
+            try:
+                self._part_path(destination, index).unlink()
+            except FileNotFoundError:
+                pass
+
+        self._validator(destination).remove()
+
+    def _assemble(
+        self, destination: Path, count: int, length: Optional[int]
+    ) -> None:
+        """
+        Concatenate the part files and move the result to the destination
+        """
+        paths = [self._part_path(destination, index) for index in range(count)]
+        size = sum(path.stat().st_size for path in paths)
+        if length is not None and size != length:
+            self._remove_parts(destination, count)
+            raise PontosError(
+                f"Downloaded {size} bytes for {destination} but expected "
+                f"{length} bytes."
+            )
+
+        first, *others = paths
+        if others:
+            with first.open("r+b") as f:
+                for path in others:
+                    _append_file(path, f)
+                    path.unlink()
+
+        first.replace(destination)
+        self._validator(destination).remove()
+
+    async def download(
+        self,
+        url: str,
+        destination: Union[Path, str],
+        *,
+        length: Optional[int] = None,
+    ) -> Path:
+        """
+        Download a file
+
+        Args:
+            url: The URL of the file
+            destination: Path of the downloaded file
+            length: Size of the file if known. Required for downloading the
+                file in parts.
+
+        Returns:
+            The path of the downloaded file
+
+        Raises:
+            HTTPError if the download failed
+            PontosError if the size of the downloaded file doesn't match
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        destination = Path(destination)
+        ranges = self._ranges(length)
+        try:
+            await self._download_parts(url, destination, ranges, length)
+        except _RestartDownloadError:
+            self._remove_parts(destination, len(ranges))
+            ranges = [(0, None)]
+            await self._download_parts(url, destination, ranges, length)
+
+        self._assemble(destination, len(ranges), length)
+        return destination
+
+    async def download_all(
+        self,
+        downloads: Iterable[Tuple[str, Union[Path, str], Optional[int]]],
+    ) -> AsyncIterator[Path]:
+        """
+        Download several files concurrently
+
+        Args:
+            downloads: Tuples of URL, destination and size (if known) of the
+                files to download
+
+        Returns:
+            An async iterator yielding the paths of the downloaded files in
+            the order of their completion
+
+        Raises:
+            HTTPError if a download failed
+            PontosError if the size of a downloaded file doesn't match
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        tasks = [
+            asyncio.ensure_future(
+                self.download(url, destination, length=length)
+            )
+            for url, destination, length in downloads
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
 class DownloadProgressIterable:
     def __init__(
         self,
@@ -236,6 +698,7 @@ def download(
     params: Dict[str, Any] = None,
     chunk_size: int = DEFAULT_CHUNK_SIZE,
     timeout: int = DEFAULT_TIMEOUT,
+    client: Optional[httpx.Client] = None,
 ) -> Generator[DownloadProgressIterable, None, None]:
     """Download file in url to filename
 
@@ -247,6 +710,9 @@ def download(
         params: HTTP request parameters to use for the download
         chunk_size: Download file in chunks of this size
         timeout: Connection timeout
+        client: Optional HTTP client to send the request with, for example to
+                reuse the connections of its pool. If not set a new connection
+                is opened for the download.
 
     Raises:
         HTTPError if the request was invalid
@@ -267,7 +733,9 @@ def download(
         Path(url.split("/")[-1]) if not destination else Path(destination)
     )
 
-    with httpx.stream(
+    stream = client.stream if client else httpx.stream
+
+    with stream(
         "GET",
         url,
         timeout=timeout,
@@ -15,10 +15,11 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, fields
 from datetime import date, datetime
 from inspect import isclass
-from typing import Any, Dict, Type, Union, get_type_hints
+from typing import Any, Callable, Dict, Type, Union, get_type_hints
 
 from dateutil import parser as dateparser
 
@@ -27,7 +28,7 @@ try:
 except ImportError:
     from typing_extensions import get_args, get_origin
 
-__all__ = ("Model",)
+__all__ = ("Model", "compact_model")
 
 
 def dotted_attributes(obj: Any, data: Dict[str, Any]) -> Any:
@@ -63,70 +64,130 @@ class ModelAttribute:
     """
 
 
+Converter = Callable[[Any], Any]
+
+# types which don't need to be converted if the value already has this type.
+# calling the type would just return the passed value.
+_IMMUTABLE_TYPES = (str, int, float, bool)
+
+
+def _parse_datetime(value: Any) -> datetime:
+    # Only Python 3.11 supports sufficient formats in
+    # datetime.fromisoformat. Therefore we have to use dateutil here.
+    return dateparser.isoparse(value)
+    # the iso format may not contain UTC data or a UTC offset
+    # this means it is considered local time (Python calls this "naive"
+    # datetime) and can't really be compared to other times. maybe we
+    # should always assume UTC for these formats.
+    # This could be done the following:
+    # if not value.tzinfo:
+    #     value = value.replace(tzinfo=timezone.utc)
+
+
+def _intern_str(value: Any) -> str:
+    return sys.intern(value if value.__class__ is str else str(value))
+
+
+def _compile_converter(
+    model_field_cls: Type[Any], *, compact: bool = False
+) -> Converter:
+    """
+    Create a function converting a value into the type of a model field
+
+    Args:
+        model_field_cls: The type of the model field
+        compact: Create compact models for model fields and intern strings
+    """
+    if isclass(model_field_cls) and issubclass(model_field_cls, _ModelBase):
+        if compact:
+            return compact_model(model_field_cls).from_dict
+        return model_field_cls.from_dict
+    if isclass(model_field_cls) and issubclass(model_field_cls, datetime):
+        return _parse_datetime
+    if isclass(model_field_cls) and issubclass(model_field_cls, date):
+        return date.fromisoformat
+
+    origin = get_origin(model_field_cls)
+    if origin == list:
+        return _compile_converter(get_args(model_field_cls)[0], compact=compact)
+    if origin == dict:
+        return _compile_converter(dict, compact=compact)
+    if origin == Union:
+        possible_types = get_args(model_field_cls)
+        converters = {
+            possible_type: _compile_converter(possible_type, compact=compact)
+            for possible_type in possible_types
+            if isclass(possible_type)
+        }
+        # currently Unions should not contain Models. this would require
+        # to iterate over the possible type, check if it is a Model
+        # class and try to create an instance of this class until it
+        # fits. For now just fallback to first type
+        fallback = converters.get(possible_types[0]) or _compile_converter(
+            possible_types[0], compact=compact
+        )
+
+        def convert_union(value: Any) -> Any:
+            return converters.get(type(value), fallback)(value)
+
+        return convert_union
+
+    if compact and model_field_cls is str:
+        return _intern_str
+
+    if model_field_cls in _IMMUTABLE_TYPES:
+
+        def convert_immutable(value: Any) -> Any:
+            if value.__class__ is model_field_cls:
+                return value
+            return model_field_cls(value)
+
+        return convert_immutable
+
+    def convert(value: Any) -> Any:
+        if isinstance(value, dict):
+            return model_field_cls(**value)
+        return model_field_cls(value)
+
+    return convert
+
+
 @dataclass(init=False)
-class Model:
+class _ModelBase:
     """
-    Base class for models
+    Common base class of models and compact models
+
+    It doesn't provide a __dict__ to allow slotted subclasses. See
+    compact_model.
     """
 
-    @staticmethod
-    def _get_value_from_model_field_cls(
-        model_field_cls: Type[Any], value: Any
-    ) -> Any:
-        if isclass(model_field_cls) and issubclass(model_field_cls, Model):
-            value = model_field_cls.from_dict(value)
-        elif isclass(model_field_cls) and issubclass(model_field_cls, datetime):
-            # Only Python 3.11 supports sufficient formats in
-            # datetime.fromisoformat. Therefore we have to use dateutil here.
-            value = dateparser.isoparse(value)
-            # the iso format may not contain UTC data or a UTC offset
-            # this means it is considered local time (Python calls this "naive"
-            # datetime) and can't really be compared to other times. maybe we
-            # should always assume UTC for these formats.
-            # This could be done the following:
-            # if not value.tzinfo:
-            #     value = value.replace(tzinfo=timezone.utc)
-        elif isclass(model_field_cls) and issubclass(model_field_cls, date):
-            value = date.fromisoformat(value)
-        elif get_origin(model_field_cls) == list:
-            model_field_cls = get_args(model_field_cls)[0]
-            value = Model._get_value_from_model_field_cls(
-                model_field_cls, value
-            )
-        elif get_origin(model_field_cls) == dict:
-            model_field_cls = dict
-            value = Model._get_value_from_model_field_cls(
-                model_field_cls, value
-            )
-        elif get_origin(model_field_cls) == Union:
-            possible_types = get_args(model_field_cls)
-            current_type = type(value)
-            if current_type in possible_types:
-                model_field_cls = current_type
-            else:
-                # currently Unions should not contain Models. this would require
-                # to iterate over the possible type, check if it is a Model
-                # class and try to create an instance of this class until it
-                # fits. For now just fallback to first type
-                model_field_cls = possible_types[0]
-
-            value = Model._get_value_from_model_field_cls(
-                model_field_cls, value
-            )
-        else:
-            if isinstance(value, dict):
-                value = model_field_cls(**value)
-            else:
-                value = model_field_cls(value)
-        return value
+    __slots__ = ()
+
+    # if True nested models are compact too, strings are interned, lists are
+    # stored as tuples and unknown attributes are dropped
+    _compact = False
+    # names of the list fields of a compact model without a value. they are
+    # set to an empty tuple instead of creating an empty list per instance
+    _empty_list_fields = ()
+
+    @classmethod
+    def _get_converters(cls) -> Dict[str, Converter]:
+        """
+        Get the converters for all fields of the model class
 
-    @staticmethod
-    def _get_value(model_field_cls: Type[Any], value: Any) -> Any:
-        if model_field_cls:
-            value = Model._get_value_from_model_field_cls(
-                model_field_cls, value
-            )
-        return value
+        The converters are created on first use and cached per class because
+        resolving the type hints is expensive. They can't be created when the
+        class is defined because the type hints may contain forward references.
+        """
+        # don't use the converters of a base class
+        converters = cls.__dict__.get("_converters")
+        if converters is None:
+            converters = {
+                name: _compile_converter(model_field_cls, compact=cls._compact)
+                for name, model_field_cls in get_type_hints(cls).items()
+            }
+            cls._converters = converters
+        return converters
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]):
@@ -143,22 +204,105 @@ class Model:
                 "updated_at": "2017-07-08T16:18:44-04:00",
             })
         """
-        kwargs = {}
+        kwargs = dict.fromkeys(cls._empty_list_fields, ())
         additional_attrs = {}
-        type_hints = get_type_hints(cls)
+        converters = cls._get_converters()
         for name, value in data.items():
-            if isinstance(value, list):
-                model_field_cls = type_hints.get(name)
-                value = [cls._get_value(model_field_cls, v) for v in value]
+            converter = converters.get(name)
+            if converter is None:
+                if not cls._compact:
+                    additional_attrs[name] = value
+            elif isinstance(value, list):
+                if cls._compact:
+                    kwargs[name] = tuple([converter(v) for v in value])
+                else:
+                    kwargs[name] = [converter(v) for v in value]
             elif value is not None:
-                model_field_cls = type_hints.get(name)
-                value = cls._get_value(model_field_cls, value)
-
-            if name in type_hints:
-                kwargs[name] = value
+                kwargs[name] = converter(value)
             else:
-                additional_attrs[name] = value
+                kwargs[name] = value
 
         instance = cls(**kwargs)
-        dotted_attributes(instance, additional_attrs)
+        if additional_attrs:
+            dotted_attributes(instance, additional_attrs)
         return instance
+
+
+@dataclass(init=False)
+class Model(_ModelBase):
+    """
+    Base class for models
+    """
+
+
+def compact_model(model_cls: Type[_ModelBase]) -> Type[_ModelBase]:
+    """
+    Get a memory compact variant of a model class
+
+    Instances of the compact class use __slots__ instead of a __dict__ for
+    storing the field values. String values are interned to share duplicate
+    strings like vendor names or URLs between instances and unknown attributes
+    that don't correspond to a field are dropped. Nested models are created as
+    compact models too.
+
+    List fields are stored as tuples and list fields without a value share a
+    single empty tuple. Therefore compact models are meant to be read only.
+
+    The compact class is a separate class with the same name, fields and
+    methods. It isn't derived from Model because Model instances always
+    provide a __dict__. Therefore its instances are not instances of Model or
+    the passed model class. The compact class is created once and cached.
+
+    Args:
+        model_cls: A dataclass derived from Model
+
+    Returns:
+        The compact variant of the model class. It is a separate class and
+        not a subclass of the passed model class or of Model. Therefore
+        isinstance checks against the model class fail for its instances.
+
+    Example:
+        .. code-block:: python
+
+            from pontos.models import compact_model
+            from pontos.nvd.models.cve import CVE
+
+            CompactCVE = compact_model(CVE)
+            cves = [CompactCVE.from_dict(data) for data in cve_data]
+    """
+    if model_cls._compact:  # pylint: disable=protected-access
+        return model_cls
+
+    # don't use the compact class of a base class
+    compact_cls = model_cls.__dict__.get("_compact_cls")
+    if compact_cls is not None:
+        return compact_cls
+
+    field_names = tuple(field.name for field in fields(model_cls))
+    # this is similar to dataclass(slots=True) which is only available since
+    # Python 3.10. the default values of the fields are kept by the generated
+    # __init__ method and the dataclass fields.
+    namespace = {}
+    mro = model_cls.__mro__
+    for klass in reversed(mro[: mro.index(Model)]):
+        namespace.update(
+            (key, value)
+            for key, value in klass.__dict__.items()
+            if key not in field_names
+            and key
+            not in ("__dict__", "__weakref__", "_converters", "_compact_cls")
+        )
+
+    namespace["__annotations__"] = get_type_hints(model_cls)
+    namespace["__slots__"] = field_names
+    namespace["_compact"] = True
+    namespace["_empty_list_fields"] = tuple(
+        field.name
+        for field in fields(model_cls)
+        if field.default_factory is list
+    )
+
+    compact_cls = type(model_cls)(model_cls.__name__, (_ModelBase,), namespace)
+    compact_cls.__qualname__ = model_cls.__qualname__
+    model_cls._compact_cls = compact_cls  # pylint: disable=protected-access
+    return compact_cls
@@ -16,27 +16,61 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import asyncio
+import random
+import re
 from abc import ABC
-from datetime import datetime, timezone
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+from enum import Enum
+from functools import lru_cache
+from json import JSONDecodeError, JSONDecoder
+from time import monotonic
 from types import TracebackType
-from typing import Any, Dict, Optional, Type
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
 
-from httpx import AsyncClient, Response, Timeout
+from httpx import AsyncClient, HTTPStatusError, Response, Timeout
 
 from pontos.helper import snake_case
 
 SLEEP_TIMEOUT = 30.0  # in seconds
+RATE_LIMIT_WINDOW = 30.0  # rolling window of the NVD rate limit in seconds
+PUBLIC_RATE_LIMIT = 5  # requests per window without an API key
+TOKEN_RATE_LIMIT = 50  # requests per window with an API key
+DEFAULT_MAX_RETRIES = 3
+RETRY_BACKOFF = 6.0  # in seconds
+RETRY_STATUS_CODES = (403, 503)
+DEFAULT_MAX_CONCURRENT_PAGES = 5
+# NVD allows a maximum range of 120 consecutive days for date filters
+MAX_DATE_RANGE = timedelta(days=120)
 DEFAULT_TIMEOUT = 180.0  # three minutes
 DEFAULT_TIMEOUT_CONFIG = Timeout(DEFAULT_TIMEOUT)  # three minutes
 
 Headers = Dict[str, str]
-Params = Dict[str, str]
+Params = Dict[str, Any]
+JSON = Dict[str, Any]
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
 
 __all__ = (
     "now",
     "format_date",
+    "date_ranges",
+    "json_default",
     "convert_camel_case",
+    "decode_results",
     "NVDApi",
+    "RateLimiter",
     "DEFAULT_TIMEOUT_CONFIG",
 )
 
@@ -52,18 +86,261 @@ def format_date(date: datetime) -> str:
     return date.isoformat(timespec="seconds")
 
 
+def date_ranges(
+    start: datetime, end: datetime, *, max_range: timedelta = MAX_DATE_RANGE
+) -> List[Tuple[datetime, datetime]]:
+    """
+    Split a date range into consecutive ranges not exceeding the maximum
+    range allowed by the NVD API
+    """
+    ranges = []
+    while start < end:
+        range_end = min(start + max_range, end)
+        ranges.append((start, range_end))
+        start = range_end
+    return ranges
+
+
+def json_default(value: Any) -> Any:
+    """
+    Convert dates, datetimes and enums of models for json.dumps
+
+    Example:
+        .. code-block:: python
+
+            json.dumps(asdict(cve), default=json_default)
+    """
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"{type(value)} is not JSON serializable")
+
+
+@lru_cache(maxsize=1024)
+def _snake_case(key: str) -> str:
+    # the NVD responses only use a small set of keys
+    return snake_case(key)
+
+
 def convert_camel_case(dct: Dict[str, Any]) -> Dict[str, Any]:
     """
     Convert camel case keys into snake case keys
     """
-    converted = {}
-    for key, value in dct.items():
-        converted[snake_case(key)] = value
-    return converted
+    return {_snake_case(key): value for key, value in dct.items()}
 
 
-async def sleep() -> None:
-    await asyncio.sleep(SLEEP_TIMEOUT)
+class _JSONStreamDecoder:
+    """
+    Decode JSON text arriving in chunks
+
+    The text is kept in a rolling buffer. Text in front of the current
+    position is dropped whenever a new chunk is read, therefore only the
+    value currently being decoded needs to fit into memory.
+    """
+
+    def __init__(self, chunks: AsyncIterable[str]) -> None:
+        self._chunks = chunks.__aiter__()
+        self._decoder = JSONDecoder(object_hook=convert_camel_case)
+        self._buffer = ""
+        self._index = 0
+        self._eof = False
+
+    async def _read(self) -> bool:
+        """
+        Append the next chunk to the buffer
+
+        Returns False if all chunks have been read already.
+        """
+        if self._eof:
+            return False
+
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self._eof = True
+            return False
+
+        self._buffer = self._buffer[self._index :] + chunk
+        self._index = 0
+        return True
+
+    async def peek(self) -> str:
+        """
+        Skip whitespace and return the next character or an empty string at
+        the end of the text
+        """
+        while True:
+            self._index = _WHITESPACE.match(self._buffer, self._index).end()
+            if self._index < len(self._buffer) or not await self._read():
+                return self._buffer[self._index : self._index + 1]
+
+    async def expect(self, char: str) -> None:
+        """
+        Skip whitespace and consume the expected character
+        """
+        if await self.peek() != char:
+            raise JSONDecodeError(
+                f"Expecting '{char}'", self._buffer, self._index
+            )
+        self._index += 1
+
+    async def decode(self) -> Any:
+        """
+        Skip whitespace and decode the next JSON value
+        """
+        await self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._index)
+            except JSONDecodeError:
+                # the value may be incomplete
+                if not await self._read():
+                    raise
+                continue
+
+            # a number at the end of the buffer may continue in the next chunk
+            if end < len(self._buffer) or not await self._read():
+                self._index = end
+                return value
+
+
+async def _iter_json_items(
+    chunks: AsyncIterable[str], key: str, data: JSON
+) -> AsyncIterator[Any]:
+    """
+    Decode a JSON object incrementally and yield the items of the array
+    stored at key one by one
+
+    All other members of the object are decoded into data. Before yielding
+    the first item None is yielded, at this point data contains all members
+    in front of the array.
+    """
+    decoder = _JSONStreamDecoder(chunks)
+
+    await decoder.expect("{")
+    if await decoder.peek() == "}":
+        return
+
+    while True:
+        name = await decoder.decode()
+        await decoder.expect(":")
+
+        if name == key and await decoder.peek() == "[":
+            yield None
+
+            await decoder.expect("[")
+            if await decoder.peek() == "]":
+                await decoder.expect("]")
+            else:
+                while True:
+                    yield await decoder.decode()
+
+                    if await decoder.peek() == "]":
+                        await decoder.expect("]")
+                        break
+                    await decoder.expect(",")
+        else:
+            data[_snake_case(name)] = await decoder.decode()
+
+        if await decoder.peek() == "}":
+            return
+        await decoder.expect(",")
+
+
+async def decode_results(
+    chunks: AsyncIterable[str], key: str
+) -> Tuple[JSON, AsyncIterator[JSON]]:
+    """
+    Decode a page of results returned by the NVD API incrementally
+
+    Instead of creating the whole object tree of the page at once, the
+    results are decoded one after another while iterating. The text is
+    consumed chunk by chunk, for example from a streamed response via
+    response.aiter_text(). The keys of all objects are converted into snake
+    case.
+
+    Args:
+        chunks: The JSON text of the page in chunks
+        key: The key of the results array, for example "vulnerabilities"
+
+    Returns:
+        A tuple of a dict containing all other members of the page like
+        total_results and an async iterator over the results. Members after
+        the results are added to the dict when the iterator is exhausted.
+    """
+    data: JSON = {}
+    items = _iter_json_items(chunks, key, data)
+    # decode all members in front of the results
+    try:
+        await items.__anext__()
+    except StopAsyncIteration:
+        pass
+    return data, items
+
+
+async def sleep(timeout: float = SLEEP_TIMEOUT) -> None:
+    await asyncio.sleep(timeout)
+
+
+class RateLimiter:
+    """
+    An async rate limiter using a rolling time window
+
+    At most `requests` requests are allowed to be started within `window`
+    seconds. A rate limiter can be shared between several API instances
+    (for example a CVEApi and a CPEApi using the same API key) to keep all
+    of their requests within the NVD rate limit.
+
+    Example:
+        .. code-block:: python
+
+            limiter = RateLimiter(50)
+
+            cve_api = CVEApi(token=token, rate_limiter=limiter)
+            cpe_api = CPEApi(token=token, rate_limiter=limiter)
+
+            async with cve_api, cpe_api:
+                ...
+    """
+
+    def __init__(
+        self, requests: int, *, window: float = RATE_LIMIT_WINDOW
+    ) -> None:
+        """
+        Create a new rate limiter
+
+        Args:
+            requests: Number of requests allowed within the window
+            window: Length of the rolling window in seconds
+        """
+        self.requests = requests
+        self.window = window
+        self._timestamps: Deque[float] = deque()
+        # must be created within the running event loop
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self) -> None:
+        """
+        Wait until another request can be started within the window
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            current = monotonic()
+            while (
+                self._timestamps
+                and self._timestamps[0] <= current - self.window
+            ):
+                self._timestamps.popleft()
+
+            if len(self._timestamps) >= self.requests:
+                # wait until the oldest request leaves the window
+                await sleep(self._timestamps[0] + self.window - current)
+                self._timestamps.popleft()
+
+            self._timestamps.append(monotonic())
 
 
 class NVDApi(ABC):
@@ -81,6 +358,8 @@ class NVDApi(ABC):
         token: Optional[str] = None,
         timeout: Optional[Timeout] = DEFAULT_TIMEOUT_CONFIG,
         rate_limit: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
     ) -> None:
         """
         Create a new instance of the CVE API.
@@ -96,17 +375,27 @@ class NVDApi(ABC):
                 rolling 30 second window.
                 See https://nvd.nist.gov/developers/start-here#divRateLimits
                 Default: True.
+            rate_limiter: An optional rate limiter to share the rate limit
+                with other API instances. If not set and rate_limit is True
+                a new rate limiter is created.
+            max_retries: Maximum number of retries for requests failing with
+                403 Forbidden or 503 Service Unavailable. The NVD API returns
+                these status codes if the rate limit is exceeded or the
+                service is overloaded.
         """
         self._url = url
         self._token = token
         self._client = AsyncClient(http2=True, timeout=timeout)
-
-        if rate_limit:
-            self._rate_limit = 50 if token else 5
+        self._max_retries = max_retries
+
+        if rate_limiter:
+            self._rate_limiter: Optional[RateLimiter] = rate_limiter
+        elif rate_limit:
+            self._rate_limiter = RateLimiter(
+                TOKEN_RATE_LIMIT if token else PUBLIC_RATE_LIMIT
+            )
         else:
-            self._rate_limit = None
-
-        self._request_count = 0
+            self._rate_limiter = None
 
     def _request_headers(self) -> Headers:
         """
@@ -123,31 +412,171 @@ class NVDApi(ABC):
         """
         Apply rate limit if necessary
         """
-        if not self._rate_limit:
-            return
+        if self._rate_limiter:
+            await self._rate_limiter.acquire()
 
-        self._request_count += 1
-        if self._request_count > self._rate_limit:
-            await sleep()
-            self._request_count = 0
+    @staticmethod
+    def _retry_delay(response: Response, attempt: int) -> float:
+        retry_after = response.headers.get("retry-after")
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+
+        delay = min(SLEEP_TIMEOUT, RETRY_BACKOFF * 2**attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
 
     async def _get(
         self,
         *,
         params: Optional[Params] = None,
+        stream: bool = False,
     ) -> Response:
         """
         A request against the NIST NVD CVE REST API.
+
+        Args:
+            params: Query parameters for the request
+            stream: Don't read the content of the response. The response
+                must be closed via aclose() afterwards.
         """
         headers = self._request_headers()
 
-        await self._consider_rate_limit()
+        attempt = 0
+        while True:
+            await self._consider_rate_limit()
+
+            if stream:
+                request = self._client.build_request(
+                    "GET", self._url, headers=headers, params=params
+                )
+                response = await self._client.send(request, stream=True)
+            else:
+                response = await self._client.get(
+                    self._url, headers=headers, params=params
+                )
+
+            if (
+                response.is_success
+                or response.status_code not in RETRY_STATUS_CODES
+                or attempt >= self._max_retries
+            ):
+                return response
+
+            if stream:
+                await response.aclose()
+
+            await sleep(self._retry_delay(response, attempt))
+            attempt += 1
+
+    async def _get_page(self, params: Params) -> Response:
+        """
+        Request a page of results without reading its content
+
+        The returned response must be closed via aclose().
+        """
+        response = await self._get(params=params, stream=True)
+        try:
+            response.raise_for_status()
+        except HTTPStatusError:
+            await response.aclose()
+            raise
+        return response
+
+    async def _get_results(
+        self,
+        params: Params,
+        key: str,
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENT_PAGES,
+        ordered: bool = True,
+    ) -> AsyncIterator[JSON]:
+        """
+        Request all pages of a paginated result and yield the results
+
+        The first page is requested on its own to get the total number of
+        results and the page size. Afterwards up to max_concurrency pages are
+        requested concurrently. The rate limiter still applies to all of these
+        requests.
+
+        The pages are streamed and their results are decoded and yielded one
+        by one while the page is downloaded.
+
+        Args:
+            params: Query parameters for the requests
+            key: The key of the results array in the pages
+            max_concurrency: Maximum number of pages requested at once
+            ordered: Yield the pages in order. If False the pages are yielded
+                as soon as they are available.
+        """
+        response = await self._get_page({**params, "startIndex": 0})
+        try:
+            data, items = await decode_results(response.aiter_text(), key)
+            async for item in items:
+                yield item
+        finally:
+            await response.aclose()
+
+        # the page information may be located after the results
+        results_per_page: int = data["results_per_page"]
+        total_results: int = data["total_results"]
+
+        if not results_per_page:
+            return
 
-        return await self._client.get(self._url, headers=headers, params=params)
+        start_indices: Iterator[int] = iter(
+            range(results_per_page, total_results, results_per_page)
+        )
+        pending: Deque[asyncio.Task] = deque()
+
+        def request_next_page() -> None:
+            start_index = next(start_indices, None)
+            if start_index is None:
+                return
+
+            pending.append(
+                asyncio.create_task(
+                    self._get_page(
+                        {
+                            **params,
+                            "startIndex": start_index,
+                            "resultsPerPage": results_per_page,
+                        }
+                    )
+                )
+            )
+
+        try:
+            for _ in range(max(1, max_concurrency)):
+                request_next_page()
+
+            while pending:
+                if ordered:
+                    task = pending.popleft()
+                else:
+                    await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    # prefer the lowest page if several pages are done
+                    task = next(task for task in pending if task.done())
+                    pending.remove(task)
+
+                response = await task
+                request_next_page()
+
+                try:
+                    _, items = await decode_results(response.aiter_text(), key)
+                    async for item in items:
+                        yield item
+                finally:
+                    await response.aclose()
+        finally:
+            for task in pending:
+                if task.cancel():
+                    continue
+                # close the responses of already requested pages
+                if not task.cancelled() and task.exception() is None:
+                    await task.result().aclose()
 
     async def __aenter__(self) -> "NVDApi":
-        # reset rate limit counter
-        self._request_count = 0
         await self._client.__aenter__()
         return self
 
@@ -19,6 +19,7 @@ import asyncio
 from argparse import ArgumentParser, Namespace
 
 from pontos.nvd.cpe.api import CPEApi
+from pontos.nvd.cpe.dictionary import CPEDictionary
 
 
 async def query_cpe(args: Namespace) -> None:
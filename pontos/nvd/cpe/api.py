@@ -17,14 +17,17 @@
 
 
 from datetime import datetime
-from typing import Any, AsyncIterator, Dict, List, Optional, Union
+from typing import AsyncIterator, List, Optional, Union
 
 from httpx import Timeout
 
 from pontos.errors import PontosError
 from pontos.nvd.api import (
+    DEFAULT_MAX_CONCURRENT_PAGES,
+    DEFAULT_MAX_RETRIES,
     DEFAULT_TIMEOUT_CONFIG,
     NVDApi,
+    RateLimiter,
     convert_camel_case,
     format_date,
     now,
@@ -53,6 +56,8 @@ class CPEApi(NVDApi):
         token: Optional[str] = None,
         timeout: Optional[Timeout] = DEFAULT_TIMEOUT_CONFIG,
         rate_limit: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
     ) -> None:
         """
         Create a new instance of the CPE API.
@@ -67,12 +72,19 @@ class CPEApi(NVDApi):
                 rolling 30 second window.
                 See https://nvd.nist.gov/developers/start-here#divRateLimits
                 Default: True.
+            rate_limiter: An optional rate limiter to share the rate limit
+                with other API instances. If not set and rate_limit is True
+                a new rate limiter is created.
+            max_retries: Maximum number of retries for requests failing with
+                403 Forbidden or 503 Service Unavailable.
         """
         super().__init__(
             DEFAULT_NIST_NVD_CPES_URL,
             token=token,
             timeout=timeout,
             rate_limit=rate_limit,
+            rate_limiter=rate_limiter,
+            max_retries=max_retries,
         )
 
     async def cpe(self, cpe_name_id: str) -> CPE:
@@ -111,6 +123,8 @@ class CPEApi(NVDApi):
         cpe_match_string: Optional[str] = None,
         keywords: Optional[Union[List[str], str]] = None,
         match_criteria_id: Optional[str] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENT_PAGES,
+        ordered: bool = True,
     ) -> AsyncIterator[CPE]:
         """
         Get all CPEs for the provided arguments
@@ -128,6 +142,11 @@ class CPEApi(NVDApi):
                 the metadata title or reference links.
             match_criteria_id: Returns all CPE records associated with a match
                 string identified by its UUID.
+            max_concurrency: Maximum number of result pages requested
+                concurrently. The requests are still limited by the rate
+                limit.
+            ordered: Return the results in the order of the pages. If False
+                results are returned as soon as their page is available.
 
         Example:
             .. code-block:: python
@@ -136,8 +155,6 @@ class CPEApi(NVDApi):
                 async for cpe in api.cpes(keywords=["Mac OS X"]):
                     print(cpe.cpe_name, cpe.cpe_name_id)
         """
-        total_results = None
-
         params = {}
         if last_modified_start_date:
             params["lastModStartDate"] = format_date(last_modified_start_date)
@@ -160,27 +177,12 @@ class CPEApi(NVDApi):
         if match_criteria_id:
             params["matchCriteriaId"] = match_criteria_id
 
-        start_index = 0
-        results_per_page = None
-
-        while total_results is None or start_index < total_results:
-            params["startIndex"] = start_index
-
-            if results_per_page is not None:
-                params["resultsPerPage"] = results_per_page
-
-            response = await self._get(params=params)
-            response.raise_for_status()
-
-            data: Dict[str, Union[int, str, Dict[str, Any]]] = response.json(
-                object_hook=convert_camel_case
-            )
-
-            results_per_page: int = data["results_per_page"]
-            total_results: int = data["total_results"]
-            products = data.get("products", [])
-
-            for product in products:
+        results = self._get_results(
+            params, "products", max_concurrency=max_concurrency, ordered=ordered
+        )
+        try:
+            async for product in results:
                 yield CPE.from_dict(product["cpe"])
-
-            start_index += results_per_page
+        finally:
+            # close the streamed pages if the iteration is stopped early
+            await results.aclose()
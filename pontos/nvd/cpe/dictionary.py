@@ -0,0 +1,346 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import operator
+import os
+import re
+import tempfile
+from dataclasses import asdict
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from pontos.errors import PontosError
+from pontos.nvd.api import date_ranges, json_default, now
+from pontos.nvd.cpe.api import CPEApi
+from pontos.nvd.cpe.match import (
+    ANY,
+    NA,
+    PRODUCT_INDEX,
+    VENDOR_INDEX,
+    VERSION_INDEX,
+    split_cpe,
+)
+from pontos.nvd.models.cpe import CPE
+
+__all__ = ("CPEDictionary",)
+
+_WILDCARD_REGEX = re.compile(r"(?<!\\)[*?]")
+_TOKEN_REGEX = re.compile(r"\\.|\*|\?|[^\\*?]+")
+
+Components = Tuple[str, ...]
+Matcher = Callable[[str], bool]
+Entry = Tuple[Components, CPE]
+# vendor -> product -> version -> CPE Name ID -> entry
+Index = Dict[str, Dict[str, Dict[str, Dict[str, Entry]]]]
+
+
+def _match_any(value: str) -> bool:  # pylint: disable=unused-argument
+    return True
+
+
+def _compile_component(pattern: str) -> Tuple[Optional[str], Matcher]:
+    """
+    Compile a component of a CPE match string
+
+    Returns:
+        A tuple of the exact value to look up if the pattern doesn't contain
+        wildcards (None otherwise) and a function to check if a component of
+        a CPE name matches the pattern
+    """
+    if pattern == ANY:
+        return None, _match_any
+
+    if not _WILDCARD_REGEX.search(pattern):
+        return pattern, partial(operator.eq, pattern)
+
+    regex = []
+    for token in _TOKEN_REGEX.findall(pattern):
+        if token == "*":
+            regex.append(".*")
+        elif token == "?":
+            regex.append(".")
+        else:
+            regex.append(re.escape(token))
+    compiled = re.compile("".join(regex), re.DOTALL)
+
+    def match(value: str) -> bool:
+        return value not in (ANY, NA) and compiled.fullmatch(value) is not None
+
+    return None, match
+
+
+def _select(
+    buckets: Dict[str, Dict], exact: Optional[str], matcher: Matcher
+) -> Iterator[Dict]:
+    if exact is not None:
+        bucket = buckets.get(exact)
+        if bucket:
+            yield bucket
+        return
+
+    for key, bucket in buckets.items():
+        if matcher(key):
+            yield bucket
+
+
+class CPEDictionary:
+    """
+    A local in-memory copy of the NVD CPE dictionary
+
+    The CPEs are indexed by their vendor, product and version components to
+    allow looking up CPE match strings without querying the NVD.
+
+    The dictionary can be saved to a file and loaded again together with the
+    date and time of the last sync. Therefore a loaded dictionary only needs
+    to download the CPEs modified since it has been saved.
+
+    Example:
+        .. code-block:: python
+
+            path = Path("cpes.jsonl")
+            dictionary = (
+                CPEDictionary.load(path) if path.exists() else CPEDictionary()
+            )
+
+            async with CPEApi(token=token) as api:
+                await dictionary.sync(api)
+
+            dictionary.save(path)
+
+            for cpe in dictionary.cpes("cpe:2.3:a:apache:http_server:2.4.*"):
+                print(cpe.cpe_name)
+    """
+
+    def __init__(self) -> None:
+        self._index: Index = {}
+        self._entries: Dict[str, Entry] = {}
+        self._last_sync: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def last_sync(self) -> Optional[datetime]:
+        """
+        Date and time of the last sync
+        """
+        return self._last_sync
+
+    def _remove(self, cpe_name_id: str) -> None:
+        entry = self._entries.pop(cpe_name_id, None)
+        if entry is None:
+            return
+
+        components, _ = entry
+        products = self._index[components[VENDOR_INDEX]]
+        versions = products[components[PRODUCT_INDEX]]
+        entries = versions[components[VERSION_INDEX]]
+        del entries[cpe_name_id]
+
+        # drop empty buckets to keep wildcard lookups fast
+        if not entries:
+            del versions[components[VERSION_INDEX]]
+        if not versions:
+            del products[components[PRODUCT_INDEX]]
+        if not products:
+            del self._index[components[VENDOR_INDEX]]
+
+    def add(self, cpes: Iterable[CPE]) -> None:
+        """
+        Add or update CPEs
+
+        Args:
+            cpes: The CPEs to add. Already known CPEs with the same CPE Name
+                ID are replaced.
+        """
+        for cpe in cpes:
+            self._remove(cpe.cpe_name_id)
+
+            components = split_cpe(cpe.cpe_name)
+            entry = (components, cpe)
+            self._entries[cpe.cpe_name_id] = entry
+            self._index.setdefault(components[VENDOR_INDEX], {}).setdefault(
+                components[PRODUCT_INDEX], {}
+            ).setdefault(components[VERSION_INDEX], {})[cpe.cpe_name_id] = entry
+
+    async def sync(self, api: CPEApi, *, full: bool = False) -> int:
+        """
+        Download new and modified CPEs from the NVD
+
+        The first sync downloads all CPEs. Afterwards only the CPEs modified
+        since the last sync are downloaded.
+
+        Args:
+            api: The CPE API to use for downloading the CPEs
+            full: Download all CPEs even if the dictionary has been synced
+                before
+
+        Returns:
+            The number of downloaded CPEs
+        """
+        started = now()
+        windows = (
+            [(None, None)]
+            if full or self._last_sync is None
+            else date_ranges(self._last_sync, started)
+        )
+
+        count = 0
+        for start, end in windows:
+            async for cpe in api.cpes(
+                last_modified_start_date=start, last_modified_end_date=end
+            ):
+                self.add([cpe])
+                count += 1
+
+        self._last_sync = started
+        return count
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Save the CPEs and the date and time of the last sync to a file
+
+        The file contains a JSON object per line. The first line contains the
+        date and time of the last sync. All other lines contain a CPE. The
+        file is replaced atomically.
+
+        Args:
+            path: The file to write
+        """
+        path = Path(path)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(
+                    json.dumps(
+                        {"last_sync": self._last_sync}, default=json_default
+                    )
+                )
+                f.write("\n")
+                for _, cpe in self._entries.values():
+                    f.write(json.dumps(asdict(cpe), default=json_default))
+                    f.write("\n")
+            os.replace(tmp_name, path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "CPEDictionary":
+        """
+        Load a dictionary from a file written by save
+
+        Args:
+            path: The file to read
+
+        Returns:
+            A new dictionary containing the saved CPEs. Its last sync is the
+            saved last sync to continue syncing incrementally.
+
+        Raises:
+            PontosError: If the file isn't a saved CPE dictionary
+        """
+        dictionary = cls()
+        with Path(path).open("r", encoding="utf-8") as f:
+            try:
+                header = json.loads(f.readline())
+                last_sync = header["last_sync"]
+                dictionary.add(CPE.from_dict(json.loads(line)) for line in f)
+            except (ValueError, KeyError, TypeError) as e:
+                raise PontosError(
+                    f"Invalid CPE dictionary file '{path}'. {e}"
+                ) from e
+
+        dictionary._last_sync = (
+            datetime.fromisoformat(last_sync) if last_sync else None
+        )
+        return dictionary
+
+    def cpe(self, cpe_name_id: str) -> CPE:
+        """
+        Get a single CPE by its CPE Name ID
+
+        Args:
+            cpe_name_id: UUID of the CPE
+
+        Raises:
+            PontosError: If the CPE is not known
+        """
+        entry = self._entries.get(cpe_name_id)
+        if entry is None:
+            raise PontosError(f"No CPE with CPE Name ID '{cpe_name_id}' found.")
+        return entry[1]
+
+    def cpes(
+        self, cpe_match_string: str, *, include_deprecated: bool = True
+    ) -> List[CPE]:
+        """
+        Get all CPEs matching a CPE match string
+
+        The matching is compatible to the cpeMatchString parameter of the NVD
+        CPE API. Missing trailing components are considered as ANY. A
+        component may contain the wildcards * (any number of characters) and ?
+        (a single character). A component of a CPE name that is ANY or NA only
+        matches ANY or the same value in the match string.
+
+        Args:
+            cpe_match_string: A CPE 2.3 formatted match string like
+                cpe:2.3:a:apache:http_server:2.4.*
+            include_deprecated: Also return deprecated CPEs
+
+        Returns:
+            A list of matching CPEs
+
+        Raises:
+            PontosError: If the match string isn't a valid CPE 2.3 string
+        """
+        pattern = split_cpe(cpe_match_string)
+        compiled = [_compile_component(component) for component in pattern]
+        matchers = [
+            (index, matcher)
+            for index, (_, matcher) in enumerate(compiled)
+            if index not in (VENDOR_INDEX, PRODUCT_INDEX, VERSION_INDEX)
+            and matcher is not _match_any
+        ]
+
+        result = []
+        for products in _select(self._index, *compiled[VENDOR_INDEX]):
+            for versions in _select(products, *compiled[PRODUCT_INDEX]):
+                for entries in _select(versions, *compiled[VERSION_INDEX]):
+                    for components, cpe in entries.values():
+                        if not include_deprecated and cpe.deprecated:
+                            continue
+                        if all(
+                            matcher(components[index])
+                            for index, matcher in matchers
+                        ):
+                            result.append(cpe)
+        return result
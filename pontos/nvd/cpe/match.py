@@ -0,0 +1,221 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import operator
+import re
+from functools import partial
+from typing import Callable, List, Optional, Tuple, Union
+
+from pontos.errors import PontosError
+
+__all__ = (
+    "ANY",
+    "NA",
+    "split_cpe",
+    "component_matches",
+    "cpe_matches",
+    "version_key",
+    "compile_version_range",
+    "version_matches_range",
+    "version_in_range",
+)
+
+ANY = "*"
+NA = "-"
+
+CPE_PREFIX = "cpe:2.3:"
+# part, vendor, product, version, update, edition, language, sw_edition,
+# target_sw, target_hw and other
+CPE_COMPONENTS = 11
+
+VENDOR_INDEX = 1
+PRODUCT_INDEX = 2
+VERSION_INDEX = 3
+
+_SPLIT_REGEX = re.compile(r"(?<!\\):")
+_VERSION_TOKEN_REGEX = re.compile(r"\d+|[a-z]+")
+
+VersionKey = Tuple[Tuple[int, Union[int, str]], ...]
+VersionCheck = Callable[[VersionKey], bool]
+
+
+def split_cpe(cpe: str) -> Tuple[str, ...]:
+    """
+    Split a CPE 2.3 formatted string into its components
+
+    The "cpe:2.3:" prefix is removed. Missing trailing components are filled
+    with ANY.
+
+    Args:
+        cpe: A CPE 2.3 formatted string like
+            cpe:2.3:a:vendor:product:1.0:*:*:*:*:*:*:*
+
+    Returns:
+        A tuple containing the part, vendor, product, version, update,
+        edition, language, sw_edition, target_sw, target_hw and other
+        components in lower case
+
+    Raises:
+        PontosError: If the string isn't a CPE 2.3 formatted string
+    """
+    if not cpe.lower().startswith(CPE_PREFIX):
+        raise PontosError(f"Invalid CPE 2.3 string '{cpe}'.")
+
+    components = _SPLIT_REGEX.split(cpe[len(CPE_PREFIX) :].lower())
+    if len(components) > CPE_COMPONENTS:
+        raise PontosError(f"Invalid CPE 2.3 string '{cpe}'.")
+
+    return tuple(components) + (ANY,) * (CPE_COMPONENTS - len(components))
+
+
+def component_matches(pattern: str, value: str) -> bool:
+    """
+    Check if a CPE component matches another component
+
+    ANY matches every value. NA only matches NA and ANY. Otherwise the
+    components must be equal. Both components must be in lower case.
+    """
+    return pattern == ANY or value == ANY or pattern == value
+
+
+def cpe_matches(
+    pattern: Tuple[str, ...], name: Tuple[str, ...], *, ignore_version=False
+) -> bool:
+    """
+    Check if all components of a CPE name match the components of a CPE
+    pattern (like a CPE match string or the criteria of a CPE match)
+
+    Args:
+        pattern: The components of the CPE pattern as returned by split_cpe
+        name: The components of the CPE name as returned by split_cpe
+        ignore_version: Don't compare the version component. Should be set if
+            the version is checked against a version range.
+    """
+    for index, (pattern_component, name_component) in enumerate(
+        zip(pattern, name)
+    ):
+        if ignore_version and index == VERSION_INDEX:
+            continue
+        if not component_matches(pattern_component, name_component):
+            return False
+    return True
+
+
+def version_key(version: str) -> VersionKey:
+    """
+    Create a key for comparing versions
+
+    The version is split into numeric and alphabetic tokens. Numeric tokens
+    are compared as numbers and sort after alphabetic tokens. All other
+    characters are considered as separators.
+
+    Example:
+        .. code-block:: python
+
+            version_key("1.2.10") > version_key("1.2.9")
+    """
+    return tuple(
+        (1, int(token)) if token.isdigit() else (0, token)
+        for token in _VERSION_TOKEN_REGEX.findall(version.lower())
+    )
+
+
+def compile_version_range(
+    *,
+    start_including: Optional[str] = None,
+    start_excluding: Optional[str] = None,
+    end_including: Optional[str] = None,
+    end_excluding: Optional[str] = None,
+) -> Optional[VersionCheck]:
+    """
+    Create a function checking if a version key is within a version range
+
+    The boundaries are converted into version keys only once. Therefore the
+    returned function should be reused for checking several versions.
+
+    Returns:
+        A function getting a version key as returned by version_key and
+        returning True if it is within all passed boundaries. None if no
+        boundary is passed.
+    """
+    # a version key is checked with <bound> <op> <key>
+    checks: List[VersionCheck] = []
+    if start_including:
+        checks.append(partial(operator.le, version_key(start_including)))
+    if start_excluding:
+        checks.append(partial(operator.lt, version_key(start_excluding)))
+    if end_including:
+        checks.append(partial(operator.ge, version_key(end_including)))
+    if end_excluding:
+        checks.append(partial(operator.gt, version_key(end_excluding)))
+
+    if not checks:
+        return None
+    if len(checks) == 1:
+        return checks[0]
+    return lambda key: all(check(key) for check in checks)
+
+
+def version_matches_range(
+    version: str,
+    version_range: VersionCheck,
+    key: Optional[VersionKey] = None,
+) -> bool:
+    """
+    Check if the version component of a CPE matches a version range of a CPE
+    match criteria
+
+    ANY matches every version range like it matches every other component.
+    NA never matches a version range.
+
+    Args:
+        version: The version component of the CPE
+        version_range: The version range as returned by compile_version_range
+        key: The version key of the version if it has been created already
+    """
+    if version == ANY:
+        return True
+    if version == NA:
+        return False
+    return version_range(version_key(version) if key is None else key)
+
+
+def version_in_range(
+    version: str,
+    *,
+    start_including: Optional[str] = None,
+    start_excluding: Optional[str] = None,
+    end_including: Optional[str] = None,
+    end_excluding: Optional[str] = None,
+) -> bool:
+    """
+    Check if a version is within a version range
+
+    Returns:
+        True if the version is within all passed boundaries. If the version
+        is ANY or NA it is not considered to be within a range.
+    """
+    if version in (ANY, NA):
+        return False
+
+    version_range = compile_version_range(
+        start_including=start_including,
+        start_excluding=start_excluding,
+        end_including=end_including,
+        end_excluding=end_excluding,
+    )
+    return version_range is None or version_range(version_key(version))
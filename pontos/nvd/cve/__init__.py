@@ -19,6 +19,8 @@ import asyncio
 from argparse import ArgumentParser, Namespace
 
 from pontos.nvd.cve.api import *
+from pontos.nvd.cve.applicability import *
+from pontos.nvd.cve.mirror import *
 
 
 async def query_cves(args: Namespace) -> None:
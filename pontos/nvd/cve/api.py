@@ -15,15 +15,28 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, AsyncIterator, Dict, List, Optional, Union
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
 
-from httpx import Timeout
+from httpx import HTTPError, Timeout
 
 from pontos.errors import PontosError
 from pontos.nvd.api import (
+    DEFAULT_MAX_CONCURRENT_PAGES,
+    DEFAULT_MAX_RETRIES,
     DEFAULT_TIMEOUT_CONFIG,
     NVDApi,
+    RateLimiter,
     convert_camel_case,
     format_date,
     now,
@@ -35,6 +48,7 @@ from pontos.nvd.models.cvss_v3 import Severity as CVSSv3Severity
 __all__ = ("CVEApi",)
 
 DEFAULT_NIST_NVD_CVES_URL = "https://services.nvd.nist.gov/rest/json/cves/2.0"
+DEFAULT_CVE_CACHE_SIZE = 1000
 
 
 class CVEApi(NVDApi):
@@ -56,6 +70,9 @@ class CVEApi(NVDApi):
         token: Optional[str] = None,
         timeout: Optional[Timeout] = DEFAULT_TIMEOUT_CONFIG,
         rate_limit: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        cache_size: int = DEFAULT_CVE_CACHE_SIZE,
     ) -> None:
         """
         Create a new instance of the CVE API.
@@ -70,14 +87,29 @@ class CVEApi(NVDApi):
                 rolling 30 second window.
                 See https://nvd.nist.gov/developers/start-here#divRateLimits
                 Default: True.
+            rate_limiter: An optional rate limiter to share the rate limit
+                with other API instances. If not set and rate_limit is True
+                a new rate limiter is created.
+            max_retries: Maximum number of retries for requests failing with
+                403 Forbidden or 503 Service Unavailable.
+            cache_size: Maximum number of CVEs requested by ID to keep in
+                memory. Set to 0 to disable the cache.
         """
         super().__init__(
             DEFAULT_NIST_NVD_CVES_URL,
             token=token,
             timeout=timeout,
             rate_limit=rate_limit,
+            rate_limiter=rate_limiter,
+            max_retries=max_retries,
         )
 
+        self._cache_size = cache_size
+        self._cache: "OrderedDict[str, CVE]" = OrderedDict()
+        self._in_flight: Dict[str, "asyncio.Future[CVE]"] = {}
+        # number of callers waiting for a running request
+        self._waiters: Dict["asyncio.Future[CVE]", int] = {}
+
     async def cves(
         self,
         *,
@@ -99,6 +131,8 @@ class CVEApi(NVDApi):
         has_cert_notes: Optional[bool] = None,
         has_kev: Optional[bool] = None,
         has_oval: Optional[bool] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENT_PAGES,
+        ordered: bool = True,
     ) -> AsyncIterator[CVE]:
         """
         Get all CVEs for the provided arguments
@@ -147,6 +181,11 @@ class CVEApi(NVDApi):
             has_oval: Returns the CVEs that contain information from MITRE's
                 Open Vulnerability and Assessment Language (OVAL) before this
                 transitioned to the Center for Internet Security (CIS).
+            max_concurrency: Maximum number of result pages requested
+                concurrently. The requests are still limited by the rate
+                limit.
+            ordered: Return the results in the order of the pages. If False
+                results are returned as soon as their page is available.
 
         Example:
             .. code-block:: python
@@ -155,8 +194,6 @@ class CVEApi(NVDApi):
                 async for cve in api.cves(keywords=["Mac OS X", "kernel"]):
                     print(cve.id)
         """
-        total_results = None
-
         params = {}
         if last_modified_start_date:
             params["lastModStartDate"] = format_date(last_modified_start_date)
@@ -212,36 +249,27 @@ class CVEApi(NVDApi):
         if has_oval:
             params["hasOval"] = ""
 
-        start_index = 0
-        results_per_page = None
-
-        while total_results is None or start_index < total_results:
-            params["startIndex"] = start_index
-
-            if results_per_page is not None:
-                params["resultsPerPage"] = results_per_page
-
-            response = await self._get(params=params)
-            response.raise_for_status()
-
-            data: Dict[str, Union[int, str, Dict[str, Any]]] = response.json(
-                object_hook=convert_camel_case
-            )
-
-            results_per_page: int = data["results_per_page"]
-            total_results: int = data["total_results"]
-            vulnerabilities = data.get("vulnerabilities", [])
-
-            for vulnerability in vulnerabilities:
+        results = self._get_results(
+            params,
+            "vulnerabilities",
+            max_concurrency=max_concurrency,
+            ordered=ordered,
+        )
+        try:
+            async for vulnerability in results:
                 yield CVE.from_dict(vulnerability["cve"])
-
-            start_index += results_per_page
+        finally:
+            # close the streamed pages if the iteration is stopped early
+            await results.aclose()
 
     async def cve(self, cve_id: str) -> CVE:
         """
         Returns a single CVE matching the CVE ID. Vulnerabilities not yet
         published in the NVD are not available.
 
+        Requested CVEs are cached in memory. Concurrent requests for the same
+        CVE ID share a single HTTP request.
+
         Args:
             cve_id: Common Vulnerabilities and Exposures identifier
 
@@ -255,6 +283,153 @@ class CVEApi(NVDApi):
         if not cve_id:
             raise PontosError("Missing CVE ID.")
 
+        cve = self._cached_cve(cve_id)
+        if cve is not None:
+            return cve
+
+        return await self._request_cve(cve_id)
+
+    async def cves_by_id(
+        self,
+        cve_ids: Iterable[str],
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENT_PAGES,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> AsyncIterator[CVE]:
+        """
+        Get several CVEs by their IDs
+
+        Duplicate IDs are requested only once. CVEs that have been requested
+        before are returned from the cache first. The remaining CVEs are
+        requested concurrently and returned as soon as they arrive, therefore
+        the order of the returned CVEs may differ from the order of the IDs.
+        If a CVE is already requested by another task the request is shared.
+
+        A CVE that can't be requested doesn't stop the other CVEs from being
+        returned. It is skipped and reported via on_error.
+
+        Args:
+            cve_ids: Common Vulnerabilities and Exposures identifiers
+            max_concurrency: Maximum number of CVEs requested at once. The
+                requests are still limited by the rate limit.
+            on_error: Optional function called with the CVE ID and the error
+                for every CVE ID that is empty, isn't found or can't be
+                requested
+
+        Example:
+            .. code-block:: python
+
+            failed = {}
+
+            async with CVEApi() as api:
+                async for cve in api.cves_by_id(
+                    ["CVE-2022-45536", ...], on_error=failed.__setitem__
+                ):
+                    print(cve.id)
+
+            for cve_id, error in failed.items():
+                print(f"Could not get {cve_id}. {error}")
+        """
+
+        def report(cve_id: str, error: Exception) -> None:
+            if on_error:
+                on_error(cve_id, error)
+
+        missing = []
+        for cve_id in dict.fromkeys(cve_ids):
+            if not cve_id:
+                report(cve_id, PontosError("Missing CVE ID."))
+                continue
+
+            cve = self._cached_cve(cve_id)
+            if cve is None:
+                missing.append(cve_id)
+            else:
+                yield cve
+
+        remaining = iter(missing)
+        # running requests and their CVE IDs
+        pending: Dict["asyncio.Future[CVE]", str] = {}
+
+        def request_next_cve() -> None:
+            cve_id = next(remaining, None)
+            if cve_id is not None:
+                task = asyncio.ensure_future(self._request_cve(cve_id))
+                pending[task] = cve_id
+
+        try:
+            for _ in range(max(1, max_concurrency)):
+                request_next_cve()
+
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                finished = [(task, pending.pop(task)) for task in done]
+                for _ in finished:
+                    request_next_cve()
+
+                for task, cve_id in finished:
+                    try:
+                        cve = task.result()
+                    except (PontosError, HTTPError) as e:
+                        report(cve_id, e)
+                    else:
+                        yield cve
+        finally:
+            for task in pending:
+                task.cancel()
+            # let the cancelled tasks stop the requests nobody waits for
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def _cached_cve(self, cve_id: str) -> Optional[CVE]:
+        cve = self._cache.get(cve_id)
+        if cve is not None:
+            self._cache.move_to_end(cve_id)
+        return cve
+
+    def _cache_cve(self, cve_id: str, cve: CVE) -> None:
+        if self._cache_size <= 0:
+            return
+
+        self._cache[cve_id] = cve
+        self._cache.move_to_end(cve_id)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    async def _request_cve(self, cve_id: str) -> CVE:
+        """
+        Request a CVE or wait for an already running request of the CVE
+        """
+        future = self._in_flight.get(cve_id)
+        if future is None:
+            future = asyncio.ensure_future(self._download_cve(cve_id))
+            self._in_flight[cve_id] = future
+            future.add_done_callback(
+                lambda done: self._remove_in_flight(cve_id, done)
+            )
+
+        self._waiters[future] = self._waiters.get(future, 0) + 1
+        try:
+            # don't cancel the shared request if a single caller is cancelled
+            return await asyncio.shield(future)
+        finally:
+            self._waiters[future] -= 1
+            if not self._waiters[future]:
+                del self._waiters[future]
+                # nobody is waiting for the CVE anymore
+                if not future.done():
+                    self._remove_in_flight(cve_id, future)
+                    future.cancel()
+
+    def _remove_in_flight(
+        self, cve_id: str, future: "asyncio.Future[CVE]"
+    ) -> None:
+        # a cancelled request may be replaced by a new one already
+        if self._in_flight.get(cve_id) is future:
+            del self._in_flight[cve_id]
+
+    async def _download_cve(self, cve_id: str) -> CVE:
         response = await self._get(params={"cveId": cve_id})
         response.raise_for_status()
         data = response.json(object_hook=convert_camel_case)
@@ -263,4 +438,6 @@ class CVEApi(NVDApi):
             raise PontosError(f"No CVE with CVE ID '{cve_id}' found.")
 
         vulnerability = vulnerabilities[0]
-        return CVE.from_dict(vulnerability["cve"])
+        cve = CVE.from_dict(vulnerability["cve"])
+        self._cache_cve(cve_id, cve)
+        return cve
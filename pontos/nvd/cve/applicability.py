@@ -0,0 +1,336 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from pontos.errors import PontosError
+from pontos.nvd.cpe.match import (
+    ANY,
+    NA,
+    PRODUCT_INDEX,
+    VENDOR_INDEX,
+    VERSION_INDEX,
+    VersionCheck,
+    VersionKey,
+    compile_version_range,
+    split_cpe,
+    version_key,
+    version_matches_range,
+)
+from pontos.nvd.models.cve import CVE, CPEMatch, Operator
+
+__all__ = (
+    "ApplicableCVE",
+    "ApplicabilityEngine",
+)
+
+Components = Tuple[str, ...]
+
+
+@dataclass
+class ApplicableCVE:
+    """
+    A CVE affecting an inventory
+
+    Attributes:
+        cve: The affected CVE
+        cpes: The CPE names of the inventory matching a vulnerable CPE match
+            criteria of the CVE
+    """
+
+    cve: CVE
+    cpes: List[str] = field(default_factory=list)
+
+
+@dataclass
+class _Criterion:
+    # components of the criteria to compare as (position, value) pairs
+    components: Tuple[Tuple[int, str], ...]
+    version_range: Optional[VersionCheck]
+    # indices of the CVEs using the criterion
+    cves: List[int] = field(default_factory=list)
+
+    def matches(self, cpe: Components, key: Optional[VersionKey]) -> bool:
+        for position, value in self.components:
+            component = cpe[position]
+            if component != value and component != ANY:
+                return False
+
+        if self.version_range is None:
+            return True
+        return version_matches_range(
+            cpe[VERSION_INDEX], self.version_range, key
+        )
+
+
+@dataclass
+class _Node:
+    operator: Operator
+    negate: bool
+    # criterion indices and if the criterion is vulnerable
+    criteria: List[Tuple[int, bool]]
+
+
+@dataclass
+class _Configuration:
+    operator: Operator
+    negate: bool
+    nodes: List[_Node]
+
+
+class ApplicabilityEngine:
+    """
+    Evaluate the applicability statements (configurations) of CVEs against
+    an inventory of CPEs
+
+    The CPE match criteria of all CVEs are compiled once and indexed by
+    their vendor and product. Identical criteria used by several CVEs are
+    only compiled and compared once. Evaluating an inventory only compares
+    the CPEs with the match criteria of the same vendor and product and only
+    evaluates the configurations of CVEs with at least one matching
+    criteria.
+
+    A CVE applies to an inventory if at least one of its configurations
+    evaluates to true and a vulnerable match criteria of that configuration
+    is matched by a CPE of the inventory. Version ranges are compared by the
+    numeric and alphabetic tokens of the versions. A CPE with an ANY version
+    matches a version range, a CPE with a NA version doesn't. Invalid match
+    criteria don't match any CPE.
+
+    Example:
+        .. code-block:: python
+
+            engine = ApplicabilityEngine(mirror.cves())
+
+            for applicable in engine.evaluate(inventory):
+                print(applicable.cve.id, applicable.cpes)
+    """
+
+    def __init__(self, cves: Iterable[CVE] = ()) -> None:
+        """
+        Create a new engine
+
+        Args:
+            cves: The CVEs to evaluate
+        """
+        self._cves: List[CVE] = []
+        self._configurations: List[List[_Configuration]] = []
+        self._criteria: List[_Criterion] = []
+        self._criterion_indices: Dict[Tuple[Optional[str], ...], int] = {}
+        # (vendor, product) -> criterion indices
+        self._index: Dict[Tuple[str, str], List[int]] = {}
+        # criteria with a wildcard vendor or product
+        self._unindexed: List[int] = []
+
+        self.add(cves)
+
+    def __len__(self) -> int:
+        return len(self._cves)
+
+    def _add_criterion(self, cpe_match: CPEMatch, cve_index: int) -> int:
+        key = (
+            cpe_match.criteria,
+            cpe_match.version_start_including,
+            cpe_match.version_start_excluding,
+            cpe_match.version_end_including,
+            cpe_match.version_end_excluding,
+        )
+        index = self._criterion_indices.get(key)
+        if index is None:
+            index = self._compile_criterion(cpe_match)
+            self._criterion_indices[key] = index
+
+        cves = self._criteria[index].cves
+        if not cves or cves[-1] != cve_index:
+            cves.append(cve_index)
+
+        return index
+
+    def _compile_criterion(self, cpe_match: CPEMatch) -> int:
+        index = len(self._criteria)
+        try:
+            criteria = split_cpe(cpe_match.criteria)
+        except PontosError:
+            # an invalid criteria doesn't match any CPE. it isn't indexed and
+            # therefore never compared.
+            self._criteria.append(_Criterion(components=(), version_range=None))
+            return index
+
+        version_range = compile_version_range(
+            start_including=cpe_match.version_start_including,
+            start_excluding=cpe_match.version_start_excluding,
+            end_including=cpe_match.version_end_including,
+            end_excluding=cpe_match.version_end_excluding,
+        )
+
+        vendor = criteria[VENDOR_INDEX]
+        product = criteria[PRODUCT_INDEX]
+        indexed = vendor != ANY and product != ANY
+
+        skip = set()
+        if indexed:
+            skip.update((VENDOR_INDEX, PRODUCT_INDEX))
+        if version_range is not None:
+            skip.add(VERSION_INDEX)
+
+        self._criteria.append(
+            _Criterion(
+                components=tuple(
+                    (position, value)
+                    for position, value in enumerate(criteria)
+                    if value != ANY and position not in skip
+                ),
+                version_range=version_range,
+            )
+        )
+
+        if indexed:
+            self._index.setdefault((vendor, product), []).append(index)
+        else:
+            self._unindexed.append(index)
+
+        return index
+
+    def add(self, cves: Iterable[CVE]) -> None:
+        """
+        Add CVEs to evaluate
+
+        Args:
+            cves: The CVEs to add
+        """
+        for cve in cves:
+            cve_index = len(self._cves)
+            self._cves.append(cve)
+            self._configurations.append(
+                [
+                    _Configuration(
+                        operator=configuration.operator or Operator.OR,
+                        negate=bool(configuration.negate),
+                        nodes=[
+                            _Node(
+                                operator=node.operator,
+                                negate=bool(node.negate),
+                                criteria=[
+                                    (
+                                        self._add_criterion(
+                                            cpe_match, cve_index
+                                        ),
+                                        cpe_match.vulnerable,
+                                    )
+                                    for cpe_match in node.cpe_match
+                                ],
+                            )
+                            for node in configuration.nodes
+                        ],
+                    )
+                    for configuration in cve.configurations
+                ]
+            )
+
+    def _match(self, cpes: Iterable[str]) -> Dict[int, List[str]]:
+        """
+        Match the CPEs against all criteria
+
+        Returns:
+            A dict of criterion indices and the matching CPE names
+        """
+        matches: Dict[int, List[str]] = {}
+        for cpe_name in dict.fromkeys(cpes):
+            cpe = split_cpe(cpe_name)
+            version = cpe[VERSION_INDEX]
+            key = version_key(version) if version not in (ANY, NA) else None
+
+            candidates = self._index.get(
+                (cpe[VENDOR_INDEX], cpe[PRODUCT_INDEX]), []
+            )
+            for indices in (candidates, self._unindexed):
+                for index in indices:
+                    if self._criteria[index].matches(cpe, key):
+                        matches.setdefault(index, []).append(cpe_name)
+
+        return matches
+
+    @staticmethod
+    def _evaluate(
+        operator_: Operator, negate: bool, values: Iterable[bool]
+    ) -> bool:
+        result = all(values) if operator_ == Operator.AND else any(values)
+        return not result if negate else result
+
+    def _vulnerable_cpes(
+        self,
+        configurations: List[_Configuration],
+        matches: Dict[int, List[str]],
+    ) -> List[str]:
+        cpes: Dict[str, None] = {}
+        for configuration in configurations:
+            if not self._evaluate(
+                configuration.operator,
+                configuration.negate,
+                (
+                    self._evaluate(
+                        node.operator,
+                        node.negate,
+                        (index in matches for index, _ in node.criteria),
+                    )
+                    for node in configuration.nodes
+                ),
+            ):
+                continue
+
+            for node in configuration.nodes:
+                if node.negate:
+                    continue
+                for index, vulnerable in node.criteria:
+                    if vulnerable and index in matches:
+                        cpes.update(dict.fromkeys(matches[index]))
+
+        return list(cpes)
+
+    def evaluate(self, cpes: Iterable[str]) -> List[ApplicableCVE]:
+        """
+        Evaluate which CVEs apply to an inventory of CPEs
+
+        Args:
+            cpes: CPE 2.3 names of the inventory
+
+        Returns:
+            The applicable CVEs in the order they have been added
+
+        Raises:
+            PontosError: If a CPE name isn't a valid CPE 2.3 string
+        """
+        matches = self._match(cpes)
+
+        cve_indices: Set[int] = set()
+        for index in matches:
+            cve_indices.update(self._criteria[index].cves)
+
+        result = []
+        for cve_index in sorted(cve_indices):
+            vulnerable_cpes = self._vulnerable_cpes(
+                self._configurations[cve_index], matches
+            )
+            if vulnerable_cpes:
+                result.append(
+                    ApplicableCVE(
+                        cve=self._cves[cve_index], cpes=vulnerable_cpes
+                    )
+                )
+
+        return result
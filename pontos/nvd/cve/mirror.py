@@ -0,0 +1,491 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import sqlite3
+from contextlib import AbstractContextManager
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from types import TracebackType
+from typing import (
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from pontos.errors import PontosError
+from pontos.nvd.api import date_ranges, json_default, now
+from pontos.nvd.cpe.match import (
+    ANY,
+    PRODUCT_INDEX,
+    VENDOR_INDEX,
+    VERSION_INDEX,
+    compile_version_range,
+    cpe_matches,
+    split_cpe,
+    version_matches_range,
+)
+from pontos.nvd.cve.api import CVEApi
+from pontos.nvd.models.cve import CVE, CPEMatch
+from pontos.nvd.models.cvss_v2 import Severity as CVSSv2Severity
+from pontos.nvd.models.cvss_v3 import Severity as CVSSv3Severity
+
+__all__ = ("CVEMirror",)
+
+# number of CVEs to store in a single transaction
+SYNC_BATCH_SIZE = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cves (
+    id TEXT PRIMARY KEY,
+    source_identifier TEXT,
+    published TEXT,
+    last_modified TEXT,
+    description TEXT,
+    cwes TEXT,
+    has_kev INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cves_published ON cves(published);
+CREATE INDEX IF NOT EXISTS cves_last_modified ON cves(last_modified);
+CREATE INDEX IF NOT EXISTS cves_source_identifier ON cves(source_identifier);
+CREATE TABLE IF NOT EXISTS cpe_matches (
+    cve_id TEXT NOT NULL,
+    vendor TEXT NOT NULL,
+    product TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cpe_matches_vendor_product
+    ON cpe_matches(vendor, product);
+CREATE INDEX IF NOT EXISTS cpe_matches_cve_id ON cpe_matches(cve_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_LAST_SYNC_KEY = "last_sync"
+
+
+def _format_datetime(value: datetime) -> str:
+    # NVD uses UTC without an offset. Use a fixed format to allow comparing
+    # the dates as strings within the database.
+    if value.tzinfo:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _cpe_matches(cve: CVE) -> Iterator[CPEMatch]:
+    for configuration in cve.configurations:
+        for node in configuration.nodes:
+            yield from node.cpe_match
+
+
+def _cpe_match_applies(
+    cpe_match: CPEMatch, cpe: Tuple[str, ...], *, is_vulnerable: bool
+) -> bool:
+    if is_vulnerable and not cpe_match.vulnerable:
+        return False
+
+    try:
+        criteria = split_cpe(cpe_match.criteria)
+    except PontosError:
+        # an invalid criteria doesn't match any CPE
+        return False
+
+    version_range = compile_version_range(
+        start_including=cpe_match.version_start_including,
+        start_excluding=cpe_match.version_start_excluding,
+        end_including=cpe_match.version_end_including,
+        end_excluding=cpe_match.version_end_excluding,
+    )
+    if version_range is None:
+        return cpe_matches(criteria, cpe)
+
+    if not cpe_matches(criteria, cpe, ignore_version=True):
+        return False
+    return version_matches_range(cpe[VERSION_INDEX], version_range)
+
+
+def _vector_matches(query: str, vector: str) -> bool:
+    return set(query.split("/")) <= set(vector.split("/"))
+
+
+class CVEMirror(AbstractContextManager):
+    """
+    A local mirror of the NIST NVD CVE information
+
+    The CVEs are stored in a SQLite database. The first sync downloads all
+    CVEs. Subsequent syncs only download the CVEs modified since the last
+    sync. The stored CVEs can be queried with the same filters as
+    CVEApi.cves.
+
+    Should be used as a context manager.
+
+    Example:
+        .. code-block:: python
+
+            with CVEMirror("cves.db") as mirror:
+                async with CVEApi(token=token) as api:
+                    await mirror.sync(api)
+
+                for cve in mirror.cves(cpe_name="cpe:2.3:a:foo:bar:1.0"):
+                    print(cve.id)
+    """
+
+    def __init__(self, database: Union[str, Path]) -> None:
+        """
+        Create a new CVE mirror
+
+        Args:
+            database: Path to the SQLite database file. Use ":memory:" for a
+                database in memory.
+        """
+        self._database = str(database)
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self._database)
+            self._connection.executescript(_SCHEMA)
+        return self._connection
+
+    def close(self) -> None:
+        """
+        Close the database connection
+        """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self) -> "CVEMirror":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM cves").fetchone()[0]
+
+    @property
+    def last_sync(self) -> Optional[datetime]:
+        """
+        Date and time of the last successful sync or None if the mirror has
+        not been synced yet
+        """
+        row = self._db.execute(
+            "SELECT value FROM meta WHERE key = ?", (_LAST_SYNC_KEY,)
+        ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def add(self, cves: Iterable[CVE]) -> None:
+        """
+        Add or update CVEs in the mirror
+
+        Args:
+            cves: The CVEs to store
+        """
+        db = self._db
+        with db:
+            for cve in cves:
+                description = " ".join(
+                    description.value
+                    for description in cve.descriptions
+                    if description.lang == "en"
+                )
+                cwes = {
+                    description.value
+                    for weakness in cve.weaknesses
+                    for description in weakness.description
+                }
+                db.execute(
+                    "INSERT OR REPLACE INTO cves "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        cve.id,
+                        cve.source_identifier,
+                        _format_datetime(cve.published),
+                        _format_datetime(cve.last_modified),
+                        description,
+                        f" {' '.join(sorted(cwes))} ",
+                        cve.cisa_exploit_add is not None,
+                        json.dumps(asdict(cve), default=json_default),
+                    ),
+                )
+
+                db.execute(
+                    "DELETE FROM cpe_matches WHERE cve_id = ?", (cve.id,)
+                )
+                vendor_products = set()
+                for cpe_match in _cpe_matches(cve):
+                    try:
+                        criteria = split_cpe(cpe_match.criteria)
+                    except PontosError:
+                        continue
+                    vendor_products.add(
+                        (criteria[VENDOR_INDEX], criteria[PRODUCT_INDEX])
+                    )
+                db.executemany(
+                    "INSERT INTO cpe_matches VALUES (?, ?, ?)",
+                    (
+                        (cve.id, vendor, product)
+                        for vendor, product in vendor_products
+                    ),
+                )
+
+    async def sync(self, api: CVEApi, *, full: bool = False) -> int:
+        """
+        Download new and modified CVEs from the NVD
+
+        The first sync downloads all CVEs. Afterwards only the CVEs modified
+        since the last sync are downloaded.
+
+        Args:
+            api: The CVE API to use for downloading the CVEs
+            full: Download all CVEs even if the mirror has been synced before
+
+        Returns:
+            The number of downloaded CVEs
+        """
+        started = now()
+        last_sync = None if full else self.last_sync
+        count = 0
+
+        async for batch in self._download(api, last_sync, started):
+            self.add(batch)
+            count += len(batch)
+
+        with self._db as db:
+            db.execute(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                (_LAST_SYNC_KEY, started.isoformat()),
+            )
+
+        return count
+
+    @staticmethod
+    async def _download(
+        api: CVEApi, last_sync: Optional[datetime], until: datetime
+    ) -> AsyncIterator[List[CVE]]:
+        windows = (
+            [(None, None)]
+            if last_sync is None
+            else date_ranges(last_sync, until)
+        )
+
+        batch = []
+        for start, end in windows:
+            async for cve in api.cves(
+                last_modified_start_date=start, last_modified_end_date=end
+            ):
+                batch.append(cve)
+                if len(batch) >= SYNC_BATCH_SIZE:
+                    yield batch
+                    batch = []
+
+        if batch:
+            yield batch
+
+    def cve(self, cve_id: str) -> CVE:
+        """
+        Get a single CVE from the mirror
+
+        Args:
+            cve_id: Common Vulnerabilities and Exposures identifier
+
+        Raises:
+            PontosError: If the CVE is not available
+        """
+        row = self._db.execute(
+            "SELECT data FROM cves WHERE id = ?", (cve_id,)
+        ).fetchone()
+        if not row:
+            raise PontosError(f"No CVE with CVE ID '{cve_id}' found.")
+        return CVE.from_dict(json.loads(row[0]))
+
+    def cves(
+        self,
+        *,
+        last_modified_start_date: Optional[datetime] = None,
+        last_modified_end_date: Optional[datetime] = None,
+        published_start_date: Optional[datetime] = None,
+        published_end_date: Optional[datetime] = None,
+        cpe_name: Optional[str] = None,
+        is_vulnerable: Optional[bool] = None,
+        cvss_v2_vector: Optional[str] = None,
+        cvss_v2_severity: Optional[CVSSv2Severity] = None,
+        cvss_v3_vector: Optional[str] = None,
+        cvss_v3_severity: Optional[CVSSv3Severity] = None,
+        keywords: Optional[Union[List[str], str]] = None,
+        cwe_id: Optional[str] = None,
+        source_identifier: Optional[str] = None,
+        virtual_match_string: Optional[str] = None,
+        has_kev: Optional[bool] = None,
+    ) -> Iterator[CVE]:
+        """
+        Get all stored CVEs for the provided arguments
+
+        The arguments are the same as for CVEApi.cves. The filters for CERT
+        alerts, CERT notes and OVAL are not supported because the information
+        is not contained in the CVE data.
+
+        Version ranges of CPE matches are compared on a best effort basis. See
+        pontos.nvd.cpe.match.version_key.
+
+        Example:
+            .. code-block:: python
+
+            with CVEMirror("cves.db") as mirror:
+                for cve in mirror.cves(keywords=["Mac OS X", "kernel"]):
+                    print(cve.id)
+        """
+        conditions = []
+        params = []
+
+        if last_modified_start_date:
+            conditions.append("last_modified >= ?")
+            params.append(_format_datetime(last_modified_start_date))
+        if last_modified_end_date:
+            conditions.append("last_modified <= ?")
+            params.append(_format_datetime(last_modified_end_date))
+        if published_start_date:
+            conditions.append("published >= ?")
+            params.append(_format_datetime(published_start_date))
+        if published_end_date:
+            conditions.append("published <= ?")
+            params.append(_format_datetime(published_end_date))
+
+        if keywords:
+            if isinstance(keywords, str):
+                keywords = [keywords]
+            for keyword in keywords:
+                conditions.append("description LIKE ? ESCAPE '\\'")
+                params.append(f"%{_escape_like(keyword)}%")
+
+        if cwe_id:
+            conditions.append("cwes LIKE ? ESCAPE '\\'")
+            params.append(f"% {_escape_like(cwe_id)} %")
+
+        if source_identifier:
+            conditions.append("source_identifier = ?")
+            params.append(source_identifier)
+
+        if has_kev:
+            conditions.append("has_kev")
+
+        cpe = None
+        if cpe_name or virtual_match_string:
+            cpe = split_cpe(cpe_name or virtual_match_string)
+            subquery = "SELECT cve_id FROM cpe_matches WHERE 1"
+            for index, column in (
+                (VENDOR_INDEX, "vendor"),
+                (PRODUCT_INDEX, "product"),
+            ):
+                if cpe[index] != ANY:
+                    subquery += f" AND {column} IN (?, ?)"
+                    params.extend((cpe[index], ANY))
+            conditions.append(f"id IN ({subquery})")
+
+        query = "SELECT data FROM cves"
+        if conditions:
+            query += f" WHERE {' AND '.join(conditions)}"
+        query += " ORDER BY published, id"
+
+        for (data,) in self._db.execute(query, params):
+            cve = CVE.from_dict(json.loads(data))
+
+            if cpe and not any(
+                _cpe_match_applies(
+                    cpe_match,
+                    cpe,
+                    is_vulnerable=bool(cpe_name and is_vulnerable),
+                )
+                for cpe_match in _cpe_matches(cve)
+            ):
+                continue
+
+            if not self._matches_cvss(
+                cve,
+                cvss_v2_vector=cvss_v2_vector,
+                cvss_v2_severity=cvss_v2_severity,
+                cvss_v3_vector=cvss_v3_vector,
+                cvss_v3_severity=cvss_v3_severity,
+            ):
+                continue
+
+            yield cve
+
+    @staticmethod
+    def _matches_cvss(
+        cve: CVE,
+        *,
+        cvss_v2_vector: Optional[str],
+        cvss_v2_severity: Optional[CVSSv2Severity],
+        cvss_v3_vector: Optional[str],
+        cvss_v3_severity: Optional[CVSSv3Severity],
+    ) -> bool:
+        if not (
+            cvss_v2_vector
+            or cvss_v2_severity
+            or cvss_v3_vector
+            or cvss_v3_severity
+        ):
+            return True
+
+        if not cve.metrics:
+            return False
+
+        v2_metrics = cve.metrics.cvss_metric_v2
+        v3_metrics = cve.metrics.cvss_metric_v31 + cve.metrics.cvss_metric_v30
+
+        if cvss_v2_vector and not any(
+            _vector_matches(cvss_v2_vector, metric.cvss_data.vector_string)
+            for metric in v2_metrics
+        ):
+            return False
+        if cvss_v2_severity and not any(
+            metric.base_severity == cvss_v2_severity.value
+            for metric in v2_metrics
+        ):
+            return False
+        if cvss_v3_vector and not any(
+            _vector_matches(cvss_v3_vector, metric.cvss_data.vector_string)
+            for metric in v3_metrics
+        ):
+            return False
+        if cvss_v3_severity and not any(
+            metric.cvss_data.base_severity == cvss_v3_severity
+            for metric in v3_metrics
+        ):
+            return False
+
+        return True
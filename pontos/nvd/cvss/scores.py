@@ -0,0 +1,38 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from dataclasses import dataclass
+
+__all__ = ("CVSSScores",)
+
+
+@dataclass(frozen=True)
+class CVSSScores:
+    """
+    Scores calculated from a CVSS vector
+
+    Attributes:
+        base_score: The base score
+        temporal_score: The temporal score. Equals the base score if no
+            temporal metrics are defined.
+        environmental_score: The environmental score. If no environmental
+            metrics are defined the base metrics are used.
+    """
+
+    base_score: float
+    temporal_score: float
+    environmental_score: float
@@ -0,0 +1,378 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import math
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from pontos.errors import PontosError
+from pontos.nvd.cvss.scores import CVSSScores
+from pontos.nvd.models.cvss_v2 import Severity
+
+__all__ = (
+    "CVSSv2",
+    "calculate_scores",
+    "calculate_column_scores",
+    "severity",
+)
+
+NOT_DEFINED = "ND"
+
+BASE_METRICS = ("AV", "AC", "Au", "C", "I", "A")
+TEMPORAL_METRICS = ("E", "RL", "RC")
+ENVIRONMENTAL_METRICS = ("CDP", "TD", "CR", "IR", "AR")
+METRICS = BASE_METRICS + TEMPORAL_METRICS + ENVIRONMENTAL_METRICS
+
+_ACCESS_VECTOR = {"L": 0.395, "A": 0.646, "N": 1.0}
+_ACCESS_COMPLEXITY = {"H": 0.35, "M": 0.61, "L": 0.71}
+_AUTHENTICATION = {"M": 0.45, "S": 0.56, "N": 0.704}
+_IMPACT = {"N": 0.0, "P": 0.275, "C": 0.660}
+_EXPLOITABILITY = {"U": 0.85, "POC": 0.9, "F": 0.95, "H": 1.0, "ND": 1.0}
+_REMEDIATION_LEVEL = {"OF": 0.87, "TF": 0.90, "W": 0.95, "U": 1.0, "ND": 1.0}
+_REPORT_CONFIDENCE = {"UC": 0.90, "UR": 0.95, "C": 1.0, "ND": 1.0}
+_COLLATERAL_DAMAGE_POTENTIAL = {
+    "N": 0.0,
+    "L": 0.1,
+    "LM": 0.3,
+    "MH": 0.4,
+    "H": 0.5,
+    "ND": 0.0,
+}
+_TARGET_DISTRIBUTION = {"N": 0.0, "L": 0.25, "M": 0.75, "H": 1.0, "ND": 1.0}
+_REQUIREMENT = {"L": 0.5, "M": 1.0, "H": 1.51, "ND": 1.0}
+
+# allowed values of all metrics
+_VALUES: Dict[str, Mapping[str, float]] = {
+    "AV": _ACCESS_VECTOR,
+    "AC": _ACCESS_COMPLEXITY,
+    "Au": _AUTHENTICATION,
+    "C": _IMPACT,
+    "I": _IMPACT,
+    "A": _IMPACT,
+    "E": _EXPLOITABILITY,
+    "RL": _REMEDIATION_LEVEL,
+    "RC": _REPORT_CONFIDENCE,
+    "CDP": _COLLATERAL_DAMAGE_POTENTIAL,
+    "TD": _TARGET_DISTRIBUTION,
+    "CR": _REQUIREMENT,
+    "IR": _REQUIREMENT,
+    "AR": _REQUIREMENT,
+}
+
+Values = Tuple[str, ...]
+
+
+def _round(value: float) -> float:
+    # round half up to one decimal like the NVD calculator
+    return math.floor(value * 10 + 0.5) / 10
+
+
+def severity(score: float) -> Severity:
+    """
+    Get the NVD severity rating of a CVSS v2 score
+    """
+    if score >= 7.0:
+        return Severity.HIGH
+    if score >= 4.0:
+        return Severity.MEDIUM
+    return Severity.LOW
+
+
+def _base_score(impact: float, exploitability: float) -> float:
+    f_impact = 0.0 if impact == 0 else 1.176
+    return _round(((0.6 * impact) + (0.4 * exploitability) - 1.5) * f_impact)
+
+
+@lru_cache(maxsize=65536)
+def _calculate(values: Values) -> CVSSScores:
+    # There are only a few hundred distinct base vectors. Caching the scores
+    # makes calculating the scores of large batches a dict lookup.
+    metrics = dict(zip(METRICS, values))
+
+    confidentiality = _IMPACT[metrics["C"]]
+    integrity = _IMPACT[metrics["I"]]
+    availability = _IMPACT[metrics["A"]]
+
+    exploitability = (
+        20
+        * _ACCESS_VECTOR[metrics["AV"]]
+        * _ACCESS_COMPLEXITY[metrics["AC"]]
+        * _AUTHENTICATION[metrics["Au"]]
+    )
+    impact = 10.41 * (
+        1 - (1 - confidentiality) * (1 - integrity) * (1 - availability)
+    )
+    base_score = _base_score(impact, exploitability)
+
+    temporal = (
+        _EXPLOITABILITY[metrics["E"]]
+        * _REMEDIATION_LEVEL[metrics["RL"]]
+        * _REPORT_CONFIDENCE[metrics["RC"]]
+    )
+    temporal_score = _round(base_score * temporal)
+
+    adjusted_impact = min(
+        10,
+        10.41
+        * (
+            1
+            - (1 - confidentiality * _REQUIREMENT[metrics["CR"]])
+            * (1 - integrity * _REQUIREMENT[metrics["IR"]])
+            * (1 - availability * _REQUIREMENT[metrics["AR"]])
+        ),
+    )
+    adjusted_temporal = _round(
+        _base_score(adjusted_impact, exploitability) * temporal
+    )
+    environmental_score = _round(
+        (
+            adjusted_temporal
+            + (10 - adjusted_temporal)
+            * _COLLATERAL_DAMAGE_POTENTIAL[metrics["CDP"]]
+        )
+        * _TARGET_DISTRIBUTION[metrics["TD"]]
+    )
+
+    return CVSSScores(
+        base_score=base_score,
+        temporal_score=temporal_score,
+        environmental_score=environmental_score,
+    )
+
+
+def _check(metric: str, value: str) -> None:
+    allowed = _VALUES.get(metric)
+    if allowed is None:
+        raise PontosError(f"Unknown CVSS v2 metric '{metric}'.")
+    if value not in allowed:
+        raise PontosError(
+            f"Invalid value '{value}' for CVSS v2 metric '{metric}'."
+        )
+
+
+class CVSSv2:
+    """
+    A CVSS v2 vector
+
+    Example:
+        .. code-block:: python
+
+            cvss = CVSSv2.from_vector("AV:N/AC:L/Au:N/C:P/I:P/A:P")
+            print(cvss.base_score)  # 7.5
+
+            # apply the own environment
+            cvss = cvss.replace(CDP="H", TD="M")
+            print(cvss.environmental_score)
+    """
+
+    def __init__(self, metrics: Mapping[str, str]):
+        """
+        Create a new CVSS v2 vector
+
+        Args:
+            metrics: A mapping of metric abbreviations (like AV) to the
+                abbreviated values (like N). All base metrics are required.
+                Not passed temporal and environmental metrics are not
+                defined (ND).
+
+        Raises:
+            PontosError: If a metric is invalid
+        """
+        for metric, value in metrics.items():
+            _check(metric, value)
+
+        missing = [metric for metric in BASE_METRICS if metric not in metrics]
+        if missing:
+            raise PontosError(
+                f"Missing CVSS v2 base metrics {', '.join(missing)}."
+            )
+
+        self._values: Values = tuple(
+            metrics.get(metric, NOT_DEFINED) for metric in METRICS
+        )
+
+    @classmethod
+    def from_vector(cls, vector: str) -> "CVSSv2":
+        """
+        Parse a CVSS v2 vector string
+
+        Args:
+            vector: A vector string like AV:N/AC:L/Au:N/C:P/I:P/A:P. The
+                vector may be enclosed in parentheses.
+
+        Raises:
+            PontosError: If the vector string is invalid
+        """
+        stripped = vector.strip()
+        if stripped.startswith("(") and stripped.endswith(")"):
+            stripped = stripped[1:-1]
+
+        metrics = {}
+        for part in stripped.split("/"):
+            metric, separator, value = part.partition(":")
+            if not separator or metric in metrics:
+                raise PontosError(f"Invalid CVSS v2 vector '{vector}'.")
+            metrics[metric] = value
+
+        return cls(metrics)
+
+    @property
+    def metrics(self) -> Dict[str, str]:
+        """
+        The defined metrics
+        """
+        return {
+            metric: value
+            for metric, value in zip(METRICS, self._values)
+            if value != NOT_DEFINED or metric in BASE_METRICS
+        }
+
+    @property
+    def vector_string(self) -> str:
+        """
+        The vector string containing all defined metrics
+        """
+        return "/".join(
+            f"{metric}:{value}" for metric, value in self.metrics.items()
+        )
+
+    def replace(self, **metrics: str) -> "CVSSv2":
+        """
+        Create a new vector with some metrics replaced
+
+        Args:
+            metrics: The metrics to replace, for example CDP="H"
+        """
+        return CVSSv2({**self.metrics, **metrics})
+
+    @property
+    def scores(self) -> CVSSScores:
+        """
+        The base, temporal and environmental scores
+        """
+        return _calculate(self._values)
+
+    @property
+    def base_score(self) -> float:
+        return self.scores.base_score
+
+    @property
+    def temporal_score(self) -> float:
+        return self.scores.temporal_score
+
+    @property
+    def environmental_score(self) -> float:
+        return self.scores.environmental_score
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CVSSv2):
+            return NotImplemented
+        return self._values == other._values
+
+    def __hash__(self) -> int:
+        return hash(self._values)
+
+    def __repr__(self) -> str:
+        return f"<CVSSv2 {self.vector_string}>"
+
+
+def calculate_scores(
+    vectors: Iterable[str], *, environment: Optional[Mapping[str, str]] = None
+) -> List[CVSSScores]:
+    """
+    Calculate the scores of many CVSS v2 vectors
+
+    Args:
+        vectors: The vector strings
+        environment: Optional temporal and environmental metrics to apply to
+            all vectors, for example {"CDP": "H", "TD": "M"}
+
+    Returns:
+        The scores in the order of the vectors
+
+    Raises:
+        PontosError: If a vector or the environment is invalid
+    """
+    environment = dict(environment or {})
+    for metric, value in environment.items():
+        _check(metric, value)
+
+    parsed: Dict[str, Values] = {}
+    scores = []
+    for vector in vectors:
+        values = parsed.get(vector)
+        if values is None:
+            cvss = CVSSv2.from_vector(vector)
+            if environment:
+                cvss = cvss.replace(**environment)
+            values = parsed[vector] = cvss._values
+        scores.append(_calculate(values))
+    return scores
+
+
+def calculate_column_scores(
+    columns: Mapping[str, Sequence[str]]
+) -> List[CVSSScores]:
+    """
+    Calculate the scores of many CVSS v2 vectors stored column-wise
+
+    Each column contains the abbreviated values of a metric for all vectors.
+    Missing temporal and environmental columns are not defined (ND). Any
+    sequence type like lists or NumPy arrays of strings can be used.
+
+    Args:
+        columns: A mapping of metric abbreviations to the column of values
+
+    Returns:
+        The scores of the rows
+
+    Raises:
+        PontosError: If a column contains an invalid value or a base metric
+            column is missing
+    """
+    for metric in columns:
+        if metric not in _VALUES:
+            raise PontosError(f"Unknown CVSS v2 metric '{metric}'.")
+
+    missing = [metric for metric in BASE_METRICS if metric not in columns]
+    if missing:
+        raise PontosError(f"Missing CVSS v2 base metrics {', '.join(missing)}.")
+
+    length = len(columns[BASE_METRICS[0]])
+    if any(len(column) != length for column in columns.values()):
+        raise PontosError(
+            "All CVSS v2 metric columns must have the same length."
+        )
+
+    rows = zip(
+        *(
+            columns[metric] if metric in columns else [NOT_DEFINED] * length
+            for metric in METRICS
+        )
+    )
+
+    known: Dict[Values, CVSSScores] = {}
+    scores = []
+    for row in rows:
+        values = tuple(row)
+        row_scores = known.get(values)
+        if row_scores is None:
+            for metric, value in zip(METRICS, values):
+                _check(metric, value)
+            row_scores = known[values] = _calculate(values)
+        scores.append(row_scores)
+    return scores
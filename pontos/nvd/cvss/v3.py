@@ -0,0 +1,491 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import math
+from functools import lru_cache
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from pontos.errors import PontosError
+from pontos.nvd.cvss.scores import CVSSScores
+from pontos.nvd.models.cvss_v3 import Severity
+
+__all__ = (
+    "CVSSv3",
+    "calculate_scores",
+    "calculate_column_scores",
+    "severity",
+)
+
+VERSIONS = ("3.0", "3.1")
+NOT_DEFINED = "X"
+
+BASE_METRICS = ("AV", "AC", "PR", "UI", "S", "C", "I", "A")
+TEMPORAL_METRICS = ("E", "RL", "RC")
+ENVIRONMENTAL_METRICS = (
+    "CR",
+    "IR",
+    "AR",
+    "MAV",
+    "MAC",
+    "MPR",
+    "MUI",
+    "MS",
+    "MC",
+    "MI",
+    "MA",
+)
+METRICS = BASE_METRICS + TEMPORAL_METRICS + ENVIRONMENTAL_METRICS
+
+_ATTACK_VECTOR = {"N": 0.85, "A": 0.62, "L": 0.55, "P": 0.2}
+_ATTACK_COMPLEXITY = {"L": 0.77, "H": 0.44}
+_PRIVILEGES_REQUIRED = {"N": 0.85, "L": 0.62, "H": 0.27}
+_PRIVILEGES_REQUIRED_CHANGED = {"N": 0.85, "L": 0.68, "H": 0.5}
+_USER_INTERACTION = {"N": 0.85, "R": 0.62}
+_SCOPE = {"U": "U", "C": "C"}
+_IMPACT = {"H": 0.56, "L": 0.22, "N": 0.0}
+_EXPLOIT_CODE_MATURITY = {"X": 1.0, "H": 1.0, "F": 0.97, "P": 0.94, "U": 0.91}
+_REMEDIATION_LEVEL = {"X": 1.0, "U": 1.0, "W": 0.97, "T": 0.96, "O": 0.95}
+_REPORT_CONFIDENCE = {"X": 1.0, "C": 1.0, "R": 0.96, "U": 0.92}
+_REQUIREMENT = {"X": 1.0, "H": 1.5, "M": 1.0, "L": 0.5}
+
+
+def _modified(values: Mapping[str, object]) -> Mapping[str, object]:
+    return {**values, NOT_DEFINED: None}
+
+
+# allowed values of all metrics
+_VALUES: Dict[str, Mapping[str, object]] = {
+    "AV": _ATTACK_VECTOR,
+    "AC": _ATTACK_COMPLEXITY,
+    "PR": _PRIVILEGES_REQUIRED,
+    "UI": _USER_INTERACTION,
+    "S": _SCOPE,
+    "C": _IMPACT,
+    "I": _IMPACT,
+    "A": _IMPACT,
+    "E": _EXPLOIT_CODE_MATURITY,
+    "RL": _REMEDIATION_LEVEL,
+    "RC": _REPORT_CONFIDENCE,
+    "CR": _REQUIREMENT,
+    "IR": _REQUIREMENT,
+    "AR": _REQUIREMENT,
+    "MAV": _modified(_ATTACK_VECTOR),
+    "MAC": _modified(_ATTACK_COMPLEXITY),
+    "MPR": _modified(_PRIVILEGES_REQUIRED),
+    "MUI": _modified(_USER_INTERACTION),
+    "MS": _modified(_SCOPE),
+    "MC": _modified(_IMPACT),
+    "MI": _modified(_IMPACT),
+    "MA": _modified(_IMPACT),
+}
+
+Values = Tuple[str, ...]
+
+
+def _roundup_v30(value: float) -> float:
+    return math.ceil(value * 10) / 10
+
+
+def _roundup_v31(value: float) -> float:
+    # avoid floating point errors as defined in the CVSS v3.1 specification
+    int_input = round(value * 100000)
+    if int_input % 10000 == 0:
+        return int_input / 100000.0
+    return (math.floor(int_input / 10000) + 1) / 10.0
+
+
+def severity(score: float) -> Optional[Severity]:
+    """
+    Get the qualitative severity rating of a CVSS v3 score
+
+    Returns:
+        The severity or None if the score is 0.0
+    """
+    if score >= 9.0:
+        return Severity.CRITICAL
+    if score >= 7.0:
+        return Severity.HIGH
+    if score >= 4.0:
+        return Severity.MEDIUM
+    if score > 0.0:
+        return Severity.LOW
+    return None
+
+
+def _exploitability(
+    attack_vector: str,
+    attack_complexity: str,
+    privileges_required: str,
+    user_interaction: str,
+    scope: str,
+) -> float:
+    privileges = (
+        _PRIVILEGES_REQUIRED_CHANGED if scope == "C" else _PRIVILEGES_REQUIRED
+    )
+    return (
+        8.22
+        * _ATTACK_VECTOR[attack_vector]
+        * _ATTACK_COMPLEXITY[attack_complexity]
+        * privileges[privileges_required]
+        * _USER_INTERACTION[user_interaction]
+    )
+
+
+@lru_cache(maxsize=65536)
+def _calculate(version: str, values: Values) -> CVSSScores:
+    # There are only a few thousand distinct base vectors. Caching the scores
+    # makes calculating the scores of large batches a dict lookup.
+    metrics = dict(zip(METRICS, values))
+    roundup = _roundup_v30 if version == "3.0" else _roundup_v31
+
+    scope = metrics["S"]
+    iss = 1 - (
+        (1 - _IMPACT[metrics["C"]])
+        * (1 - _IMPACT[metrics["I"]])
+        * (1 - _IMPACT[metrics["A"]])
+    )
+    if scope == "U":
+        impact = 6.42 * iss
+    else:
+        impact = 7.52 * (iss - 0.029) - 3.25 * (iss - 0.02) ** 15
+
+    exploitability = _exploitability(
+        metrics["AV"], metrics["AC"], metrics["PR"], metrics["UI"], scope
+    )
+
+    if impact <= 0:
+        base_score = 0.0
+    elif scope == "U":
+        base_score = roundup(min(impact + exploitability, 10))
+    else:
+        base_score = roundup(min(1.08 * (impact + exploitability), 10))
+
+    temporal = (
+        _EXPLOIT_CODE_MATURITY[metrics["E"]]
+        * _REMEDIATION_LEVEL[metrics["RL"]]
+        * _REPORT_CONFIDENCE[metrics["RC"]]
+    )
+    temporal_score = roundup(base_score * temporal)
+
+    def modified(metric: str) -> str:
+        value = metrics[f"M{metric}"]
+        return metrics[metric] if value == NOT_DEFINED else value
+
+    modified_scope = modified("S")
+    miss = min(
+        1
+        - (
+            (1 - _REQUIREMENT[metrics["CR"]] * _IMPACT[modified("C")])
+            * (1 - _REQUIREMENT[metrics["IR"]] * _IMPACT[modified("I")])
+            * (1 - _REQUIREMENT[metrics["AR"]] * _IMPACT[modified("A")])
+        ),
+        0.915,
+    )
+    if modified_scope == "U":
+        modified_impact = 6.42 * miss
+    elif version == "3.0":
+        modified_impact = 7.52 * (miss - 0.029) - 3.25 * (miss - 0.02) ** 15
+    else:
+        modified_impact = (
+            7.52 * (miss - 0.029) - 3.25 * (miss * 0.9731 - 0.02) ** 13
+        )
+
+    modified_exploitability = _exploitability(
+        modified("AV"),
+        modified("AC"),
+        modified("PR"),
+        modified("UI"),
+        modified_scope,
+    )
+
+    if modified_impact <= 0:
+        environmental_score = 0.0
+    else:
+        factor = 1.0 if modified_scope == "U" else 1.08
+        environmental_score = roundup(
+            roundup(
+                min(factor * (modified_impact + modified_exploitability), 10)
+            )
+            * temporal
+        )
+
+    return CVSSScores(
+        base_score=base_score,
+        temporal_score=temporal_score,
+        environmental_score=environmental_score,
+    )
+
+
+def _check(metric: str, value: str) -> None:
+    allowed = _VALUES.get(metric)
+    if allowed is None:
+        raise PontosError(f"Unknown CVSS v3 metric '{metric}'.")
+    if value not in allowed:
+        raise PontosError(
+            f"Invalid value '{value}' for CVSS v3 metric '{metric}'."
+        )
+
+
+class CVSSv3:
+    """
+    A CVSS v3.0 or v3.1 vector
+
+    Example:
+        .. code-block:: python
+
+            cvss = CVSSv3.from_vector(
+                "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H"
+            )
+            print(cvss.base_score)  # 9.8
+
+            # apply the own environment
+            cvss = cvss.replace(CR="H", MAV="L")
+            print(cvss.environmental_score)
+    """
+
+    def __init__(self, metrics: Mapping[str, str], *, version: str = "3.1"):
+        """
+        Create a new CVSS v3 vector
+
+        Args:
+            metrics: A mapping of metric abbreviations (like AV) to the
+                abbreviated values (like N). All base metrics are required.
+                Not passed temporal and environmental metrics are not
+                defined (X).
+            version: The CVSS version. Either 3.0 or 3.1.
+
+        Raises:
+            PontosError: If the version or a metric is invalid
+        """
+        if version not in VERSIONS:
+            raise PontosError(f"Unsupported CVSS version '{version}'.")
+
+        for metric, value in metrics.items():
+            _check(metric, value)
+
+        missing = [metric for metric in BASE_METRICS if metric not in metrics]
+        if missing:
+            raise PontosError(
+                f"Missing CVSS v3 base metrics {', '.join(missing)}."
+            )
+
+        self.version = version
+        self._values: Values = tuple(
+            metrics.get(metric, NOT_DEFINED) for metric in METRICS
+        )
+
+    @classmethod
+    def from_vector(cls, vector: str) -> "CVSSv3":
+        """
+        Parse a CVSS v3 vector string
+
+        Args:
+            vector: A vector string like
+                CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H
+
+        Raises:
+            PontosError: If the vector string is invalid
+        """
+        prefix, _, rest = vector.strip().partition("/")
+        if not prefix.startswith("CVSS:"):
+            raise PontosError(f"Invalid CVSS v3 vector '{vector}'.")
+
+        metrics = {}
+        for part in rest.split("/"):
+            metric, separator, value = part.partition(":")
+            if not separator or metric in metrics:
+                raise PontosError(f"Invalid CVSS v3 vector '{vector}'.")
+            metrics[metric] = value
+
+        return cls(metrics, version=prefix[len("CVSS:") :])
+
+    @property
+    def metrics(self) -> Dict[str, str]:
+        """
+        The defined metrics
+        """
+        return {
+            metric: value
+            for metric, value in zip(METRICS, self._values)
+            if value != NOT_DEFINED or metric in BASE_METRICS
+        }
+
+    @property
+    def vector_string(self) -> str:
+        """
+        The vector string containing all defined metrics
+        """
+        metrics = "/".join(
+            f"{metric}:{value}" for metric, value in self.metrics.items()
+        )
+        return f"CVSS:{self.version}/{metrics}"
+
+    def replace(self, **metrics: str) -> "CVSSv3":
+        """
+        Create a new vector with some metrics replaced
+
+        Args:
+            metrics: The metrics to replace, for example CR="H"
+        """
+        return CVSSv3({**self.metrics, **metrics}, version=self.version)
+
+    @property
+    def scores(self) -> CVSSScores:
+        """
+        The base, temporal and environmental scores
+        """
+        return _calculate(self.version, self._values)
+
+    @property
+    def base_score(self) -> float:
+        return self.scores.base_score
+
+    @property
+    def temporal_score(self) -> float:
+        return self.scores.temporal_score
+
+    @property
+    def environmental_score(self) -> float:
+        return self.scores.environmental_score
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CVSSv3):
+            return NotImplemented
+        return (self.version, self._values) == (other.version, other._values)
+
+    def __hash__(self) -> int:
+        return hash((self.version, self._values))
+
+    def __repr__(self) -> str:
+        return f"<CVSSv3 {self.vector_string}>"
+
+
+def calculate_scores(
+    vectors: Iterable[str], *, environment: Optional[Mapping[str, str]] = None
+) -> List[CVSSScores]:
+    """
+    Calculate the scores of many CVSS v3 vectors
+
+    Args:
+        vectors: The vector strings
+        environment: Optional temporal and environmental metrics to apply to
+            all vectors, for example {"CR": "H", "MAV": "L"}
+
+    Returns:
+        The scores in the order of the vectors
+
+    Raises:
+        PontosError: If a vector or the environment is invalid
+    """
+    environment = dict(environment or {})
+    for metric, value in environment.items():
+        _check(metric, value)
+
+    parsed: Dict[str, Tuple[str, Values]] = {}
+    scores = []
+    for vector in vectors:
+        entry = parsed.get(vector)
+        if entry is None:
+            cvss = CVSSv3.from_vector(vector)
+            if environment:
+                cvss = cvss.replace(**environment)
+            entry = parsed[vector] = (cvss.version, cvss._values)
+        scores.append(_calculate(*entry))
+    return scores
+
+
+def calculate_column_scores(
+    columns: Mapping[str, Sequence[str]], *, version: str = "3.1"
+) -> List[CVSSScores]:
+    """
+    Calculate the scores of many CVSS v3 vectors stored column-wise
+
+    Each column contains the abbreviated values of a metric for all vectors.
+    Missing temporal and environmental columns are not defined (X). Any
+    sequence type like lists or NumPy arrays of strings can be used.
+
+    Example:
+        .. code-block:: python
+
+            scores = calculate_column_scores(
+                {
+                    "AV": ["N", "L"],
+                    "AC": ["L", "L"],
+                    "PR": ["N", "N"],
+                    "UI": ["N", "R"],
+                    "S": ["U", "U"],
+                    "C": ["H", "L"],
+                    "I": ["H", "L"],
+                    "A": ["H", "N"],
+                    "CR": ["H", "H"],
+                }
+            )
+
+    Args:
+        columns: A mapping of metric abbreviations to the column of values
+        version: The CVSS version of all vectors. Either 3.0 or 3.1.
+
+    Returns:
+        The scores of the rows
+
+    Raises:
+        PontosError: If a column contains an invalid value or a base metric
+            column is missing
+    """
+    if version not in VERSIONS:
+        raise PontosError(f"Unsupported CVSS version '{version}'.")
+
+    for metric in columns:
+        if metric not in _VALUES:
+            raise PontosError(f"Unknown CVSS v3 metric '{metric}'.")
+
+    missing = [metric for metric in BASE_METRICS if metric not in columns]
+    if missing:
+        raise PontosError(f"Missing CVSS v3 base metrics {', '.join(missing)}.")
+
+    length = len(columns[BASE_METRICS[0]])
+    if any(len(column) != length for column in columns.values()):
+        raise PontosError(
+            "All CVSS v3 metric columns must have the same length."
+        )
+
+    rows = zip(
+        *(
+            columns[metric] if metric in columns else [NOT_DEFINED] * length
+            for metric in METRICS
+        )
+    )
+
+    known: Dict[Values, CVSSScores] = {}
+    scores = []
+    for row in rows:
+        values = tuple(row)
+        row_scores = known.get(values)
+        if row_scores is None:
+            for metric, value in zip(METRICS, values):
+                _check(metric, value)
+            row_scores = known[values] = _calculate(version, values)
+        scores.append(row_scores)
+    return scores
@@ -0,0 +1,134 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import hashlib
+import mmap
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterable, Optional, Tuple, Union
+
+__all__ = (
+    "SHA256SUMS",
+    "file_digest",
+    "hash_files",
+    "write_manifest",
+)
+
+SHA256SUMS = "SHA256SUMS"
+DEFAULT_HASH_ALGORITHM = "sha256"
+# hashlib releases the GIL while hashing and the data is read via mmap.
+# therefore threads are sufficient to hash files in parallel.
+DEFAULT_MAX_HASH_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+
+def file_digest(
+    file_path: Union[Path, str], algorithm: str = DEFAULT_HASH_ALGORITHM
+) -> str:
+    """
+    Calculate the hex digest of a file
+
+    The file is memory-mapped to avoid copying its content into Python
+    buffers.
+
+    Args:
+        file_path: File to hash
+        algorithm: Name of the hash algorithm. Default: sha256.
+
+    Returns:
+        The hex digest of the file content
+    """
+    digest = hashlib.new(algorithm)
+    with open(file_path, "rb") as f:
+        # empty files can't be memory-mapped
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                digest.update(m)
+    return digest.hexdigest()
+
+
+async def hash_files(
+    files: Iterable[Union[Path, str]],
+    *,
+    algorithm: str = DEFAULT_HASH_ALGORITHM,
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[Tuple[Path, str]]:
+    """
+    Hash files in parallel
+
+    Args:
+        files: Files to hash
+        algorithm: Name of the hash algorithm. Default: sha256.
+        executor: Optional executor to run the hashing in. If not set a
+            thread pool is used.
+
+    Returns:
+        yields tuples of the file path and its hex digest as soon as the
+        file has been hashed
+
+    Example:
+        .. code-block:: python
+
+            async for file_path, digest in hash_files(["foo.zip", "bar.zip"]):
+                print(digest, file_path)
+    """
+    loop = asyncio.get_running_loop()
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_HASH_WORKERS)
+
+    async def hash_file(file_path: Path) -> Tuple[Path, str]:
+        digest = await loop.run_in_executor(
+            executor, file_digest, file_path, algorithm
+        )
+        return file_path, digest
+
+    tasks = [asyncio.create_task(hash_file(Path(f))) for f in files]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        if own_executor:
+            executor.shutdown(wait=False)
+
+
+def write_manifest(
+    manifest_path: Union[Path, str], digests: Dict[Path, str]
+) -> Path:
+    """
+    Write a checksum manifest in the format of the sha256sum tool
+
+    Args:
+        manifest_path: Path of the manifest file to write
+        digests: A dict of file paths and their hex digests. Only the file
+            names are written to the manifest.
+
+    Returns:
+        The path of the manifest file
+    """
+    manifest_path = Path(manifest_path)
+    lines = [
+        f"{digest}  {Path(file_path).name}\n"
+        for file_path, digest in sorted(
+            digests.items(), key=lambda item: Path(item[0]).name
+        )
+    ]
+    manifest_path.write_text("".join(lines), encoding="utf-8")
+    return manifest_path
@@ -0,0 +1,193 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import AsyncIterator, Iterable, List, Optional, Union
+
+__all__ = ("GPGSigner",)
+
+SIGNATURE_SUFFIX = ".asc"
+
+
+class GPGSigner:
+    """
+    Create detached armored signatures with gpg
+
+    All signing processes share a single gpg-agent session. The agent is
+    started once and the signing key is unlocked once before the first file
+    is signed. Afterwards the files are signed by parallel gpg processes
+    using the already unlocked key. A passphrase is passed to gpg via stdin
+    and never on the command line.
+
+    Example:
+        .. code-block:: python
+
+            signer = GPGSigner("0ED1E580", passphrase="secret")
+            async for signature in signer.sign_files(["foo.zip", "bar.zip"]):
+                print(signature)
+    """
+
+    def __init__(
+        self,
+        signing_key: str,
+        *,
+        passphrase: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> None:
+        """
+        Create a new GPGSigner instance
+
+        Args:
+            signing_key: ID of the key to sign the files with
+            passphrase: Optional passphrase of the key. If set gpg runs
+                headless and doesn't ask for the passphrase.
+            max_concurrency: Maximum number of gpg processes signing in
+                parallel. Defaults to the number of CPUs.
+        """
+        self._signing_key = signing_key
+        self._passphrase = passphrase
+        self._max_concurrency = max_concurrency or os.cpu_count() or 1
+        self._unlocked = False
+        # asyncio primitives must be created within the running event loop
+        self._lock: Optional[asyncio.Lock] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _gpg_command(self, *args: str) -> List[str]:
+        cmd = ["gpg"]
+        if self._passphrase:
+            cmd.extend(
+                [
+                    "--batch",
+                    "--pinentry-mode",
+                    "loopback",
+                    "--passphrase-fd",
+                    "0",
+                ]
+            )
+        cmd.extend(["--default-key", self._signing_key, "--yes"])
+        cmd.extend(args)
+        return cmd
+
+    def _gpg_input(self) -> Optional[bytes]:
+        if self._passphrase:
+            return f"{self._passphrase}\n".encode("utf-8")
+        return None
+
+    @staticmethod
+    async def _run(cmd: List[str], *, stdin: Optional[bytes] = None) -> bytes:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=subprocess.PIPE if stdin is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        stdout, stderr = await process.communicate(stdin)
+        if process.returncode:
+            raise subprocess.CalledProcessError(
+                process.returncode,
+                " ".join(cmd),
+                output=stdout.decode("utf-8", errors="replace"),
+                stderr=stderr.decode("utf-8", errors="replace"),
+            )
+        return stdout
+
+    async def unlock(self) -> None:
+        """
+        Start the gpg-agent and unlock the signing key
+
+        Signing empty data lets the agent ask for the passphrase once and
+        cache it for all following signing processes. It is called
+        automatically before the first file is signed. The agent is launched
+        via gpgconf if it is installed.
+
+        Raises:
+            subprocess.CalledProcessError: If gpg failed
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if self._unlocked:
+                return
+
+            # without gpgconf the agent is started on demand by gpg itself
+            if shutil.which("gpgconf"):
+                await self._run(["gpgconf", "--launch", "gpg-agent"])
+
+            await self._run(
+                self._gpg_command(
+                    "--detach-sign", "--output", os.devnull, os.devnull
+                ),
+                stdin=self._gpg_input(),
+            )
+            self._unlocked = True
+
+    async def sign(self, file_path: Union[Path, str]) -> Path:
+        """
+        Create a detached armored signature for a file
+
+        Args:
+            file_path: File to sign
+
+        Returns:
+            The path of the signature file
+
+        Raises:
+            subprocess.CalledProcessError: If gpg failed
+        """
+        await self.unlock()
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        signature = Path(f"{file_path}{SIGNATURE_SUFFIX}")
+        async with self._semaphore:
+            await self._run(
+                self._gpg_command(
+                    "--detach-sign",
+                    "--armor",
+                    "--output",
+                    str(signature),
+                    str(file_path),
+                ),
+                stdin=self._gpg_input(),
+            )
+        return signature
+
+    async def sign_files(
+        self, files: Iterable[Union[Path, str]]
+    ) -> AsyncIterator[Path]:
+        """
+        Sign files in parallel
+
+        Args:
+            files: Files to sign
+
+        Returns:
+            yields the path of each signature as soon as it has been created
+        """
+        tasks = [asyncio.create_task(self.sign(f)) for f in files]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -220,6 +220,14 @@ def parse_args(args) -> Tuple[str, str, Namespace]:
     sign_parser.add_argument(
         "--dry-run", action="store_true", help="Do not upload signed files."
     )
+    sign_parser.add_argument(
+        "--checksum-manifest",
+        action="store_true",
+        help=(
+            "Create and sign a single SHA256SUMS manifest of all release "
+            "files instead of signing each file."
+        ),
+    )
     parsed_args = parser.parse_args(args)
     token = os.getenv("GITHUB_TOKEN") if not args else "TOKEN"
     user = os.getenv("GITHUB_USER") if not args else "USER"
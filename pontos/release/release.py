@@ -97,21 +97,20 @@ def release(
     terminal.info(f"Creating release for v{release_version}")
     changelog_text: str = Path(RELEASE_TEXT_FILE).read_text(encoding="utf-8")
 
-    github = GitHubRESTApi(token=token)
-
     git_version = f"{git_tag_prefix}{release_version}"
     repo = f"{space}/{project}"
 
-    try:
-        github.create_release(
-            repo,
-            git_version,
-            name=f"{project} {release_version}",
-            body=changelog_text,
-        )
-    except httpx.HTTPError as e:
-        terminal.error(str(e))
-        return ReleaseReturnValue.CREATE_RELEASE_ERROR
+    with GitHubRESTApi(token=token) as github:
+        try:
+            github.create_release(
+                repo,
+                git_version,
+                name=f"{project} {release_version}",
+                body=changelog_text,
+            )
+        except httpx.HTTPError as e:
+            terminal.error(str(e))
+            return ReleaseReturnValue.CREATE_RELEASE_ERROR
 
     Path(RELEASE_TEXT_FILE).unlink()
 
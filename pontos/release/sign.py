@@ -16,18 +16,26 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 
+import asyncio
 from argparse import Namespace
 from enum import IntEnum
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 import httpx
 
-from pontos.github.api import GitHubRESTApi
-from pontos.helper import shell_cmd_runner
+from pontos.github.api import GitHubAsyncRESTApi
+from pontos.helper import DownloadProgressCallback
 from pontos.terminal import Terminal
 
+from .checksums import SHA256SUMS, hash_files, write_manifest
+from .gpg import GPGSigner
 from .helper import get_current_version, get_git_repository_name
 
+SIGNATURE_CONTENT_TYPE = "application/pgp-signature"
+MANIFEST_CONTENT_TYPE = "text/plain"
+DOWNLOAD_PROGRESS_STEP = 25
+
 
 class SignReturnValue(IntEnum):
     SUCCESS = 0
@@ -37,6 +45,145 @@ class SignReturnValue(IntEnum):
     UPLOAD_ASSET_ERROR = 4
 
 
+def _is_signed_asset(name: str) -> bool:
+    return name.endswith(".zip") or name.endswith(".tar.gz")
+
+
+def _download_progress(terminal: Terminal) -> DownloadProgressCallback:
+    """
+    Create a download progress callback reporting every
+    DOWNLOAD_PROGRESS_STEP percent of a file with a known size
+    """
+    reported: Dict[Path, int] = {}
+
+    def progress(path: Path, downloaded: int, length: Optional[int]) -> None:
+        if not length:
+            return
+
+        percent = downloaded * 100 // length
+        step = percent - percent % DOWNLOAD_PROGRESS_STEP
+        if step > reported.get(path, 0):
+            reported[path] = step
+            terminal.info(f"Downloading {path}: {step}%")
+
+    return progress
+
+
+async def _sign(
+    terminal: Terminal,
+    *,
+    token: str,
+    repo: str,
+    git_version: str,
+    project: str,
+    release_version: str,
+    signing_key: str,
+    passphrase: Optional[str],
+    dry_run: bool,
+    checksum_manifest: bool,
+) -> IntEnum:
+    async with GitHubAsyncRESTApi(token=token) as github:
+        releases = github.releases
+        try:
+            release = await releases.get(repo, git_version)
+        except httpx.HTTPStatusError:
+            terminal.error(f"Release version {git_version} does not exist.")
+            return SignReturnValue.NO_RELEASE
+
+        signer = GPGSigner(signing_key, passphrase=passphrase)
+        downloaded_files: List[Path] = []
+
+        async def upload(files: List[Tuple[Path, str]]) -> bool:
+            try:
+                async for uploaded_file in releases.upload_release_assets(
+                    repo, git_version, files, release=release
+                ):
+                    terminal.ok(f"Uploaded: {uploaded_file}")
+            except httpx.HTTPError as e:
+                terminal.error(f"Failed uploading asset {e}")
+                return False
+
+            return True
+
+        async def process_file(file_path: Path) -> bool:
+            terminal.info(f"Downloaded {file_path}")
+            downloaded_files.append(file_path)
+
+            if checksum_manifest:
+                # files are hashed after all downloads have finished
+                return True
+
+            terminal.info(f"Signing {file_path}")
+            signature = await signer.sign(file_path)
+
+            if dry_run:
+                return True
+
+            return await upload([(signature, SIGNATURE_CONTENT_TYPE)])
+
+        archive_url = f"https://github.com/{repo}/archive/refs/tags"
+        downloads: List[Tuple[str, Path, Optional[int]]] = [
+            (
+                f"{archive_url}/{git_version}.zip",
+                Path(f"{project}-{release_version}.zip"),
+                None,
+            ),
+            (
+                f"{archive_url}/{git_version}.tar.gz",
+                Path(f"{project}-{release_version}.tar.gz"),
+                None,
+            ),
+        ]
+        downloads.extend(
+            (asset.browser_download_url, Path(asset.name), asset.size)
+            for asset in release.assets
+            if _is_signed_asset(asset.name)
+        )
+
+        manager = releases.download_manager(
+            progress=_download_progress(terminal)
+        )
+        tasks: List[asyncio.Task] = []
+
+        try:
+            # each file is processed as soon as its download has finished
+            async for file_path in manager.download_all(downloads):
+                tasks.append(asyncio.create_task(process_file(file_path)))
+
+            results = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            # wait for cancelled tasks before closing the client
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if checksum_manifest:
+            terminal.info(f"Creating {SHA256SUMS}")
+            digests = {
+                file_path: digest
+                async for file_path, digest in hash_files(downloaded_files)
+            }
+            manifest = write_manifest(SHA256SUMS, digests)
+
+            terminal.info(f"Signing {manifest}")
+            signature = await signer.sign(manifest)
+
+            if not dry_run:
+                results.append(
+                    await upload(
+                        [
+                            (manifest, MANIFEST_CONTENT_TYPE),
+                            (signature, SIGNATURE_CONTENT_TYPE),
+                        ]
+                    )
+                )
+
+    if not all(results):
+        return SignReturnValue.UPLOAD_ASSET_ERROR
+
+    return SignReturnValue.SUCCESS
+
+
 def sign(
     terminal: Terminal,
     args: Namespace,
@@ -66,67 +213,24 @@ def sign(
     if not release_version:
         return SignReturnValue.NO_RELEASE_VERSION
 
-    signing_key: str = args.signing_key
-
     git_version: str = f"{git_tag_prefix}{release_version}"
     repo = f"{space}/{project}"
 
-    github = GitHubRESTApi(token=token)
-
-    if not github.release_exists(repo, git_version):
-        terminal.error(f"Release version {git_version} does not exist.")
-        return SignReturnValue.NO_RELEASE
-
-    zip_destination = Path(f"{project}-{release_version}.zip")
-    with github.download_release_zip(
-        repo, git_version, zip_destination
-    ) as zip_progress:
-        terminal.download_progress(zip_progress)
-
-    tarball_destination = Path(f"{project}-{release_version}.tar.gz")
-    with github.download_release_tarball(
-        repo, git_version, tarball_destination
-    ) as tar_progress:
-        terminal.download_progress(tar_progress)
-
-    file_paths = [zip_destination, tarball_destination]
-
-    for progress in github.download_release_assets(repo, git_version):
-        file_paths.append(progress.destination)
-        terminal.download_progress(progress)
-
-    for file_path in file_paths:
-        terminal.info(f"Signing {file_path}")
-
-        if args.passphrase:
-            process = shell_cmd_runner(
-                f"gpg --pinentry-mode loopback --default-key {signing_key}"
-                f" --yes --detach-sign --passphrase {args.passphrase}"
-                f" --armor {file_path}"
-            )
-        else:
-            process = shell_cmd_runner(
-                f"gpg --default-key {signing_key} --yes --detach-sign "
-                f"--armor {file_path}"
-            )
-
-        process.check_returncode()
-
-    if args.dry_run:
-        return SignReturnValue.SUCCESS
-
-    upload_files = [
-        (Path(f"{str(p)}.asc"), "application/pgp-signature") for p in file_paths
-    ]
-    terminal.info(f"Uploading assets: {[str(p[0]) for p in upload_files]}")
-
-    try:
-        for uploaded_file in github.upload_release_assets(
-            repo, git_version, upload_files
-        ):
-            terminal.ok(f"Uploaded: {uploaded_file}")
-    except httpx.HTTPError as e:
-        terminal.error(f"Failed uploading asset {e}")
-        return SignReturnValue.UPLOAD_ASSET_ERROR
-
-    return SignReturnValue.SUCCESS
+    # downloads, signing and uploads run concurrently. each file is signed
+    # as soon as its download has finished and each signature is uploaded as
+    # soon as it has been created. with a checksum manifest only the
+    # manifest of all downloaded files is signed.
+    return asyncio.run(
+        _sign(
+            terminal,
+            token=token,
+            repo=repo,
+            git_version=git_version,
+            project=project,
+            release_version=release_version,
+            signing_key=args.signing_key,
+            passphrase=args.passphrase,
+            dry_run=args.dry_run,
+            checksum_manifest=args.checksum_manifest,
+        )
+    )
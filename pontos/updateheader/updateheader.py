@@ -20,13 +20,32 @@ in the license header of source code files.\n
 Also it appends a header if it is missing in the file.
 """
 
+import os
 import re
+import shutil
 import sys
-from argparse import ArgumentParser, FileType, Namespace
+import tempfile
+from argparse import ArgumentParser, Namespace
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import redirect_stdout
 from datetime import datetime
+from functools import lru_cache
+from io import StringIO
+from itertools import chain, islice
 from pathlib import Path
 from subprocess import CalledProcessError, run
-from typing import Dict, List, Tuple, Union
+from typing import (
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from pontos.terminal import Terminal
 from pontos.terminal.null import NullTerminal
@@ -53,6 +72,45 @@ SUPPORTED_LICENCES = [
     "GPL-2.0-or-later",
     "GPL-3.0-or-later",
 ]
+# number of files passed to a worker process at once
+DEFAULT_CHUNK_SIZE = 100
+# buffer size for copying the file content after a changed header
+COPY_BUFFER_SIZE = 1024 * 1024
+# files containing a NUL byte within this size are considered binary
+BINARY_SNIFF_SIZE = 8192
+# files with these suffixes are skipped without opening them
+BINARY_FILE_SUFFIXES = frozenset(
+    [
+        ".7z",
+        ".a",
+        ".bin",
+        ".bmp",
+        ".bz2",
+        ".class",
+        ".dll",
+        ".exe",
+        ".gif",
+        ".gz",
+        ".ico",
+        ".jar",
+        ".jpeg",
+        ".jpg",
+        ".mo",
+        ".o",
+        ".pdf",
+        ".png",
+        ".pyc",
+        ".so",
+        ".tar",
+        ".tgz",
+        ".ttf",
+        ".woff",
+        ".woff2",
+        ".xz",
+        ".zip",
+    ]
+)
+TEMPLATES_DIR = Path(__file__).parent / "templates"
 
 
 def _get_modified_year(f: Path) -> str:
@@ -71,6 +129,55 @@ def _get_modified_year(f: Path) -> str:
         raise e
 
 
+def _get_modified_years(paths: Iterable[Path]) -> Dict[Path, str]:
+    """Reads the git history once and returns the year of the last
+    modification for all files below the given paths.
+    The keys of the returned dict are resolved paths.
+    """
+    proc = run(
+        ["git", "rev-parse", "--show-toplevel"],
+        text=True,
+        capture_output=True,
+        check=True,
+    )
+    root = Path(proc.stdout.rstrip())
+
+    # \x01 marks the date lines because file names can't be distinguished
+    # from the commit format otherwise
+    cmd = [
+        "git",
+        "log",
+        "-z",
+        "--format=%x01%ad",
+        "--date=format:%Y",
+        "--name-only",
+        "--",
+        *[str(path.absolute()) for path in paths],
+    ]
+    proc = run(cmd, text=True, capture_output=True, check=True)
+
+    modified_years: Dict[Path, str] = {}
+    year = None
+    after_date = False
+    for entry in proc.stdout.split("\0"):
+        if entry.startswith("\x01"):
+            year = entry[1:]
+            after_date = True
+            continue
+
+        # the first file name of a commit is separated by a newline
+        if after_date and entry.startswith("\n"):
+            entry = entry[1:]
+        after_date = False
+
+        # the history is in reverse chronological order. therefore the first
+        # commit containing a file is its last modification.
+        if entry and year:
+            modified_years.setdefault((root / entry).resolve(), year)
+
+    return modified_years
+
+
 def _find_copyright(
     line: str,
     regex: re.Pattern,
@@ -89,6 +196,19 @@ def _find_copyright(
     return False, None
 
 
+@lru_cache(maxsize=None)
+def _read_template(licence: str, suffix: str) -> Optional[str]:
+    """Reads the header template for the licence and file suffix once.
+    Returns None if no template exists.
+    """
+    licence_file = TEMPLATES_DIR / licence / f"template{suffix}"
+    try:
+        return licence_file.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+
+@lru_cache(maxsize=1024)
 def _add_header(
     suffix: str, licence: str, company: str, year: str
 ) -> Union[str, None]:
@@ -96,114 +216,158 @@ def _add_header(
     Requirements:
       - file type must be supported
       - licence file must exist
+    The rendered headers are cached.
     """
     if suffix in SUPPORTED_FILE_TYPES:
-        root = Path(__file__).parent
-        licence_file = root / "templates" / licence / f"template{suffix}"
-        try:
-            return (
-                licence_file.read_text(encoding="utf-8")
-                .replace("<company>", company)
-                .replace("<year>", year)
+        template = _read_template(licence, suffix)
+        if template is None:
+            raise FileNotFoundError(
+                f"No template for {licence} and {suffix} files."
             )
-        except FileNotFoundError as e:
-            raise e
+        return template.replace("<company>", company).replace("<year>", year)
     else:
         raise ValueError
 
 
+def _edit_file(file: Path, offset: int, old: bytes, new: bytes) -> None:
+    """Replaces the old bytes at offset in the file with the new bytes.
+    Nothing is written if the content doesn't change. Content of the same
+    length is overwritten in place. Otherwise the file is copied into a
+    temporary file containing the change, which atomically replaces the
+    original file.
+    """
+    if old == new:
+        return
+
+    # resolve symlinks to replace the linked file instead of the link
+    file = Path(os.path.realpath(file))
+
+    if len(old) == len(new):
+        with file.open("r+b") as fp:
+            fp.seek(offset)
+            fp.write(new)
+        return
+
+    fd, temp_name = tempfile.mkstemp(
+        prefix=f".{file.name}.", suffix=".tmp", dir=file.parent
+    )
+    temp_file = Path(temp_name)
+    try:
+        with file.open("rb") as src, os.fdopen(fd, "wb") as dst:
+            dst.write(src.read(offset))
+            dst.write(new)
+            src.seek(offset + len(old))
+            shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+        shutil.copymode(file, temp_file)
+        os.replace(temp_file, file)
+    except BaseException:
+        try:
+            temp_file.unlink()
+        except FileNotFoundError:
+            pass
+        raise
+
+
 def _update_file(
     file: Path,
     regex: re.Pattern,
     parsed_args: Namespace,
     term: Terminal,
+    modified_years: Optional[Dict[Path, str]] = None,
 ) -> int:
     """Function to update the given file.
     Checks if header exists. If not it adds an
     header to that file, else it checks if year
-    is up to date
+    is up to date.
+    If modified_years contains the resolved path of the file its year of
+    last modification isn't requested from git separately.
     """
 
     if parsed_args.changed:
-        try:
-            parsed_args.year = _get_modified_year(file)
-        except CalledProcessError:
-            term.warning(
-                f"{file}: Could not get date of last modification"
-                f" using git, using {str(parsed_args.year)} instead."
-            )
+        modified_year = (
+            modified_years.get(file.resolve()) if modified_years else None
+        )
+        if modified_year:
+            parsed_args.year = modified_year
+        else:
+            try:
+                parsed_args.year = _get_modified_year(file)
+            except CalledProcessError:
+                term.warning(
+                    f"{file}: Could not get date of last modification"
+                    f" using git, using {str(parsed_args.year)} instead."
+                )
 
     try:
-        with file.open("r+") as fp:
+        with file.open("rb") as fp:
+            head = fp.read(BINARY_SNIFF_SIZE)
+            position = head.find(b"\0")
+            if position != -1:
+                # NUL is valid UTF-8 but indicates a binary file
+                raise UnicodeDecodeError(
+                    "utf-8", head, position, position + 1, "binary file"
+                )
+
+            fp.seek(0)
             found = False
+            offset = 0
             i = 10  # assume that copyright is in the first 10 lines
             while not found and i > 0:
-                line = fp.readline()
-                if line == "":
+                offset = fp.tell()
+                raw_line = fp.readline()
+                if raw_line == b"":
                     i = 0
                     continue
+                line = raw_line.decode("utf-8")
                 found, copyright_match = _find_copyright(line=line, regex=regex)
                 i = i - 1
-            # header not found, add header
-            if i == 0 and not found:
-                try:
-                    header = _add_header(
-                        file.suffix,
-                        parsed_args.licence,
-                        parsed_args.company,
-                        parsed_args.year,
-                    )
-                    if header:
-                        fp.seek(0)  # back to beginning of file
-                        rest_of_file = fp.read()
-                        fp.seek(0)
-                        fp.write(header)
-                        fp.write("\n")
-                        fp.write(rest_of_file)
-                        print(f"{file}: Added licence header.")
-                        return 0
-                except ValueError:
-                    print(
-                        f"{file}: No licence header for the"
-                        f" format {file.suffix} found.",
-                    )
-                except FileNotFoundError:
-                    print(
-                        f"{file}: Licence file for {parsed_args.licence} "
-                        "is not existing."
-                    )
-                return 1
-            # replace found header and write it to file
-            if copyright_match and (
-                not copyright_match["modification_year"]
-                and copyright_match["creation_year"] < parsed_args.year
-                or copyright_match["modification_year"]
-                and copyright_match["modification_year"] < parsed_args.year
-            ):
-                copyright_term = (
-                    f'Copyright (C) {copyright_match["creation_year"]}'
-                    f'-{parsed_args.year} {copyright_match["company"]}'
+        # header not found, add header
+        if i == 0 and not found:
+            try:
+                header = _add_header(
+                    file.suffix,
+                    parsed_args.licence,
+                    parsed_args.company,
+                    parsed_args.year,
+                )
+                if header:
+                    _edit_file(file, 0, b"", f"{header}\n".encode("utf-8"))
+                    print(f"{file}: Added licence header.")
+                    return 0
+            except ValueError:
+                print(
+                    f"{file}: No licence header for the"
+                    f" format {file.suffix} found.",
                 )
-                new_line = re.sub(regex, copyright_term, line)
-                fp_write = fp.tell() - len(line)  # save position to insert
-                rest_of_file = fp.read()
-                fp.seek(fp_write)
-                fp.write(new_line)
-                fp.write(rest_of_file)
-                # in some cases we replace "YYYY - YYYY" with "YYYY-YYYY"
-                # resulting in 2 characters left at the end of the file
-                # so we truncate the file, just in case!
-                fp.truncate()
+            except FileNotFoundError:
                 print(
-                    f"{file}: Changed Licence Header Copyright Year "
-                    f'{copyright_match["modification_year"]} -> '
-                    f"{parsed_args.year}"
+                    f"{file}: Licence file for {parsed_args.licence} "
+                    "is not existing."
                 )
+            return 1
+        # replace found header and write it to file
+        if copyright_match and (
+            not copyright_match["modification_year"]
+            and copyright_match["creation_year"] < parsed_args.year
+            or copyright_match["modification_year"]
+            and copyright_match["modification_year"] < parsed_args.year
+        ):
+            copyright_term = (
+                f'Copyright (C) {copyright_match["creation_year"]}'
+                f'-{parsed_args.year} {copyright_match["company"]}'
+            )
+            new_line = re.sub(regex, copyright_term, line)
+            _edit_file(file, offset, raw_line, new_line.encode("utf-8"))
+            print(
+                f"{file}: Changed Licence Header Copyright Year "
+                f'{copyright_match["modification_year"]} -> '
+                f"{parsed_args.year}"
+            )
 
-                return 0
-            else:
-                print(f"{file}: Licence Header is ok.")
-                return 0
+            return 0
+        else:
+            print(f"{file}: Licence Header is ok.")
+            return 0
     except FileNotFoundError as e:
         print(f"{file}: File is not existing.")
         raise e
@@ -212,41 +376,320 @@ def _update_file(
         raise e
 
 
-def _get_exclude_list(
-    exclude_file: Path, directories: List[Path]
-) -> List[Path]:
-    """Tries to get the list of excluded files / directories.
+def _translate_component(component: str) -> str:
+    """Translates a glob pattern for a single path component into a regular
+    expression. In contrast to fnmatch wildcards don't match slashes.
+    """
+    regex = []
+    i = 0
+    while i < len(component):
+        char = component[i]
+        i += 1
+        if char == "*":
+            regex.append("[^/]*")
+        elif char == "?":
+            regex.append("[^/]")
+        elif char == "[":
+            end = component.find("]", i + 1)
+            if end == -1:
+                regex.append(re.escape(char))
+                continue
+            chars = component[i:end].replace("\\", "\\\\")
+            if chars.startswith("!"):
+                chars = f"^{chars[1:]}"
+            regex.append(f"[{chars}]")
+            i = end + 1
+        elif char == "\\" and i < len(component):
+            regex.append(re.escape(component[i]))
+            i += 1
+        else:
+            regex.append(re.escape(char))
+    return "".join(regex)
+
+
+def _translate_pattern(pattern: str) -> str:
+    """Translates a gitignore pattern without negation and trailing slash
+    into a regular expression matching relative paths.
+    """
+    # patterns containing a slash are relative to the directory of the
+    # ignore file. others match at any depth.
+    anchored = "/" in pattern
+    components = pattern.lstrip("/").split("/")
+    regex = []
+    for index, component in enumerate(components):
+        last = index == len(components) - 1
+        if component == "**":
+            regex.append(".*" if last else "(?:.*/)?")
+        else:
+            regex.append(_translate_component(component))
+            if not last:
+                regex.append("/")
+    prefix = "" if anchored else "(?:.*/)?"
+    return f"{prefix}{''.join(regex)}"
+
+
+def _has_magic(pattern: str) -> bool:
+    return any(char in pattern for char in "*?[\\")
+
+
+class _PatternGroup:
+    """Consecutive exclude patterns with the same negation. Literal file
+    names are looked up in a set and all other patterns are compiled into a
+    single regular expression.
+    """
+
+    def __init__(self, negated: bool) -> None:
+        self.negated = negated
+        self._names: Set[str] = set()
+        self._dir_names: Set[str] = set()
+        self._regexes: List[str] = []
+        self._dir_regexes: List[str] = []
+        self._regex: Optional[re.Pattern] = None
+        self._dir_regex: Optional[re.Pattern] = None
+
+    def add(self, pattern: str, dir_only: bool) -> None:
+        if "/" not in pattern and not _has_magic(pattern):
+            (self._dir_names if dir_only else self._names).add(pattern)
+        else:
+            (self._dir_regexes if dir_only else self._regexes).append(
+                _translate_pattern(pattern)
+            )
+
+    def compile(self) -> None:
+        self._regex = _compile_patterns(self._regexes)
+        self._dir_regex = _compile_patterns(self._dir_regexes)
+
+    def match(self, path: str, is_dir: bool) -> bool:
+        name = path.rpartition("/")[2]
+        if name in self._names or is_dir and name in self._dir_names:
+            return True
+        if self._regex and self._regex.match(path):
+            return True
+        return bool(is_dir and self._dir_regex and self._dir_regex.match(path))
+
+
+class _ExcludeMatcher:
+    """Matches relative paths against gitignore like exclude patterns.
+    Like with gitignore the last matching pattern decides whether a path is
+    excluded. Therefore consecutive patterns with the same negation are
+    grouped and the groups are checked in reverse order. A matcher for a sub
+    directory falls back to the matcher of its parent directory.
+    """
+
+    def __init__(
+        self,
+        patterns: Iterable[str],
+        *,
+        parent: Optional["_ExcludeMatcher"] = None,
+        prefix: str = "",
+    ) -> None:
+        """
+        Args:
+            patterns: gitignore patterns
+            parent: Matcher of a parent directory
+            prefix: Relative path of the directory of the patterns
+                including a trailing slash
+        """
+        self._parent = parent
+        self._prefix = prefix
+
+        groups: List[_PatternGroup] = []
+
+        for line in patterns:
+            pattern = line.rstrip("\n").rstrip()
+            if not pattern or pattern.startswith("#"):
+                continue
+
+            negated = pattern.startswith("!")
+            if negated:
+                pattern = pattern[1:]
+
+            dir_only = pattern.endswith("/")
+            pattern = pattern.rstrip("/")
+            if not pattern:
+                continue
+
+            if not groups or groups[-1].negated != negated:
+                groups.append(_PatternGroup(negated))
+            groups[-1].add(pattern, dir_only)
+
+        for group in groups:
+            group.compile()
+
+        # the last matching pattern wins
+        self._groups = groups[::-1]
+
+    @classmethod
+    def from_file(
+        cls,
+        path: Path,
+        *,
+        parent: Optional["_ExcludeMatcher"] = None,
+        prefix: str = "",
+    ) -> Optional["_ExcludeMatcher"]:
+        """Creates a matcher from an ignore file if it exists"""
+        try:
+            lines = path.read_text(encoding="utf-8").splitlines()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return cls(lines, parent=parent, prefix=prefix)
+
+    def _match(self, path: str, is_dir: bool) -> Optional[bool]:
+        for group in self._groups:
+            if group.match(path, is_dir):
+                return not group.negated
+        return None
+
+    def excluded(self, path: str, is_dir: bool = False) -> bool:
+        """Checks if a path is excluded
+
+        Args:
+            path: Path relative to the walked directory using slashes as
+                separator
+            is_dir: True if the path is a directory
+        """
+        matcher: Optional[_ExcludeMatcher] = self
+        while matcher is not None:
+            prefix = matcher._prefix
+            if path.startswith(prefix):
+                result = matcher._match(path[len(prefix) :], is_dir)
+                if result is not None:
+                    return result
+            matcher = matcher._parent
+        return False
+
+
+def _compile_patterns(regexes: List[str]) -> Optional[re.Pattern]:
+    if not regexes:
+        return None
+    return re.compile("|".join(f"(?:{regex})" for regex in regexes) + r"\Z")
+
+
+def _exclude_file_pattern(line: str) -> str:
+    """Converts a line of the exclude file into a gitignore pattern.
+    Patterns starting with a slash are relative to the walked directory.
+    All other patterns match in all sub directories like with rglob.
+    """
+    negated = line.startswith("!")
+    pattern = line[1:] if negated else line
+    if not pattern.startswith("/"):
+        pattern = f"**/{pattern}"
+    return f"!{pattern}" if negated else pattern
+
+
+def _get_exclude_matcher(
+    exclude_file: Optional[Path],
+) -> Optional[_ExcludeMatcher]:
+    """Tries to get the matcher for the excluded files / directories.
     If a file is given, it will be used. Otherwise it will be searched
     in the executed root path.
     The ignore file should only contain relative paths like *.py,
-    not absolute as **/*.py
+    not absolute as **/*.py. Like with rglob the patterns match in all
+    sub directories. A pattern starting with a slash only matches relative
+    to the walked directory and a pattern starting with ! includes the
+    matching paths again.
     """
 
     if exclude_file is None:
         exclude_file = Path(".pontos-header-ignore")
     try:
-        exclude_lines = exclude_file.read_text(encoding="utf-8").split("\n")
+        exclude_lines = exclude_file.read_text(encoding="utf-8").splitlines()
     except FileNotFoundError:
         print("No exclude list file found.")
-        return []
+        return None
 
-    expanded_globs = [
-        directory.rglob(line.strip())
-        for directory in directories
+    return _ExcludeMatcher(
+        _exclude_file_pattern(line.strip())
         for line in exclude_lines
-        if line
-    ]
+        if line.strip() and not line.startswith("#")
+    )
 
-    exclude_list = []
-    for glob_paths in expanded_globs:
-        for path in glob_paths:
-            if path.is_dir():
-                for efile in path.rglob("*"):
-                    exclude_list.append(efile.absolute())
-            else:
-                exclude_list.append(path.absolute())
 
-    return exclude_list
+def _iter_files(
+    directory: Path,
+    exclude_matcher: Optional[_ExcludeMatcher] = None,
+    *,
+    gitignore: bool = False,
+    term: Optional[Terminal] = None,
+) -> Iterator[Path]:
+    """Walks the directory lazily and yields all files.
+    Excluded directories are skipped without descending into them.
+    If gitignore is True the patterns of all .gitignore files are
+    considered too and .git directories are skipped.
+    If a terminal is passed the excluded files and directories are reported.
+    """
+    directories = [(directory, "", exclude_matcher)]
+    while directories:
+        current, relative, matcher = directories.pop()
+        if gitignore:
+            matcher = (
+                _ExcludeMatcher.from_file(
+                    current / ".gitignore", parent=matcher, prefix=relative
+                )
+                or matcher
+            )
+
+        try:
+            entries = list(os.scandir(current))
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+
+        for entry in entries:
+            path = f"{relative}{entry.name}"
+            if entry.is_dir(follow_symlinks=False):
+                if gitignore and entry.name == ".git":
+                    continue
+                if matcher and matcher.excluded(path, is_dir=True):
+                    if term:
+                        term.warning(
+                            f"{entry.path}: Ignoring directory from "
+                            "exclusion list."
+                        )
+                else:
+                    directories.append((Path(entry.path), f"{path}/", matcher))
+            elif entry.is_file():
+                if matcher and matcher.excluded(path):
+                    if term:
+                        term.warning(
+                            f"{entry.path}: Ignoring file from exclusion list."
+                        )
+                else:
+                    yield Path(entry.path)
+
+
+def _chunks(files: Iterable[Path], size: int) -> Iterator[List[Path]]:
+    iterator = iter(files)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+def _update_files(
+    files: List[Path],
+    regex: re.Pattern,
+    parsed_args: Namespace,
+    modified_years: Optional[Dict[Path, str]] = None,
+) -> str:
+    """Updates the given files and returns the collected output.
+    Runs in a worker process. Collecting the output allows to print the
+    results in batches instead of interleaving the output of the workers.
+    """
+    term = NullTerminal() if parsed_args.quiet else RichTerminal()
+    output = StringIO()
+    with redirect_stdout(output):
+        for file in files:
+            try:
+                _update_file(
+                    file=file,
+                    regex=regex,
+                    parsed_args=parsed_args,
+                    term=term,
+                    modified_years=modified_years,
+                )
+            except (FileNotFoundError, UnicodeDecodeError, ValueError):
+                continue
+    return output.getvalue()
 
 
 def _parse_args(args=None):
@@ -320,6 +763,14 @@ def _parse_args(args=None):
         help="Directories to find files to update recursively.",
     )
 
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of files to update in parallel. Default: %(default)s",
+    )
+
     parser.add_argument(
         "--exclude-file",
         help=(
@@ -330,7 +781,16 @@ def _parse_args(args=None):
             "The ignore file should only contain relative paths like *.py,"
             "not absolute as **/*.py"
         ),
-        type=FileType("r"),
+        type=Path,
+    )
+
+    parser.add_argument(
+        "--gitignore",
+        action="store_true",
+        help=(
+            "Also ignore files matching the patterns of the .gitignore files "
+            "in the directories and the .git directories."
+        ),
     )
 
     return parser.parse_args(args)
@@ -338,7 +798,6 @@ def _parse_args(args=None):
 
 def main() -> None:
     parsed_args = _parse_args()
-    exclude_list = []
 
     if parsed_args.quiet:
         term: Union[NullTerminal, RichTerminal] = NullTerminal()
@@ -354,20 +813,26 @@ def main() -> None:
             ]
         else:
             directories = [Path(parsed_args.directories)]
-        # get file paths to exclude
-        exclude_list = _get_exclude_list(parsed_args.exclude_file, directories)
+        paths = directories
+        # get matcher for the files to exclude
+        exclude_matcher = _get_exclude_matcher(parsed_args.exclude_file)
         # get files to update
-        files = [
-            Path(file)
+        files: Iterable[Path] = (
+            file
             for directory in directories
-            for file in directory.rglob("*")
-            if file.is_file()
-        ]
+            for file in _iter_files(
+                directory,
+                exclude_matcher,
+                gitignore=parsed_args.gitignore,
+                term=term,
+            )
+        )
     elif parsed_args.files:
         if isinstance(parsed_args.files, list):
             files = [Path(name) for name in parsed_args.files]
         else:
             files = [Path(parsed_args.files)]
+        paths = files
 
     else:
         # should never happen
@@ -379,16 +844,82 @@ def main() -> None:
         f"?-? ?(19[0-9]{{2}}|20[0-9]{{2}})? ({parsed_args.company})"
     )
 
-    for file in files:
-        try:
-            if file.absolute() in exclude_list:
-                term.warning(f"{file}: Ignoring file from exclusion list.")
+    def included_files() -> Iterator[Path]:
+        # filter files before they are opened by a worker
+        for file in files:
+            if file.suffix.lower() in BINARY_FILE_SUFFIXES:
+                print(f"{file}: Ignoring binary file.")
             else:
-                _update_file(
-                    file=file, regex=regex, parsed_args=parsed_args, term=term
+                yield file
+
+    modified_years: Optional[Dict[Path, str]] = None
+    if parsed_args.changed:
+        try:
+            modified_years = _get_modified_years(paths)
+        except CalledProcessError:
+            term.warning(
+                "Could not read the git history. Requesting the date of last "
+                "modification for each file instead."
+            )
+
+    def chunk_modified_years(
+        chunk: List[Path],
+    ) -> Optional[Dict[Path, str]]:
+        # only pass the years of the files of a chunk to the workers
+        if modified_years is None:
+            return None
+        years = {}
+        for file in chunk:
+            path = file.resolve()
+            if path in modified_years:
+                years[path] = modified_years[path]
+        return years
+
+    # only pass the picklable arguments required for updating to the workers
+    update_args = Namespace(
+        changed=parsed_args.changed,
+        year=parsed_args.year,
+        licence=parsed_args.licence,
+        company=parsed_args.company,
+        quiet=parsed_args.quiet,
+    )
+    jobs = max(parsed_args.jobs, 1)
+    chunks = _chunks(included_files(), DEFAULT_CHUNK_SIZE)
+    # don't start worker processes if there is only a single chunk
+    first_chunks = list(islice(chunks, 2))
+    chunks = chain(first_chunks, chunks)
+
+    if jobs == 1 or len(first_chunks) < 2:
+        for chunk in chunks:
+            print(
+                _update_files(
+                    chunk, regex, update_args, chunk_modified_years(chunk)
+                ),
+                end="",
+            )
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # print the output in the order of the chunks
+        pending: Deque[Future] = deque()
+        for chunk in chunks:
+            # limit the number of queued chunks to keep walking the
+            # directories lazily
+            if len(pending) >= jobs * 2:
+                print(pending.popleft().result(), end="")
+
+            pending.append(
+                executor.submit(
+                    _update_files,
+                    chunk,
+                    regex,
+                    update_args,
+                    chunk_modified_years(chunk),
                 )
-        except (FileNotFoundError, UnicodeDecodeError, ValueError):
-            continue
+            )
+
+        for future in pending:
+            print(future.result(), end="")
 
 
 if __name__ == "__main__":
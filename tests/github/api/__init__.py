@@ -26,7 +26,14 @@ from tests import AsyncMock, IsolatedAsyncioTestCase
 
 
 def create_response(*args, **kwargs) -> MagicMock:
-    return MagicMock(spec=httpx.Response, *args, **kwargs)
+    # successful response without headers by default. the request scheduler
+    # evaluates the status code and the rate limit headers.
+    kwargs.setdefault("status_code", 200)
+    kwargs.setdefault("headers", httpx.Headers())
+    response = MagicMock(spec=httpx.Response, *args, **kwargs)
+    response.aclose = AsyncMock()
+    response.aread = AsyncMock()
+    return response
 
 
 def default_request(*args, **kwargs) -> Tuple[Tuple[Any], Dict[str, Any]]:
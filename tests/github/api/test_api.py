@@ -0,0 +1,239 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# pylint: disable=protected-access
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+from pontos.github.api import (
+    DEFAULT_LIMITS,
+    GitHubAsyncRESTApi,
+    GitHubRESTApi,
+)
+from pontos.github.api.helper import DEFAULT_TIMEOUT_CONFIG
+from pontos.github.api.scheduler import (
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_REQUESTS_PER_SECOND,
+    RequestScheduler,
+)
+from tests import AsyncMock, IsolatedAsyncioTestCase
+from tests.github.api import create_response, default_request
+
+
+@patch("pontos.github.api.api.httpx.Client")
+class GitHubRESTApiTestCase(unittest.TestCase):
+    def test_client_is_created_lazily(self, client_mock: MagicMock):
+        GitHubRESTApi("12345")
+
+        client_mock.assert_not_called()
+
+    def test_reuse_client(self, client_mock: MagicMock):
+        client = client_mock.return_value
+        client.is_closed = False
+        client.get.return_value = create_response()
+
+        api = GitHubRESTApi("12345")
+        api.get_repository_artifact("foo/bar", "123")
+        api.get_repository_artifact("foo/bar", "456")
+
+        client_mock.assert_called_once_with(
+            timeout=DEFAULT_TIMEOUT_CONFIG, http2=True, limits=DEFAULT_LIMITS
+        )
+        self.assertEqual(client.get.call_count, 2)
+
+        args, kwargs = default_request(
+            "https://api.github.com/repos/foo/bar/actions/artifacts/456",
+        )
+        client.get.assert_called_with(*args, **kwargs)
+
+    def test_client_settings(self, client_mock: MagicMock):
+        client = client_mock.return_value
+        client.get.return_value = create_response()
+        limits = httpx.Limits(max_connections=1)
+
+        api = GitHubRESTApi("12345", http2=False, limits=limits)
+        api.get_repository_artifact("foo/bar", "123")
+
+        client_mock.assert_called_once_with(
+            timeout=DEFAULT_TIMEOUT_CONFIG, http2=False, limits=limits
+        )
+
+    def test_post(self, client_mock: MagicMock):
+        client = client_mock.return_value
+        client.post.return_value = create_response()
+
+        api = GitHubRESTApi("12345")
+        api.create_release("foo/bar", "v1.2.3")
+
+        args, kwargs = default_request(
+            "https://api.github.com/repos/foo/bar/releases",
+            json={
+                "tag_name": "v1.2.3",
+                "draft": False,
+                "prerelease": False,
+            },
+        )
+        client.post.assert_called_once_with(*args, **kwargs)
+        client.get.assert_not_called()
+
+    def test_custom_request(self, client_mock: MagicMock):
+        request_mock = MagicMock()
+        request_mock.return_value = create_response()
+
+        api = GitHubRESTApi("12345")
+        api._request("/foo", request=request_mock)
+
+        args, kwargs = default_request("https://api.github.com/foo")
+        request_mock.assert_called_once_with(*args, **kwargs)
+        client_mock.assert_not_called()
+
+    def test_context_manager(self, client_mock: MagicMock):
+        client = client_mock.return_value
+        client.is_closed = False
+        client.get.return_value = create_response()
+
+        with GitHubRESTApi("12345") as api:
+            api.get_repository_artifact("foo/bar", "123")
+
+            client.close.assert_not_called()
+
+        client.close.assert_called_once_with()
+
+    def test_recreate_client_after_close(self, client_mock: MagicMock):
+        client_mock.return_value.get.return_value = create_response()
+
+        api = GitHubRESTApi("12345")
+        api.get_repository_artifact("foo/bar", "123")
+        api.close()
+        api.get_repository_artifact("foo/bar", "123")
+
+        self.assertEqual(client_mock.call_count, 2)
+
+    def test_close_without_client(self, client_mock: MagicMock):
+        api = GitHubRESTApi("12345")
+        api.close()
+
+        client_mock.assert_not_called()
+
+
+class GitHubAsyncRESTApiTestCase(IsolatedAsyncioTestCase):
+    def test_scheduler(self):
+        scheduler = RequestScheduler(max_retries=1)
+        api = GitHubAsyncRESTApi("12345", scheduler=scheduler)
+
+        self.assertIs(api._client.scheduler, scheduler)
+
+    def test_default_scheduler(self):
+        api = GitHubAsyncRESTApi("12345")
+
+        scheduler = api._client.scheduler
+        self.assertEqual(scheduler.max_concurrency, DEFAULT_MAX_CONCURRENCY)
+        self.assertEqual(
+            scheduler.requests_per_second, DEFAULT_REQUESTS_PER_SECOND
+        )
+        self.assertEqual(scheduler.max_retries, DEFAULT_MAX_RETRIES)
+
+    def test_graphql_shares_scheduler(self):
+        api = GitHubAsyncRESTApi("12345")
+
+        self.assertIs(api.graphql._client._scheduler, api._client.scheduler)
+        self.assertIs(api.graphql._client, api.graphql._client)
+
+    @patch("pontos.github.api.client.httpx.AsyncClient")
+    async def test_context_manager(self, async_client_mock: MagicMock):
+        rest_client = MagicMock()
+        rest_client.__aenter__ = AsyncMock()
+        rest_client.__aexit__ = AsyncMock(return_value=None)
+        async_client_mock.return_value = rest_client
+
+        async with GitHubAsyncRESTApi("12345"):
+            rest_client.__aenter__.assert_awaited_once_with()
+            rest_client.__aexit__.assert_not_awaited()
+
+        rest_client.__aexit__.assert_awaited_once()
+        # the GraphQL client is only created if it is used
+        async_client_mock.assert_called_once()
+
+    @patch("pontos.github.api.client.httpx.AsyncClient")
+    async def test_context_manager_graphql(self, async_client_mock: MagicMock):
+        manager = MagicMock()
+        rest_client = MagicMock()
+        rest_client.__aenter__ = AsyncMock()
+        rest_client.__aexit__ = AsyncMock(return_value=None)
+        manager.attach_mock(rest_client.__aexit__, "rest_aexit")
+        graphql_client = MagicMock()
+        graphql_client.__aenter__ = AsyncMock()
+        graphql_client.__aexit__ = AsyncMock(return_value=None)
+        manager.attach_mock(graphql_client.__aexit__, "graphql_aexit")
+        async_client_mock.side_effect = [rest_client, graphql_client]
+
+        async with GitHubAsyncRESTApi("12345") as api:
+            async_client_mock.assert_called_once()
+
+            self.assertIs(api.graphql._client._client, graphql_client)
+            self.assertIs(api.graphql._client._client, graphql_client)
+
+            self.assertEqual(async_client_mock.call_count, 2)
+            graphql_client.__aenter__.assert_not_awaited()
+            graphql_client.__aexit__.assert_not_awaited()
+
+        # the GraphQL client is closed before the REST client
+        self.assertEqual(
+            [name for name, _, _ in manager.mock_calls],
+            ["graphql_aexit", "rest_aexit"],
+        )
+
+    @patch("pontos.github.api.client.httpx.AsyncClient")
+    async def test_context_manager_graphql_before_enter(
+        self, async_client_mock: MagicMock
+    ):
+        rest_client = MagicMock()
+        rest_client.__aenter__ = AsyncMock()
+        rest_client.__aexit__ = AsyncMock(return_value=None)
+        graphql_client = MagicMock()
+        graphql_client.__aexit__ = AsyncMock(return_value=None)
+        async_client_mock.side_effect = [rest_client, graphql_client]
+
+        api = GitHubAsyncRESTApi("12345")
+        graphql = api.graphql
+
+        async with api:
+            self.assertIs(graphql._client._client, graphql_client)
+
+        rest_client.__aexit__.assert_awaited_once()
+        graphql_client.__aexit__.assert_awaited_once()
+
+    @patch("pontos.github.api.client.httpx.AsyncClient")
+    async def test_context_manager_enter_failure(
+        self, async_client_mock: MagicMock
+    ):
+        rest_client = MagicMock()
+        rest_client.__aenter__ = AsyncMock(side_effect=RuntimeError())
+        rest_client.__aexit__ = AsyncMock(return_value=None)
+        async_client_mock.return_value = rest_client
+
+        api = GitHubAsyncRESTApi("12345")
+        with self.assertRaises(RuntimeError):
+            async with api:
+                pass
+
+        rest_client.__aexit__.assert_not_awaited()
+        self.assertIsNone(api._exit_stack)
@@ -433,10 +433,11 @@ class GitHubArtifactsTestCase(unittest.TestCase):
         requests_mock.assert_called_once_with(*args, **kwargs)
 
     @patch("pontos.helper.Path")
-    @patch("pontos.github.api.api.httpx.stream")
+    @patch("pontos.github.api.api.httpx.Client")
     def test_download_repository_artifact(
-        self, requests_mock: MagicMock, path_mock: MagicMock
+        self, client_mock: MagicMock, path_mock: MagicMock
     ):
+        requests_mock = client_mock.return_value.stream
         response = MagicMock()
         response.iter_bytes.return_value = [b"foo", b"bar", b"baz"]
         response_headers = MagicMock()
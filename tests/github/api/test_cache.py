@@ -0,0 +1,225 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# pylint: disable=protected-access
+
+import json
+import unittest
+from typing import Optional
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+from pontos.github.api.api import GitHubRESTApi
+from pontos.github.api.cache import ResponseCache
+from pontos.github.api.client import GitHubAsyncRESTClient
+from pontos.testing import temp_directory
+from tests import AsyncMock, IsolatedAsyncioTestCase
+from tests.github.api import create_response
+
+URL = "https://api.github.com/repos/foo/bar"
+
+
+def create_cache_response(
+    status_code: int = 200,
+    *,
+    content: bytes = b'{"name": "bar"}',
+    etag: Optional[str] = '"123"',
+) -> MagicMock:
+    response = create_response(
+        status_code=status_code,
+        headers=httpx.Headers({"ETag": etag} if etag else {}),
+        content=content,
+        url=httpx.URL(URL),
+        is_success=200 <= status_code < 300,
+        request=httpx.Request("GET", URL),
+    )
+    response.json.return_value = json.loads(content) if content else None
+    return response
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+    def test_key(self):
+        key = ResponseCache.key(URL, headers={"Authorization": "token 1"})
+        self.assertEqual(
+            key, ResponseCache.key(URL, headers={"Authorization": "token 1"})
+        )
+        self.assertNotEqual(
+            key, ResponseCache.key(URL, headers={"Authorization": "token 2"})
+        )
+        self.assertNotEqual(
+            key,
+            ResponseCache.key(
+                URL,
+                params={"page": "2"},
+                headers={"Authorization": "token 1"},
+            ),
+        )
+
+    def test_store(self):
+        cache = ResponseCache()
+        key = cache.key(URL)
+
+        self.assertEqual(cache.request_headers(key), {})
+
+        cache.store(key, create_cache_response())
+
+        self.assertEqual(cache.request_headers(key), {"If-None-Match": '"123"'})
+
+    def test_dont_store_without_validator(self):
+        cache = ResponseCache()
+        key = cache.key(URL)
+
+        cache.store(key, create_cache_response(etag=None))
+
+        self.assertIsNone(cache.get(key))
+
+    def test_dont_store_errors(self):
+        cache = ResponseCache()
+        key = cache.key(URL)
+
+        cache.store(key, create_cache_response(404))
+
+        self.assertIsNone(cache.get(key))
+
+    def test_not_modified_response(self):
+        cache = ResponseCache()
+        key = cache.key(URL)
+
+        cache.response(key, create_cache_response())
+        response = cache.response(key, create_cache_response(304, content=b""))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"name": "bar"})
+
+    def test_modified_response(self):
+        cache = ResponseCache()
+        key = cache.key(URL)
+
+        cache.response(key, create_cache_response())
+        response = cache.response(
+            key, create_cache_response(content=b'{"name": "baz"}', etag='"321"')
+        )
+
+        self.assertEqual(response.json(), {"name": "baz"})
+        self.assertEqual(cache.request_headers(key), {"If-None-Match": '"321"'})
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2)
+
+        cache.store("a", create_cache_response())
+        cache.store("b", create_cache_response())
+        cache.get("a")
+        cache.store("c", create_cache_response())
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+
+    @patch("pontos.github.api.cache.time.monotonic")
+    def test_ttl(self, monotonic_mock: MagicMock):
+        monotonic_mock.return_value = 100.0
+        cache = ResponseCache(ttl=10)
+        cache.store("a", create_cache_response())
+
+        monotonic_mock.return_value = 105.0
+        self.assertIsNotNone(cache.get("a"))
+
+        monotonic_mock.return_value = 111.0
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_directory(self):
+        with temp_directory() as temp_dir:
+            cache = ResponseCache(directory=temp_dir)
+            key = cache.key(URL)
+            cache.store(key, create_cache_response())
+
+            cache = ResponseCache(directory=temp_dir)
+            response = cache.response(
+                key, create_cache_response(304, content=b"")
+            )
+
+            self.assertEqual(response.json(), {"name": "bar"})
+
+            cache.clear()
+
+            self.assertEqual(list(temp_dir.iterdir()), [])
+
+    def test_remove_missing_file(self):
+        with temp_directory() as temp_dir:
+            cache = ResponseCache(directory=temp_dir)
+            key = cache.key(URL)
+            cache.store(key, create_cache_response())
+
+            for path in temp_dir.iterdir():
+                path.unlink()
+
+            cache.remove(key)
+            cache.clear()
+
+            self.assertIsNone(cache.get(key))
+
+
+class GitHubAsyncRESTClientCacheTestCase(IsolatedAsyncioTestCase):
+    @patch("pontos.github.api.client.httpx.AsyncClient")
+    def setUp(self, async_client: MagicMock) -> None:
+        self.http_client = AsyncMock()
+        async_client.return_value = self.http_client
+        self.cache = ResponseCache()
+        self.client = GitHubAsyncRESTClient("token", cache=self.cache)
+
+    async def test_conditional_request(self):
+        self.http_client.get.side_effect = [
+            create_cache_response(),
+            create_cache_response(304, content=b""),
+        ]
+
+        response = await self.client.get("/repos/foo/bar")
+        self.assertEqual(response.json(), {"name": "bar"})
+        self.assertNotIn(
+            "If-None-Match", self.http_client.get.call_args.kwargs["headers"]
+        )
+
+        response = await self.client.get("/repos/foo/bar")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"name": "bar"})
+        self.assertEqual(
+            self.http_client.get.call_args.kwargs["headers"]["If-None-Match"],
+            '"123"',
+        )
+
+
+class GitHubRESTApiCacheTestCase(unittest.TestCase):
+    @patch("pontos.github.api.api.httpx.get")
+    def test_conditional_request(self, get_mock: MagicMock):
+        get_mock.side_effect = [
+            create_cache_response(),
+            create_cache_response(304, content=b""),
+        ]
+        api = GitHubRESTApi("12345", cache=ResponseCache())
+
+        response = api._request("/repos/foo/bar")
+        self.assertEqual(response.json(), {"name": "bar"})
+
+        response = api._request("/repos/foo/bar")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"name": "bar"})
+        self.assertEqual(
+            get_mock.call_args.kwargs["headers"]["If-None-Match"], '"123"'
+        )
@@ -22,12 +22,15 @@ from unittest.mock import MagicMock, call, patch
 from pontos.github.api.client import GITHUB_API_VERSION, GitHubAsyncRESTClient
 from pontos.github.api.helper import DEFAULT_GITHUB_API_URL
 from tests import AsyncMock, IsolatedAsyncioTestCase, aiter, anext
+from tests.github.api import create_response
 
 
 class GitHubAsyncRESTClientTestCase(IsolatedAsyncioTestCase):
     @patch("pontos.github.api.client.httpx.AsyncClient")
     def setUp(self, async_client: MagicMock) -> None:
         self.http_client = AsyncMock()
+        for method in ("get", "post", "put", "patch", "delete"):
+            getattr(self.http_client, method).return_value = create_response()
         async_client.return_value = self.http_client
         self.client = GitHubAsyncRESTClient("token")
 
@@ -61,8 +64,8 @@ class GitHubAsyncRESTClientTestCase(IsolatedAsyncioTestCase):
 
     async def test_get_all(self):
         url = "https://foo.bar"
-        response1 = MagicMock(links={"next": {"url": url}})
-        response2 = MagicMock(links=None)
+        response1 = create_response(links={"next": {"url": url}})
+        response2 = create_response(links=None)
 
         self.http_client.get.side_effect = [
             response1,
@@ -101,6 +104,90 @@ class GitHubAsyncRESTClientTestCase(IsolatedAsyncioTestCase):
             ]
         )
 
+    async def test_get_all_prefetch(self):
+        url = f"{DEFAULT_GITHUB_API_URL}/foo/bar?per_page=100"
+        response1 = create_response(
+            links={
+                "next": {"url": f"{url}&page=2"},
+                "last": {"url": f"{url}&page=4"},
+            }
+        )
+        response2 = create_response()
+        response3 = create_response()
+        response4 = create_response()
+
+        self.http_client.get.side_effect = [
+            response1,
+            response2,
+            response3,
+            response4,
+        ]
+        it = aiter(self.client.get_all("/foo/bar", max_prefetch=2))
+
+        self.assertIs(await anext(it), response1)
+        self.assertIs(await anext(it), response2)
+        self.assertIs(await anext(it), response3)
+        self.assertIs(await anext(it), response4)
+
+        with self.assertRaises(StopAsyncIteration):
+            await anext(it)
+
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "Authorization": "token token",
+            "X-GitHub-Api-Version": GITHUB_API_VERSION,
+        }
+        self.http_client.get.assert_has_awaits(
+            [
+                call(
+                    f"{DEFAULT_GITHUB_API_URL}/foo/bar",
+                    headers=headers,
+                    params=None,
+                    follow_redirects=True,
+                ),
+                call(
+                    f"{url}&page=2",
+                    headers=headers,
+                    params=None,
+                    follow_redirects=True,
+                ),
+                call(
+                    f"{url}&page=3",
+                    headers=headers,
+                    params=None,
+                    follow_redirects=True,
+                ),
+                call(
+                    f"{url}&page=4",
+                    headers=headers,
+                    params=None,
+                    follow_redirects=True,
+                ),
+            ]
+        )
+
+    async def test_get_all_prefetch_cancel(self):
+        url = f"{DEFAULT_GITHUB_API_URL}/foo/bar?per_page=100"
+        response1 = create_response(
+            links={
+                "next": {"url": f"{url}&page=2"},
+                "last": {"url": f"{url}&page=10"},
+            }
+        )
+        response2 = create_response()
+
+        self.http_client.get.side_effect = [response1] + [response2] * 9
+
+        it = aiter(self.client.get_all("/foo/bar", max_prefetch=3))
+
+        await anext(it)
+        await anext(it)
+        await it.aclose()
+
+        # first page, the prefetched pages 2, 3 and 4 and page 5 which is
+        # requested after page 2 has been consumed
+        self.assertLessEqual(self.http_client.get.await_count, 5)
+
     async def test_delete(self):
         await self.client.delete("/foo/bar")
 
@@ -159,6 +246,28 @@ class GitHubAsyncRESTClientTestCase(IsolatedAsyncioTestCase):
             content=None,
         )
 
+    async def test_post_headers(self):
+        await self.client.post(
+            "/foo/bar",
+            content=b"foo",
+            content_type="text/plain",
+            headers={"Content-Length": "3"},
+        )
+
+        self.http_client.post.assert_awaited_once_with(
+            f"{DEFAULT_GITHUB_API_URL}/foo/bar",
+            headers={
+                "Accept": "application/vnd.github+json",
+                "Authorization": "token token",
+                "X-GitHub-Api-Version": GITHUB_API_VERSION,
+                "Content-Type": "text/plain",
+                "Content-Length": "3",
+            },
+            json=None,
+            params=None,
+            content=b"foo",
+        )
+
     async def test_put(self):
         await self.client.put("/foo/bar", data={"foo": "bar"})
 
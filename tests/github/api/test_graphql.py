@@ -0,0 +1,515 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# pylint: disable=protected-access
+
+import json
+from unittest.mock import MagicMock, patch
+
+from pontos.github.api.client import GITHUB_API_VERSION
+from pontos.github.api.errors import GitHubApiError
+from pontos.github.api.graphql import (
+    GitHubAsyncGraphQL,
+    GitHubAsyncGraphQLClient,
+    _graphql_url,
+    _uploads_url,
+)
+from pontos.github.api.helper import DEFAULT_GITHUB_API_URL
+from pontos.github.models.organization import RepositoryType
+from tests import AsyncMock, IsolatedAsyncioTestCase, aiter, anext
+from tests.github.api import create_response
+
+
+def graphql_response(data) -> MagicMock:
+    response = create_response()
+    response.status_code = 200
+    response.headers = {}
+    response.json.return_value = {"data": data}
+    return response
+
+
+def connection(nodes, *, cursor=None):
+    return {
+        "pageInfo": {"hasNextPage": cursor is not None, "endCursor": cursor},
+        "nodes": nodes,
+    }
+
+
+def user_node(login, database_id):
+    return {
+        "__typename": "User",
+        "login": login,
+        "id": f"U_{database_id}",
+        "databaseId": database_id,
+        "avatarUrl": f"https://avatars.githubusercontent.com/u/{database_id}",
+        "url": f"https://github.com/{login}",
+        "isSiteAdmin": False,
+    }
+
+
+def repository_node(name, *, branch=None, protection=None):
+    return {
+        "databaseId": 1,
+        "id": "R_1",
+        "name": name,
+        "nameWithOwner": f"foo/{name}",
+        "description": "A repository",
+        "url": f"https://github.com/foo/{name}",
+        "sshUrl": f"git@github.com:foo/{name}.git",
+        "homepageUrl": None,
+        "isArchived": False,
+        "isDisabled": False,
+        "isFork": False,
+        "isPrivate": False,
+        "isTemplate": False,
+        "visibility": "PUBLIC",
+        "hasIssuesEnabled": True,
+        "hasProjectsEnabled": False,
+        "hasWikiEnabled": False,
+        "forkCount": 2,
+        "stargazerCount": 3,
+        "createdAt": "2020-01-01T10:00:00Z",
+        "updatedAt": "2023-01-01T10:00:00Z",
+        "pushedAt": "2023-01-02T10:00:00Z",
+        "primaryLanguage": {"name": "Python"},
+        "owner": {
+            "__typename": "Organization",
+            "login": "foo",
+            "id": "O_1",
+            "databaseId": 42,
+            "avatarUrl": "https://avatars.githubusercontent.com/u/42",
+            "url": "https://github.com/foo",
+        },
+        "defaultBranchRef": (
+            {"name": branch, "branchProtectionRule": protection}
+            if branch
+            else None
+        ),
+    }
+
+
+PROTECTION_RULE = {
+    "allowsDeletions": False,
+    "allowsForcePushes": False,
+    "blocksCreations": False,
+    "dismissesStaleReviews": True,
+    "isAdminEnforced": True,
+    "lockAllowsFetchAndMerge": False,
+    "lockBranch": False,
+    "requireLastPushApproval": False,
+    "requiredApprovingReviewCount": 2,
+    "requiresApprovingReviews": True,
+    "requiresCodeOwnerReviews": True,
+    "requiresCommitSignatures": True,
+    "requiresConversationResolution": False,
+    "requiresLinearHistory": True,
+    "requiresStatusChecks": True,
+    "requiresStrictStatusChecks": True,
+    "requiredStatusChecks": [
+        {"context": "build", "app": {"databaseId": 15368}},
+        {"context": "lint", "app": None},
+    ],
+}
+
+
+class GraphQLUrlTestCase(IsolatedAsyncioTestCase):
+    def test_graphql_url(self):
+        self.assertEqual(
+            _graphql_url(DEFAULT_GITHUB_API_URL),
+            "https://api.github.com/graphql",
+        )
+        self.assertEqual(
+            _graphql_url("https://github.example.com/api/v3"),
+            "https://github.example.com/api/graphql",
+        )
+
+    def test_uploads_url(self):
+        self.assertEqual(
+            _uploads_url(DEFAULT_GITHUB_API_URL), "https://uploads.github.com"
+        )
+        self.assertEqual(
+            _uploads_url("https://github.example.com/api/v3"),
+            "https://github.example.com/api/uploads",
+        )
+
+
+class GitHubAsyncGraphQLClientTestCase(IsolatedAsyncioTestCase):
+    @patch("pontos.github.api.graphql.httpx.AsyncClient")
+    def setUp(self, async_client: MagicMock) -> None:
+        self.http_client = AsyncMock()
+        async_client.return_value = self.http_client
+        self.client = GitHubAsyncGraphQLClient("token")
+
+    async def test_query(self):
+        self.http_client.post.return_value = graphql_response(
+            {"viewer": {"login": "foo"}}
+        )
+
+        data = await self.client.query(
+            "query($a: Int) { viewer { login } }", {"a": 1}
+        )
+
+        self.assertEqual(data, {"viewer": {"login": "foo"}})
+        self.http_client.post.assert_awaited_once_with(
+            "https://api.github.com/graphql",
+            headers={
+                "Accept": "application/vnd.github+json",
+                "Authorization": "bearer token",
+                "X-GitHub-Api-Version": GITHUB_API_VERSION,
+            },
+            json={
+                "query": "query($a: Int) { viewer { login } }",
+                "variables": {"a": 1},
+            },
+        )
+
+    async def test_query_errors(self):
+        response = graphql_response(None)
+        response.json.return_value = {
+            "data": None,
+            "errors": [{"message": "Something went wrong"}],
+        }
+        self.http_client.post.return_value = response
+
+        with self.assertRaisesRegex(GitHubApiError, "Something went wrong"):
+            await self.client.query("query { viewer { login } }")
+
+    async def test_query_all(self):
+        self.http_client.post.side_effect = [
+            graphql_response(
+                {"organization": {"items": connection([1, 2], cursor="c1")}}
+            ),
+            graphql_response({"organization": {"items": connection([3])}}),
+        ]
+
+        it = aiter(
+            self.client.query_all(
+                "query", ("organization", "items"), {"organization": "foo"}
+            )
+        )
+
+        self.assertEqual(await anext(it), 1)
+        self.assertEqual(await anext(it), 2)
+        self.assertEqual(await anext(it), 3)
+
+        with self.assertRaises(StopAsyncIteration):
+            await anext(it)
+
+        variables = [
+            c.kwargs["json"]["variables"]
+            for c in self.http_client.post.await_args_list
+        ]
+        self.assertEqual(
+            variables,
+            [
+                {"organization": "foo", "cursor": None},
+                {"organization": "foo", "cursor": "c1"},
+            ],
+        )
+
+    async def test_query_all_missing_connection(self):
+        self.http_client.post.return_value = graphql_response(
+            {"organization": None}
+        )
+
+        it = aiter(self.client.query_all("query", ("organization", "items")))
+
+        with self.assertRaises(StopAsyncIteration):
+            await anext(it)
+
+    async def test_context_manager(self):
+        async with self.client:
+            pass
+
+        self.http_client.__aenter__.assert_awaited_once()
+        self.http_client.__aexit__.assert_awaited_once()
+
+
+class GitHubAsyncGraphQLTestCase(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.client = AsyncMock(spec=GitHubAsyncGraphQLClient)
+        self.client.url = DEFAULT_GITHUB_API_URL
+        self.api = GitHubAsyncGraphQL(self.client)
+
+    def mock_query_all(self, *pages):
+        pages = iter(pages)
+
+        async def query_all(*args, **kwargs):
+            for node in next(pages):
+                yield node
+
+        self.client.query_all = MagicMock(side_effect=query_all)
+
+    async def test_repositories(self):
+        self.mock_query_all([repository_node("bar"), repository_node("baz")])
+
+        it = aiter(self.api.repositories("foo"))
+        repo = await anext(it)
+
+        self.assertEqual(repo.id, 1)
+        self.assertEqual(repo.name, "bar")
+        self.assertEqual(repo.full_name, "foo/bar")
+        self.assertEqual(repo.url, "https://api.github.com/repos/foo/bar")
+        self.assertEqual(repo.html_url, "https://github.com/foo/bar")
+        self.assertEqual(
+            repo.issues_url,
+            "https://api.github.com/repos/foo/bar/issues{/number}",
+        )
+        self.assertEqual(repo.visibility, "public")
+        self.assertEqual(repo.language, "Python")
+        self.assertIsNone(repo.default_branch)
+        self.assertEqual(repo.owner.login, "foo")
+        self.assertEqual(repo.owner.id, 42)
+        self.assertEqual(repo.owner.type, "Organization")
+        self.assertFalse(repo.owner.site_admin)
+
+        repo = await anext(it)
+        self.assertEqual(repo.name, "baz")
+
+        with self.assertRaises(StopAsyncIteration):
+            await anext(it)
+
+        args, _ = self.client.query_all.call_args
+        self.assertNotIn("branchProtectionRule", args[0])
+        self.assertEqual(args[1], ("organization", "repositories"))
+        self.assertEqual(args[2], {"organization": "foo"})
+
+    async def test_repositories_type(self):
+        self.mock_query_all([])
+
+        async for _ in self.api.repositories(
+            "foo", repository_type=RepositoryType.SOURCES
+        ):
+            pass
+
+        args, _ = self.client.query_all.call_args
+        self.assertEqual(args[2], {"organization": "foo", "isFork": False})
+
+    async def test_repositories_unsupported_type(self):
+        with self.assertRaises(GitHubApiError):
+            async for _ in self.api.repositories(
+                "foo", repository_type=RepositoryType.INTERNAL
+            ):
+                pass
+
+    async def test_default_branch_protections(self):
+        self.mock_query_all(
+            [
+                repository_node(
+                    "bar", branch="main", protection=PROTECTION_RULE
+                ),
+                repository_node("baz", branch="main"),
+                repository_node("empty"),
+            ]
+        )
+
+        it = aiter(self.api.default_branch_protections("foo"))
+        repo, protection = await anext(it)
+
+        self.assertEqual(repo.name, "bar")
+        self.assertEqual(repo.default_branch, "main")
+        self.assertEqual(
+            protection.url,
+            "https://api.github.com/repos/foo/bar/branches/main/protection",
+        )
+        self.assertTrue(protection.enforce_admins.enabled)
+        self.assertTrue(protection.required_linear_history.enabled)
+        self.assertFalse(protection.allow_force_pushes.enabled)
+        self.assertTrue(protection.required_signatures.enabled)
+        self.assertTrue(protection.required_status_checks.strict)
+        self.assertEqual(
+            [
+                (check.context, check.app_id)
+                for check in protection.required_status_checks.checks
+            ],
+            [("build", 15368), ("lint", None)],
+        )
+        reviews = protection.required_pull_request_reviews
+        self.assertEqual(reviews.required_approving_review_count, 2)
+        self.assertTrue(reviews.dismiss_stale_reviews)
+        self.assertTrue(reviews.require_code_owner_reviews)
+        self.assertIsNone(protection.restrictions)
+
+        repo, protection = await anext(it)
+        self.assertEqual(repo.name, "baz")
+        self.assertIsNone(protection)
+
+        repo, protection = await anext(it)
+        self.assertEqual(repo.name, "empty")
+        self.assertIsNone(protection)
+
+        with self.assertRaises(StopAsyncIteration):
+            await anext(it)
+
+        args, _ = self.client.query_all.call_args
+        self.assertIn("branchProtectionRule", args[0])
+
+    async def test_default_branch_protection_without_checks(self):
+        rule = dict(
+            PROTECTION_RULE,
+            requiresStatusChecks=False,
+            requiresApprovingReviews=False,
+        )
+        self.mock_query_all(
+            [repository_node("bar", branch="main", protection=rule)]
+        )
+
+        it = aiter(self.api.default_branch_protections("foo"))
+        _, protection = await anext(it)
+
+        self.assertIsNone(protection.required_status_checks)
+        self.assertIsNone(protection.required_pull_request_reviews)
+
+    async def test_team_members(self):
+        self.mock_query_all(
+            [
+                {
+                    "slug": "team-a",
+                    "members": connection([user_node("a", 1)], cursor="c1"),
+                },
+                {
+                    "slug": "team-b",
+                    "members": connection([user_node("b", 2)]),
+                },
+            ],
+            [user_node("c", 3)],
+        )
+
+        it = aiter(self.api.team_members("foo"))
+        team, members = await anext(it)
+
+        self.assertEqual(team, "team-a")
+        self.assertEqual([member.login for member in members], ["a", "c"])
+        self.assertEqual(members[0].id, 1)
+        self.assertEqual(members[0].node_id, "U_1")
+        self.assertEqual(members[0].url, "https://api.github.com/users/a")
+        self.assertEqual(members[0].html_url, "https://github.com/a")
+
+        _, kwargs = self.client.query_all.call_args
+        self.assertEqual(kwargs["cursor"], "c1")
+
+        team, members = await anext(it)
+        self.assertEqual(team, "team-b")
+        self.assertEqual([member.login for member in members], ["b"])
+
+        with self.assertRaises(StopAsyncIteration):
+            await anext(it)
+
+        self.assertEqual(self.client.query_all.call_count, 2)
+
+    async def test_labels(self):
+        self.client.query.side_effect = [
+            {
+                "repo0": {"labels": connection([{"name": "bug"}], cursor="c1")},
+                "repo1": {"labels": connection([{"name": "feature"}])},
+            },
+            {"repo0": {"labels": connection([{"name": "docs"}])}},
+        ]
+        self.mock_query_all([{"name": "chore"}])
+
+        labels = [
+            item
+            async for item in self.api.labels(
+                ["foo/bar", "foo/baz", "foo/bar", "foo/qux"], batch_size=2
+            )
+        ]
+
+        self.assertEqual(
+            labels,
+            [
+                ("foo/bar", ["bug", "chore"]),
+                ("foo/baz", ["feature"]),
+                ("foo/qux", ["docs"]),
+            ],
+        )
+
+        self.assertEqual(self.client.query.await_count, 2)
+        query, variables = self.client.query.await_args_list[0].args
+        self.assertIn("repo0: repository(owner: $owner0, name: $name0)", query)
+        self.assertIn("repo1: repository(owner: $owner1, name: $name1)", query)
+        self.assertEqual(
+            variables,
+            {
+                "owner0": "foo",
+                "name0": "bar",
+                "owner1": "foo",
+                "name1": "baz",
+            },
+        )
+
+        args, kwargs = self.client.query_all.call_args
+        self.assertEqual(args[1], ("repository", "labels"))
+        self.assertEqual(args[2], {"owner": "foo", "name": "bar"})
+        self.assertEqual(kwargs["cursor"], "c1")
+
+    async def test_labels_invalid_repository(self):
+        with self.assertRaises(GitHubApiError):
+            async for _ in self.api.labels(["foo"]):
+                pass
+
+    async def test_releases(self):
+        self.client.query.return_value = {
+            "repo0": {
+                "releases": connection(
+                    [
+                        {
+                            "databaseId": 10,
+                            "id": "RE_10",
+                            "name": "v1.0.0",
+                            "tagName": "v1.0.0",
+                            "description": "Changes",
+                            "url": "https://github.com/foo/bar/releases/v1.0.0",
+                            "isDraft": False,
+                            "isPrerelease": True,
+                            "createdAt": "2023-01-01T10:00:00Z",
+                            "publishedAt": "2023-01-01T11:00:00Z",
+                            "tagCommit": {"oid": "abc123"},
+                            "author": user_node("a", 1),
+                        }
+                    ]
+                )
+            }
+        }
+
+        it = aiter(self.api.releases(["foo/bar"]))
+        repo, releases = await anext(it)
+
+        self.assertEqual(repo, "foo/bar")
+        self.assertEqual(len(releases), 1)
+        release = releases[0]
+        self.assertEqual(release.id, 10)
+        self.assertEqual(release.tag_name, "v1.0.0")
+        self.assertEqual(release.body, "Changes")
+        self.assertTrue(release.prerelease)
+        self.assertEqual(release.target_commitish, "abc123")
+        self.assertEqual(
+            release.url, "https://api.github.com/repos/foo/bar/releases/10"
+        )
+        self.assertEqual(
+            release.upload_url,
+            "https://uploads.github.com/repos/foo/bar/releases/10/assets"
+            "{?name,label}",
+        )
+        self.assertEqual(release.author.login, "a")
+        self.assertEqual(release.assets, [])
+
+        with self.assertRaises(StopAsyncIteration):
+            await anext(it)
+
+        query, _ = self.client.query.await_args.args
+        self.assertIn("orderBy: {field: CREATED_AT, direction: DESC}", query)
+        self.client.query_all.assert_not_called()
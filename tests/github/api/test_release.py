@@ -17,6 +17,7 @@
 
 # pylint: disable=redefined-builtin, line-too-long, too-many-lines
 
+import asyncio
 import json
 import unittest
 from pathlib import Path
@@ -26,7 +27,9 @@ import httpx
 
 from pontos.github.api import GitHubRESTApi
 from pontos.github.api.release import GitHubAsyncRESTReleases
+from pontos.github.models.release import Release
 from pontos.helper import DEFAULT_TIMEOUT
+from pontos.testing import temp_directory
 from tests import AsyncIteratorMock, AsyncMock, aiter, anext
 from tests.github.api import (
     GitHubAsyncRESTTestCase,
@@ -367,6 +370,44 @@ class GitHubAsyncRESTReleasesTestCase(GitHubAsyncRESTTestCase):
         with self.assertRaises(StopAsyncIteration):
             await anext(assets_it)
 
+    async def test_download_release_assets_to(self):
+        get_assets_url_response = create_response()
+        data = RELEASE_JSON.copy()
+        data.update({"assets_url": "https://foo.bar/assets"})
+        get_assets_url_response.json.return_value = data
+        get_assets_response = create_response()
+        get_assets_response.json.return_value = [
+            {"browser_download_url": "http://bar", "name": "bar", "size": 10},
+            {"browser_download_url": "http://baz", "name": "baz.zip"},
+        ]
+        self.client.get.side_effect = [
+            get_assets_url_response,
+            get_assets_response,
+        ]
+
+        def stream(url, headers):
+            stream_context = AsyncMock()
+            stream_context.__aenter__.return_value = httpx.Response(
+                200, content=url.encode(), request=httpx.Request("GET", url)
+            )
+            return stream_context
+
+        self.client.stream.side_effect = stream
+
+        with temp_directory() as tmp:
+            directory = tmp / "foo" / "bar"
+            paths = [
+                path
+                async for path in self.api.download_release_assets_to(
+                    "foo/bar", "v1.2.3", directory, match_pattern="bar"
+                )
+            ]
+
+            self.assertEqual(paths, [directory / "bar"])
+            self.assertEqual((directory / "bar").read_bytes(), b"http://bar")
+
+        self.client.stream.assert_called_once_with("http://bar", headers={})
+
     async def test_download_release_assets_no_assets_url(self):
         get_assets_url_response = create_response()
         data = RELEASE_JSON.copy()
@@ -442,6 +483,7 @@ class GitHubAsyncRESTReleasesTestCase(GitHubAsyncRESTTestCase):
         data.update({"upload_url": "https://uploads/assets{?name,label}"})
         response.json.return_value = data
         post_response = create_response()
+        post_response.is_server_error = False
         self.client.get.return_value = response
         self.client.post.return_value = post_response
 
@@ -495,6 +537,139 @@ class GitHubAsyncRESTReleasesTestCase(GitHubAsyncRESTTestCase):
             "/repos/foo/bar/releases/tags/v1.2.3"
         )
 
+    async def test_upload_release_assets_with_release(self):
+        data = RELEASE_JSON.copy()
+        data.update({"upload_url": "https://uploads/assets{?name,label}"})
+        release = Release.from_dict(data)
+        post_response = create_response()
+        post_response.is_server_error = False
+        self.client.post.return_value = post_response
+
+        file1 = MagicMock(spec=Path)
+        file1.name = "foo.txt"
+        file1.open.return_value.__enter__.return_value.read.side_effect = [
+            b"foo"
+        ]
+
+        paths = [
+            path
+            async for path in self.api.upload_release_assets(
+                "foo/bar", "v1.2.3", [file1], release=release
+            )
+        ]
+
+        self.assertEqual(paths, [file1])
+        self.client.get.assert_not_awaited()
+        self.client.post.assert_awaited_once()
+        self.assertEqual(
+            self.client.post.await_args[0], ("https://uploads/assets",)
+        )
+
+    @patch("pontos.github.api.release.asyncio.sleep", new_callable=AsyncMock)
+    async def test_upload_release_assets_retry(self, sleep_mock: AsyncMock):
+        response = create_response()
+        data = RELEASE_JSON.copy()
+        data.update({"upload_url": "https://uploads/assets{?name,label}"})
+        response.json.return_value = data
+        self.client.get.return_value = response
+        error_response = create_response()
+        error_response.is_server_error = True
+        post_response = create_response()
+        post_response.is_server_error = False
+        self.client.post.side_effect = [error_response, post_response]
+
+        with temp_directory() as tmp:
+            file = tmp / "foo.txt"
+            file.write_bytes(b"foo")
+
+            it = aiter(
+                self.api.upload_release_assets("foo/bar", "v1.2.3", [file])
+            )
+
+            self.assertEqual(await anext(it), file)
+
+            with self.assertRaises(StopAsyncIteration):
+                await anext(it)
+
+        self.assertEqual(self.client.post.await_count, 2)
+        sleep_mock.assert_awaited_once()
+
+        kwargs = self.client.post.await_args.kwargs
+        self.assertEqual(kwargs["headers"], {"Content-Length": "3"})
+        self.assertEqual(kwargs["content"].path, file)
+        post_response.raise_for_status.assert_called_once_with()
+
+    @patch("pontos.github.api.release.asyncio.sleep", new_callable=AsyncMock)
+    async def test_upload_release_assets_max_retries(
+        self, sleep_mock: AsyncMock
+    ):
+        response = create_response()
+        data = RELEASE_JSON.copy()
+        data.update({"upload_url": "https://uploads/assets{?name,label}"})
+        response.json.return_value = data
+        self.client.get.return_value = response
+        error_response = create_response()
+        error_response.is_server_error = True
+        error_response.raise_for_status.side_effect = httpx.HTTPStatusError(
+            "502", request=MagicMock(), response=error_response
+        )
+        self.client.post.return_value = error_response
+
+        with temp_directory() as tmp:
+            file = tmp / "foo.txt"
+            file.write_bytes(b"foo")
+
+            it = aiter(
+                self.api.upload_release_assets(
+                    "foo/bar", "v1.2.3", [file], max_retries=2
+                )
+            )
+
+            with self.assertRaises(httpx.HTTPStatusError):
+                await anext(it)
+
+        self.assertEqual(self.client.post.await_count, 3)
+        self.assertEqual(sleep_mock.await_count, 2)
+
+    async def test_upload_release_assets_max_concurrency(self):
+        response = create_response()
+        data = RELEASE_JSON.copy()
+        data.update({"upload_url": "https://uploads/assets{?name,label}"})
+        response.json.return_value = data
+        self.client.get.return_value = response
+
+        running = 0
+        max_running = 0
+
+        async def post(*args, **kwargs):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0)
+            running -= 1
+            post_response = create_response()
+            post_response.is_server_error = False
+            return post_response
+
+        self.client.post.side_effect = post
+
+        with temp_directory() as tmp:
+            files = []
+            for index in range(5):
+                file = tmp / f"{index}.txt"
+                file.write_bytes(b"foo")
+                files.append(file)
+
+            uploaded = [
+                path
+                async for path in self.api.upload_release_assets(
+                    "foo/bar", "v1.2.3", files, max_concurrency=2
+                )
+            ]
+
+        self.assertEqual(sorted(uploaded), files)
+        self.assertEqual(max_running, 2)
+
 
 class GitHubReleaseTestCase(unittest.TestCase):
     @patch("pontos.github.api.api.httpx.post")
@@ -632,10 +807,11 @@ class GitHubReleaseTestCase(unittest.TestCase):
         self.assertEqual(data["id"], 52499047)
 
     @patch("pontos.helper.Path")
-    @patch("pontos.github.api.api.httpx.stream")
+    @patch("pontos.github.api.api.httpx.Client")
     def test_download_release_tarball(
-        self, requests_mock: MagicMock, path_mock: MagicMock
+        self, client_mock: MagicMock, path_mock: MagicMock
     ):
+        requests_mock = client_mock.return_value.stream
         response = MagicMock()
         response.iter_bytes.return_value = [b"foo", b"bar", b"baz"]
         response_headers = MagicMock()
@@ -673,10 +849,11 @@ class GitHubReleaseTestCase(unittest.TestCase):
                 next(it)
 
     @patch("pontos.helper.Path")
-    @patch("pontos.github.api.api.httpx.stream")
+    @patch("pontos.github.api.api.httpx.Client")
     def test_download_release_tarball_with_content_length(
-        self, requests_mock: MagicMock, path_mock: MagicMock
+        self, client_mock: MagicMock, path_mock: MagicMock
     ):
+        requests_mock = client_mock.return_value.stream
         response = MagicMock()
         response.iter_bytes.return_value = [b"foo", b"bar", b"baz"]
         response_headers = MagicMock()
@@ -714,10 +891,11 @@ class GitHubReleaseTestCase(unittest.TestCase):
                 next(it)
 
     @patch("pontos.helper.Path")
-    @patch("pontos.github.api.api.httpx.stream")
+    @patch("pontos.github.api.api.httpx.Client")
     def test_download_release_zip(
-        self, requests_mock: MagicMock, path_mock: MagicMock
+        self, client_mock: MagicMock, path_mock: MagicMock
     ):
+        requests_mock = client_mock.return_value.stream
         response = MagicMock()
         response.iter_bytes.return_value = [b"foo", b"bar", b"baz"]
         response_headers = MagicMock()
@@ -756,13 +934,14 @@ class GitHubReleaseTestCase(unittest.TestCase):
 
     @patch("pontos.helper.Path")
     @patch("pontos.github.api.api.httpx.get")
-    @patch("pontos.github.api.api.httpx.stream")
+    @patch("pontos.github.api.api.httpx.Client")
     def test_download_release_assets(
         self,
-        stream_mock: MagicMock,
+        client_mock: MagicMock,
         request_mock: MagicMock,
         _path_mock: MagicMock,
     ):
+        stream_mock = client_mock.return_value.stream
         response = MagicMock()
         response.iter_bytes.side_effect = [
             [b"foo", b"bar", b"baz"],
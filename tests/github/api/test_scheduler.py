@@ -0,0 +1,239 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# pylint: disable=protected-access
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+from pontos.github.api.client import GitHubAsyncRESTClient
+from pontos.github.api.scheduler import RequestScheduler
+from tests import AsyncMock, IsolatedAsyncioTestCase
+from tests.github.api import create_response
+
+
+@patch("pontos.github.api.scheduler.asyncio.sleep", new_callable=AsyncMock)
+class RequestSchedulerTestCase(IsolatedAsyncioTestCase):
+    async def test_run(self, sleep_mock: AsyncMock):
+        scheduler = RequestScheduler()
+        request = AsyncMock(return_value=create_response())
+
+        response = await scheduler.run(request)
+
+        self.assertEqual(response.status_code, 200)
+        request.assert_awaited_once()
+        sleep_mock.assert_not_awaited()
+
+    async def test_retry_too_many_requests(self, sleep_mock: AsyncMock):
+        scheduler = RequestScheduler()
+        request = AsyncMock(
+            side_effect=[create_response(status_code=429), create_response()]
+        )
+
+        response = await scheduler.run(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(request.await_count, 2)
+        sleep_mock.assert_awaited()
+
+    async def test_retry_secondary_rate_limit(self, sleep_mock: AsyncMock):
+        scheduler = RequestScheduler()
+        request = AsyncMock(
+            side_effect=[
+                create_response(
+                    status_code=403,
+                    headers=httpx.Headers({"Retry-After": "30"}),
+                ),
+                create_response(),
+            ]
+        )
+
+        response = await scheduler.run(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(request.await_count, 2)
+        # waits until retry after has passed
+        self.assertGreater(sleep_mock.await_args_list[-1].args[0], 29)
+
+    async def test_dont_retry_forbidden(self, sleep_mock: AsyncMock):
+        scheduler = RequestScheduler()
+        request = AsyncMock(return_value=create_response(status_code=403))
+
+        response = await scheduler.run(request)
+
+        self.assertEqual(response.status_code, 403)
+        request.assert_awaited_once()
+        sleep_mock.assert_not_awaited()
+
+    async def test_retry_server_error(self, sleep_mock: AsyncMock):
+        scheduler = RequestScheduler()
+        request = AsyncMock(
+            side_effect=[create_response(status_code=502), create_response()]
+        )
+
+        response = await scheduler.run(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(request.await_count, 2)
+
+    async def test_dont_retry_server_error(self, sleep_mock: AsyncMock):
+        scheduler = RequestScheduler()
+        request = AsyncMock(return_value=create_response(status_code=502))
+
+        response = await scheduler.run(request, retry_server_errors=False)
+
+        self.assertEqual(response.status_code, 502)
+        request.assert_awaited_once()
+        sleep_mock.assert_not_awaited()
+
+    async def test_max_retries(self, sleep_mock: AsyncMock):
+        scheduler = RequestScheduler(max_retries=2)
+        request = AsyncMock(return_value=create_response(status_code=503))
+
+        response = await scheduler.run(request)
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(request.await_count, 3)
+
+    async def test_no_retry(self, sleep_mock: AsyncMock):
+        scheduler = RequestScheduler()
+        request = AsyncMock(return_value=create_response(status_code=503))
+
+        response = await scheduler.run(request, retry=False)
+
+        self.assertEqual(response.status_code, 503)
+        request.assert_awaited_once()
+
+    @patch("pontos.github.api.scheduler.time.time")
+    async def test_rate_limit_exhausted(
+        self, time_mock: MagicMock, sleep_mock: AsyncMock
+    ):
+        time_mock.return_value = 1000.0
+        scheduler = RequestScheduler()
+        request = AsyncMock(
+            return_value=create_response(
+                headers=httpx.Headers(
+                    {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1060"}
+                )
+            )
+        )
+
+        await scheduler.run(request)
+        sleep_mock.assert_not_awaited()
+
+        await scheduler.run(request)
+        # waits until the rate limit is reset
+        self.assertGreater(sleep_mock.await_args.args[0], 59)
+
+    async def test_token_bucket(self, sleep_mock: AsyncMock):
+        scheduler = RequestScheduler(requests_per_second=2, burst=2)
+        request = AsyncMock(return_value=create_response())
+
+        await scheduler.run(request)
+        await scheduler.run(request)
+        sleep_mock.assert_not_awaited()
+
+        await scheduler.run(request)
+        sleep_mock.assert_awaited_once()
+        self.assertAlmostEqual(sleep_mock.await_args.args[0], 0.5, places=1)
+
+    async def test_max_concurrency(self, _sleep_mock: AsyncMock):
+        scheduler = RequestScheduler(
+            max_concurrency=2, requests_per_second=None
+        )
+        running = 0
+        max_running = 0
+
+        async def request():
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            # asyncio.sleep is patched. therefore use a future to give
+            # control back to the event loop
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            loop.call_soon(future.set_result, None)
+            await future
+            running -= 1
+            return create_response()
+
+        await asyncio.gather(*[scheduler.run(request) for _ in range(10)])
+
+        self.assertEqual(max_running, 2)
+
+
+@patch("pontos.github.api.scheduler.asyncio.sleep", new_callable=AsyncMock)
+class GitHubAsyncRESTClientSchedulerTestCase(IsolatedAsyncioTestCase):
+    @patch("pontos.github.api.client.httpx.AsyncClient")
+    def setUp(self, async_client: MagicMock) -> None:
+        self.http_client = AsyncMock()
+        async_client.return_value = self.http_client
+        self.client = GitHubAsyncRESTClient(
+            "token", scheduler=RequestScheduler()
+        )
+
+    @patch("pontos.github.api.client.httpx.AsyncClient")
+    async def test_default_retry(
+        self, async_client: MagicMock, sleep_mock: AsyncMock
+    ):
+        http_client = AsyncMock()
+        async_client.return_value = http_client
+        http_client.get.side_effect = [
+            create_response(status_code=429),
+            create_response(),
+        ]
+        client = GitHubAsyncRESTClient("token")
+
+        response = await client.get("/foo/bar")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(http_client.get.await_count, 2)
+        sleep_mock.assert_awaited()
+
+    async def test_get_retry(self, _sleep_mock: AsyncMock):
+        self.http_client.get.side_effect = [
+            create_response(status_code=429),
+            create_response(),
+        ]
+
+        response = await self.client.get("/foo/bar")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.http_client.get.await_count, 2)
+
+    async def test_post_dont_retry_server_error(self, _sleep_mock: AsyncMock):
+        self.http_client.post.return_value = create_response(status_code=502)
+
+        response = await self.client.post("/foo/bar", data={"foo": "bar"})
+
+        self.assertEqual(response.status_code, 502)
+        self.http_client.post.assert_awaited_once()
+
+    async def test_post_dont_retry_streamed_content(
+        self, _sleep_mock: AsyncMock
+    ):
+        async def content():
+            yield b"foo"
+
+        self.http_client.post.return_value = create_response(status_code=429)
+
+        response = await self.client.post("/foo/bar", content=content())
+
+        self.assertEqual(response.status_code, 429)
+        self.http_client.post.assert_awaited_once()
@@ -20,9 +20,15 @@
 import unittest
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta, timezone
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Union, get_type_hints
+from unittest.mock import call, patch
 
-from pontos.models import Model, ModelAttribute, dotted_attributes
+from pontos.models import (
+    Model,
+    ModelAttribute,
+    compact_model,
+    dotted_attributes,
+)
 
 
 class ModelTestCase(unittest.TestCase):
@@ -165,6 +171,51 @@ class ExampleModelTestCase(unittest.TestCase):
         self.assertIsNotNone(model.ipsum)
         self.assertEqual(model.ipsum.something, "def")
 
+    def test_converters_are_cached(self):
+        @dataclass
+        class OtherModel(Model):
+            bar: str
+
+        @dataclass
+        class ExampleModel(Model):
+            foo: Optional[OtherModel] = None
+
+        with patch(
+            "pontos.models.get_type_hints", wraps=get_type_hints
+        ) as get_type_hints_mock:
+            ExampleModel.from_dict({"foo": {"bar": "baz"}})
+            ExampleModel.from_dict({"foo": {"bar": "baz"}})
+
+        self.assertEqual(get_type_hints_mock.call_count, 2)
+        get_type_hints_mock.assert_has_calls(
+            [call(ExampleModel), call(OtherModel)]
+        )
+
+    def test_converters_of_subclass(self):
+        @dataclass
+        class ExampleModel(Model):
+            foo: str
+
+        @dataclass
+        class OtherModel(ExampleModel):
+            bar: int
+
+        ExampleModel.from_dict({"foo": "abc"})
+        model = OtherModel.from_dict({"foo": "abc", "bar": "1"})
+
+        self.assertEqual(model.foo, "abc")
+        self.assertEqual(model.bar, 1)
+
+    def test_union_with_subclass_value(self):
+        @dataclass
+        class ExampleModel(Model):
+            foo: Union[int, str]
+
+        model = ExampleModel.from_dict({"foo": True})
+
+        self.assertEqual(model.foo, 1)
+        self.assertIs(type(model.foo), int)
+
 
 class DottedAttributesTestCase(unittest.TestCase):
     def test_with_new_class(self):
@@ -197,3 +248,111 @@ class DottedAttributesTestCase(unittest.TestCase):
 
         model = ExampleModel.from_dict({"foo": [{"a": 1}, {"b": 2}, {"c": 3}]})
         self.assertEqual(model.foo, [{"a": 1}, {"b": 2}, {"c": 3}])
+
+
+class CompactModelTestCase(unittest.TestCase):
+    def test_compact_model(self):
+        @dataclass
+        class OtherModel(Model):
+            bar: str
+
+        @dataclass
+        class ExampleModel(Model):
+            foo: str
+            baz: List[OtherModel] = field(default_factory=list)
+            ipsum: Optional[OtherModel] = None
+
+        compact_cls = compact_model(ExampleModel)
+
+        model = compact_cls.from_dict(
+            {
+                "foo": "abc",
+                "baz": [{"bar": "def"}],
+                "ipsum": {"bar": "ghi", "unknown": "attr"},
+                "unknown": "attr",
+            }
+        )
+
+        self.assertEqual(model.foo, "abc")
+        self.assertEqual(model.baz[0].bar, "def")
+        self.assertEqual(model.ipsum.bar, "ghi")
+        self.assertFalse(hasattr(model, "__dict__"))
+        self.assertFalse(hasattr(model, "unknown"))
+        self.assertFalse(hasattr(model.ipsum, "__dict__"))
+        self.assertFalse(hasattr(model.ipsum, "unknown"))
+        self.assertIs(type(model.ipsum), compact_model(OtherModel))
+        self.assertEqual(compact_cls.__name__, "ExampleModel")
+        self.assertNotIsInstance(model, ExampleModel)
+        self.assertNotIsInstance(model, Model)
+
+    def test_defaults(self):
+        @dataclass
+        class ExampleModel(Model):
+            foo: str
+            bar: Optional[str] = None
+            baz: List[str] = field(default_factory=list)
+
+        model = compact_model(ExampleModel).from_dict({"foo": "abc"})
+
+        self.assertEqual(model.foo, "abc")
+        self.assertIsNone(model.bar)
+        self.assertEqual(model.baz, ())
+
+    def test_lists_as_tuples(self):
+        @dataclass
+        class OtherModel(Model):
+            bar: str
+
+        @dataclass
+        class ExampleModel(Model):
+            foo: List[str]
+            baz: List[OtherModel] = field(default_factory=list)
+
+        model = compact_model(ExampleModel).from_dict(
+            {"foo": ["abc", "def"], "baz": [{"bar": "ghi"}]}
+        )
+
+        self.assertEqual(model.foo, ("abc", "def"))
+        self.assertEqual(len(model.baz), 1)
+        self.assertIsInstance(model.baz, tuple)
+        self.assertEqual(model.baz[0].bar, "ghi")
+
+    def test_cached(self):
+        @dataclass
+        class ExampleModel(Model):
+            foo: str
+
+        compact_cls = compact_model(ExampleModel)
+
+        self.assertIs(compact_model(ExampleModel), compact_cls)
+        self.assertIs(compact_model(compact_cls), compact_cls)
+
+    def test_interned_strings(self):
+        @dataclass
+        class ExampleModel(Model):
+            foo: str
+            bar: List[str]
+
+        value = "".join(["some", "value"])
+        model1 = compact_model(ExampleModel).from_dict(
+            {"foo": value, "bar": [value]}
+        )
+        model2 = compact_model(ExampleModel).from_dict(
+            {"foo": "".join(["some", "value"]), "bar": []}
+        )
+
+        self.assertIs(model1.foo, model2.foo)
+        self.assertIs(model1.bar[0], model2.foo)
+
+    def test_equal(self):
+        @dataclass
+        class ExampleModel(Model):
+            foo: str
+            bar: datetime
+
+        data = {"foo": "abc", "bar": "1988-10-01T04:00:00.000"}
+        model = ExampleModel.from_dict(data)
+        compact = compact_model(ExampleModel).from_dict(data)
+
+        self.assertEqual(repr(model), repr(compact))
+        self.assertEqual(compact, compact_model(ExampleModel).from_dict(data))
@@ -17,16 +17,23 @@
 
 # pylint: disable=line-too-long, arguments-differ, redefined-builtin
 
+import json
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 from unittest.mock import MagicMock, patch
 
-from httpx import AsyncClient, Response
+from httpx import AsyncClient, Request, Response
 
 from pontos.errors import PontosError
 from pontos.nvd.api import now, sleep
 from pontos.nvd.cpe.api import CPEApi
-from tests import AsyncMock, IsolatedAsyncioTestCase, aiter, anext
+from tests import (
+    AsyncIteratorMock,
+    AsyncMock,
+    IsolatedAsyncioTestCase,
+    aiter,
+    anext,
+)
 from tests.nvd import get_cpe_data
 
 
@@ -42,6 +49,9 @@ def create_cpe_response(
 
     response = MagicMock(spec=Response)
     response.json.return_value = data
+    response.text = json.dumps(data)
+    response.aiter_text.return_value = AsyncIteratorMock([response.text])
+    response.aclose = AsyncMock()
     return response
 
 
@@ -56,6 +66,7 @@ class CPEApiTestCase(IsolatedAsyncioTestCase):
     @patch("pontos.nvd.api.AsyncClient", spec=AsyncClient)
     def setUp(self, async_client: MagicMock) -> None:
         self.http_client = AsyncMock()
+        self.http_client.build_request = MagicMock(side_effect=Request)
         async_client.return_value = self.http_client
         self.api = CPEApi()
 
@@ -103,9 +114,9 @@ class CPEApiTestCase(IsolatedAsyncioTestCase):
 
     @patch("pontos.nvd.api.sleep", spec=sleep)
     async def test_rate_limit(self, sleep_mock: MagicMock):
-        self.http_client.get.side_effect = create_cpes_responses(6)
+        self.http_client.send.side_effect = create_cpes_responses(6)
 
-        it = aiter(self.api.cpes())
+        it = aiter(self.api.cpes(max_concurrency=1))
         await anext(it)
         await anext(it)
         await anext(it)
@@ -116,12 +127,32 @@ class CPEApiTestCase(IsolatedAsyncioTestCase):
 
         await anext(it)
 
-        sleep_mock.assert_called_once_with()
+        sleep_mock.assert_called_once()
+
+    async def test_cpes_concurrent_pages(self):
+        self.http_client.send.side_effect = create_cpes_responses(3)
+
+        cpes = [cpe async for cpe in self.api.cpes(max_concurrency=2)]
+
+        self.assertEqual(
+            [cpe.cpe_name_id for cpe in cpes], ["CPE-1", "CPE-2", "CPE-3"]
+        )
+        self.assertEqual(
+            [
+                call.kwargs["params"]
+                for call in self.http_client.build_request.call_args_list
+            ],
+            [
+                {"startIndex": 0},
+                {"startIndex": 1, "resultsPerPage": 1},
+                {"startIndex": 2, "resultsPerPage": 1},
+            ],
+        )
 
     @patch("pontos.nvd.cpe.api.now", spec=now)
     async def test_cves_last_modified_start_date(self, now_mock: MagicMock):
         now_mock.return_value = datetime(2022, 12, 31)
-        self.http_client.get.side_effect = create_cpes_responses()
+        self.http_client.send.side_effect = create_cpes_responses()
 
         it = aiter(
             self.api.cpes(last_modified_start_date=datetime(2022, 12, 1))
@@ -129,7 +160,8 @@ class CPEApiTestCase(IsolatedAsyncioTestCase):
         cve = await anext(it)
 
         self.assertEqual(cve.cpe_name_id, "CPE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cpes/2.0",
             headers={},
             params={
@@ -139,12 +171,13 @@ class CPEApiTestCase(IsolatedAsyncioTestCase):
             },
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.cpe_name_id, "CPE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cpes/2.0",
             headers={},
             params={
@@ -159,7 +192,7 @@ class CPEApiTestCase(IsolatedAsyncioTestCase):
             cve = await anext(it)
 
     async def test_cves_last_modified_end_date(self):
-        self.http_client.get.side_effect = create_cpes_responses()
+        self.http_client.send.side_effect = create_cpes_responses()
 
         it = aiter(
             self.api.cpes(
@@ -170,7 +203,8 @@ class CPEApiTestCase(IsolatedAsyncioTestCase):
         cve = await anext(it)
 
         self.assertEqual(cve.cpe_name_id, "CPE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cpes/2.0",
             headers={},
             params={
@@ -180,12 +214,13 @@ class CPEApiTestCase(IsolatedAsyncioTestCase):
             },
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.cpe_name_id, "CPE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cpes/2.0",
             headers={},
             params={
@@ -200,13 +235,14 @@ class CPEApiTestCase(IsolatedAsyncioTestCase):
             cve = await anext(it)
 
     async def test_cpes_keywords(self):
-        self.http_client.get.side_effect = create_cpes_responses()
+        self.http_client.send.side_effect = create_cpes_responses()
 
         it = aiter(self.api.cpes(keywords=["Mac OS X", "kernel"]))
         cve = await anext(it)
 
         self.assertEqual(cve.cpe_name_id, "CPE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cpes/2.0",
             headers={},
             params={
@@ -216,12 +252,13 @@ class CPEApiTestCase(IsolatedAsyncioTestCase):
             },
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.cpe_name_id, "CPE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cpes/2.0",
             headers={},
             params={
@@ -236,13 +273,14 @@ class CPEApiTestCase(IsolatedAsyncioTestCase):
             cve = await anext(it)
 
     async def test_cpes_keyword(self):
-        self.http_client.get.side_effect = create_cpes_responses()
+        self.http_client.send.side_effect = create_cpes_responses()
 
         it = aiter(self.api.cpes(keywords="macOS"))
         cve = await anext(it)
 
         self.assertEqual(cve.cpe_name_id, "CPE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cpes/2.0",
             headers={},
             params={
@@ -251,12 +289,13 @@ class CPEApiTestCase(IsolatedAsyncioTestCase):
             },
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.cpe_name_id, "CPE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cpes/2.0",
             headers={},
             params={
@@ -270,7 +309,7 @@ class CPEApiTestCase(IsolatedAsyncioTestCase):
             cve = await anext(it)
 
     async def test_cpes_cpe_match_string(self):
-        self.http_client.get.side_effect = create_cpes_responses()
+        self.http_client.send.side_effect = create_cpes_responses()
 
         it = aiter(
             self.api.cpes(
@@ -280,7 +319,8 @@ class CPEApiTestCase(IsolatedAsyncioTestCase):
         cve = await anext(it)
 
         self.assertEqual(cve.cpe_name_id, "CPE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cpes/2.0",
             headers={},
             params={
@@ -289,12 +329,13 @@ class CPEApiTestCase(IsolatedAsyncioTestCase):
             },
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.cpe_name_id, "CPE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cpes/2.0",
             headers={},
             params={
@@ -308,7 +349,7 @@ class CPEApiTestCase(IsolatedAsyncioTestCase):
             cve = await anext(it)
 
     async def test_cpes_match_criteria_id(self):
-        self.http_client.get.side_effect = create_cpes_responses()
+        self.http_client.send.side_effect = create_cpes_responses()
 
         it = aiter(
             self.api.cpes(
@@ -318,7 +359,8 @@ class CPEApiTestCase(IsolatedAsyncioTestCase):
         cve = await anext(it)
 
         self.assertEqual(cve.cpe_name_id, "CPE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cpes/2.0",
             headers={},
             params={
@@ -327,12 +369,13 @@ class CPEApiTestCase(IsolatedAsyncioTestCase):
             },
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.cpe_name_id, "CPE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cpes/2.0",
             headers={},
             params={
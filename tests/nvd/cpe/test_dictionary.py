@@ -0,0 +1,262 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# pylint: disable=line-too-long
+
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+from pontos.errors import PontosError
+from pontos.nvd.cpe.api import CPEApi
+from pontos.nvd.cpe.dictionary import CPEDictionary
+from pontos.nvd.models.cpe import CPE
+from pontos.testing import temp_directory, temp_file
+from tests import AsyncIteratorMock, IsolatedAsyncioTestCase
+from tests.nvd import get_cpe_data
+
+
+def create_cpe(cpe_name_id: str, cpe_name: str, **kwargs) -> CPE:
+    return CPE.from_dict(
+        get_cpe_data(
+            {"cpe_name_id": cpe_name_id, "cpe_name": cpe_name, **kwargs}
+        )
+    )
+
+
+class CPEDictionaryTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dictionary = CPEDictionary()
+        self.dictionary.add(
+            [
+                create_cpe(
+                    "1", "cpe:2.3:a:apache:http_server:2.4.1:*:*:*:*:*:*:*"
+                ),
+                create_cpe(
+                    "2", "cpe:2.3:a:apache:http_server:2.4.10:*:*:*:*:*:*:*"
+                ),
+                create_cpe(
+                    "3", "cpe:2.3:a:apache:http_server:2.2.0:*:*:*:*:*:*:*"
+                ),
+                create_cpe(
+                    "4", "cpe:2.3:a:apache:tomcat:9.0.0:beta:*:*:*:*:*:*"
+                ),
+                create_cpe(
+                    "5",
+                    "cpe:2.3:o:microsoft:windows_10:-:*:*:*:*:*:arm64:*",
+                    deprecated=True,
+                ),
+                create_cpe(
+                    "6", "cpe:2.3:o:microsoft:windows_10:1607:*:*:*:*:*:x64:*"
+                ),
+            ]
+        )
+
+    def cpes(self, cpe_match_string: str, **kwargs):
+        return [
+            cpe.cpe_name_id
+            for cpe in self.dictionary.cpes(cpe_match_string, **kwargs)
+        ]
+
+    def test_len(self):
+        self.assertEqual(len(self.dictionary), 6)
+
+    def test_cpe(self):
+        self.assertEqual(
+            self.dictionary.cpe("4").cpe_name,
+            "cpe:2.3:a:apache:tomcat:9.0.0:beta:*:*:*:*:*:*",
+        )
+
+        with self.assertRaises(PontosError):
+            self.dictionary.cpe("7")
+
+    def test_update(self):
+        self.dictionary.add(
+            [create_cpe("1", "cpe:2.3:a:apache:httpd:2.4.1:*:*:*:*:*:*:*")]
+        )
+
+        self.assertEqual(len(self.dictionary), 6)
+        self.assertEqual(self.cpes("cpe:2.3:a:apache:http_server"), ["2", "3"])
+        self.assertEqual(self.cpes("cpe:2.3:a:apache:httpd"), ["1"])
+
+    def test_vendor_product(self):
+        self.assertEqual(
+            self.cpes("cpe:2.3:a:apache:http_server"), ["1", "2", "3"]
+        )
+        self.assertEqual(
+            self.cpes("cpe:2.3:*:apache:*:*:*:*:*:*:*:*:*"),
+            ["1", "2", "3", "4"],
+        )
+        self.assertEqual(self.cpes("cpe:2.3:a:apache:foo"), [])
+        self.assertEqual(self.cpes("cpe:2.3:a:foo"), [])
+
+    def test_version(self):
+        self.assertEqual(
+            self.cpes("cpe:2.3:a:apache:http_server:2.4.1:*:*:*:*:*:*:*"), ["1"]
+        )
+        self.assertEqual(self.cpes("cpe:2.3:o:microsoft:windows_10:-"), ["5"])
+
+    def test_wildcards(self):
+        self.assertEqual(
+            self.cpes("cpe:2.3:a:apache:http_server:2.4.*"), ["1", "2"]
+        )
+        self.assertEqual(self.cpes("cpe:2.3:a:apache:http_server:2.4.?"), ["1"])
+        self.assertEqual(self.cpes("cpe:2.3:a:apache:http*:2.2*"), ["3"])
+        self.assertEqual(self.cpes("cpe:2.3:*:*:windows*"), ["5", "6"])
+        # NA is not matched by a wildcard
+        self.assertEqual(self.cpes("cpe:2.3:o:microsoft:windows_10:?*"), ["6"])
+
+    def test_other_components(self):
+        self.assertEqual(self.cpes("cpe:2.3:a:apache:tomcat:*:beta"), ["4"])
+        self.assertEqual(self.cpes("cpe:2.3:a:apache:*:*:beta"), ["4"])
+        self.assertEqual(self.cpes("cpe:2.3:o:*:*:*:*:*:*:*:*:x64:*"), ["6"])
+        # ANY in the CPE name isn't matched by a specific value
+        self.assertEqual(self.cpes("cpe:2.3:a:apache:http_server:*:beta"), [])
+
+    def test_include_deprecated(self):
+        self.assertEqual(
+            self.cpes("cpe:2.3:o:microsoft", include_deprecated=False), ["6"]
+        )
+
+    def test_case_insensitive(self):
+        self.assertEqual(self.cpes("cpe:2.3:a:Apache:Tomcat"), ["4"])
+
+    def test_invalid_match_string(self):
+        with self.assertRaises(PontosError):
+            self.dictionary.cpes("apache:tomcat")
+
+
+class CPEDictionarySaveTestCase(unittest.TestCase):
+    def test_save_load(self):
+        dictionary = CPEDictionary()
+        dictionary.add(
+            [
+                create_cpe(
+                    "1",
+                    "cpe:2.3:a:apache:http_server:2.4.1:*:*:*:*:*:*:*",
+                    refs=[
+                        {"ref": "https://httpd.apache.org", "type": "Vendor"}
+                    ],
+                ),
+                create_cpe(
+                    "2", "cpe:2.3:a:apache:tomcat:9.0.0:beta:*:*:*:*:*:*"
+                ),
+            ]
+        )
+        dictionary._last_sync = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+        with temp_directory() as temp_dir:
+            path = temp_dir / "cpes.jsonl"
+            dictionary.save(path)
+            loaded = CPEDictionary.load(path)
+
+            self.assertEqual(
+                [f.name for f in temp_dir.iterdir()], ["cpes.jsonl"]
+            )
+
+        self.assertEqual(len(loaded), 2)
+        self.assertEqual(
+            loaded.last_sync, datetime(2023, 1, 1, tzinfo=timezone.utc)
+        )
+        self.assertEqual(loaded.cpe("1"), dictionary.cpe("1"))
+        self.assertEqual(
+            [
+                cpe.cpe_name_id
+                for cpe in loaded.cpes("cpe:2.3:a:apache:tomcat:9.0.*")
+            ],
+            ["2"],
+        )
+
+    def test_save_load_not_synced(self):
+        with temp_directory() as temp_dir:
+            path = temp_dir / "cpes.jsonl"
+            CPEDictionary().save(path)
+            loaded = CPEDictionary.load(path)
+
+        self.assertEqual(len(loaded), 0)
+        self.assertIsNone(loaded.last_sync)
+
+    def test_load_invalid(self):
+        with temp_file("foo", name="cpes.jsonl") as path, self.assertRaises(
+            PontosError
+        ):
+            CPEDictionary.load(path)
+
+
+@patch("pontos.nvd.cpe.dictionary.now")
+class CPEDictionarySyncTestCase(IsolatedAsyncioTestCase):
+    async def test_sync(self, now_mock: MagicMock):
+        dictionary = CPEDictionary()
+        api = MagicMock(spec=CPEApi)
+
+        now_mock.return_value = datetime(2023, 1, 1, tzinfo=timezone.utc)
+        api.cpes.return_value = AsyncIteratorMock(
+            [
+                create_cpe("1", "cpe:2.3:a:foo:bar:1.0"),
+                create_cpe("2", "cpe:2.3:a:foo:bar:2.0"),
+            ]
+        )
+
+        self.assertEqual(await dictionary.sync(api), 2)
+        self.assertEqual(len(dictionary), 2)
+        self.assertEqual(
+            dictionary.last_sync, datetime(2023, 1, 1, tzinfo=timezone.utc)
+        )
+        api.cpes.assert_called_once_with(
+            last_modified_start_date=None, last_modified_end_date=None
+        )
+
+        now_mock.return_value = datetime(2023, 2, 1, tzinfo=timezone.utc)
+        api.cpes.return_value = AsyncIteratorMock(
+            [create_cpe("2", "cpe:2.3:a:foo:bar:2.1")]
+        )
+
+        self.assertEqual(await dictionary.sync(api), 1)
+        self.assertEqual(len(dictionary), 2)
+        self.assertEqual(
+            [
+                cpe.cpe_name_id
+                for cpe in dictionary.cpes("cpe:2.3:a:foo:bar:2.1")
+            ],
+            ["2"],
+        )
+        api.cpes.assert_called_with(
+            last_modified_start_date=datetime(2023, 1, 1, tzinfo=timezone.utc),
+            last_modified_end_date=datetime(2023, 2, 1, tzinfo=timezone.utc),
+        )
+
+    async def test_sync_loaded(self, now_mock: MagicMock):
+        dictionary = CPEDictionary()
+        dictionary.add([create_cpe("1", "cpe:2.3:a:foo:bar:1.0")])
+        dictionary._last_sync = datetime(2023, 1, 1, tzinfo=timezone.utc)
+        api = MagicMock(spec=CPEApi)
+
+        with temp_directory() as temp_dir:
+            dictionary.save(temp_dir / "cpes.jsonl")
+            dictionary = CPEDictionary.load(temp_dir / "cpes.jsonl")
+
+        now_mock.return_value = datetime(2023, 2, 1, tzinfo=timezone.utc)
+        api.cpes.return_value = AsyncIteratorMock(
+            [create_cpe("2", "cpe:2.3:a:foo:bar:2.0")]
+        )
+
+        self.assertEqual(await dictionary.sync(api), 1)
+        self.assertEqual(len(dictionary), 2)
+        api.cpes.assert_called_once_with(
+            last_modified_start_date=datetime(2023, 1, 1, tzinfo=timezone.utc),
+            last_modified_end_date=datetime(2023, 2, 1, tzinfo=timezone.utc),
+        )
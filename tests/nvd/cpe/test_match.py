@@ -0,0 +1,123 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from pontos.errors import PontosError
+from pontos.nvd.cpe.match import (
+    compile_version_range,
+    cpe_matches,
+    split_cpe,
+    version_in_range,
+    version_key,
+    version_matches_range,
+)
+
+
+class SplitCPETestCase(unittest.TestCase):
+    def test_split(self):
+        self.assertEqual(
+            split_cpe("cpe:2.3:a:Foo:bar:1.0:*:*:*:*:*:*:*"),
+            ("a", "foo", "bar", "1.0", "*", "*", "*", "*", "*", "*", "*"),
+        )
+
+    def test_fill_missing(self):
+        self.assertEqual(
+            split_cpe("cpe:2.3:a:foo:bar"),
+            ("a", "foo", "bar", "*", "*", "*", "*", "*", "*", "*", "*"),
+        )
+
+    def test_escaped_colon(self):
+        self.assertEqual(
+            split_cpe(r"cpe:2.3:a:foo:bar\:baz:1.0")[2], r"bar\:baz"
+        )
+
+    def test_invalid(self):
+        with self.assertRaises(PontosError):
+            split_cpe("cpe:/a:foo:bar")
+
+        with self.assertRaises(PontosError):
+            split_cpe("cpe:2.3:a:foo:bar:1:2:3:4:5:6:7:8:9")
+
+
+class CPEMatchesTestCase(unittest.TestCase):
+    def test_matches(self):
+        pattern = split_cpe("cpe:2.3:a:foo:bar:*:*:*:*:*:*:*:*")
+
+        self.assertTrue(
+            cpe_matches(pattern, split_cpe("cpe:2.3:a:foo:bar:1.0"))
+        )
+        self.assertFalse(
+            cpe_matches(pattern, split_cpe("cpe:2.3:a:foo:baz:1.0"))
+        )
+
+    def test_not_applicable(self):
+        pattern = split_cpe("cpe:2.3:a:foo:bar:-")
+
+        self.assertTrue(cpe_matches(pattern, split_cpe("cpe:2.3:a:foo:bar:-")))
+        self.assertFalse(
+            cpe_matches(pattern, split_cpe("cpe:2.3:a:foo:bar:1.0"))
+        )
+
+    def test_ignore_version(self):
+        pattern = split_cpe("cpe:2.3:a:foo:bar:2.0")
+        name = split_cpe("cpe:2.3:a:foo:bar:1.0")
+
+        self.assertFalse(cpe_matches(pattern, name))
+        self.assertTrue(cpe_matches(pattern, name, ignore_version=True))
+
+
+class VersionTestCase(unittest.TestCase):
+    def test_version_key(self):
+        self.assertGreater(version_key("1.2.10"), version_key("1.2.9"))
+        self.assertGreater(version_key("1.2.0"), version_key("1.2"))
+        self.assertLess(version_key("1.2a"), version_key("1.2.1"))
+        self.assertEqual(version_key("1.2-RC1"), version_key("1.2.rc.1"))
+
+    def test_version_in_range(self):
+        self.assertTrue(
+            version_in_range("1.5", start_including="1.0", end_excluding="2.0")
+        )
+        self.assertTrue(version_in_range("1.0", start_including="1.0"))
+        self.assertFalse(version_in_range("1.0", start_excluding="1.0"))
+        self.assertTrue(version_in_range("2.0", end_including="2.0"))
+        self.assertFalse(version_in_range("2.0", end_excluding="2.0"))
+        self.assertFalse(version_in_range("*", end_excluding="2.0"))
+        self.assertFalse(version_in_range("-", end_excluding="2.0"))
+
+    def test_compile_version_range(self):
+        self.assertIsNone(compile_version_range())
+
+        version_range = compile_version_range(
+            start_excluding="1.0", end_including="2.0"
+        )
+
+        self.assertFalse(version_range(version_key("1.0")))
+        self.assertTrue(version_range(version_key("1.0.1")))
+        self.assertTrue(version_range(version_key("2.0")))
+        self.assertFalse(version_range(version_key("2.0.1")))
+
+    def test_version_matches_range(self):
+        version_range = compile_version_range(end_excluding="2.0")
+
+        self.assertTrue(version_matches_range("1.0", version_range))
+        self.assertTrue(
+            version_matches_range("1.0", version_range, version_key("1.0"))
+        )
+        self.assertFalse(version_matches_range("2.0", version_range))
+        self.assertTrue(version_matches_range("*", version_range))
+        self.assertFalse(version_matches_range("-", version_range))
@@ -17,17 +17,25 @@
 
 # pylint: disable=line-too-long, arguments-differ, redefined-builtin
 
+import asyncio
+import json
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 from unittest.mock import MagicMock, patch
 
-from httpx import AsyncClient, Response
+from httpx import AsyncClient, HTTPError, Request, Response
 
 from pontos.errors import PontosError
-from pontos.nvd.api import now, sleep
+from pontos.nvd.api import RateLimiter, now, sleep
 from pontos.nvd.cve.api import CVEApi
 from pontos.nvd.models import cvss_v2, cvss_v3
-from tests import AsyncMock, IsolatedAsyncioTestCase, aiter, anext
+from tests import (
+    AsyncIteratorMock,
+    AsyncMock,
+    IsolatedAsyncioTestCase,
+    aiter,
+    anext,
+)
 from tests.nvd import get_cve_data
 
 
@@ -43,6 +51,9 @@ def create_cve_response(
 
     response = MagicMock(spec=Response)
     response.json.return_value = data
+    response.text = json.dumps(data)
+    response.aiter_text.return_value = AsyncIteratorMock([response.text])
+    response.aclose = AsyncMock()
     return response
 
 
@@ -57,6 +68,7 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
     @patch("pontos.nvd.api.AsyncClient", spec=AsyncClient)
     def setUp(self, async_client: MagicMock) -> None:
         self.http_client = AsyncMock()
+        self.http_client.build_request = MagicMock(side_effect=Request)
         async_client.return_value = self.http_client
         self.api = CVEApi(token="token")
 
@@ -112,25 +124,234 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
         self.assertIsNone(cve.cisa_required_action)
         self.assertIsNone(cve.cisa_vulnerability_name)
 
+    async def test_cve_cached(self):
+        self.http_client.get.return_value = create_cve_response("CVE-1")
+
+        cve1 = await self.api.cve("CVE-1")
+        cve2 = await self.api.cve("CVE-1")
+
+        self.assertIs(cve1, cve2)
+        self.http_client.get.assert_awaited_once()
+
+    @patch("pontos.nvd.api.AsyncClient", spec=AsyncClient)
+    async def test_cve_cache_disabled(self, async_client: MagicMock):
+        async_client.return_value = self.http_client
+        self.http_client.get.return_value = create_cve_response("CVE-1")
+        api = CVEApi(cache_size=0)
+
+        await api.cve("CVE-1")
+        await api.cve("CVE-1")
+
+        self.assertEqual(self.http_client.get.await_count, 2)
+
+    async def test_cve_shared_request(self):
+        release = asyncio.Event()
+
+        async def get(*args, params, **kwargs):
+            await release.wait()
+            return create_cve_response(params["cveId"])
+
+        self.http_client.get.side_effect = get
+
+        task1 = asyncio.ensure_future(self.api.cve("CVE-1"))
+        task2 = asyncio.ensure_future(self.api.cve("CVE-1"))
+        await asyncio.sleep(0)
+        release.set()
+
+        cve1, cve2 = await asyncio.gather(task1, task2)
+
+        self.assertIs(cve1, cve2)
+        self.http_client.get.assert_awaited_once()
+
+    async def test_cves_by_id(self):
+        self.http_client.get.side_effect = lambda *args, params, **kwargs: (
+            create_cve_response(params["cveId"])
+        )
+
+        await self.api.cve("CVE-2")
+        self.http_client.get.reset_mock()
+
+        cves = [
+            cve.id
+            async for cve in self.api.cves_by_id(
+                ["CVE-1", "CVE-2", "CVE-3", "CVE-1"]
+            )
+        ]
+
+        # cached CVEs are returned first
+        self.assertEqual(cves[0], "CVE-2")
+        self.assertEqual(sorted(cves), ["CVE-1", "CVE-2", "CVE-3"])
+        self.assertEqual(
+            sorted(
+                call.kwargs["params"]["cveId"]
+                for call in self.http_client.get.await_args_list
+            ),
+            ["CVE-1", "CVE-3"],
+        )
+
+    async def test_cves_by_id_as_completed(self):
+        release_first = asyncio.Event()
+
+        async def get(*args, params, **kwargs):
+            if params["cveId"] == "CVE-1":
+                await release_first.wait()
+            return create_cve_response(params["cveId"])
+
+        self.http_client.get.side_effect = get
+
+        it = aiter(self.api.cves_by_id(["CVE-1", "CVE-2"]))
+        cve = await anext(it)
+        self.assertEqual(cve.id, "CVE-2")
+
+        release_first.set()
+
+        cve = await anext(it)
+        self.assertEqual(cve.id, "CVE-1")
+
+        with self.assertRaises(StopAsyncIteration):
+            await anext(it)
+
+    async def test_cves_by_id_stop_early(self):
+        cancelled = []
+
+        async def get(*args, params, **kwargs):
+            cve_id = params["cveId"]
+            if cve_id != "CVE-1":
+                try:
+                    await asyncio.Event().wait()
+                except asyncio.CancelledError:
+                    cancelled.append(cve_id)
+                    raise
+            return create_cve_response(cve_id)
+
+        self.http_client.get.side_effect = get
+
+        it = aiter(self.api.cves_by_id(["CVE-1", "CVE-2", "CVE-3"]))
+        cve = await anext(it)
+        self.assertEqual(cve.id, "CVE-1")
+
+        await it.aclose()
+        await asyncio.sleep(0)
+
+        self.assertEqual(sorted(cancelled), ["CVE-2", "CVE-3"])
+        # pylint: disable=protected-access
+        self.assertEqual(self.api._in_flight, {})
+        self.assertEqual(self.api._waiters, {})
+
+    async def test_cve_shared_request_cancelled(self):
+        release = asyncio.Event()
+
+        async def get(*args, params, **kwargs):
+            await release.wait()
+            return create_cve_response(params["cveId"])
+
+        self.http_client.get.side_effect = get
+
+        task1 = asyncio.ensure_future(self.api.cve("CVE-1"))
+        task2 = asyncio.ensure_future(self.api.cve("CVE-1"))
+        await asyncio.sleep(0)
+
+        task1.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        # the request is still running for the second caller
+        cve = await task2
+
+        self.assertEqual(cve.id, "CVE-1")
+        self.assertTrue(task1.cancelled())
+        self.http_client.get.assert_awaited_once()
+
+    async def test_cves_by_id_not_found(self):
+        self.http_client.get.side_effect = lambda *args, params, **kwargs: (
+            create_cve_response(params["cveId"], {"vulnerabilities": []})
+            if params["cveId"] == "CVE-2"
+            else create_cve_response(params["cveId"])
+        )
+        on_error = MagicMock()
+
+        cves = [
+            cve.id
+            async for cve in self.api.cves_by_id(
+                ["CVE-1", "CVE-2", "CVE-3"], on_error=on_error
+            )
+        ]
+
+        self.assertEqual(sorted(cves), ["CVE-1", "CVE-3"])
+        on_error.assert_called_once()
+        cve_id, error = on_error.call_args[0]
+        self.assertEqual(cve_id, "CVE-2")
+        self.assertIsInstance(error, PontosError)
+
+    async def test_cves_by_id_http_error(self):
+        def get(*args, params, **kwargs):
+            if params["cveId"] == "CVE-1":
+                raise HTTPError("Connection failed")
+            return create_cve_response(params["cveId"])
+
+        self.http_client.get.side_effect = get
+        failed = {}
+
+        cves = [
+            cve.id
+            async for cve in self.api.cves_by_id(
+                ["CVE-1", "CVE-2"], on_error=failed.__setitem__
+            )
+        ]
+
+        self.assertEqual(cves, ["CVE-2"])
+        self.assertEqual(list(failed), ["CVE-1"])
+        self.assertIsInstance(failed["CVE-1"], HTTPError)
+
+    async def test_cves_by_id_skip_failed(self):
+        self.http_client.get.return_value = create_cve_response(
+            "CVE-1", {"vulnerabilities": []}
+        )
+
+        cves = [cve async for cve in self.api.cves_by_id(["CVE-1"])]
+
+        self.assertEqual(cves, [])
+
+    async def test_cves_by_id_missing_id(self):
+        self.http_client.get.side_effect = lambda *args, params, **kwargs: (
+            create_cve_response(params["cveId"])
+        )
+        on_error = MagicMock()
+
+        cves = [
+            cve.id
+            async for cve in self.api.cves_by_id(
+                ["CVE-1", ""], on_error=on_error
+            )
+        ]
+
+        self.assertEqual(cves, ["CVE-1"])
+        on_error.assert_called_once()
+        cve_id, error = on_error.call_args[0]
+        self.assertEqual(cve_id, "")
+        self.assertIsInstance(error, PontosError)
+
     async def test_cves(self):
-        self.http_client.get.side_effect = create_cves_responses()
+        self.http_client.send.side_effect = create_cves_responses()
 
         it = aiter(self.api.cves())
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={"startIndex": 0},
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={"startIndex": 1, "resultsPerPage": 1},
@@ -139,10 +360,85 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
         with self.assertRaises(StopAsyncIteration):
             cve = await anext(it)
 
+    async def test_cves_concurrent_pages(self):
+        self.http_client.send.side_effect = create_cves_responses(4)
+
+        cves = [cve async for cve in self.api.cves(max_concurrency=2)]
+
+        self.assertEqual(
+            [cve.id for cve in cves], ["CVE-1", "CVE-2", "CVE-3", "CVE-4"]
+        )
+        self.assertEqual(self.http_client.build_request.call_count, 4)
+        self.assertEqual(
+            [
+                call.kwargs["params"]
+                for call in self.http_client.build_request.call_args_list
+            ],
+            [
+                {"startIndex": 0},
+                {"startIndex": 1, "resultsPerPage": 1},
+                {"startIndex": 2, "resultsPerPage": 1},
+                {"startIndex": 3, "resultsPerPage": 1},
+            ],
+        )
+
+    async def test_cves_close_responses(self):
+        responses = create_cves_responses(3)
+        self.http_client.send.side_effect = responses
+
+        cves = [cve async for cve in self.api.cves()]
+
+        self.assertEqual(len(cves), 3)
+        for response in responses:
+            response.aclose.assert_awaited_once()
+
+    async def test_cves_stop_early(self):
+        responses = create_cves_responses(3)
+        self.http_client.send.side_effect = responses
+
+        it = aiter(self.api.cves(max_concurrency=1))
+        await anext(it)
+        await anext(it)
+        # let the request of the third page finish
+        while self.http_client.send.await_count < 3:
+            await asyncio.sleep(0)
+
+        await it.aclose()
+
+        for response in responses:
+            response.aclose.assert_awaited_once()
+
+    async def test_cves_unordered(self):
+        responses = create_cves_responses(3)
+        release_second_page = asyncio.Event()
+
+        async def send(request, **kwargs):
+            start_index = int(request.url.params["startIndex"])
+            if start_index == 1:
+                await release_second_page.wait()
+            return responses[start_index]
+
+        self.http_client.send.side_effect = send
+
+        it = aiter(self.api.cves(ordered=False))
+        cve = await anext(it)
+        self.assertEqual(cve.id, "CVE-1")
+
+        cve = await anext(it)
+        self.assertEqual(cve.id, "CVE-3")
+
+        release_second_page.set()
+
+        cve = await anext(it)
+        self.assertEqual(cve.id, "CVE-2")
+
+        with self.assertRaises(StopAsyncIteration):
+            await anext(it)
+
     @patch("pontos.nvd.cve.api.now", spec=now)
     async def test_cves_last_modified_start_date(self, now_mock: MagicMock):
         now_mock.return_value = datetime(2022, 12, 31)
-        self.http_client.get.side_effect = create_cves_responses()
+        self.http_client.send.side_effect = create_cves_responses()
 
         it = aiter(
             self.api.cves(last_modified_start_date=datetime(2022, 12, 1))
@@ -150,7 +446,8 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -160,12 +457,13 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             },
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -180,7 +478,7 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             cve = await anext(it)
 
     async def test_cves_last_modified_end_date(self):
-        self.http_client.get.side_effect = create_cves_responses()
+        self.http_client.send.side_effect = create_cves_responses()
 
         it = aiter(
             self.api.cves(
@@ -191,7 +489,8 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -201,12 +500,13 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             },
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -223,13 +523,14 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
     @patch("pontos.nvd.cve.api.now", spec=now)
     async def test_cves_published_start_date(self, now_mock: MagicMock):
         now_mock.return_value = datetime(2022, 12, 31)
-        self.http_client.get.side_effect = create_cves_responses()
+        self.http_client.send.side_effect = create_cves_responses()
 
         it = aiter(self.api.cves(published_start_date=datetime(2022, 12, 1)))
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -239,12 +540,13 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             },
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -259,7 +561,7 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             cve = await anext(it)
 
     async def test_cves_published_end_date(self):
-        self.http_client.get.side_effect = create_cves_responses()
+        self.http_client.send.side_effect = create_cves_responses()
 
         it = aiter(
             self.api.cves(
@@ -270,7 +572,8 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -280,12 +583,13 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             },
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -300,24 +604,26 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             cve = await anext(it)
 
     async def test_cves_cpe_name(self):
-        self.http_client.get.side_effect = create_cves_responses()
+        self.http_client.send.side_effect = create_cves_responses()
 
         it = aiter(self.api.cves(cpe_name="foo-bar"))
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={"startIndex": 0, "cpeName": "foo-bar"},
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -331,24 +637,26 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             cve = await anext(it)
 
     async def test_cves_is_vulnerable(self):
-        self.http_client.get.side_effect = create_cves_responses()
+        self.http_client.send.side_effect = create_cves_responses()
 
         it = aiter(self.api.cves(cpe_name="foo-bar", is_vulnerable=True))
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={"startIndex": 0, "cpeName": "foo-bar", "isVulnerable": ""},
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -363,13 +671,14 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             cve = await anext(it)
 
     async def test_cves_cvss_v2_vector(self):
-        self.http_client.get.side_effect = create_cves_responses()
+        self.http_client.send.side_effect = create_cves_responses()
 
         it = aiter(self.api.cves(cvss_v2_vector="AV:N/AC:M/Au:N/C:N/I:P/A:N"))
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -378,12 +687,13 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             },
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -397,7 +707,7 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             cve = await anext(it)
 
     async def test_cves_cvss_v3_vector(self):
-        self.http_client.get.side_effect = create_cves_responses()
+        self.http_client.send.side_effect = create_cves_responses()
 
         it = aiter(
             self.api.cves(
@@ -407,7 +717,8 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -416,12 +727,13 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             },
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -435,13 +747,14 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             cve = await anext(it)
 
     async def test_cves_cvss_v2_severity(self):
-        self.http_client.get.side_effect = create_cves_responses()
+        self.http_client.send.side_effect = create_cves_responses()
 
         it = aiter(self.api.cves(cvss_v2_severity=cvss_v2.Severity.HIGH))
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -450,12 +763,13 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             },
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -469,13 +783,14 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             cve = await anext(it)
 
     async def test_cves_cvss_v3_severity(self):
-        self.http_client.get.side_effect = create_cves_responses()
+        self.http_client.send.side_effect = create_cves_responses()
 
         it = aiter(self.api.cves(cvss_v3_severity=cvss_v3.Severity.HIGH))
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -484,12 +799,13 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             },
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -503,13 +819,14 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             cve = await anext(it)
 
     async def test_cves_keywords(self):
-        self.http_client.get.side_effect = create_cves_responses()
+        self.http_client.send.side_effect = create_cves_responses()
 
         it = aiter(self.api.cves(keywords=["Mac OS X", "kernel"]))
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -519,12 +836,13 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             },
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -539,13 +857,14 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             cve = await anext(it)
 
     async def test_cves_keyword(self):
-        self.http_client.get.side_effect = create_cves_responses()
+        self.http_client.send.side_effect = create_cves_responses()
 
         it = aiter(self.api.cves(keywords="Windows"))
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -554,12 +873,13 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             },
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -573,24 +893,26 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             cve = await anext(it)
 
     async def test_cves_cwe(self):
-        self.http_client.get.side_effect = create_cves_responses()
+        self.http_client.send.side_effect = create_cves_responses()
 
         it = aiter(self.api.cves(cwe_id="CWE-1"))
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={"startIndex": 0, "cweId": "CWE-1"},
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={"startIndex": 1, "resultsPerPage": 1, "cweId": "CWE-1"},
@@ -600,13 +922,14 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             cve = await anext(it)
 
     async def test_cves_source_identifier(self):
-        self.http_client.get.side_effect = create_cves_responses()
+        self.http_client.send.side_effect = create_cves_responses()
 
         it = aiter(self.api.cves(source_identifier="nvd@nist.gov"))
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -615,12 +938,13 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             },
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -634,13 +958,14 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             cve = await anext(it)
 
     async def test_cves_virtual_match_string(self):
-        self.http_client.get.side_effect = create_cves_responses()
+        self.http_client.send.side_effect = create_cves_responses()
 
         it = aiter(self.api.cves(virtual_match_string="foo-bar"))
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -649,12 +974,13 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             },
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -668,24 +994,26 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             cve = await anext(it)
 
     async def test_cves_has_cert_alerts(self):
-        self.http_client.get.side_effect = create_cves_responses()
+        self.http_client.send.side_effect = create_cves_responses()
 
         it = aiter(self.api.cves(has_cert_alerts=True))
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={"startIndex": 0, "hasCertAlerts": ""},
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -699,24 +1027,26 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             cve = await anext(it)
 
     async def test_cves_has_cert_notes(self):
-        self.http_client.get.side_effect = create_cves_responses()
+        self.http_client.send.side_effect = create_cves_responses()
 
         it = aiter(self.api.cves(has_cert_notes=True))
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={"startIndex": 0, "hasCertNotes": ""},
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -730,24 +1060,26 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             cve = await anext(it)
 
     async def test_cves_has_kev(self):
-        self.http_client.get.side_effect = create_cves_responses()
+        self.http_client.send.side_effect = create_cves_responses()
 
         it = aiter(self.api.cves(has_kev=True))
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={"startIndex": 0, "hasKev": ""},
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -761,24 +1093,26 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
             cve = await anext(it)
 
     async def test_cves_has_oval(self):
-        self.http_client.get.side_effect = create_cves_responses()
+        self.http_client.send.side_effect = create_cves_responses()
 
         it = aiter(self.api.cves(has_oval=True))
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-1")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={"startIndex": 0, "hasOval": ""},
         )
 
-        self.http_client.get.reset_mock()
+        self.http_client.build_request.reset_mock()
 
         cve = await anext(it)
 
         self.assertEqual(cve.id, "CVE-2")
-        self.http_client.get.assert_awaited_once_with(
+        self.http_client.build_request.assert_called_once_with(
+            "GET",
             "https://services.nvd.nist.gov/rest/json/cves/2.0",
             headers={"apiKey": "token"},
             params={
@@ -800,10 +1134,11 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
 
     @patch("pontos.nvd.api.sleep", spec=sleep)
     async def test_rate_limit(self, sleep_mock: MagicMock):
-        self.http_client.get.side_effect = create_cves_responses(6)
-        self.api._rate_limit = 5  # pylint: disable=protected-access
+        self.http_client.send.side_effect = create_cves_responses(6)
+        # pylint: disable=protected-access
+        self.api._rate_limiter = RateLimiter(5)
 
-        it = aiter(self.api.cves())
+        it = aiter(self.api.cves(max_concurrency=1))
         await anext(it)
         await anext(it)
         await anext(it)
@@ -814,4 +1149,4 @@ class CVEApiTestCase(IsolatedAsyncioTestCase):
 
         await anext(it)
 
-        sleep_mock.assert_called_once_with()
+        sleep_mock.assert_called_once()
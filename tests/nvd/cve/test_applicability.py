@@ -0,0 +1,365 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# pylint: disable=line-too-long
+
+import unittest
+from typing import Any, Dict, List
+
+from pontos.errors import PontosError
+from pontos.nvd.cve.applicability import ApplicabilityEngine
+from pontos.nvd.models.cve import CVE
+from tests.nvd import get_cve_data
+
+
+def create_cpe_match(
+    criteria: str, vulnerable: bool = True, **kwargs
+) -> Dict[str, Any]:
+    return {
+        "vulnerable": vulnerable,
+        "criteria": criteria,
+        "match_criteria_id": "EFAA48D9-BBB8-4E0B-BA4E-5D8A8E2A6AE0",
+        **kwargs,
+    }
+
+
+def create_node(
+    *cpe_matches: Dict[str, Any], operator: str = "OR", negate: bool = False
+) -> Dict[str, Any]:
+    return {
+        "operator": operator,
+        "negate": negate,
+        "cpe_match": list(cpe_matches),
+    }
+
+
+def create_cve(cve_id: str, *configurations: Dict[str, Any]) -> CVE:
+    return CVE.from_dict(
+        get_cve_data({"id": cve_id, "configurations": list(configurations)})
+    )
+
+
+def applicable(
+    engine: ApplicabilityEngine, cpes: List[str]
+) -> Dict[str, List[str]]:
+    return {result.cve.id: result.cpes for result in engine.evaluate(cpes)}
+
+
+class ApplicabilityEngineTestCase(unittest.TestCase):
+    def test_no_cves(self):
+        engine = ApplicabilityEngine()
+
+        self.assertEqual(len(engine), 0)
+        self.assertEqual(
+            engine.evaluate(["cpe:2.3:a:foo:bar:1.0:*:*:*:*:*:*:*"]), []
+        )
+
+    def test_exact_version(self):
+        engine = ApplicabilityEngine(
+            [
+                create_cve(
+                    "CVE-1",
+                    {
+                        "nodes": [
+                            create_node(
+                                create_cpe_match(
+                                    "cpe:2.3:a:foo:bar:1.0:*:*:*:*:*:*:*"
+                                )
+                            )
+                        ]
+                    },
+                )
+            ]
+        )
+
+        self.assertEqual(len(engine), 1)
+        self.assertEqual(
+            applicable(engine, ["cpe:2.3:a:foo:bar:1.0:*:*:*:*:*:*:*"]),
+            {"CVE-1": ["cpe:2.3:a:foo:bar:1.0:*:*:*:*:*:*:*"]},
+        )
+        self.assertEqual(
+            applicable(engine, ["cpe:2.3:a:foo:bar:1.1:*:*:*:*:*:*:*"]), {}
+        )
+        self.assertEqual(
+            applicable(engine, ["cpe:2.3:a:foo:baz:1.0:*:*:*:*:*:*:*"]), {}
+        )
+
+    def test_version_range(self):
+        engine = ApplicabilityEngine(
+            [
+                create_cve(
+                    "CVE-1",
+                    {
+                        "nodes": [
+                            create_node(
+                                create_cpe_match(
+                                    "cpe:2.3:a:foo:bar:*:*:*:*:*:*:*:*",
+                                    version_start_including="1.2",
+                                    version_end_excluding="1.10",
+                                )
+                            )
+                        ]
+                    },
+                ),
+                create_cve(
+                    "CVE-2",
+                    {
+                        "nodes": [
+                            create_node(
+                                create_cpe_match(
+                                    "cpe:2.3:a:foo:bar:*:*:*:*:*:*:*:*",
+                                    version_start_excluding="1.2",
+                                    version_end_including="2.0",
+                                )
+                            )
+                        ]
+                    },
+                ),
+            ]
+        )
+
+        self.assertEqual(
+            list(applicable(engine, ["cpe:2.3:a:foo:bar:1.2"])), ["CVE-1"]
+        )
+        self.assertEqual(
+            list(applicable(engine, ["cpe:2.3:a:foo:bar:1.9"])),
+            ["CVE-1", "CVE-2"],
+        )
+        self.assertEqual(
+            list(applicable(engine, ["cpe:2.3:a:foo:bar:1.10"])), ["CVE-2"]
+        )
+        self.assertEqual(
+            list(applicable(engine, ["cpe:2.3:a:foo:bar:2.0"])), ["CVE-2"]
+        )
+        self.assertEqual(applicable(engine, ["cpe:2.3:a:foo:bar:2.0.1"]), {})
+        self.assertEqual(applicable(engine, ["cpe:2.3:a:foo:bar:1.1"]), {})
+        # not applicable version
+        self.assertEqual(applicable(engine, ["cpe:2.3:a:foo:bar:-"]), {})
+        # any version
+        self.assertEqual(
+            list(applicable(engine, ["cpe:2.3:a:foo:bar:*"])),
+            ["CVE-1", "CVE-2"],
+        )
+
+    def test_running_on(self):
+        # a vulnerable application running on a specific operating system
+        engine = ApplicabilityEngine(
+            [
+                create_cve(
+                    "CVE-1",
+                    {
+                        "operator": "AND",
+                        "nodes": [
+                            create_node(
+                                create_cpe_match(
+                                    "cpe:2.3:a:foo:bar:*:*:*:*:*:*:*:*",
+                                    version_end_excluding="2.0",
+                                )
+                            ),
+                            create_node(
+                                create_cpe_match(
+                                    "cpe:2.3:o:microsoft:windows:-:*:*:*:*:*:*:*",
+                                    vulnerable=False,
+                                ),
+                            ),
+                        ],
+                    },
+                )
+            ]
+        )
+
+        self.assertEqual(
+            applicable(engine, ["cpe:2.3:a:foo:bar:1.0"]),
+            {},
+        )
+        self.assertEqual(
+            applicable(engine, ["cpe:2.3:o:microsoft:windows:-"]),
+            {},
+        )
+        self.assertEqual(
+            applicable(
+                engine,
+                [
+                    "cpe:2.3:a:foo:bar:1.0",
+                    "cpe:2.3:o:microsoft:windows:-",
+                ],
+            ),
+            {"CVE-1": ["cpe:2.3:a:foo:bar:1.0"]},
+        )
+
+    def test_and_node(self):
+        engine = ApplicabilityEngine(
+            [
+                create_cve(
+                    "CVE-1",
+                    {
+                        "nodes": [
+                            create_node(
+                                create_cpe_match("cpe:2.3:a:foo:bar:1.0"),
+                                create_cpe_match("cpe:2.3:a:foo:baz:1.0"),
+                                operator="AND",
+                            )
+                        ]
+                    },
+                )
+            ]
+        )
+
+        self.assertEqual(applicable(engine, ["cpe:2.3:a:foo:bar:1.0"]), {})
+        self.assertEqual(
+            applicable(
+                engine, ["cpe:2.3:a:foo:bar:1.0", "cpe:2.3:a:foo:baz:1.0"]
+            ),
+            {"CVE-1": ["cpe:2.3:a:foo:bar:1.0", "cpe:2.3:a:foo:baz:1.0"]},
+        )
+
+    def test_negate(self):
+        # vulnerable unless running on a specific operating system
+        engine = ApplicabilityEngine(
+            [
+                create_cve(
+                    "CVE-1",
+                    {
+                        "operator": "AND",
+                        "nodes": [
+                            create_node(
+                                create_cpe_match("cpe:2.3:a:foo:bar:1.0")
+                            ),
+                            create_node(
+                                create_cpe_match(
+                                    "cpe:2.3:o:foo:os:*", vulnerable=False
+                                ),
+                                negate=True,
+                            ),
+                        ],
+                    },
+                )
+            ]
+        )
+
+        self.assertEqual(
+            applicable(engine, ["cpe:2.3:a:foo:bar:1.0"]),
+            {"CVE-1": ["cpe:2.3:a:foo:bar:1.0"]},
+        )
+        self.assertEqual(
+            applicable(engine, ["cpe:2.3:a:foo:bar:1.0", "cpe:2.3:o:foo:os:2"]),
+            {},
+        )
+
+    def test_multiple_configurations(self):
+        engine = ApplicabilityEngine(
+            [
+                create_cve(
+                    "CVE-1",
+                    {
+                        "nodes": [
+                            create_node(
+                                create_cpe_match("cpe:2.3:a:foo:bar:1.0")
+                            )
+                        ]
+                    },
+                    {
+                        "nodes": [
+                            create_node(
+                                create_cpe_match("cpe:2.3:a:foo:baz:1.0")
+                            )
+                        ]
+                    },
+                )
+            ]
+        )
+
+        self.assertEqual(
+            applicable(engine, ["cpe:2.3:a:foo:baz:1.0"]),
+            {"CVE-1": ["cpe:2.3:a:foo:baz:1.0"]},
+        )
+
+    def test_wildcard_product(self):
+        engine = ApplicabilityEngine(
+            [
+                create_cve(
+                    "CVE-1",
+                    {
+                        "nodes": [
+                            create_node(create_cpe_match("cpe:2.3:a:foo:*:1.0"))
+                        ]
+                    },
+                )
+            ]
+        )
+
+        self.assertEqual(
+            applicable(engine, ["cpe:2.3:a:foo:baz:1.0"]),
+            {"CVE-1": ["cpe:2.3:a:foo:baz:1.0"]},
+        )
+        self.assertEqual(applicable(engine, ["cpe:2.3:a:bar:baz:1.0"]), {})
+
+    def test_add(self):
+        engine = ApplicabilityEngine()
+        engine.add(
+            [
+                create_cve(
+                    "CVE-1",
+                    {
+                        "nodes": [
+                            create_node(
+                                create_cpe_match("cpe:2.3:a:foo:bar:1.0")
+                            )
+                        ]
+                    },
+                )
+            ]
+        )
+
+        self.assertEqual(len(engine), 1)
+        self.assertEqual(
+            list(applicable(engine, ["cpe:2.3:a:foo:bar:1.0"])), ["CVE-1"]
+        )
+
+    def test_invalid_cpe(self):
+        engine = ApplicabilityEngine()
+
+        with self.assertRaises(PontosError):
+            engine.evaluate(["foo:bar"])
+
+    def test_invalid_criteria(self):
+        engine = ApplicabilityEngine(
+            [
+                create_cve(
+                    "CVE-1",
+                    {"nodes": [create_node(create_cpe_match("foo:bar"))]},
+                ),
+                create_cve(
+                    "CVE-2",
+                    {
+                        "nodes": [
+                            create_node(
+                                create_cpe_match("foo:bar"),
+                                create_cpe_match(
+                                    "cpe:2.3:a:foo:bar:1.0:*:*:*:*:*:*:*"
+                                ),
+                            )
+                        ]
+                    },
+                ),
+            ]
+        )
+
+        self.assertEqual(
+            applicable(engine, ["cpe:2.3:a:foo:bar:1.0"]),
+            {"CVE-2": ["cpe:2.3:a:foo:bar:1.0"]},
+        )
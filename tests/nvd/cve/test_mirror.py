@@ -0,0 +1,443 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# pylint: disable=line-too-long
+
+import unittest
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, patch
+
+from pontos.errors import PontosError
+from pontos.nvd.cve.api import CVEApi
+from pontos.nvd.cve.mirror import CVEMirror
+from pontos.nvd.models.cve import CVE
+from pontos.nvd.models.cvss_v3 import Severity
+from tests import AsyncIteratorMock, IsolatedAsyncioTestCase
+from tests.nvd import get_cve_data
+
+
+def create_cve(cve_id: str, data: Dict[str, Any] = None) -> CVE:
+    return CVE.from_dict(get_cve_data({"id": cve_id, **(data or {})}))
+
+
+def create_configuration(
+    criteria: str, vulnerable: bool = True, **kwargs
+) -> List[Dict[str, Any]]:
+    return [
+        {
+            "nodes": [
+                {
+                    "operator": "OR",
+                    "negate": False,
+                    "cpe_match": [
+                        {
+                            "vulnerable": vulnerable,
+                            "criteria": criteria,
+                            "match_criteria_id": "EFAA48D9-BBB8-4E0B-BA4E-5D8A8E2A6AE0",
+                            **kwargs,
+                        }
+                    ],
+                }
+            ]
+        }
+    ]
+
+
+def create_metrics(vector: str, severity: str) -> Dict[str, Any]:
+    return {
+        "cvss_metric_v31": [
+            {
+                "source": "nvd@nist.gov",
+                "type": "Primary",
+                "cvss_data": {
+                    "version": "3.1",
+                    "vector_string": vector,
+                    "base_score": 9.8,
+                    "base_severity": severity,
+                },
+            }
+        ]
+    }
+
+
+class CVEMirrorTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mirror = CVEMirror(":memory:")
+
+    def tearDown(self) -> None:
+        self.mirror.close()
+
+    def test_add(self):
+        self.mirror.add([create_cve("CVE-1"), create_cve("CVE-2")])
+
+        self.assertEqual(len(self.mirror), 2)
+
+        # update
+        self.mirror.add([create_cve("CVE-1", {"vuln_status": "Modified"})])
+
+        self.assertEqual(len(self.mirror), 2)
+        self.assertEqual(self.mirror.cve("CVE-1").vuln_status, "Modified")
+
+    def test_cve(self):
+        cve = create_cve(
+            "CVE-1",
+            {
+                "configurations": create_configuration(
+                    "cpe:2.3:a:foo:bar:*:*:*:*:*:*:*:*",
+                    version_end_excluding="2.0",
+                ),
+                "metrics": create_metrics(
+                    "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H", "CRITICAL"
+                ),
+                "cisa_exploit_add": "2022-10-01",
+            },
+        )
+        self.mirror.add([cve])
+
+        self.assertEqual(self.mirror.cve("CVE-1"), cve)
+
+    def test_unknown_cve(self):
+        with self.assertRaises(PontosError):
+            self.mirror.cve("CVE-1")
+
+    def test_cves(self):
+        self.mirror.add([create_cve("CVE-1"), create_cve("CVE-2")])
+
+        self.assertEqual(
+            [cve.id for cve in self.mirror.cves()], ["CVE-1", "CVE-2"]
+        )
+
+    def test_dates(self):
+        self.mirror.add(
+            [
+                create_cve(
+                    "CVE-1",
+                    {
+                        "published": "2022-01-01T10:00:00.000",
+                        "last_modified": "2022-03-01T10:00:00.000",
+                    },
+                ),
+                create_cve(
+                    "CVE-2",
+                    {
+                        "published": "2022-02-01T10:00:00.000",
+                        "last_modified": "2022-02-01T10:00:00.000",
+                    },
+                ),
+            ]
+        )
+
+        self.assertEqual(
+            [
+                cve.id
+                for cve in self.mirror.cves(
+                    published_start_date=datetime(2022, 1, 15)
+                )
+            ],
+            ["CVE-2"],
+        )
+        self.assertEqual(
+            [
+                cve.id
+                for cve in self.mirror.cves(
+                    last_modified_start_date=datetime(
+                        2022, 2, 15, tzinfo=timezone.utc
+                    ),
+                    last_modified_end_date=datetime(
+                        2022, 3, 15, tzinfo=timezone.utc
+                    ),
+                )
+            ],
+            ["CVE-1"],
+        )
+        self.assertEqual(
+            [
+                cve.id
+                for cve in self.mirror.cves(
+                    published_end_date=datetime(
+                        2022, 1, 1, 11, tzinfo=timezone(timedelta(hours=2))
+                    )
+                )
+            ],
+            [],
+        )
+
+    def test_keywords(self):
+        self.mirror.add(
+            [
+                create_cve(
+                    "CVE-1",
+                    {
+                        "descriptions": [
+                            {"lang": "en", "value": "Mac OS X kernel 100%"}
+                        ]
+                    },
+                ),
+                create_cve("CVE-2"),
+            ]
+        )
+
+        self.assertEqual(
+            [cve.id for cve in self.mirror.cves(keywords=["mac os x"])],
+            ["CVE-1"],
+        )
+        self.assertEqual(
+            [cve.id for cve in self.mirror.cves(keywords="100%")],
+            ["CVE-1"],
+        )
+        self.assertEqual(
+            [cve.id for cve in self.mirror.cves(keywords=["kernel", "foo"])],
+            [],
+        )
+
+    def test_cwe_id(self):
+        self.mirror.add(
+            [
+                create_cve(
+                    "CVE-1",
+                    {
+                        "weaknesses": [
+                            {
+                                "source": "nvd@nist.gov",
+                                "type": "Primary",
+                                "description": [
+                                    {"lang": "en", "value": "CWE-89"}
+                                ],
+                            }
+                        ]
+                    },
+                ),
+                create_cve("CVE-2"),
+            ]
+        )
+
+        self.assertEqual(
+            [cve.id for cve in self.mirror.cves(cwe_id="CWE-89")], ["CVE-1"]
+        )
+        self.assertEqual(
+            [cve.id for cve in self.mirror.cves(cwe_id="CWE-8")], []
+        )
+
+    def test_source_identifier_and_kev(self):
+        self.mirror.add(
+            [
+                create_cve("CVE-1", {"cisa_exploit_add": "2022-10-01"}),
+                create_cve("CVE-2", {"source_identifier": "nvd@nist.gov"}),
+            ]
+        )
+
+        self.assertEqual(
+            [
+                cve.id
+                for cve in self.mirror.cves(source_identifier="nvd@nist.gov")
+            ],
+            ["CVE-2"],
+        )
+        self.assertEqual(
+            [cve.id for cve in self.mirror.cves(has_kev=True)], ["CVE-1"]
+        )
+
+    def test_cpe_name(self):
+        self.mirror.add(
+            [
+                create_cve(
+                    "CVE-1",
+                    {
+                        "configurations": create_configuration(
+                            "cpe:2.3:a:foo:bar:*:*:*:*:*:*:*:*",
+                            version_start_including="1.0",
+                            version_end_excluding="2.0",
+                        )
+                    },
+                ),
+                create_cve(
+                    "CVE-2",
+                    {
+                        "configurations": create_configuration(
+                            "cpe:2.3:a:foo:bar:2.1:*:*:*:*:*:*:*",
+                            vulnerable=False,
+                        )
+                    },
+                ),
+                create_cve(
+                    "CVE-3",
+                    {
+                        "configurations": create_configuration(
+                            "cpe:2.3:a:foo:baz:*:*:*:*:*:*:*:*"
+                        )
+                    },
+                ),
+            ]
+        )
+
+        self.assertEqual(
+            [
+                cve.id
+                for cve in self.mirror.cves(
+                    cpe_name="cpe:2.3:a:foo:bar:1.5:*:*:*:*:*:*:*"
+                )
+            ],
+            ["CVE-1"],
+        )
+        self.assertEqual(
+            [
+                cve.id
+                for cve in self.mirror.cves(
+                    cpe_name="cpe:2.3:a:foo:bar:2.1:*:*:*:*:*:*:*"
+                )
+            ],
+            ["CVE-2"],
+        )
+        self.assertEqual(
+            [
+                cve.id
+                for cve in self.mirror.cves(
+                    cpe_name="cpe:2.3:a:foo:bar:2.1:*:*:*:*:*:*:*",
+                    is_vulnerable=True,
+                )
+            ],
+            [],
+        )
+        self.assertEqual(
+            [
+                cve.id
+                for cve in self.mirror.cves(
+                    virtual_match_string="cpe:2.3:a:foo"
+                )
+            ],
+            ["CVE-1", "CVE-2", "CVE-3"],
+        )
+
+    def test_cvss(self):
+        self.mirror.add(
+            [
+                create_cve(
+                    "CVE-1",
+                    {
+                        "metrics": create_metrics(
+                            "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H",
+                            "CRITICAL",
+                        )
+                    },
+                ),
+                create_cve(
+                    "CVE-2",
+                    {
+                        "metrics": create_metrics(
+                            "CVSS:3.1/AV:L/AC:L/PR:N/UI:N/S:U/C:L/I:L/A:L",
+                            "MEDIUM",
+                        )
+                    },
+                ),
+                create_cve("CVE-3"),
+            ]
+        )
+
+        self.assertEqual(
+            [
+                cve.id
+                for cve in self.mirror.cves(cvss_v3_severity=Severity.CRITICAL)
+            ],
+            ["CVE-1"],
+        )
+        self.assertEqual(
+            [cve.id for cve in self.mirror.cves(cvss_v3_vector="AV:L/AC:L")],
+            ["CVE-2"],
+        )
+
+
+@patch("pontos.nvd.cve.mirror.now")
+class CVEMirrorSyncTestCase(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.mirror = CVEMirror(":memory:")
+        self.api = MagicMock(spec=CVEApi)
+
+    def tearDown(self) -> None:
+        self.mirror.close()
+
+    async def test_initial_sync(self, now_mock: MagicMock):
+        now_mock.return_value = datetime(2023, 1, 1, tzinfo=timezone.utc)
+        self.api.cves.return_value = AsyncIteratorMock(
+            [create_cve("CVE-1"), create_cve("CVE-2")]
+        )
+
+        count = await self.mirror.sync(self.api)
+
+        self.assertEqual(count, 2)
+        self.assertEqual(len(self.mirror), 2)
+        self.assertEqual(
+            self.mirror.last_sync, datetime(2023, 1, 1, tzinfo=timezone.utc)
+        )
+        self.api.cves.assert_called_once_with(
+            last_modified_start_date=None, last_modified_end_date=None
+        )
+
+    async def test_incremental_sync(self, now_mock: MagicMock):
+        now_mock.return_value = datetime(2023, 1, 1, tzinfo=timezone.utc)
+        self.api.cves.return_value = AsyncIteratorMock([create_cve("CVE-1")])
+        await self.mirror.sync(self.api)
+
+        now_mock.return_value = datetime(2023, 6, 1, tzinfo=timezone.utc)
+        self.api.cves.reset_mock()
+        self.api.cves.side_effect = [
+            AsyncIteratorMock([create_cve("CVE-2")]),
+            AsyncIteratorMock([create_cve("CVE-1", {"vuln_status": "Foo"})]),
+        ]
+
+        count = await self.mirror.sync(self.api)
+
+        self.assertEqual(count, 2)
+        self.assertEqual(len(self.mirror), 2)
+        self.assertEqual(self.mirror.cve("CVE-1").vuln_status, "Foo")
+        self.assertEqual(
+            self.mirror.last_sync, datetime(2023, 6, 1, tzinfo=timezone.utc)
+        )
+
+        # the maximum allowed range is 120 days
+        middle = datetime(2023, 5, 1, tzinfo=timezone.utc)
+        self.assertEqual(self.api.cves.call_count, 2)
+        self.assertEqual(
+            self.api.cves.call_args_list[0].kwargs,
+            {
+                "last_modified_start_date": datetime(
+                    2023, 1, 1, tzinfo=timezone.utc
+                ),
+                "last_modified_end_date": middle,
+            },
+        )
+        self.assertEqual(
+            self.api.cves.call_args_list[1].kwargs,
+            {
+                "last_modified_start_date": middle,
+                "last_modified_end_date": datetime(
+                    2023, 6, 1, tzinfo=timezone.utc
+                ),
+            },
+        )
+
+    async def test_full_sync(self, now_mock: MagicMock):
+        now_mock.return_value = datetime(2023, 1, 1, tzinfo=timezone.utc)
+        self.api.cves.return_value = AsyncIteratorMock([create_cve("CVE-1")])
+        await self.mirror.sync(self.api)
+
+        self.api.cves.return_value = AsyncIteratorMock([create_cve("CVE-1")])
+        await self.mirror.sync(self.api, full=True)
+
+        self.api.cves.assert_called_with(
+            last_modified_start_date=None, last_modified_end_date=None
+        )
@@ -0,0 +1,129 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from pontos.errors import PontosError
+from pontos.nvd.cvss.scores import CVSSScores
+from pontos.nvd.cvss.v2 import (
+    CVSSv2,
+    calculate_column_scores,
+    calculate_scores,
+    severity,
+)
+from pontos.nvd.models.cvss_v2 import Severity
+
+
+class CVSSv2TestCase(unittest.TestCase):
+    def test_base_score(self):
+        for vector, score in (
+            ("AV:N/AC:L/Au:N/C:P/I:P/A:P", 7.5),
+            ("AV:N/AC:M/Au:N/C:N/I:P/A:N", 4.3),
+            ("AV:L/AC:L/Au:N/C:C/I:C/A:C", 7.2),
+            ("AV:N/AC:L/Au:N/C:N/I:N/A:N", 0.0),
+            ("(AV:N/AC:L/Au:N/C:N/I:N/A:C)", 7.8),
+        ):
+            with self.subTest(vector=vector):
+                self.assertEqual(CVSSv2.from_vector(vector).base_score, score)
+
+    def test_temporal_and_environmental_score(self):
+        # example from the CVSS v2 specification (CVE-2002-0392)
+        cvss = CVSSv2.from_vector(
+            "AV:N/AC:L/Au:N/C:N/I:N/A:C/E:F/RL:OF/RC:C/"
+            "CDP:H/TD:H/CR:M/IR:M/AR:H"
+        )
+
+        self.assertEqual(
+            cvss.scores,
+            CVSSScores(
+                base_score=7.8, temporal_score=6.4, environmental_score=9.2
+            ),
+        )
+
+    def test_replace(self):
+        cvss = CVSSv2.from_vector("AV:N/AC:L/Au:N/C:N/I:N/A:C/E:F/RL:OF/RC:C")
+        modified = cvss.replace(CDP="H", TD="H", AR="H")
+
+        self.assertEqual(cvss.environmental_score, 6.4)
+        self.assertEqual(modified.environmental_score, 9.2)
+        self.assertEqual(
+            modified.vector_string,
+            "AV:N/AC:L/Au:N/C:N/I:N/A:C/E:F/RL:OF/RC:C/CDP:H/TD:H/AR:H",
+        )
+
+    def test_invalid_vector(self):
+        for vector in (
+            "AV:N/AC:L/Au:N/C:P/I:P",
+            "AV:N/AC:L/Au:N/C:P/I:P/A:P/A:N",
+            "AV:X/AC:L/Au:N/C:P/I:P/A:P",
+            "AV:N/AC:L/Au:N/C:P/I:P/A:P/FOO:ND",
+            "AV:N/AC:L/Au:N/C:P/I:P/A:P/",
+        ):
+            with self.subTest(vector=vector), self.assertRaises(PontosError):
+                CVSSv2.from_vector(vector)
+
+    def test_severity(self):
+        self.assertEqual(severity(0.0), Severity.LOW)
+        self.assertEqual(severity(4.0), Severity.MEDIUM)
+        self.assertEqual(severity(7.0), Severity.HIGH)
+
+
+class CalculateScoresTestCase(unittest.TestCase):
+    def test_calculate_scores(self):
+        scores = calculate_scores(
+            ["AV:N/AC:L/Au:N/C:N/I:N/A:C", "AV:N/AC:L/Au:N/C:P/I:P/A:P"],
+            environment={"CDP": "H", "TD": "H", "AR": "H"},
+        )
+
+        self.assertEqual([score.base_score for score in scores], [7.8, 7.5])
+        self.assertEqual(scores[0].environmental_score, 10.0)
+
+    def test_calculate_column_scores(self):
+        scores = calculate_column_scores(
+            {
+                "AV": ["N", "N"],
+                "AC": ["L", "L"],
+                "Au": ["N", "N"],
+                "C": ["N", "P"],
+                "I": ["N", "P"],
+                "A": ["C", "P"],
+                "E": ["F", "ND"],
+                "RL": ["OF", "ND"],
+                "RC": ["C", "ND"],
+            }
+        )
+
+        self.assertEqual(
+            [(score.base_score, score.temporal_score) for score in scores],
+            [(7.8, 6.4), (7.5, 7.5)],
+        )
+
+    def test_invalid_columns(self):
+        with self.assertRaises(PontosError):
+            calculate_column_scores({"AV": ["N"]})
+
+        with self.assertRaises(PontosError):
+            calculate_column_scores(
+                {
+                    "AV": ["N"],
+                    "AC": ["L"],
+                    "Au": ["N"],
+                    "C": ["N"],
+                    "I": ["N"],
+                    "A": ["X"],
+                }
+            )
@@ -0,0 +1,214 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from pontos.errors import PontosError
+from pontos.nvd.cvss.scores import CVSSScores
+from pontos.nvd.cvss.v3 import (
+    CVSSv3,
+    calculate_column_scores,
+    calculate_scores,
+    severity,
+)
+from pontos.nvd.models.cvss_v3 import Severity
+
+
+class CVSSv3TestCase(unittest.TestCase):
+    def test_base_score(self):
+        for vector, score in (
+            ("CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H", 9.8),
+            ("CVSS:3.1/AV:N/AC:L/PR:N/UI:R/S:C/C:L/I:L/A:N", 6.1),
+            ("CVSS:3.1/AV:L/AC:L/PR:L/UI:N/S:U/C:H/I:N/A:N", 5.5),
+            ("CVSS:3.0/AV:N/AC:L/PR:L/UI:N/S:C/C:H/I:H/A:H", 9.9),
+            ("CVSS:3.1/AV:P/AC:H/PR:H/UI:R/S:U/C:L/I:N/A:N", 1.6),
+            ("CVSS:3.1/AV:N/AC:H/PR:N/UI:N/S:U/C:N/I:N/A:N", 0.0),
+        ):
+            with self.subTest(vector=vector):
+                self.assertEqual(CVSSv3.from_vector(vector).base_score, score)
+
+    def test_temporal_and_environmental_score(self):
+        cvss = CVSSv3.from_vector(
+            "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H/E:P/RL:O/RC:C/"
+            "CR:H/IR:H/AR:L/MAV:A/MAC:H/MPR:L/MUI:R/MS:C/MC:H/MI:L/MA:N"
+        )
+
+        self.assertEqual(
+            cvss.scores,
+            CVSSScores(
+                base_score=9.8, temporal_score=8.8, environmental_score=6.9
+            ),
+        )
+
+    def test_not_defined(self):
+        cvss = CVSSv3.from_vector(
+            "CVSS:3.1/AV:N/AC:L/PR:N/UI:R/S:C/C:L/I:L/A:N/E:X/MAV:X"
+        )
+
+        self.assertEqual(cvss.temporal_score, 6.1)
+        self.assertEqual(cvss.environmental_score, 6.1)
+        self.assertEqual(
+            cvss.vector_string, "CVSS:3.1/AV:N/AC:L/PR:N/UI:R/S:C/C:L/I:L/A:N"
+        )
+
+    def test_replace(self):
+        cvss = CVSSv3.from_vector(
+            "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H"
+        )
+        modified = cvss.replace(MAV="P", CR="L")
+
+        self.assertEqual(cvss.environmental_score, 9.8)
+        self.assertEqual(modified.base_score, 9.8)
+        self.assertEqual(modified.environmental_score, 6.5)
+        self.assertEqual(
+            modified.vector_string,
+            "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H/CR:L/MAV:P",
+        )
+
+    def test_equal(self):
+        self.assertEqual(
+            CVSSv3.from_vector("CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H"),
+            CVSSv3.from_vector("CVSS:3.1/S:U/AV:N/AC:L/PR:N/UI:N/C:H/I:H/A:H"),
+        )
+        self.assertNotEqual(
+            CVSSv3.from_vector("CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H"),
+            CVSSv3.from_vector("CVSS:3.0/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H"),
+        )
+
+    def test_invalid_vector(self):
+        for vector in (
+            "AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H",
+            "CVSS:2.0/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H",
+            "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H",
+            "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H/A:L",
+            "CVSS:3.1/AV:Q/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H",
+            "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:X/C:H/I:H/A:H",
+            "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H/FOO:X",
+            "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H/",
+        ):
+            with self.subTest(vector=vector), self.assertRaises(PontosError):
+                CVSSv3.from_vector(vector)
+
+    def test_severity(self):
+        self.assertIsNone(severity(0.0))
+        self.assertEqual(severity(0.1), Severity.LOW)
+        self.assertEqual(severity(4.0), Severity.MEDIUM)
+        self.assertEqual(severity(7.0), Severity.HIGH)
+        self.assertEqual(severity(9.0), Severity.CRITICAL)
+
+
+class CalculateScoresTestCase(unittest.TestCase):
+    def test_calculate_scores(self):
+        scores = calculate_scores(
+            [
+                "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H",
+                "CVSS:3.1/AV:N/AC:L/PR:N/UI:R/S:C/C:L/I:L/A:N",
+                "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H",
+            ]
+        )
+
+        self.assertEqual(
+            [score.base_score for score in scores], [9.8, 6.1, 9.8]
+        )
+
+    def test_calculate_scores_with_environment(self):
+        scores = calculate_scores(
+            [
+                "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H",
+                "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H/MAV:N",
+            ],
+            environment={"MAV": "P", "CR": "L"},
+        )
+
+        self.assertEqual(
+            [score.environmental_score for score in scores], [6.5, 6.5]
+        )
+
+    def test_invalid_environment(self):
+        with self.assertRaises(PontosError):
+            calculate_scores([], environment={"MAV": "Q"})
+
+    def test_calculate_column_scores(self):
+        scores = calculate_column_scores(
+            {
+                "AV": ["N", "N"],
+                "AC": ["L", "L"],
+                "PR": ["N", "N"],
+                "UI": ["N", "R"],
+                "S": ["U", "C"],
+                "C": ["H", "L"],
+                "I": ["H", "L"],
+                "A": ["H", "N"],
+                "MAV": ["P", "X"],
+                "CR": ["L", "X"],
+            }
+        )
+
+        self.assertEqual(
+            scores,
+            [
+                CVSSScores(
+                    base_score=9.8, temporal_score=9.8, environmental_score=6.5
+                ),
+                CVSSScores(
+                    base_score=6.1, temporal_score=6.1, environmental_score=6.1
+                ),
+            ],
+        )
+
+    def test_calculate_column_scores_version(self):
+        columns = {
+            "AV": ["N"],
+            "AC": ["L"],
+            "PR": ["L"],
+            "UI": ["N"],
+            "S": ["C"],
+            "C": ["L"],
+            "I": ["L"],
+            "A": ["N"],
+        }
+
+        self.assertEqual(
+            calculate_column_scores(columns, version="3.0")[0].base_score,
+            calculate_column_scores(columns, version="3.1")[0].base_score,
+        )
+
+        with self.assertRaises(PontosError):
+            calculate_column_scores(columns, version="2.0")
+
+    def test_invalid_columns(self):
+        columns = {
+            "AV": ["N"],
+            "AC": ["L"],
+            "PR": ["N"],
+            "UI": ["N"],
+            "S": ["U"],
+            "C": ["H"],
+            "I": ["H"],
+        }
+
+        with self.assertRaisesRegex(PontosError, "Missing"):
+            calculate_column_scores(columns)
+
+        with self.assertRaisesRegex(PontosError, "Invalid value"):
+            calculate_column_scores({**columns, "A": ["Q"]})
+
+        with self.assertRaisesRegex(PontosError, "Unknown"):
+            calculate_column_scores({**columns, "A": ["H"], "FOO": ["X"]})
+
+        with self.assertRaisesRegex(PontosError, "same length"):
+            calculate_column_scores({**columns, "A": ["H", "H"]})
@@ -19,12 +19,21 @@
 
 import unittest
 from datetime import datetime
+from json import JSONDecodeError
+from typing import Any, AsyncIterator, List
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from httpx import AsyncClient
+from httpx import AsyncClient, Request, Response
 
-from pontos.nvd.api import NVDApi, convert_camel_case, format_date, sleep
-from tests import IsolatedAsyncioTestCase
+from pontos.nvd.api import (
+    NVDApi,
+    RateLimiter,
+    convert_camel_case,
+    decode_results,
+    format_date,
+    sleep,
+)
+from tests import AsyncIteratorMock, IsolatedAsyncioTestCase, anext
 
 
 class ConvertCamelCaseTestCase(unittest.TestCase):
@@ -39,6 +48,126 @@ class ConvertCamelCaseTestCase(unittest.TestCase):
         self.assertEqual(converted["other_value"], "bar")
 
 
+def chunked(text: str, size: int) -> AsyncIteratorMock:
+    return AsyncIteratorMock(
+        text[index : index + size] for index in range(0, len(text), size)
+    )
+
+
+async def collect(items: AsyncIterator[Any]) -> List[Any]:
+    return [item async for item in items]
+
+
+class DecodeResultsTestCase(IsolatedAsyncioTestCase):
+    async def test_decode(self):
+        text = """{
+            "resultsPerPage": 2,
+            "startIndex": 0,
+            "totalResults": 2,
+            "vulnerabilities" : [
+                {"cve": {"id": "CVE-1", "vulnStatus": "Analyzed"}} ,
+                {"cve": {"id": "CVE-2", "vulnStatus": "Modified"}}
+            ],
+            "timestamp": "2023-01-01T00:00:00.000"
+        }"""
+
+        data, items = await decode_results(
+            AsyncIteratorMock([text]), "vulnerabilities"
+        )
+
+        self.assertEqual(
+            data, {"results_per_page": 2, "start_index": 0, "total_results": 2}
+        )
+        self.assertEqual(
+            await anext(items),
+            {"cve": {"id": "CVE-1", "vuln_status": "Analyzed"}},
+        )
+        self.assertEqual(
+            await anext(items),
+            {"cve": {"id": "CVE-2", "vuln_status": "Modified"}},
+        )
+
+        with self.assertRaises(StopAsyncIteration):
+            await anext(items)
+
+        self.assertEqual(data["timestamp"], "2023-01-01T00:00:00.000")
+
+    async def test_decode_chunks(self):
+        text = (
+            '{"resultsPerPage": 12345, "vulnerabilities": '
+            '[{"cve": {"id": "CVE-1"}}, {"cve": {"id": "CVE-2"}}], '
+            '"totalResults": 2, "format": "NVD_CVE"}'
+        )
+
+        for size in range(1, len(text) + 1):
+            with self.subTest(size=size):
+                data, items = await decode_results(
+                    chunked(text, size), "vulnerabilities"
+                )
+
+                self.assertEqual(data, {"results_per_page": 12345})
+                self.assertEqual(
+                    await collect(items),
+                    [{"cve": {"id": "CVE-1"}}, {"cve": {"id": "CVE-2"}}],
+                )
+                self.assertEqual(
+                    data,
+                    {
+                        "results_per_page": 12345,
+                        "total_results": 2,
+                        "format": "NVD_CVE",
+                    },
+                )
+
+    async def test_decode_empty(self):
+        data, items = await decode_results(
+            AsyncIteratorMock(['{"totalResults": 0, "vulnerabilities": []}']),
+            "vulnerabilities",
+        )
+
+        self.assertEqual(data, {"total_results": 0})
+        self.assertEqual(await collect(items), [])
+
+        data, items = await decode_results(
+            AsyncIteratorMock(["{}"]), "vulnerabilities"
+        )
+
+        self.assertEqual(data, {})
+        self.assertEqual(await collect(items), [])
+
+    async def test_decode_missing_results(self):
+        data, items = await decode_results(
+            chunked('{"totalResults": 0, "format": "NVD_CVE"}', 3),
+            "vulnerabilities",
+        )
+
+        self.assertEqual(data, {"total_results": 0, "format": "NVD_CVE"})
+        self.assertEqual(await collect(items), [])
+
+    async def test_decode_invalid(self):
+        with self.assertRaises(JSONDecodeError):
+            await decode_results(AsyncIteratorMock(["[]"]), "vulnerabilities")
+
+        data, items = await decode_results(
+            chunked('{"vulnerabilities": [{"id": 1} {"id": 2}]}', 4),
+            "vulnerabilities",
+        )
+        self.assertEqual(await anext(items), {"id": 1})
+
+        with self.assertRaises(JSONDecodeError):
+            await anext(items)
+
+    async def test_decode_truncated(self):
+        data, items = await decode_results(
+            chunked('{"vulnerabilities": [{"id": 1}, {"id": ', 4),
+            "vulnerabilities",
+        )
+        self.assertEqual(await anext(items), {"id": 1})
+
+        with self.assertRaises(JSONDecodeError):
+            await anext(items)
+
+
 class FormatDateTestCase(unittest.TestCase):
     def test_format_date(self):
         dt = datetime(2022, 12, 10, 10, 0, 12, 123)
@@ -103,7 +232,7 @@ class NVDApiTestCase(IsolatedAsyncioTestCase):
 
         await api._get()
 
-        sleep_mock.assert_called_once_with()
+        sleep_mock.assert_called_once()
 
     @patch("pontos.nvd.api.sleep", spec=sleep)
     @patch("pontos.nvd.api.AsyncClient", spec=AsyncClient)
@@ -125,3 +254,138 @@ class NVDApiTestCase(IsolatedAsyncioTestCase):
         await api._get()
 
         sleep_mock.assert_not_called()
+
+    @patch("pontos.nvd.api.sleep", spec=sleep)
+    @patch("pontos.nvd.api.AsyncClient", spec=AsyncClient)
+    async def test_shared_rate_limiter(
+        self, async_client: MagicMock, sleep_mock: MagicMock
+    ):
+        http_client = AsyncMock()
+        async_client.return_value = http_client
+        limiter = RateLimiter(3)
+        api1 = NVDApi("https://foo.bar/baz", rate_limiter=limiter)
+        api2 = NVDApi("https://foo.bar/baz", rate_limiter=limiter)
+
+        await api1._get()
+        await api2._get()
+        await api1._get()
+
+        sleep_mock.assert_not_called()
+
+        await api2._get()
+
+        sleep_mock.assert_called_once()
+
+    @patch("pontos.nvd.api.sleep", spec=sleep)
+    @patch("pontos.nvd.api.AsyncClient", spec=AsyncClient)
+    async def test_retry(self, async_client: MagicMock, sleep_mock: MagicMock):
+        http_client = AsyncMock()
+        http_client.get.side_effect = [
+            Response(403),
+            Response(503, headers={"Retry-After": "10"}),
+            Response(200),
+        ]
+        async_client.return_value = http_client
+        api = NVDApi("https://foo.bar/baz", rate_limit=False)
+
+        response = await api._get()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(http_client.get.await_count, 3)
+        self.assertEqual(sleep_mock.call_count, 2)
+        self.assertEqual(sleep_mock.call_args.args, (10.0,))
+
+    @patch("pontos.nvd.api.sleep", spec=sleep)
+    @patch("pontos.nvd.api.AsyncClient", spec=AsyncClient)
+    async def test_retry_stream(
+        self, async_client: MagicMock, sleep_mock: MagicMock
+    ):
+        retry_response = MagicMock(spec=Response, status_code=503)
+        retry_response.is_success = False
+        retry_response.headers = {}
+        retry_response.aclose = AsyncMock()
+        success_response = MagicMock(spec=Response, status_code=200)
+        success_response.aclose = AsyncMock()
+        http_client = AsyncMock()
+        http_client.build_request = MagicMock(side_effect=Request)
+        http_client.send.side_effect = [retry_response, success_response]
+        async_client.return_value = http_client
+        api = NVDApi("https://foo.bar/baz", rate_limit=False)
+
+        response = await api._get(params={"startIndex": 0}, stream=True)
+
+        self.assertIs(response, success_response)
+        http_client.get.assert_not_awaited()
+        http_client.build_request.assert_called_with(
+            "GET",
+            "https://foo.bar/baz",
+            headers={},
+            params={"startIndex": 0},
+        )
+        self.assertEqual(http_client.send.await_count, 2)
+        self.assertEqual(http_client.send.await_args[1], {"stream": True})
+        retry_response.aclose.assert_awaited_once()
+        success_response.aclose.assert_not_awaited()
+        sleep_mock.assert_called_once()
+
+    @patch("pontos.nvd.api.sleep", spec=sleep)
+    @patch("pontos.nvd.api.AsyncClient", spec=AsyncClient)
+    async def test_retry_exhausted(
+        self, async_client: MagicMock, sleep_mock: MagicMock
+    ):
+        http_client = AsyncMock()
+        http_client.get.return_value = Response(503)
+        async_client.return_value = http_client
+        api = NVDApi("https://foo.bar/baz", rate_limit=False, max_retries=2)
+
+        response = await api._get()
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(http_client.get.await_count, 3)
+        self.assertEqual(sleep_mock.call_count, 2)
+
+
+@patch("pontos.nvd.api.monotonic")
+@patch("pontos.nvd.api.sleep", spec=sleep)
+class RateLimiterTestCase(IsolatedAsyncioTestCase):
+    async def test_within_limit(
+        self, sleep_mock: MagicMock, monotonic_mock: MagicMock
+    ):
+        monotonic_mock.return_value = 100.0
+        limiter = RateLimiter(2, window=30.0)
+
+        await limiter.acquire()
+        await limiter.acquire()
+
+        sleep_mock.assert_not_called()
+
+    async def test_wait_for_window(
+        self, sleep_mock: MagicMock, monotonic_mock: MagicMock
+    ):
+        limiter = RateLimiter(2, window=30.0)
+
+        monotonic_mock.return_value = 100.0
+        await limiter.acquire()
+        monotonic_mock.return_value = 110.0
+        await limiter.acquire()
+        monotonic_mock.return_value = 120.0
+        await limiter.acquire()
+
+        # wait until the first request leaves the window
+        sleep_mock.assert_called_once_with(10.0)
+
+    async def test_window_passed(
+        self, sleep_mock: MagicMock, monotonic_mock: MagicMock
+    ):
+        limiter = RateLimiter(2, window=30.0)
+
+        monotonic_mock.return_value = 100.0
+        await limiter.acquire()
+        await limiter.acquire()
+
+        # slow requests don't require to wait
+        monotonic_mock.return_value = 131.0
+        await limiter.acquire()
+        await limiter.acquire()
+
+        sleep_mock.assert_not_called()
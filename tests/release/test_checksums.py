@@ -0,0 +1,112 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import hashlib
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from pontos.release.checksums import file_digest, hash_files, write_manifest
+from pontos.testing import temp_directory
+from tests import IsolatedAsyncioTestCase
+
+
+class FileDigestTestCase(unittest.TestCase):
+    def test_file_digest(self):
+        with temp_directory() as temp_dir:
+            file_path = temp_dir / "foo.zip"
+            file_path.write_bytes(b"foo" * 1000)
+
+            self.assertEqual(
+                file_digest(file_path),
+                hashlib.sha256(b"foo" * 1000).hexdigest(),
+            )
+
+    def test_file_digest_algorithm(self):
+        with temp_directory() as temp_dir:
+            file_path = temp_dir / "foo.zip"
+            file_path.write_bytes(b"foo")
+
+            self.assertEqual(
+                file_digest(file_path, "sha512"),
+                hashlib.sha512(b"foo").hexdigest(),
+            )
+
+    def test_empty_file(self):
+        with temp_directory() as temp_dir:
+            file_path = temp_dir / "empty.zip"
+            file_path.touch()
+
+            self.assertEqual(
+                file_digest(str(file_path)), hashlib.sha256().hexdigest()
+            )
+
+
+class HashFilesTestCase(IsolatedAsyncioTestCase):
+    async def test_hash_files(self):
+        with temp_directory() as temp_dir:
+            files = []
+            for name in ("foo.zip", "bar.tar.gz", "baz.zip"):
+                file_path = temp_dir / name
+                file_path.write_text(name, encoding="utf8")
+                files.append(file_path)
+
+            digests = {
+                file_path: digest
+                async for file_path, digest in hash_files(files)
+            }
+
+        self.assertEqual(
+            digests,
+            {
+                f: hashlib.sha256(f.name.encode("utf8")).hexdigest()
+                for f in files
+            },
+        )
+
+    async def test_hash_files_with_executor(self):
+        with temp_directory() as temp_dir, ThreadPoolExecutor(1) as executor:
+            file_path = temp_dir / "foo.zip"
+            file_path.write_bytes(b"foo")
+
+            digests = [
+                digest
+                async for digest in hash_files(
+                    [str(file_path)], algorithm="sha1", executor=executor
+                )
+            ]
+
+        self.assertEqual(
+            digests, [(file_path, hashlib.sha1(b"foo").hexdigest())]
+        )
+
+
+class WriteManifestTestCase(unittest.TestCase):
+    def test_write_manifest(self):
+        with temp_directory() as temp_dir:
+            manifest = write_manifest(
+                temp_dir / "SHA256SUMS",
+                {
+                    Path("/tmp/foo.zip"): "abc",
+                    Path("bar.tar.gz"): "def",
+                },
+            )
+
+            self.assertEqual(
+                manifest.read_text(encoding="utf8"),
+                "def  bar.tar.gz\nabc  foo.zip\n",
+            )
@@ -0,0 +1,176 @@
+# Copyright (C) 2023 Greenbone Networks GmbH
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# pylint: disable=protected-access
+
+import os
+import subprocess
+from pathlib import Path
+from unittest.mock import MagicMock, call, patch
+
+from pontos.release.gpg import GPGSigner
+from tests import AsyncMock, IsolatedAsyncioTestCase
+
+
+def create_process(returncode: int = 0) -> MagicMock:
+    process = MagicMock()
+    process.returncode = returncode
+    process.communicate = AsyncMock(return_value=(b"", b"gpg error"))
+    return process
+
+
+def process_call(*cmd: str, stdin=subprocess.DEVNULL):
+    return call(
+        *cmd,
+        stdin=stdin,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+
+
+@patch("pontos.release.gpg.shutil.which", return_value="/usr/bin/gpgconf")
+@patch("pontos.release.gpg.asyncio.create_subprocess_exec", autospec=True)
+class GPGSignerTestCase(IsolatedAsyncioTestCase):
+    async def test_sign(self, subprocess_mock, _which_mock):
+        process = create_process()
+        subprocess_mock.return_value = process
+
+        signer = GPGSigner("1234")
+        signature = await signer.sign(Path("foo.zip"))
+
+        self.assertEqual(signature, Path("foo.zip.asc"))
+        subprocess_mock.assert_has_calls(
+            [
+                process_call("gpgconf", "--launch", "gpg-agent"),
+                process_call(
+                    "gpg",
+                    "--default-key",
+                    "1234",
+                    "--yes",
+                    "--detach-sign",
+                    "--output",
+                    os.devnull,
+                    os.devnull,
+                ),
+                process_call(
+                    "gpg",
+                    "--default-key",
+                    "1234",
+                    "--yes",
+                    "--detach-sign",
+                    "--armor",
+                    "--output",
+                    "foo.zip.asc",
+                    "foo.zip",
+                ),
+            ]
+        )
+        process.communicate.assert_awaited_with(None)
+
+    async def test_sign_with_passphrase(self, subprocess_mock, _which_mock):
+        process = create_process()
+        subprocess_mock.return_value = process
+
+        signer = GPGSigner("1234", passphrase="secret")
+        await signer.sign("foo.zip")
+
+        subprocess_mock.assert_called_with(
+            "gpg",
+            "--batch",
+            "--pinentry-mode",
+            "loopback",
+            "--passphrase-fd",
+            "0",
+            "--default-key",
+            "1234",
+            "--yes",
+            "--detach-sign",
+            "--armor",
+            "--output",
+            "foo.zip.asc",
+            "foo.zip",
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        process.communicate.assert_awaited_with(b"secret\n")
+
+        for c in subprocess_mock.call_args_list:
+            self.assertNotIn("secret", c.args)
+
+    async def test_unlock_once(self, subprocess_mock, _which_mock):
+        subprocess_mock.return_value = create_process()
+
+        signer = GPGSigner("1234")
+        signatures = [
+            signature
+            async for signature in signer.sign_files(
+                ["foo.zip", "bar.zip", "baz.tar.gz"]
+            )
+        ]
+
+        self.assertCountEqual(
+            signatures,
+            [Path("foo.zip.asc"), Path("bar.zip.asc"), Path("baz.tar.gz.asc")],
+        )
+        # launch agent and unlock key once, then sign each file
+        self.assertEqual(subprocess_mock.call_count, 5)
+        launch_calls = [
+            c for c in subprocess_mock.call_args_list if c.args[0] == "gpgconf"
+        ]
+        self.assertEqual(len(launch_calls), 1)
+
+    async def test_sign_failure(self, subprocess_mock, _which_mock):
+        subprocess_mock.side_effect = [
+            create_process(),
+            create_process(),
+            create_process(returncode=2),
+        ]
+
+        signer = GPGSigner("1234", passphrase="secret")
+        with self.assertRaises(subprocess.CalledProcessError) as cm:
+            await signer.sign("foo.zip")
+
+        self.assertEqual(cm.exception.returncode, 2)
+        self.assertEqual(cm.exception.stderr, "gpg error")
+        self.assertIn("--passphrase-fd", cm.exception.cmd)
+        self.assertNotIn("secret", cm.exception.cmd)
+
+    async def test_unlock_failure(self, subprocess_mock, _which_mock):
+        subprocess_mock.side_effect = [
+            create_process(),
+            create_process(returncode=2),
+        ]
+
+        signer = GPGSigner("1234", passphrase="wrong")
+        with self.assertRaises(subprocess.CalledProcessError):
+            await signer.sign("foo.zip")
+
+        self.assertEqual(subprocess_mock.call_count, 2)
+
+    async def test_unlock_without_gpgconf(self, subprocess_mock, which_mock):
+        which_mock.return_value = None
+        subprocess_mock.return_value = create_process()
+
+        signer = GPGSigner("1234")
+        await signer.sign("foo.zip")
+
+        which_mock.assert_called_once_with("gpgconf")
+        # unlock the key and sign the file without launching the agent
+        self.assertEqual(subprocess_mock.call_count, 2)
+        for c in subprocess_mock.call_args_list:
+            self.assertEqual(c[0][0], "gpg")
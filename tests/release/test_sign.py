@@ -14,157 +14,348 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
 # pylint: disable=C0413,W0108
 
-import os
+import hashlib
+import subprocess
 import unittest
-from unittest.mock import MagicMock, patch
+from pathlib import Path
+from typing import Dict, Optional
+from unittest.mock import MagicMock, call, patch
 
 import httpx
 
+from pontos.helper import DownloadProgressCallback
 from pontos.release.main import parse_args
-from pontos.release.sign import SignReturnValue, sign
+from pontos.release.sign import SignReturnValue, _download_progress, sign
 from pontos.terminal.terminal import Terminal
+from pontos.testing import temp_directory
+from tests import AsyncMock
 
 
 def mock_terminal() -> MagicMock:
     return MagicMock(spec=Terminal)
 
 
+ARCHIVE_URL = "https://github.com/greenbone/bar/archive/refs/tags"
+ASSETS_URL = "https://github.com/greenbone/bar/releases/download/v0.0.1"
+
+
+def create_asset(name: str) -> MagicMock:
+    asset = MagicMock(browser_download_url=f"{ASSETS_URL}/{name}", size=3)
+    # name is an argument of the MagicMock constructor
+    asset.name = name
+    return asset
+
+
+class FakeDownloadManager:
+    def __init__(
+        self,
+        contents: Dict[str, bytes],
+        progress: Optional[DownloadProgressCallback] = None,
+    ) -> None:
+        self.contents = contents
+        self.progress = progress
+        self.downloads = []
+
+    async def download_all(self, downloads):
+        for url, destination, length in downloads:
+            self.downloads.append((url, destination, length))
+            content = self.contents[url]
+            destination.write_bytes(content)
+            if self.progress:
+                self.progress(destination, len(content), length)
+            yield destination
+
+
+async def sign_file(file_path: Path) -> Path:
+    return Path(f"{file_path}.asc")
+
+
+async def upload_assets(_repo, _tag, files, **_kwargs):
+    for file_path, _content_type in files:
+        yield file_path
+
+
+async def failing_upload_assets(_repo, _tag, _files, **_kwargs):
+    raise httpx.HTTPStatusError(
+        "Server Error", request=MagicMock(), response=MagicMock()
+    )
+    yield  # pylint: disable=unreachable
+
+
+class DownloadProgressTestCase(unittest.TestCase):
+    def test_report_steps(self):
+        terminal = mock_terminal()
+        progress = _download_progress(terminal)
+
+        for downloaded in (10, 30, 40, 60, 99, 100):
+            progress(Path("foo.zip"), downloaded, 100)
+
+        self.assertEqual(
+            terminal.info.call_args_list,
+            [
+                call("Downloading foo.zip: 25%"),
+                call("Downloading foo.zip: 50%"),
+                call("Downloading foo.zip: 75%"),
+                call("Downloading foo.zip: 100%"),
+            ],
+        )
+
+    def test_unknown_size(self):
+        terminal = mock_terminal()
+        progress = _download_progress(terminal)
+
+        progress(Path("foo.zip"), 100, None)
+
+        terminal.info.assert_not_called()
+
+
+@patch("pontos.release.sign.GPGSigner", autospec=True)
+@patch("pontos.release.sign.GitHubAsyncRESTApi", autospec=True)
 class SignTestCase(unittest.TestCase):
     def setUp(self) -> None:
-        os.environ["GITHUB_TOKEN"] = "foo"
-        self.valid_gh_release_response = (
-            '{"zipball_url": "zip", "tarball_url":'
-            ' "tar", "upload_url":"upload"}'
+        self.terminal = mock_terminal()
+        self.release = MagicMock(
+            assets=[
+                create_asset("bar-0.0.1-linux.zip"),
+                create_asset("bar-0.0.1.txt"),
+            ]
         )
+        self.download_manager = None
 
-    @patch("pontos.release.sign.shell_cmd_runner", autospec=True)
-    @patch("pontos.release.sign.Path", autospec=True)
-    @patch("pontos.github.api.api.httpx", autospec=True)
-    def test_fail_sign_on_invalid_get_response(
-        self,
-        requests_mock,
-        _path_mock,
-        _shell_mock,
-    ):
-        fake_get = MagicMock()
-        fake_get.status_code = 404
-        fake_get.text = self.valid_gh_release_response
-        requests_mock.get.return_value = fake_get
-
-        _, token, args = parse_args(
+        def download_manager(*, progress=None, **_kwargs):
+            self.download_manager = FakeDownloadManager(
+                {
+                    f"{ARCHIVE_URL}/v0.0.1.zip": b"foobar",
+                    f"{ARCHIVE_URL}/v0.0.1.tar.gz": b"loremipsum",
+                    f"{ASSETS_URL}/bar-0.0.1-linux.zip": b"baz",
+                    f"{ASSETS_URL}/bar-0.0.1.txt": b"dolor",
+                },
+                progress,
+            )
+            return self.download_manager
+
+        self.github = MagicMock()
+        self.github.releases.get = AsyncMock(return_value=self.release)
+        self.github.releases.download_manager.side_effect = download_manager
+        self.github.releases.upload_release_assets.side_effect = upload_assets
+
+    def sign(self, *args: str) -> SignReturnValue:
+        _, token, parsed_args = parse_args(
             [
                 "sign",
                 "--project",
-                "foo",
+                "bar",
                 "--release-version",
                 "0.0.1",
+                *args,
             ]
         )
+        return sign(terminal=self.terminal, args=parsed_args, token=token)
+
+    def test_missing_token(self, _api_mock, _signer_mock):
+        _, _, args = parse_args(
+            ["sign", "--project", "bar", "--release-version", "0.0.1"]
+        )
+        released = sign(terminal=mock_terminal(), args=args, token=None)
+
+        self.assertEqual(released, SignReturnValue.TOKEN_MISSING)
+
+    def test_no_release(self, api_mock, signer_mock):
+        self.github.releases.get.side_effect = httpx.HTTPStatusError(
+            "Not Found", request=MagicMock(), response=MagicMock()
+        )
+        api_mock.return_value.__aenter__.return_value = self.github
+
+        released = self.sign()
 
-        with self.assertRaises(httpx.HTTPError):
-            sign(
-                terminal=mock_terminal(),
-                args=args,
-                token=token,
+        self.assertEqual(released, SignReturnValue.NO_RELEASE)
+        signer_mock.assert_not_called()
+        self.github.releases.download_manager.assert_not_called()
+
+    def test_successfully_sign(self, api_mock, signer_mock):
+        api_mock.return_value.__aenter__.return_value = self.github
+        signer_mock.return_value.sign.side_effect = sign_file
+
+        with temp_directory(change_into=True) as temp_dir:
+            released = self.sign()
+
+            self.assertEqual(released, SignReturnValue.SUCCESS)
+            self.assertEqual(
+                (temp_dir / "bar-0.0.1.zip").read_bytes(), b"foobar"
             )
+            self.assertEqual(
+                (temp_dir / "bar-0.0.1.tar.gz").read_bytes(), b"loremipsum"
+            )
+            self.assertEqual(
+                (temp_dir / "bar-0.0.1-linux.zip").read_bytes(), b"baz"
+            )
+            self.assertFalse((temp_dir / "bar-0.0.1.txt").exists())
 
-    @patch("pontos.release.sign.shell_cmd_runner", autospec=True)
-    @patch("pontos.release.sign.Path", autospec=True)
-    @patch("pontos.helper.Path", autospec=True)
-    @patch("pontos.github.api.api.httpx", autospec=True)
-    @patch("pontos.github.api.release.httpx", autospec=True)
-    @patch("pontos.helper.httpx.stream", autospec=True)
-    def test_fail_sign_on_upload_fail(
-        self,
-        stream_mock,
-        request_mock,
-        request2_mock,
-        _path_mock,
-        _path2_mock,
-        _shell_mock,
-    ):
-        fake_get = MagicMock()
-        fake_get.status_code = 200
-        fake_get.text = self.valid_gh_release_response
-        fake_post = MagicMock()
-        fake_post.status_code = 500
-        fake_post.is_success = False
-        fake_post.text = self.valid_gh_release_response
-        fake_post.raise_for_status.side_effect = httpx.HTTPStatusError(
-            "Server Error", request=MagicMock(), response=fake_post
+        self.github.releases.get.assert_awaited_once_with(
+            "greenbone/bar", "v0.0.1"
         )
-        request_mock.get.return_value = fake_get
-        request_mock.post.return_value = fake_post
-        request2_mock.get.return_value = fake_get
-        request2_mock.post.return_value = fake_post
-
-        response = MagicMock()
-        response.iter_bytes.side_effect = [
-            [b"foo", b"bar", b"baz"],
-            [b"lorem", b"ipsum"],
-        ]
-        response_stream = MagicMock()
-        response_stream.__enter__.return_value = response
-        stream_mock.return_value = response_stream
-
-        _, token, args = parse_args(
+        self.assertEqual(
+            self.download_manager.downloads,
             [
-                "sign",
-                "--project",
-                "foo",
-                "--release-version",
-                "0.0.1",
-            ]
+                (f"{ARCHIVE_URL}/v0.0.1.zip", Path("bar-0.0.1.zip"), None),
+                (
+                    f"{ARCHIVE_URL}/v0.0.1.tar.gz",
+                    Path("bar-0.0.1.tar.gz"),
+                    None,
+                ),
+                (
+                    f"{ASSETS_URL}/bar-0.0.1-linux.zip",
+                    Path("bar-0.0.1-linux.zip"),
+                    3,
+                ),
+            ],
         )
-        released = sign(terminal=mock_terminal(), args=args, token=token)
+
+        signer_mock.assert_called_once_with("0ED1E580", passphrase=None)
+        sign_mock = signer_mock.return_value.sign
+        self.assertEqual(sign_mock.call_count, 3)
+        for name in (
+            "bar-0.0.1.zip",
+            "bar-0.0.1.tar.gz",
+            "bar-0.0.1-linux.zip",
+        ):
+            sign_mock.assert_any_await(Path(name))
+
+        upload_mock = self.github.releases.upload_release_assets
+        self.assertEqual(upload_mock.call_count, 3)
+        for name in (
+            "bar-0.0.1.zip.asc",
+            "bar-0.0.1.tar.gz.asc",
+            "bar-0.0.1-linux.zip.asc",
+        ):
+            self.assertIn(
+                call(
+                    "greenbone/bar",
+                    "v0.0.1",
+                    [(Path(name), "application/pgp-signature")],
+                    release=self.release,
+                ),
+                upload_mock.call_args_list,
+            )
+
+    def test_sign_with_passphrase(self, api_mock, signer_mock):
+        api_mock.return_value.__aenter__.return_value = self.github
+        signer_mock.return_value.sign.side_effect = sign_file
+
+        with temp_directory(change_into=True):
+            released = self.sign("--passphrase", "secret")
+
+        self.assertEqual(released, SignReturnValue.SUCCESS)
+        signer_mock.assert_called_once_with("0ED1E580", passphrase="secret")
+
+    def test_download_progress(self, api_mock, signer_mock):
+        api_mock.return_value.__aenter__.return_value = self.github
+        signer_mock.return_value.sign.side_effect = sign_file
+
+        with temp_directory(change_into=True):
+            released = self.sign()
+
+        self.assertEqual(released, SignReturnValue.SUCCESS)
+        # only files with a known size report their progress
+        self.terminal.info.assert_any_call(
+            "Downloading bar-0.0.1-linux.zip: 100%"
+        )
+        self.assertNotIn(
+            call("Downloading bar-0.0.1.zip: 100%"),
+            self.terminal.info.call_args_list,
+        )
+
+    def test_sign_dry_run(self, api_mock, signer_mock):
+        api_mock.return_value.__aenter__.return_value = self.github
+        signer_mock.return_value.sign.side_effect = sign_file
+
+        with temp_directory(change_into=True):
+            released = self.sign("--dry-run")
+
+        self.assertEqual(released, SignReturnValue.SUCCESS)
+        self.assertEqual(signer_mock.return_value.sign.call_count, 3)
+        self.github.releases.upload_release_assets.assert_not_called()
+
+    def test_fail_sign_on_upload_fail(self, api_mock, signer_mock):
+        self.github.releases.upload_release_assets.side_effect = (
+            failing_upload_assets
+        )
+        api_mock.return_value.__aenter__.return_value = self.github
+        signer_mock.return_value.sign.side_effect = sign_file
+
+        with temp_directory(change_into=True):
+            released = self.sign()
 
         self.assertEqual(released, SignReturnValue.UPLOAD_ASSET_ERROR)
 
-    @patch("pontos.release.sign.shell_cmd_runner", autospec=True)
-    @patch("pontos.release.sign.Path", autospec=True)
-    @patch("pontos.helper.Path", autospec=True)
-    @patch("pontos.github.api.api.httpx", autospec=True)
-    @patch("pontos.github.api.release.httpx", autospec=True)
-    @patch("pontos.helper.httpx.stream", autospec=True)
-    def test_successfully_sign(
-        self,
-        stream_mock,
-        request_mock,
-        request_mock2,
-        _path_mock,
-        _path2_mock,
-        _shell_mock,
-    ):
-        fake_get = MagicMock()
-        fake_get.status_code = 200
-        fake_get.text = self.valid_gh_release_response
-        fake_post = MagicMock()
-        fake_post.status_code = 201
-        fake_post.text = self.valid_gh_release_response
-        request_mock.get.return_value = fake_get
-        request_mock.post.return_value = fake_post
-        request_mock2.get.return_value = fake_get
-        request_mock2.post.return_value = fake_post
-
-        response = MagicMock()
-        response.iter_bytes.side_effect = [
-            [b"foo", b"bar", b"baz"],
-            [b"lorem", b"ipsum"],
-        ]
-        response_stream = MagicMock()
-        response_stream.__enter__.return_value = response
-        stream_mock.return_value = response_stream
-
-        _, token, args = parse_args(
-            args=[
-                "sign",
-                "--project",
-                "bar",
-                "--release-version",
-                "0.0.1",
-            ]
+    def test_fail_sign_on_gpg_error(self, api_mock, signer_mock):
+        api_mock.return_value.__aenter__.return_value = self.github
+        signer_mock.return_value.sign.side_effect = (
+            subprocess.CalledProcessError(2, "gpg --detach-sign")
+        )
+
+        with temp_directory(change_into=True), self.assertRaises(
+            subprocess.CalledProcessError
+        ):
+            self.sign()
+
+        self.github.releases.upload_release_assets.assert_not_called()
+
+    def test_sign_checksum_manifest(self, api_mock, signer_mock):
+        api_mock.return_value.__aenter__.return_value = self.github
+        signer_mock.return_value.sign.side_effect = sign_file
+
+        with temp_directory(change_into=True) as temp_dir:
+            released = self.sign("--checksum-manifest")
+
+            self.assertEqual(released, SignReturnValue.SUCCESS)
+            self.assertEqual(
+                (temp_dir / "SHA256SUMS").read_text(encoding="utf8"),
+                f"{hashlib.sha256(b'baz').hexdigest()}  bar-0.0.1-linux.zip\n"
+                f"{hashlib.sha256(b'loremipsum').hexdigest()}  "
+                "bar-0.0.1.tar.gz\n"
+                f"{hashlib.sha256(b'foobar').hexdigest()}  bar-0.0.1.zip\n",
+            )
+
+        signer_mock.return_value.sign.assert_awaited_once_with(
+            Path("SHA256SUMS")
         )
-        released = sign(terminal=mock_terminal(), args=args, token=token)
+        self.github.releases.upload_release_assets.assert_called_once_with(
+            "greenbone/bar",
+            "v0.0.1",
+            [
+                (Path("SHA256SUMS"), "text/plain"),
+                (Path("SHA256SUMS.asc"), "application/pgp-signature"),
+            ],
+            release=self.release,
+        )
+
+    def test_sign_checksum_manifest_dry_run(self, api_mock, signer_mock):
+        api_mock.return_value.__aenter__.return_value = self.github
+        signer_mock.return_value.sign.side_effect = sign_file
+
+        with temp_directory(change_into=True) as temp_dir:
+            released = self.sign("--checksum-manifest", "--dry-run")
+
+            self.assertTrue((temp_dir / "SHA256SUMS").exists())
+
         self.assertEqual(released, SignReturnValue.SUCCESS)
+        signer_mock.return_value.sign.assert_awaited_once_with(
+            Path("SHA256SUMS")
+        )
+        self.github.releases.upload_release_assets.assert_not_called()
+
+    def test_sign_checksum_manifest_upload_fail(self, api_mock, signer_mock):
+        self.github.releases.upload_release_assets.side_effect = (
+            failing_upload_assets
+        )
+        api_mock.return_value.__aenter__.return_value = self.github
+        signer_mock.return_value.sign.side_effect = sign_file
+
+        with temp_directory(change_into=True):
+            released = self.sign("--checksum-manifest")
+
+        self.assertEqual(released, SignReturnValue.UPLOAD_ASSET_ERROR)
@@ -17,6 +17,7 @@
 
 # pylint: disable=redefined-builtin,disallowed-name
 
+import re
 import unittest
 from enum import Enum
 from pathlib import Path
@@ -27,7 +28,9 @@ import httpx
 from pontos.errors import PontosError
 from pontos.helper import (
     DEFAULT_TIMEOUT,
+    AsyncDownloadManager,
     AsyncDownloadProgressIterable,
+    AsyncFileContent,
     DownloadProgressIterable,
     add_sys_path,
     deprecated,
@@ -39,7 +42,7 @@ from pontos.helper import (
     snake_case,
     unload_module,
 )
-from pontos.testing import temp_file, temp_python_module
+from pontos.testing import temp_directory, temp_file, temp_python_module
 from tests import (
     AsyncIteratorMock,
     AsyncMock,
@@ -149,6 +152,379 @@ class DownloadAsyncTestCase(IsolatedAsyncioTestCase):
                 pass
 
 
+class AsyncFileContentTestCase(IsolatedAsyncioTestCase):
+    async def test_content(self):
+        with temp_file(content="foo" * 10) as f:
+            content = AsyncFileContent(f, chunk_size=12)
+
+            self.assertEqual(content.length, 30)
+            chunks = [chunk async for chunk in content]
+
+            self.assertEqual(
+                chunks, [b"foofoofoofoo", b"foofoofoofoo", b"foofoo"]
+            )
+
+            # can be iterated again
+            self.assertEqual(
+                b"".join([chunk async for chunk in content]), b"foo" * 10
+            )
+
+    async def test_empty(self):
+        with temp_file(content="") as f:
+            content = AsyncFileContent(f)
+
+            self.assertEqual(content.length, 0)
+            self.assertEqual([chunk async for chunk in content], [])
+
+
+CONTENT = bytes(range(256)) * 40
+
+RANGE_REGEX = re.compile(r"bytes=(\d+)-(\d*)")
+
+
+class FailingStream(httpx.AsyncByteStream):
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+
+    async def __aiter__(self):
+        yield self.content
+        raise httpx.ReadError("connection lost")
+
+
+class DownloadServer:
+    """
+    Serves CONTENT with support for Range requests
+    """
+
+    def __init__(self, *, ranges=True, fail=0, disconnect=0, etag='"1"'):
+        self.ranges = ranges
+        self.fail = fail
+        self.disconnect = disconnect
+        self.etag = etag
+        self.requests = []
+        self.if_ranges = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        range_header = request.headers.get("range")
+        self.requests.append(range_header)
+        if_range = request.headers.get("if-range")
+        self.if_ranges.append(if_range)
+
+        if self.fail:
+            self.fail -= 1
+            return httpx.Response(503)
+
+        if if_range and if_range != self.etag:
+            # the file has changed. send the whole file.
+            range_header = None
+
+        status = 200
+        content = CONTENT
+        headers = {"ETag": self.etag} if self.etag else {}
+        if self.ranges and range_header:
+            start, end = RANGE_REGEX.fullmatch(range_header).groups()
+            start = int(start)
+            if start >= len(CONTENT):
+                return httpx.Response(416)
+            content = CONTENT[start : int(end) + 1 if end else None]
+            status = 206
+
+        if self.disconnect:
+            self.disconnect -= 1
+            return httpx.Response(
+                status,
+                headers=headers,
+                stream=FailingStream(content[: len(content) // 2]),
+            )
+
+        return httpx.Response(status, headers=headers, content=content)
+
+
+class AsyncDownloadManagerTestCase(IsolatedAsyncioTestCase):
+    def create_manager(self, server: DownloadServer, **kwargs):
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(server.handler)
+        )
+        self.addAsyncCleanup(client.aclose)
+        return AsyncDownloadManager(
+            lambda url, headers: client.stream("GET", url, headers=headers),
+            **kwargs,
+        )
+
+    @patch("pontos.helper.asyncio.sleep", new_callable=AsyncMock)
+    async def test_download(self, _sleep_mock: AsyncMock):
+        server = DownloadServer()
+        manager = self.create_manager(server)
+
+        with temp_directory() as tmp:
+            path = await manager.download("https://foo.bar/baz", tmp / "baz")
+
+            self.assertEqual(path, tmp / "baz")
+            self.assertEqual(path.read_bytes(), CONTENT)
+            self.assertEqual(list(tmp.iterdir()), [path])
+
+        self.assertEqual(server.requests, [None])
+
+    async def test_download_parts(self):
+        server = DownloadServer()
+        progress = MagicMock()
+        manager = self.create_manager(server, part_size=4000, progress=progress)
+
+        with temp_directory() as tmp:
+            path = await manager.download(
+                "https://foo.bar/baz", tmp / "baz", length=len(CONTENT)
+            )
+
+            self.assertEqual(path.read_bytes(), CONTENT)
+            self.assertEqual(list(tmp.iterdir()), [path])
+
+        self.assertEqual(
+            sorted(server.requests),
+            ["bytes=0-3999", "bytes=4000-7999", "bytes=8000-10239"],
+        )
+        progress.assert_called_with(tmp / "baz", len(CONTENT), len(CONTENT))
+        self.assertEqual(progress.call_count, 3)
+
+    @patch("pontos.helper.os.sendfile", create=True)
+    async def test_download_parts_without_sendfile(
+        self, sendfile_mock: MagicMock
+    ):
+        sendfile_mock.side_effect = OSError("not supported")
+        server = DownloadServer()
+        manager = self.create_manager(server, part_size=4000)
+
+        with temp_directory() as tmp:
+            path = await manager.download(
+                "https://foo.bar/baz", tmp / "baz", length=len(CONTENT)
+            )
+
+            self.assertEqual(path.read_bytes(), CONTENT)
+
+        sendfile_mock.assert_called()
+
+    async def test_download_parts_without_range_support(self):
+        server = DownloadServer(ranges=False)
+        manager = self.create_manager(server, part_size=4000)
+
+        with temp_directory() as tmp:
+            path = await manager.download(
+                "https://foo.bar/baz", tmp / "baz", length=len(CONTENT)
+            )
+
+            self.assertEqual(path.read_bytes(), CONTENT)
+            self.assertEqual(list(tmp.iterdir()), [path])
+
+        self.assertIsNone(server.requests[-1])
+
+    @patch("pontos.helper.asyncio.sleep", new_callable=AsyncMock)
+    async def test_resume_after_disconnect(self, sleep_mock: AsyncMock):
+        server = DownloadServer(disconnect=1)
+        manager = self.create_manager(server)
+
+        with temp_directory() as tmp:
+            path = await manager.download("https://foo.bar/baz", tmp / "baz")
+
+            self.assertEqual(path.read_bytes(), CONTENT)
+
+        self.assertEqual(server.requests, [None, "bytes=5120-"])
+        sleep_mock.assert_awaited_once()
+
+    @patch("pontos.helper.asyncio.sleep", new_callable=AsyncMock)
+    async def test_retry_server_error(self, _sleep_mock: AsyncMock):
+        server = DownloadServer(fail=2)
+        manager = self.create_manager(server, part_size=8000)
+
+        with temp_directory() as tmp:
+            path = await manager.download(
+                "https://foo.bar/baz", tmp / "baz", length=len(CONTENT)
+            )
+
+            self.assertEqual(path.read_bytes(), CONTENT)
+
+        self.assertEqual(len(server.requests), 4)
+
+    @patch("pontos.helper.asyncio.sleep", new_callable=AsyncMock)
+    async def test_max_retries(self, _sleep_mock: AsyncMock):
+        server = DownloadServer(fail=3)
+        manager = self.create_manager(server, max_retries=2)
+
+        with temp_directory() as tmp, self.assertRaises(httpx.HTTPStatusError):
+            await manager.download("https://foo.bar/baz", tmp / "baz")
+
+        self.assertEqual(len(server.requests), 3)
+
+    async def test_client_error(self):
+        def handler(request):
+            return httpx.Response(404)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.addAsyncCleanup(client.aclose)
+        manager = AsyncDownloadManager(
+            lambda url, headers: client.stream("GET", url, headers=headers)
+        )
+
+        with temp_directory() as tmp, self.assertRaises(httpx.HTTPStatusError):
+            await manager.download("https://foo.bar/baz", tmp / "baz")
+
+    async def test_resume_partial_files(self):
+        server = DownloadServer()
+        manager = self.create_manager(server, part_size=4000)
+
+        with temp_directory() as tmp:
+            (tmp / "baz.part0").write_bytes(CONTENT[:1000])
+            (tmp / "baz.part1").write_bytes(CONTENT[4000:8000])
+            (tmp / "baz.validator").write_text('"1"', encoding="utf-8")
+
+            path = await manager.download(
+                "https://foo.bar/baz", tmp / "baz", length=len(CONTENT)
+            )
+
+            self.assertEqual(path.read_bytes(), CONTENT)
+            self.assertEqual(list(tmp.iterdir()), [path])
+
+        self.assertEqual(
+            sorted(server.requests), ["bytes=1000-3999", "bytes=8000-10239"]
+        )
+        self.assertEqual(server.if_ranges, ['"1"', '"1"'])
+
+    async def test_resume_changed_file(self):
+        server = DownloadServer(etag='"2"')
+        manager = self.create_manager(server, part_size=4000)
+
+        with temp_directory() as tmp:
+            (tmp / "baz.part0").write_bytes(b"x" * 1000)
+            (tmp / "baz.part1").write_bytes(b"x" * 4000)
+            (tmp / "baz.validator").write_text('"1"', encoding="utf-8")
+
+            path = await manager.download(
+                "https://foo.bar/baz", tmp / "baz", length=len(CONTENT)
+            )
+
+            self.assertEqual(path.read_bytes(), CONTENT)
+            self.assertEqual(list(tmp.iterdir()), [path])
+
+        # the whole file is downloaded again
+        self.assertEqual(server.if_ranges[:2], ['"1"', '"1"'])
+        self.assertIsNone(server.requests[-1])
+
+    async def test_resume_single_changed_file(self):
+        server = DownloadServer(etag='"2"')
+        manager = self.create_manager(server)
+
+        with temp_directory() as tmp:
+            (tmp / "baz.part0").write_bytes(b"x" * 1000)
+            (tmp / "baz.validator").write_text('"1"', encoding="utf-8")
+
+            path = await manager.download("https://foo.bar/baz", tmp / "baz")
+
+            self.assertEqual(path.read_bytes(), CONTENT)
+
+        self.assertEqual(server.requests, ["bytes=1000-"])
+        self.assertEqual(server.if_ranges, ['"1"'])
+
+    async def test_restart_parts_without_validator(self):
+        server = DownloadServer()
+        manager = self.create_manager(server)
+
+        with temp_directory() as tmp:
+            (tmp / "baz.part0").write_bytes(b"x" * 1000)
+
+            path = await manager.download("https://foo.bar/baz", tmp / "baz")
+
+            self.assertEqual(path.read_bytes(), CONTENT)
+
+        self.assertEqual(server.requests, [None])
+
+    async def test_file_changed_during_download(self):
+        server = DownloadServer()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            response = server.handler(request)
+            if request.headers.get("range") == "bytes=4000-7999":
+                # another version of the file
+                response.headers["ETag"] = '"2"'
+            return response
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.addAsyncCleanup(client.aclose)
+        manager = AsyncDownloadManager(
+            lambda url, headers: client.stream("GET", url, headers=headers),
+            part_size=4000,
+            max_concurrency=1,
+        )
+
+        with temp_directory() as tmp:
+            path = await manager.download(
+                "https://foo.bar/baz", tmp / "baz", length=len(CONTENT)
+            )
+
+            self.assertEqual(path.read_bytes(), CONTENT)
+            self.assertEqual(list(tmp.iterdir()), [path])
+
+        self.assertEqual(
+            server.requests[:2], ["bytes=0-3999", "bytes=4000-7999"]
+        )
+        self.assertIsNone(server.requests[-1])
+
+    async def test_resume_complete_file(self):
+        server = DownloadServer()
+        manager = self.create_manager(server)
+
+        with temp_directory() as tmp:
+            (tmp / "baz.part0").write_bytes(CONTENT)
+            (tmp / "baz.validator").write_text('"1"', encoding="utf-8")
+
+            path = await manager.download("https://foo.bar/baz", tmp / "baz")
+
+            self.assertEqual(path.read_bytes(), CONTENT)
+
+        self.assertEqual(server.requests, [f"bytes={len(CONTENT)}-"])
+
+    async def test_restart_without_range_support(self):
+        server = DownloadServer(ranges=False)
+        manager = self.create_manager(server)
+
+        with temp_directory() as tmp:
+            (tmp / "baz.part0").write_bytes(b"foo")
+
+            path = await manager.download("https://foo.bar/baz", tmp / "baz")
+
+            self.assertEqual(path.read_bytes(), CONTENT)
+
+    async def test_length_mismatch(self):
+        server = DownloadServer()
+        manager = self.create_manager(server)
+
+        with temp_directory() as tmp:
+            with self.assertRaises(PontosError):
+                await manager.download(
+                    "https://foo.bar/baz", tmp / "baz", length=10
+                )
+
+            self.assertEqual(list(tmp.iterdir()), [])
+
+    async def test_download_all(self):
+        server = DownloadServer()
+        manager = self.create_manager(server, part_size=4000)
+
+        with temp_directory() as tmp:
+            paths = [
+                path
+                async for path in manager.download_all(
+                    [
+                        ("https://foo.bar/a", tmp / "a", len(CONTENT)),
+                        ("https://foo.bar/b", tmp / "b", None),
+                    ]
+                )
+            ]
+
+            self.assertEqual(sorted(paths), [tmp / "a", tmp / "b"])
+            for path in paths:
+                self.assertEqual(path.read_bytes(), CONTENT)
+
+        self.assertEqual(len(server.requests), 4)
+
+
 class DownloadProgressIterableTestCase(unittest.TestCase):
     def test_properties(self):
         content = ["foo", "bar", "baz"]
@@ -261,7 +637,6 @@ class DownloadTestCase(unittest.TestCase):
         with download(
             "https://github.com/greenbone/pontos/archive/refs/tags/v21.11.0.tar.gz"  # pylint: disable=line-too-long
         ) as download_progress:
-
             requests_mock.assert_called_once_with(
                 "GET",
                 "https://github.com/greenbone/pontos/archive/refs/tags/v21.11.0.tar.gz",  # pylint: disable=line-too-long
@@ -313,7 +688,6 @@ class DownloadTestCase(unittest.TestCase):
             "https://github.com/greenbone/pontos/archive/refs/tags/v21.11.0.tar.gz",  # pylint: disable=line-too-long
             download_file,
         ) as download_progress:
-
             requests_mock.assert_called_once_with(
                 "GET",
                 "https://github.com/greenbone/pontos/archive/refs/tags/v21.11.0.tar.gz",  # pylint: disable=line-too-long
@@ -343,6 +717,34 @@ class DownloadTestCase(unittest.TestCase):
             with self.assertRaises(StopIteration):
                 next(it)
 
+    @patch("pontos.helper.Path")
+    @patch("pontos.github.api.api.httpx.stream")
+    def test_download_with_client(
+        self, requests_mock: MagicMock, path_mock: MagicMock
+    ):
+        response = MagicMock()
+        response.iter_bytes.return_value = [b"foo"]
+        response.headers = {"content-length": "3"}
+        client = MagicMock(spec=httpx.Client)
+        client.stream.return_value.__enter__.return_value = response
+
+        with download(
+            "https://github.com/foo/bar/archive/refs/tags/v1.2.3.tar.gz",
+            path_mock(),
+            client=client,
+        ) as download_progress:
+            client.stream.assert_called_once_with(
+                "GET",
+                "https://github.com/foo/bar/archive/refs/tags/v1.2.3.tar.gz",
+                timeout=DEFAULT_TIMEOUT,
+                follow_redirects=True,
+                headers=None,
+                params=None,
+            )
+            requests_mock.assert_not_called()
+
+            self.assertEqual(download_progress.length, 3)
+
 
 class DeprecatedTestCase(unittest.TestCase):
     def test_function(self):
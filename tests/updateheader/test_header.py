@@ -24,18 +24,26 @@ from io import StringIO
 from pathlib import Path
 from subprocess import CalledProcessError, CompletedProcess
 from unittest import TestCase
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from pontos.terminal.terminal import ConsoleTerminal
+from pontos.testing import temp_directory
 from pontos.updateheader.updateheader import _add_header as add_header
+from pontos.updateheader.updateheader import _edit_file as edit_file
+from pontos.updateheader.updateheader import _ExcludeMatcher as ExcludeMatcher
 from pontos.updateheader.updateheader import _find_copyright as find_copyright
 from pontos.updateheader.updateheader import (
-    _get_exclude_list as get_exclude_list,
+    _get_exclude_matcher as get_exclude_matcher,
 )
 from pontos.updateheader.updateheader import (
     _get_modified_year as get_modified_year,
 )
+from pontos.updateheader.updateheader import (
+    _get_modified_years as get_modified_years,
+)
+from pontos.updateheader.updateheader import _iter_files as iter_files
 from pontos.updateheader.updateheader import _parse_args as parse_args
+from pontos.updateheader.updateheader import _read_template as read_template
 from pontos.updateheader.updateheader import _update_file as update_file
 from pontos.updateheader.updateheader import main
 
@@ -107,6 +115,53 @@ class UpdateHeaderTestCase(TestCase):
         with self.assertRaises(CalledProcessError):
             get_modified_year(f=test_file)
 
+    @patch("pontos.updateheader.updateheader.run")
+    def test_get_modified_years(self, run_mock):
+        run_mock.side_effect = [
+            CompletedProcess(
+                args=["git", "rev-parse", "--show-toplevel"],
+                returncode=0,
+                stdout="/foo\n",
+                stderr="",
+            ),
+            CompletedProcess(
+                args=["git", "log"],
+                returncode=0,
+                stdout=(
+                    "\x012021\0\nbar/baz.py\0foo.py\0"
+                    "\x012020\0\nfoo.py\0lorem ipsum.py\0"
+                ),
+                stderr="",
+            ),
+        ]
+
+        years = get_modified_years([Path("/foo/bar"), Path("/foo/foo.py")])
+
+        self.assertEqual(
+            years,
+            {
+                Path("/foo/bar/baz.py"): "2021",
+                Path("/foo/foo.py"): "2021",
+                Path("/foo/lorem ipsum.py"): "2020",
+            },
+        )
+        run_mock.assert_called_with(
+            [
+                "git",
+                "log",
+                "-z",
+                "--format=%x01%ad",
+                "--date=format:%Y",
+                "--name-only",
+                "--",
+                "/foo/bar",
+                "/foo/foo.py",
+            ],
+            text=True,
+            capture_output=True,
+            check=True,
+        )
+
     def test_find_copyright(self):
         test_line = "# Copyright (C) 1995-2021 Greenbone Networks GmbH"
         test2_line = "# Copyright (C) 1995 Greenbone Networks GmbH"
@@ -306,6 +361,74 @@ class UpdateHeaderTestCase(TestCase):
         self.assertIn(f"using {self.args.year} instead.", ret)
         self.assertIn("File is not existing.", ret)
 
+    @patch("sys.stdout", new_callable=StringIO)
+    @patch("pontos.updateheader.updateheader.run")
+    def test_update_file_changed_modified_years(self, run_mock, mock_stdout):
+        self.args.year = "2021"
+        self.args.changed = True
+        self.args.licence = "AGPL-3.0-or-later"
+
+        term = Terminal()
+
+        with temp_directory() as temp_dir:
+            test_file = temp_dir / "test.py"
+            test_file.write_text(HEADER.format(date="2020"), encoding="utf-8")
+
+            code = update_file(
+                file=test_file,
+                regex=self.regex,
+                parsed_args=self.args,
+                term=term,
+                modified_years={test_file.resolve(): "2022"},
+            )
+
+            self.assertEqual(code, 0)
+            self.assertIn(
+                "# Copyright (C) 2020-2022 Greenbone Networks GmbH",
+                test_file.read_text(encoding="utf-8"),
+            )
+
+        run_mock.assert_not_called()
+        self.assertEqual(
+            mock_stdout.getvalue(),
+            f"{test_file}: Changed Licence Header "
+            "Copyright Year None -> 2022\n",
+        )
+
+    @patch("sys.stdout", new_callable=StringIO)
+    @patch("pontos.updateheader.updateheader.run")
+    def test_update_file_changed_modified_years_symlink(
+        self, run_mock, mock_stdout
+    ):
+        self.args.year = "2021"
+        self.args.changed = True
+        self.args.licence = "AGPL-3.0-or-later"
+
+        term = Terminal()
+
+        with temp_directory() as temp_dir:
+            (temp_dir / "real").mkdir()
+            (temp_dir / "link").symlink_to(temp_dir / "real")
+            real_file = temp_dir / "real" / "test.py"
+            real_file.write_text(HEADER.format(date="2020"), encoding="utf-8")
+            test_file = temp_dir / "link" / "test.py"
+
+            code = update_file(
+                file=test_file,
+                regex=self.regex,
+                parsed_args=self.args,
+                term=term,
+                modified_years={real_file.resolve(): "2022"},
+            )
+
+            self.assertEqual(code, 0)
+            self.assertIn(
+                "# Copyright (C) 2020-2022 Greenbone Networks GmbH",
+                real_file.read_text(encoding="utf-8"),
+            )
+
+        run_mock.assert_not_called()
+
     @patch("sys.stdout", new_callable=StringIO)
     def test_update_create_header(self, mock_stdout):
         self.args.year = "1995"
@@ -399,6 +522,97 @@ class UpdateHeaderTestCase(TestCase):
 
         test_file.unlink()
 
+    @patch("sys.stdout", new_callable=StringIO)
+    def test_update_file_nul_bytes(self, mock_stdout):
+        self.args.year = "2021"
+        self.args.changed = False
+        self.args.licence = "AGPL-3.0-or-later"
+
+        term = Terminal()
+
+        with temp_directory() as temp_dir:
+            test_file = temp_dir / "test.py"
+            test_file.write_bytes(b"foo\0bar\n")
+
+            with self.assertRaises(UnicodeDecodeError):
+                update_file(
+                    file=test_file,
+                    regex=self.regex,
+                    parsed_args=self.args,
+                    term=term,
+                )
+
+            self.assertEqual(test_file.read_bytes(), b"foo\0bar\n")
+
+        self.assertEqual(
+            mock_stdout.getvalue(), f"{test_file}: Ignoring binary file.\n"
+        )
+
+    def test_add_header_cached_template(self):
+        read_template.cache_clear()
+        add_header.cache_clear()
+
+        with patch(
+            "pontos.updateheader.updateheader.Path.read_text",
+            return_value="# <year> <company>",
+        ) as read_text_mock:
+            for year in ("2021", "2022", "2021"):
+                header = add_header(
+                    ".py", "AGPL-3.0-or-later", "Greenbone Networks GmbH", year
+                )
+                self.assertEqual(header, f"# {year} Greenbone Networks GmbH")
+
+        read_text_mock.assert_called_once_with(encoding="utf-8")
+
+        read_template.cache_clear()
+        add_header.cache_clear()
+
+    def test_edit_file_in_place(self):
+        with temp_directory() as temp_dir:
+            test_file = temp_dir / "test.py"
+            test_file.write_bytes(b"# 2020-2021\nfoo\n")
+            inode = test_file.stat().st_ino
+
+            edit_file(test_file, 0, b"# 2020-2021\n", b"# 2020-2022\n")
+
+            self.assertEqual(test_file.read_bytes(), b"# 2020-2022\nfoo\n")
+            self.assertEqual(test_file.stat().st_ino, inode)
+
+    def test_edit_file_copy(self):
+        with temp_directory() as temp_dir:
+            test_file = temp_dir / "test.py"
+            test_file.write_bytes(b"#!/bin/sh\n# 2020\n" + b"foo\n" * 1000)
+            test_file.chmod(0o755)
+
+            edit_file(test_file, 10, b"# 2020\n", b"# 2020-2021\n")
+
+            self.assertEqual(
+                test_file.read_bytes(),
+                b"#!/bin/sh\n# 2020-2021\n" + b"foo\n" * 1000,
+            )
+            self.assertEqual(test_file.stat().st_mode & 0o777, 0o755)
+            self.assertEqual(list(temp_dir.iterdir()), [test_file])
+
+    def test_edit_file_symlink(self):
+        with temp_directory() as temp_dir:
+            test_file = temp_dir / "test.py"
+            test_file.write_bytes(b"foo\n")
+            link = temp_dir / "link.py"
+            link.symlink_to(test_file)
+
+            edit_file(link, 0, b"", b"# header\n")
+
+            self.assertTrue(link.is_symlink())
+            self.assertEqual(test_file.read_bytes(), b"# header\nfoo\n")
+
+    @patch("pontos.updateheader.updateheader.Path.open")
+    @patch("pontos.updateheader.updateheader.tempfile")
+    def test_edit_file_unchanged(self, tempfile_mock, open_mock):
+        edit_file(Path("test.py"), 0, b"# 2021\n", b"# 2021\n")
+
+        tempfile_mock.mkstemp.assert_not_called()
+        open_mock.assert_not_called()
+
     def test_argparser_files(self):
         self.args.year = "2021"
         self.args.changed = False
@@ -428,21 +642,111 @@ class UpdateHeaderTestCase(TestCase):
         self.assertEqual(args.year, str(datetime.datetime.now().year))
         self.assertEqual(args.licence, self.args.licence)
 
-    def test_get_exclude_list(self):
-        # Try to find the current file from two directories up...
-        test_dirname = Path(__file__) / "../.."
+    def test_get_exclude_matcher(self):
         # with a relative glob
         test_ignore_file = Path("ignore.file")
         test_ignore_file.write_text("*.py\n", encoding="utf-8")
 
-        exclude_list = get_exclude_list(
-            test_ignore_file, [test_dirname.resolve()]
+        matcher = get_exclude_matcher(test_ignore_file)
+
+        self.assertTrue(matcher.excluded("tests/updateheader/test_header.py"))
+        self.assertTrue(matcher.excluded("test_header.py"))
+        self.assertFalse(matcher.excluded("tests/updateheader/__init__.pyc"))
+
+        test_ignore_file.unlink()
+
+    def test_get_exclude_matcher_negation(self):
+        test_ignore_file = Path("ignore.file")
+        test_ignore_file.write_text(
+            "*.log\n!keep.log\n/build\n", encoding="utf-8"
         )
 
-        self.assertIn(Path(__file__), exclude_list)
+        matcher = get_exclude_matcher(test_ignore_file)
+
+        self.assertTrue(matcher.excluded("foo/debug.log"))
+        self.assertFalse(matcher.excluded("keep.log"))
+        self.assertFalse(matcher.excluded("foo/keep.log"))
+        self.assertTrue(matcher.excluded("build", is_dir=True))
+        self.assertFalse(matcher.excluded("foo/build", is_dir=True))
 
         test_ignore_file.unlink()
 
+    @patch("sys.stdout", new_callable=StringIO)
+    def test_get_exclude_matcher_no_file(self, mock_stdout):
+        self.assertIsNone(get_exclude_matcher(Path("not-existing.file")))
+        self.assertEqual(
+            mock_stdout.getvalue(), "No exclude list file found.\n"
+        )
+
+    def test_exclude_matcher(self):
+        matcher = ExcludeMatcher(
+            [
+                "# comment",
+                "",
+                "build",
+                "*.log",
+                "!keep.log",
+                "dist/",
+                "/root.py",
+                "docs/*.txt",
+                "**/generated/**",
+                "foo?.[ch]",
+                "spam[!0-9].py",
+            ]
+        )
+
+        self.assertTrue(matcher.excluded("build"))
+        self.assertTrue(matcher.excluded("foo/build", is_dir=True))
+        self.assertTrue(matcher.excluded("foo/bar.log"))
+        self.assertFalse(matcher.excluded("foo/keep.log"))
+        self.assertTrue(matcher.excluded("foo/dist", is_dir=True))
+        self.assertFalse(matcher.excluded("foo/dist"))
+        self.assertTrue(matcher.excluded("root.py"))
+        self.assertFalse(matcher.excluded("foo/root.py"))
+        self.assertTrue(matcher.excluded("docs/readme.txt"))
+        self.assertFalse(matcher.excluded("docs/api/readme.txt"))
+        self.assertFalse(matcher.excluded("foo/docs/readme.txt"))
+        self.assertTrue(matcher.excluded("foo/generated/bar/baz.py"))
+        self.assertTrue(matcher.excluded("foo1.c"))
+        self.assertTrue(matcher.excluded("bar/foo2.h"))
+        self.assertFalse(matcher.excluded("foo12.c"))
+        self.assertTrue(matcher.excluded("spamx.py"))
+        self.assertFalse(matcher.excluded("spam1.py"))
+        self.assertFalse(matcher.excluded("comment"))
+        self.assertFalse(matcher.excluded("foo/bar.py"))
+
+    def test_exclude_matcher_parent(self):
+        parent = ExcludeMatcher(["*.log", "/foo.py"])
+        matcher = ExcludeMatcher(
+            ["!keep.log", "/bar.py"], parent=parent, prefix="sub/"
+        )
+
+        self.assertTrue(matcher.excluded("sub/foo.log"))
+        self.assertFalse(matcher.excluded("sub/keep.log"))
+        self.assertTrue(parent.excluded("keep.log"))
+        self.assertTrue(matcher.excluded("sub/bar.py"))
+        self.assertFalse(matcher.excluded("bar.py"))
+        self.assertTrue(matcher.excluded("foo.py"))
+        self.assertFalse(matcher.excluded("sub/foo.py"))
+
+    def test_exclude_matcher_last_pattern_wins(self):
+        matcher = ExcludeMatcher(["!foo.py", "foo.py", "*.log", "!keep.log"])
+
+        self.assertTrue(matcher.excluded("foo.py"))
+        self.assertTrue(matcher.excluded("bar/foo.py"))
+        self.assertTrue(matcher.excluded("debug.log"))
+        self.assertFalse(matcher.excluded("keep.log"))
+
+        matcher = ExcludeMatcher(["!keep.log", "*.log"])
+
+        self.assertTrue(matcher.excluded("keep.log"))
+
+    def test_exclude_matcher_negated_directory(self):
+        matcher = ExcludeMatcher(["build", "!build/"])
+
+        self.assertFalse(matcher.excluded("build", is_dir=True))
+        self.assertTrue(matcher.excluded("build"))
+
     @patch("pontos.updateheader.updateheader._parse_args")
     def test_main(self, argparser_mock):
         self.args.year = "2021"
@@ -453,6 +757,7 @@ class UpdateHeaderTestCase(TestCase):
         self.args.verbose = 0
         self.args.log_file = None
         self.args.quiet = False
+        self.args.jobs = 1
 
         argparser_mock.return_value = self.args
 
@@ -462,6 +767,187 @@ class UpdateHeaderTestCase(TestCase):
         # I have no idea how or why test main ...
         self.assertTrue(code)
 
+    @patch("sys.stdout", new_callable=StringIO)
+    @patch("pontos.updateheader.updateheader._parse_args")
+    def test_main_directories(self, argparser_mock, mock_stdout):
+        self.args.year = "2021"
+        self.args.changed = False
+        self.args.licence = "AGPL-3.0-or-later"
+        self.args.files = None
+        self.args.verbose = 0
+        self.args.log_file = None
+        self.args.quiet = True
+        self.args.jobs = 2
+        self.args.gitignore = True
+
+        argparser_mock.return_value = self.args
+
+        with temp_directory(change_into=True) as temp_dir:
+            self.args.directories = [str(temp_dir)]
+            self.args.exclude_file = temp_dir / "ignore.file"
+            self.args.exclude_file.write_text("build\n", encoding="utf-8")
+
+            (temp_dir / "foo").mkdir()
+            (temp_dir / "build").mkdir()
+            ok_file = temp_dir / "foo" / "ok.py"
+            ok_file.write_text(HEADER.format(date="2021"), encoding="utf-8")
+            new_file = temp_dir / "new.py"
+            new_file.touch()
+            build_file = temp_dir / "build" / "build.py"
+            build_file.touch()
+            (temp_dir / ".gitignore").write_text("*.log\n", encoding="utf-8")
+            log_file = temp_dir / "foo" / "debug.log"
+            log_file.write_text("log", encoding="utf-8")
+            image_file = temp_dir / "foo" / "logo.png"
+            image_file.write_bytes(b"no header")
+
+            main()
+
+            self.assertEqual(
+                new_file.read_text(encoding="utf-8"),
+                HEADER.format(date="2021") + "\n\n",
+            )
+            self.assertEqual(build_file.read_text(encoding="utf-8"), "")
+            self.assertEqual(image_file.read_bytes(), b"no header")
+
+        ret = mock_stdout.getvalue()
+        self.assertIn(f"{new_file}: Added licence header.", ret)
+        self.assertIn(f"{ok_file}: Licence Header is ok.", ret)
+        self.assertNotIn("build.py", ret)
+        self.assertNotIn("debug.log", ret)
+        self.assertIn(f"{image_file}: Ignoring binary file.", ret)
+
+    def _run_main_in_directory(self, temp_dir: Path, jobs: int) -> str:
+        self.args.year = "2021"
+        self.args.changed = False
+        self.args.licence = "AGPL-3.0-or-later"
+        self.args.files = None
+        self.args.directories = [str(temp_dir)]
+        self.args.exclude_file = None
+        self.args.quiet = True
+        self.args.jobs = jobs
+        self.args.gitignore = False
+
+        with patch(
+            "pontos.updateheader.updateheader._parse_args",
+            return_value=self.args,
+        ), redirect_stdout(StringIO()) as output:
+            main()
+
+        return output.getvalue()
+
+    @patch("pontos.updateheader.updateheader.DEFAULT_CHUNK_SIZE", 2)
+    def test_main_output_order(self):
+        with temp_directory() as temp_dir:
+            for i in range(10):
+                (temp_dir / f"file{i}.py").write_text(
+                    HEADER.format(date="2021"), encoding="utf-8"
+                )
+
+            serial = self._run_main_in_directory(temp_dir, jobs=1)
+            parallel = self._run_main_in_directory(temp_dir, jobs=3)
+
+        self.assertEqual(len(serial.splitlines()), 10)
+        self.assertEqual(parallel, serial)
+
+    @patch("pontos.updateheader.updateheader.ProcessPoolExecutor")
+    def test_main_single_chunk_serial(self, executor_mock):
+        with temp_directory() as temp_dir:
+            new_file = temp_dir / "new.py"
+            new_file.touch()
+
+            output = self._run_main_in_directory(temp_dir, jobs=4)
+
+            self.assertEqual(
+                new_file.read_text(encoding="utf-8"),
+                HEADER.format(date="2021") + "\n\n",
+            )
+
+        executor_mock.assert_not_called()
+        self.assertIn(f"{new_file}: Added licence header.", output)
+
+    def test_iter_files_gitignore(self):
+        with temp_directory() as temp_dir:
+            (temp_dir / ".git").mkdir()
+            (temp_dir / ".git" / "config").touch()
+            (temp_dir / "foo" / "build").mkdir(parents=True)
+            (temp_dir / ".gitignore").write_text("*.log\n", encoding="utf-8")
+            (temp_dir / "foo" / ".gitignore").write_text(
+                "/build/\n!keep.log\n", encoding="utf-8"
+            )
+            (temp_dir / "foo" / "build" / "foo.py").touch()
+            (temp_dir / "foo" / "foo.py").touch()
+            (temp_dir / "foo" / "foo.log").touch()
+            (temp_dir / "foo" / "keep.log").touch()
+            (temp_dir / "root.log").touch()
+            (temp_dir / "root.py").touch()
+
+            files = list(
+                iter_files(temp_dir, ExcludeMatcher(["*.pyc"]), gitignore=True)
+            )
+            all_files = list(iter_files(temp_dir))
+
+        self.assertCountEqual(
+            files,
+            [
+                temp_dir / ".gitignore",
+                temp_dir / "foo" / ".gitignore",
+                temp_dir / "foo" / "foo.py",
+                temp_dir / "foo" / "keep.log",
+                temp_dir / "root.py",
+            ],
+        )
+        self.assertEqual(len(all_files), 9)
+
+    def test_iter_files(self):
+        with temp_directory() as temp_dir:
+            (temp_dir / "foo" / "bar").mkdir(parents=True)
+            (temp_dir / "excluded").mkdir()
+            (temp_dir / "foo" / "bar" / "baz.py").touch()
+            (temp_dir / "foo" / "foo.py").touch()
+            (temp_dir / "excluded" / "excluded.py").touch()
+            (temp_dir / "root.py").touch()
+
+            files = list(iter_files(temp_dir, ExcludeMatcher(["excluded"])))
+
+        self.assertCountEqual(
+            files,
+            [
+                temp_dir / "foo" / "bar" / "baz.py",
+                temp_dir / "foo" / "foo.py",
+                temp_dir / "root.py",
+            ],
+        )
+
+    def test_iter_files_report_excluded(self):
+        term = MagicMock(spec=Terminal)
+
+        with temp_directory() as temp_dir:
+            (temp_dir / ".git").mkdir()
+            (temp_dir / "excluded").mkdir()
+            (temp_dir / "excluded" / "excluded.py").touch()
+            (temp_dir / "foo.log").touch()
+            (temp_dir / "root.py").touch()
+
+            files = list(
+                iter_files(
+                    temp_dir,
+                    ExcludeMatcher(["excluded", "*.log"]),
+                    gitignore=True,
+                    term=term,
+                )
+            )
+
+        self.assertEqual(files, [temp_dir / "root.py"])
+        self.assertCountEqual(
+            [args[0] for args, _ in term.warning.call_args_list],
+            [
+                f"{temp_dir / 'excluded'}: Ignoring directory from "
+                "exclusion list.",
+                f"{temp_dir / 'foo.log'}: Ignoring file from exclusion list.",
+            ],
+        )
+
     @patch("sys.stdout", new_callable=StringIO)
     @patch("pontos.updateheader.updateheader._parse_args")
     def test_main_never_happen(self, argparser_mock, mock_stdout):